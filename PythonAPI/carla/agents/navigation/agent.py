@@ -10,10 +10,14 @@ The agent also responds to traffic lights. """
 import sys
 import math
 
+import numpy as np
+
 from enum import Enum
 
 import carla
 from agents.tools.misc import is_within_distance_ahead, is_within_distance, compute_distance
+from agents.tools.actor_state_table import get_actor_state_table, in_cone
+from agents.tools.traffic_light_index import get_traffic_light_index
 
 class AgentState(Enum):
     """
@@ -83,11 +87,19 @@ class Agent(object):
                    red traffic light affecting us
         """
         ego_vehicle_location = self._vehicle.get_location()
+
+        # Only the lights with their trigger waypoint within the proximity threshold can affect us
+        tlight_index = get_traffic_light_index(self._world, self._map)
+        nearby_ids = tlight_index.light_ids_with_trigger_near(ego_vehicle_location, self._proximity_tlight_threshold)
+        if not nearby_ids:
+            return (False, None)
+
         ego_vehicle_waypoint = self._map.get_waypoint(ego_vehicle_location)
 
         for traffic_light in lights_list:
-            object_location = self._get_trafficlight_trigger_location(traffic_light)
-            object_waypoint = self._map.get_waypoint(object_location)
+            if traffic_light.id not in nearby_ids:
+                continue
+            object_waypoint = tlight_index.trigger_waypoint(traffic_light)
 
             if object_waypoint.road_id != ego_vehicle_waypoint.road_id:
                 continue
@@ -165,26 +177,33 @@ class Agent(object):
         if ego_wpt.lane_id < 0 and lane_offset != 0:
             lane_offset *= -1
 
-        for target_vehicle in vehicle_list:
+        vehicle_list = list(vehicle_list)
+        if not vehicle_list:
+            return (False, None, -1)
 
-            target_vehicle_loc = target_vehicle.get_location()
-            # If the object is not in our next or current lane it's not an obstacle
+        # Distance and angle test of all the targets at once, on the actor state table of this frame
+        table = get_actor_state_table(self._world)
+        target_locations = table.locations_of(vehicle_list)
+        in_range = in_cone(target_locations, ego_loc, table.yaw_of(self._vehicle),
+                           proximity_th, up_angle_th, low_angle_th)
+
+        # The lane test (a map query per target) is only done for the targets in range, in the order of vehicle_list
+        next_wpt = None
+        for i in np.flatnonzero(in_range):
+            target_vehicle = vehicle_list[i]
+            target_vehicle_loc = carla.Location(*(float(value) for value in target_locations[i]))
 
+            # If the object is not in our next or current lane it's not an obstacle
             target_wpt = self._map.get_waypoint(target_vehicle_loc)
             if target_wpt.road_id != ego_wpt.road_id or \
                     target_wpt.lane_id != ego_wpt.lane_id + lane_offset:
-                next_wpt = self._local_planner.get_incoming_waypoint_and_direction(steps=5)[0]
+                if next_wpt is None:
+                    next_wpt = self._local_planner.get_incoming_waypoint_and_direction(steps=5)[0]
                 if target_wpt.road_id != next_wpt.road_id or \
                         target_wpt.lane_id != next_wpt.lane_id + lane_offset:  # safe from vehicle in other lane
                     continue
 
-            if is_within_distance(target_vehicle_loc, ego_loc,  # same lane maybe Z
-                                  self._vehicle.get_transform().rotation.yaw,
-                                  proximity_th, up_angle_th, low_angle_th):
-
-            # is_within_distance Check if a target object is within a certain distance in front of a reference object.Z
-
-                return (True, target_vehicle, compute_distance(target_vehicle_loc, ego_loc))
+            return (True, target_vehicle, compute_distance(target_vehicle_loc, ego_loc))
 
         return (False, None, -1)
 
@@ -11,15 +11,16 @@ traffic signs, and has different possible configurations. """
 import random
 import numpy as np
 import carla
-from agents.navigation.agent import Agent
+from agents.navigation.reusable_behavior_agent import ReusableBehaviorAgent
 from agents.navigation.local_planner_behavior import LocalPlanner, RoadOption
 from agents.navigation.global_route_planner import GlobalRoutePlanner
 from agents.navigation.global_route_planner_dao import GlobalRoutePlannerDAO
 from agents.navigation.types_behavior2 import Cautious, Aggressive, Normal
 
 from agents.tools.misc import get_speed, positive
+from agents.tools.actor_state_table import get_actor_state_table, VEHICLE, WALKER
 
-class BehaviorAgentZ4(Agent):
+class BehaviorAgentZ4(ReusableBehaviorAgent):
     """
     BehaviorAgent implements an agent that navigates scenes to reach a given
     target destination, by computing the shortest possible path to it.
@@ -43,25 +44,10 @@ class BehaviorAgentZ4(Agent):
         """
 
         super(BehaviorAgentZ4, self).__init__(vehicle)
-        self.vehicle = vehicle
         self.ignore_traffic_light = ignore_traffic_light
         self._local_planner = LocalPlanner(self)  # def __init__(self, agent):
-        self._grp = None
         self.look_ahead_steps = 0
-
-        # Vehicle information
-        self.speed = 0
-        self.speed_limit = 0
-        self.direction = None
-        self.incoming_direction = None
-        self.incoming_waypoint = None
-        self.start_waypoint = None
-        self.end_waypoint = None
-        self.is_at_traffic_light = 0
-        self.light_state = "Green"
-        self.light_id_to_ignore = -1
         self.min_speed = 5
-        self.behavior = None
         self._sampling_resolution = 4.5
 
         # Parameters for agent behavior
@@ -309,9 +295,10 @@ class BehaviorAgentZ4(Agent):
             :return distance: distance to nearby vehicle
         """
 
-        vehicle_list = self._world.get_actors().filter("*vehicle*")
-        def dist(v): return v.get_location().distance(waypoint.transform.location)
-        vehicle_list = [v for v in vehicle_list if dist(v) < 45 and v.id != self.vehicle.id]
+        # nearby vehicles from the actor state table shared by all agents in this frame
+        table = get_actor_state_table(self._world)
+        vehicle_list = table.actors(table.within_radius(
+            waypoint.transform.location, 45, kind=VEHICLE, exclude_id=self.vehicle.id))
 
         if self.direction == RoadOption.CHANGELANELEFT:
             vehicle_state, vehicle, distance = self._bh_is_vehicle_hazard(
@@ -366,9 +353,9 @@ class BehaviorAgentZ4(Agent):
             :return distance: distance to nearby walker
         """
 
-        walker_list = self._world.get_actors().filter("*walker.pedestrian*")
-        def dist(w): return w.get_location().distance(waypoint.transform.location)
-        walker_list = [w for w in walker_list if dist(w) < 10]
+        table = get_actor_state_table(self._world)
+        walker_list = table.actors(table.within_radius(
+            waypoint.transform.location, 10, kind=WALKER))
 
         if self.direction == RoadOption.CHANGELANELEFT:
             walker_state, walker, distance = self._bh_is_vehicle_hazard(waypoint, location, walker_list, max(
@@ -14,6 +14,7 @@ import networkx as nx
 import sys
 
 import carla
+from agents.navigation import global_route_planner_cache
 from agents.navigation.local_planner import RoadOption
 from agents.tools.misc import vector
 
@@ -41,11 +42,19 @@ class GlobalRoutePlanner(object):
         """
         Performs initial server data lookup for detailed topology
         and builds graph representation of the world map.
+        The graph is built once per map and sampling resolution, and then reused from the cache.
         """
+        wmap, resolution = self._dao.get_map(), self._dao.get_resolution()
+        cached_graph = global_route_planner_cache.load(wmap, resolution)
+        if cached_graph is not None:
+            self._graph, self._id_map, self._road_id_to_edge = cached_graph
+            return
+
         self._topology = self._dao.get_topology()  # returns a densely populated list of dictionaries that have entry exit and a waypoint path between them for a given map.
         self._graph, self._id_map, self._road_id_to_edge = self._build_graph()  # return graph, id_map, road_id_to_edge
         self._find_loose_ends()
         self._lane_change_link()
+        global_route_planner_cache.store(wmap, resolution, self._graph, self._id_map, self._road_id_to_edge)
 
         #Now we have a full graph made with nodes and edges. Nodes are the waypoint entry exit xyz points and the node ids are their values from the keys of entry exit xyz point and edges are connections between all the entry exits of the roads and all the attributes along with the possible lane changes
 
@@ -0,0 +1,174 @@
+# Copyright (c) # Copyright (c) 2018-2020 CVC.
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides the cache of the road graphs built by GlobalRoutePlanner.
+
+A graph (with its id_map and road_id_to_edge) is identified by the map name,
+the hash of the OpenDRIVE description and the sampling resolution. It is kept
+in memory for the rest of the process and written to disk, so that the next
+process does not have to walk the topology again.
+
+On disk, every waypoint is stored as (road_id, lane_id, s) and recreated with
+carla.Map.get_waypoint_xodr, which only needs the client side map.
+The cache directory is CARLA_ROUTE_PLANNER_CACHE (default
+~/.cache/carla_route_planner), an empty value disables the disk cache.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+
+import numpy as np
+import networkx as nx
+
+from agents.navigation.local_planner import RoadOption
+
+_FORMAT_VERSION = 1
+_WAYPOINT_ATTRIBUTES = ('entry_waypoint', 'exit_waypoint', 'change_waypoint')
+_WAYPOINT_DTYPE = np.dtype([('road_id', np.int32), ('lane_id', np.int32), ('s', np.float64)])
+
+_graphs = dict()  # key -> (graph, id_map, road_id_to_edge)
+
+
+def cache_directory():
+    """
+    Directory of the disk cache, None if it is disabled
+    """
+    directory = os.environ.get('CARLA_ROUTE_PLANNER_CACHE',
+                               os.path.join(os.path.expanduser('~'), '.cache', 'carla_route_planner'))
+    return directory or None
+
+
+def graph_key(wmap, sampling_resolution):
+    """
+    Key of the graph of a map: (map name, OpenDRIVE hash, sampling resolution)
+    """
+    opendrive_hash = hashlib.sha1(wmap.to_opendrive().encode('utf-8')).hexdigest()
+    return (wmap.name, opendrive_hash, float(sampling_resolution))
+
+
+def _cache_filename(key):
+    """
+    File of a graph in the disk cache
+    """
+    map_name, opendrive_hash, sampling_resolution = key
+    basename = "{}_{}_{}.pkl".format(map_name.replace('/', '_'), opendrive_hash[:16], sampling_resolution)
+    return os.path.join(cache_directory(), basename)
+
+
+def load(wmap, sampling_resolution):
+    """
+    Return the cached (graph, id_map, road_id_to_edge) of a map, None if it has not been built yet
+    """
+    key = graph_key(wmap, sampling_resolution)
+    if key in _graphs:
+        return _graphs[key]
+
+    if cache_directory() is None or not hasattr(wmap, 'get_waypoint_xodr'):
+        return None
+
+    filename = _cache_filename(key)
+    if not os.path.isfile(filename):
+        return None
+
+    try:
+        with open(filename, 'rb') as fd:
+            data = pickle.load(fd)
+        if data['version'] != _FORMAT_VERSION or data['key'] != key:
+            return None
+        graph_data = _decode(wmap, data)
+    except Exception as e:  # pylint: disable=broad-except
+        print("Ignoring the route planner cache {}: {}".format(filename, e))
+        return None
+
+    _graphs[key] = graph_data
+    return graph_data
+
+
+def store(wmap, sampling_resolution, graph, id_map, road_id_to_edge):
+    """
+    Cache a freshly built graph in memory and on disk
+    """
+    key = graph_key(wmap, sampling_resolution)
+    _graphs[key] = (graph, id_map, road_id_to_edge)
+
+    if cache_directory() is None:
+        return
+
+    filename = _cache_filename(key)
+    try:
+        data = _encode(graph, id_map, road_id_to_edge)
+        data['key'] = key
+
+        if not os.path.isdir(cache_directory()):
+            os.makedirs(cache_directory())
+        # write to a temporary file first, so that concurrent processes never read a partial file
+        fd, temp_filename = tempfile.mkstemp(dir=cache_directory(), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as temp_file:
+            pickle.dump(data, temp_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_filename, filename)
+    except Exception as e:  # pylint: disable=broad-except
+        print("Could not write the route planner cache {}: {}".format(filename, e))
+
+
+def _encode(graph, id_map, road_id_to_edge):
+    """
+    Convert a graph into plain python and numpy data, waypoints become indices into a waypoint table
+    """
+    waypoint_index = dict()
+    waypoint_table = []
+
+    def index(waypoint):
+        if waypoint.id not in waypoint_index:
+            waypoint_index[waypoint.id] = len(waypoint_table)
+            waypoint_table.append((waypoint.road_id, waypoint.lane_id, waypoint.s))
+        return waypoint_index[waypoint.id]
+
+    edges = []
+    for n1, n2, attributes in graph.edges(data=True):
+        attributes = dict(attributes)
+        for name in _WAYPOINT_ATTRIBUTES:
+            if name in attributes:
+                attributes[name] = index(attributes[name])
+        attributes['path'] = np.array([index(waypoint) for waypoint in attributes['path']], dtype=np.int32)
+        attributes['type'] = attributes['type'].value
+        edges.append((n1, n2, attributes))
+
+    return {
+        'version': _FORMAT_VERSION,
+        'nodes': list(graph.nodes(data='vertex')),
+        'edges': edges,
+        'waypoints': np.array(waypoint_table, dtype=_WAYPOINT_DTYPE),
+        'id_map': id_map,
+        'road_id_to_edge': road_id_to_edge,
+    }
+
+
+def _decode(wmap, data):
+    """
+    Rebuild (graph, id_map, road_id_to_edge) from the data written by _encode
+    """
+    waypoints = []
+    for road_id, lane_id, s in data['waypoints']:
+        waypoint = wmap.get_waypoint_xodr(int(road_id), int(lane_id), float(s))
+        if waypoint is None:
+            raise ValueError("waypoint ({}, {}, {}) does not exist in the map".format(road_id, lane_id, s))
+        waypoints.append(waypoint)
+
+    graph = nx.DiGraph()
+    for node, vertex in data['nodes']:
+        graph.add_node(node, vertex=vertex)
+
+    for n1, n2, attributes in data['edges']:
+        for name in _WAYPOINT_ATTRIBUTES:
+            if name in attributes:
+                attributes[name] = waypoints[attributes[name]]
+        attributes['path'] = [waypoints[i] for i in attributes['path']]
+        attributes['type'] = RoadOption(attributes['type'])
+        graph.add_edge(n1, n2, **attributes)
+
+    return graph, data['id_map'], data['road_id_to_edge']
@@ -130,3 +130,7 @@ class GlobalRoutePlannerDAO(object):  # DAO, data access object?
     def get_resolution(self):
         """ Accessor for self._sampling_resolution """
         return self._sampling_resolution
+
+    def get_map(self):
+        """ Accessor for self._wmap """
+        return self._wmap
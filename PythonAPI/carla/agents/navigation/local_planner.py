@@ -12,6 +12,7 @@ import sys
 
 import carla
 from agents.navigation.controller import VehiclePIDController
+from agents.navigation.route_polyline import RoutePolyline
 from agents.tools.misc import draw_waypoints
 
 
@@ -82,6 +83,7 @@ class LocalPlanner(object):
         self._waypoints_queue = deque(maxlen=20000)
         self._buffer_size = 5
         self._waypoint_buffer = deque(maxlen=self._buffer_size)
+        self._route = None  # RoutePolyline of the global plan
 
         # initializing controller
         self._init_controller(opt_dict)
@@ -222,8 +224,24 @@ class LocalPlanner(object):
             else:
                 break
 
+        # the plan as a polyline, converted once
+        self._route = RoutePolyline(list(self._waypoint_buffer) + list(self._waypoints_queue))
+
         self._global_plan = True
 
+    def _followed_route(self):
+        """
+        Returns the RoutePolyline of the global plan if its cursor is at the head of the waypoint buffer,
+        None otherwise (no global plan, or waypoints computed on the fly)
+
+        :return: RoutePolyline or None
+        """
+        if not self._global_plan or self._route is None or not self._waypoint_buffer:
+            return None
+        if self._route.head() is not self._waypoint_buffer[0]:
+            return None
+        return self._route
+
     def run_step(self, debug=False):
         """
         Execute one step of local planning which involves running the longitudinal and lateral PID controllers to
@@ -256,9 +274,8 @@ class LocalPlanner(object):
                 else:
                     break
 
-        # current vehicle waypoint
         vehicle_transform = self._vehicle.get_transform()
-        self._current_waypoint = self._map.get_waypoint(vehicle_transform.location)
+        route = self._followed_route()
         # target waypoint
         self.target_waypoint, self._target_road_option = self._waypoint_buffer[0]
 
@@ -280,9 +297,13 @@ class LocalPlanner(object):
         # purge the queue of obsolete waypoints
         max_index = -1
 
-        for i, (waypoint, _) in enumerate(self._waypoint_buffer):
-            if waypoint.transform.location.distance(vehicle_transform.location) < self._min_distance:
-                max_index = i  # jump to this waypoint directly as vehcicle has moved to this waypoint after control loop :3
+        if route is not None:
+            max_index = route.advance(vehicle_transform.location, self._min_distance, len(self._waypoint_buffer)) - 1
+        else:
+            for i, (waypoint, _) in enumerate(self._waypoint_buffer):
+                if waypoint.transform.location.distance(vehicle_transform.location) < self._min_distance:
+                    # jump to this waypoint directly as vehcicle has moved to this waypoint after control loop :3
+                    max_index = i
         if max_index >= 0:
             for i in range(max_index + 1):  # range(3) is 0, 1, 2. That means we have to add 1 for max_index = i if i =3
                 self._waypoint_buffer.popleft()
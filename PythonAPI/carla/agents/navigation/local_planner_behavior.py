@@ -14,6 +14,7 @@ from enum import Enum
 
 import carla
 from agents.navigation.controller import VehiclePIDController
+from agents.navigation.route_polyline import RoutePolyline
 from agents.tools.misc import distance_vehicle, draw_waypoints
 
 
@@ -70,6 +71,7 @@ class LocalPlanner(object):
         self.waypoints_queue = deque(maxlen=20000)  # queue with tuples of (waypoint, RoadOption)
         self._buffer_size = 5
         self._waypoint_buffer = deque(maxlen=self._buffer_size)
+        self._route = None  # RoutePolyline of the global plan
 
         self._init_controller()  # initializing controller
 
@@ -78,6 +80,28 @@ class LocalPlanner(object):
         self._vehicle = None
         print("Resetting ego-vehicle!")
 
+    def set_vehicle(self, vehicle, wmap=None):
+        """
+        Bind the planner to a new vehicle, clearing the plan of the previous one.
+
+            :param vehicle: actor to apply to local planner logic onto
+            :param wmap: map of the vehicle, if it changed
+        """
+        self._vehicle = vehicle
+        if wmap is not None:
+            self._map = wmap
+
+        self.waypoints_queue.clear()
+        self._waypoint_buffer.clear()
+        self.target_waypoint = None
+        self.target_road_option = None
+        self._pid_controller = None
+        self._route = None
+
+        self._current_waypoint = self._map.get_waypoint(self._vehicle.get_location())
+        self._global_plan = False
+        self._target_speed = self._vehicle.get_speed_limit()
+
     def _init_controller(self):
         """
         Controller initialization.
@@ -153,8 +177,22 @@ class LocalPlanner(object):
                 else:
                     break
 
+        # the whole remaining plan as a polyline, converted once
+        self._route = RoutePolyline(list(self._waypoint_buffer) + list(self.waypoints_queue))
+
         self._global_plan = True
 
+    def _followed_route(self):
+        """
+        Returns the RoutePolyline of the plan if its cursor is at the head of the waypoint buffer,
+        None if there is no plan or the queue has been changed without set_global_plan().
+        """
+        if self._route is None or not self._waypoint_buffer:
+            return None
+        if self._route.head() is not self._waypoint_buffer[0]:
+            return None
+        return self._route
+
     def get_incoming_waypoint_and_direction(self, steps=3):
         """
         Returns direction and waypoint at a distance ahead defined by the user.
@@ -207,8 +245,8 @@ class LocalPlanner(object):
                 else:
                     break
 
-        # Current vehicle waypoint
-        self._current_waypoint = self._map.get_waypoint(self._vehicle.get_location())
+        vehicle_transform = self._vehicle.get_transform()
+        route = self._followed_route()
 
         # Target waypoint
         self.target_waypoint, self.target_road_option = self._waypoint_buffer[0]  # first location is the start way point of over take i.e., the left lane change or right
@@ -227,13 +265,16 @@ class LocalPlanner(object):
         control = self._pid_controller.run_step(self._target_speed, self.target_waypoint)
 
         # Purge the queue of obsolete waypoints
-        vehicle_transform = self._vehicle.get_transform()
         max_index = -1
 
-        for i, (waypoint, _) in enumerate(self._waypoint_buffer):
-            if distance_vehicle(
-                    waypoint, vehicle_transform) < self._min_distance:
-                max_index = i
+        if route is not None:
+            max_index = route.advance(vehicle_transform.location, self._min_distance,
+                                      len(self._waypoint_buffer), planar=True) - 1
+        else:
+            for i, (waypoint, _) in enumerate(self._waypoint_buffer):
+                if distance_vehicle(
+                        waypoint, vehicle_transform) < self._min_distance:
+                    max_index = i
         if max_index >= 0:
             for i in range(max_index + 1):
                 self._waypoint_buffer.popleft()
@@ -0,0 +1,75 @@
+# Copyright (c) # Copyright (c) 2018-2020 CVC.
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+""" This module implements the base class of the behavior agents that are reused
+across the repetitions of a scenario, i.e. bound to the new vehicle of every
+repetition instead of being created again. """
+
+from agents.navigation.agent import Agent
+
+
+class ReusableBehaviorAgent(Agent):
+    """
+    Base class of BehaviorAgentZ2 and BehaviorAgentZ4. Subclasses set up the
+    LocalPlanner of local_planner_behavior, the global route planner (_grp),
+    and the behavior in their constructor.
+    """
+
+    def __init__(self, vehicle):
+        """
+        Constructor method.
+
+            :param vehicle: actor to apply to local planner logic onto
+        """
+        super(ReusableBehaviorAgent, self).__init__(vehicle)
+        self.vehicle = vehicle
+        self._grp = None
+        self.behavior = None
+
+        # Vehicle information
+        self.speed = 0
+        self.speed_limit = 0
+        self.direction = None
+        self.incoming_direction = None
+        self.incoming_waypoint = None
+        self.start_waypoint = None
+        self.end_waypoint = None
+        self.is_at_traffic_light = 0
+        self.light_state = "Green"
+        self.light_id_to_ignore = -1
+
+    def reset(self, vehicle):
+        """
+        This method binds the agent to a new vehicle (e.g. the one of the next
+        repetition of a scenario). The route planner is kept as long as the map
+        does not change, the plan and the state of the previous vehicle are cleared.
+
+            :param vehicle: actor to apply to local planner logic onto
+        """
+        world = vehicle.get_world()
+        if world.id != self._world.id:  # new episode, the map has to be fetched again
+            wmap = world.get_map()
+            if wmap.name != self._map.name:
+                self._grp = None
+            self._world = world
+            self._map = wmap
+
+        self._vehicle = vehicle
+        self.vehicle = vehicle
+        self._last_traffic_light = None
+        self._local_planner.set_vehicle(vehicle, self._map)
+
+        # Vehicle information
+        self.speed = 0
+        self.speed_limit = 0
+        self.direction = None
+        self.incoming_direction = None
+        self.incoming_waypoint = None
+        self.start_waypoint = None
+        self.end_waypoint = None
+        self.is_at_traffic_light = 0
+        self.light_state = "Green"
+        self.light_id_to_ignore = -1
+        self.behavior = type(self.behavior)()  # fresh counters (e.g. tailgate_counter)
@@ -0,0 +1,64 @@
+# Copyright (c) # Copyright (c) 2018-2020 CVC.
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+""" This module contains the numpy polyline of a planned route used by the local planners. """
+
+import numpy as np
+
+
+class RoutePolyline(object):
+    """
+    RoutePolyline holds a planned route, a list of (carla.Waypoint, RoadOption) as returned by
+    GlobalRoutePlanner.trace_route, as a contiguous array of points. A cursor marks the first
+    point that has not been reached yet, it only moves forward.
+
+    The points are converted once, so that following the route needs no waypoint queries:
+    the reached points are found with one vectorized distance test.
+    """
+
+    def __init__(self, plan):
+        """
+        :param plan: list of (carla.Waypoint, RoadOption)
+        """
+        self.plan = list(plan)
+        self.cursor = 0
+
+        self.points = np.array([[wpt.transform.location.x, wpt.transform.location.y, wpt.transform.location.z]
+                                for wpt, _ in self.plan], dtype=np.float64).reshape(-1, 3)
+
+    def __len__(self):
+        """
+        Number of points not reached yet
+        """
+        return len(self.plan) - self.cursor
+
+    def advance(self, location, min_distance, count, planar=False):
+        """
+        Move the cursor past the last of the next count points closer than min_distance to location.
+
+        :param planar: measure the distances in the xy plane only
+        :return: number of points the cursor moved
+        """
+        dimensions = 2 if planar else 3
+        window = self.points[self.cursor:self.cursor + count, :dimensions]
+        if len(window) == 0:
+            return 0
+
+        offset = window - np.array([location.x, location.y, location.z])[:dimensions]
+        reached = np.flatnonzero(np.einsum('ij,ij->i', offset, offset) < min_distance * min_distance)
+        if len(reached) == 0:
+            return 0
+
+        passed = int(reached[-1]) + 1
+        self.cursor += passed
+        return passed
+
+    def head(self):
+        """
+        (carla.Waypoint, RoadOption) at the cursor, None once the route has been completed
+        """
+        if self.cursor >= len(self.plan):
+            return None
+        return self.plan[self.cursor]
@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Module with the actor state table: positions, yaws and velocities of all the
+actors of a frame as numpy arrays.
+
+The table is built once per frame from the world snapshot (which is kept on
+the client side) and shared by all the agents driving in that world, so the
+nearby actor queries of the agents are vectorized operations on these arrays
+instead of a get_actors() call and per actor getters in every step.
+The type of an actor is only looked up the first time it is seen.
+"""
+
+import math
+import numpy as np
+
+OTHER = 0
+VEHICLE = 1
+WALKER = 2
+
+
+def _actor_kind(type_id):
+    """
+    Kind of an actor from its blueprint id
+    """
+    if type_id.startswith('vehicle.'):
+        return VEHICLE
+    if type_id.startswith('walker.pedestrian'):
+        return WALKER
+    return OTHER
+
+
+class ActorRegistry(object):
+    """
+    The actors seen in the frames of one world: their kind and carla.Actor object
+    by actor id, and the table of the last frame. The actors that are no longer in
+    a frame are dropped, so that the registry doesn't grow across the scenarios
+    run on the same world.
+    """
+
+    def __init__(self):
+        self.world_id = None
+        self.kinds = {}     # actor id -> OTHER, VEHICLE or WALKER
+        self.actors = {}    # actor id -> carla.Actor
+        self.latest = None  # table of the last frame
+
+    def clear(self):
+        """
+        Forget all the actors and the last table
+        """
+        self.kinds.clear()
+        self.actors.clear()
+        self.latest = None
+
+    def get_table(self, world, snapshot=None):
+        """
+        Return the actor state table of the given frame of world, the latest one if snapshot is None
+        """
+        if snapshot is None:
+            snapshot = world.get_snapshot()
+
+        if self.world_id != world.id:  # new episode, actor ids may be reused
+            self.world_id = world.id
+            self.clear()
+
+        if self.latest is not None and self.latest.frame == snapshot.frame:
+            return self.latest
+
+        self.latest = ActorStateTable(world, snapshot, self)
+        return self.latest
+
+    def update(self, world, actor_ids):
+        """
+        Look up the actors of a frame that are not known yet, and drop the known
+        actors that are not in the frame anymore
+        """
+        unknown_ids = [actor_id for actor_id in actor_ids if actor_id not in self.kinds]
+        if len(self.kinds) > len(actor_ids) - len(unknown_ids):
+            alive = set(actor_ids)
+            for actor_id in [actor_id for actor_id in self.kinds if actor_id not in alive]:
+                del self.kinds[actor_id]
+                self.actors.pop(actor_id, None)
+
+        if unknown_ids:
+            for actor in world.get_actors(unknown_ids):
+                self.kinds[actor.id] = _actor_kind(actor.type_id)
+                self.actors[actor.id] = actor
+
+
+_registry = ActorRegistry()
+
+
+def get_actor_state_table(world, snapshot=None):
+    """
+    Return the actor state table of the current frame of world. It is built by the
+    first agent asking for it in a frame, the other agents get the same table.
+
+        :param world: carla.World object
+        :param snapshot: carla.WorldSnapshot of the frame, the latest one of world if None
+        :return: ActorStateTable
+    """
+    return _registry.get_table(world, snapshot)
+
+
+def in_cone(locations, reference_location, orientation, max_distance, d_angle_th_up, d_angle_th_low=0):
+    """
+    Vectorized misc.is_within_distance: which of the target locations are within
+    max_distance of the reference location and inside the given angle range.
+
+        :param locations: (n, 2) or (n, 3) array of target locations
+        :param reference_location: location of the reference object
+        :param orientation: orientation (yaw) of the reference object in degrees
+        :param max_distance: maximum allowed distance
+        :param d_angle_th_up: upper threshold for angle
+        :param d_angle_th_low: low threshold for angle (optional, default is 0)
+        :return: boolean array, one value per target location
+    """
+    delta = locations[:, :2] - np.array([reference_location.x, reference_location.y])
+    norm = np.hypot(delta[:, 0], delta[:, 1])
+
+    forward = np.array([math.cos(math.radians(orientation)), math.sin(math.radians(orientation))])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d_angle = np.degrees(np.arccos(np.clip(delta.dot(forward) / norm, -1., 1.)))
+
+    # targets closer than 1 mm count as within distance, as in is_within_distance
+    return (norm < 0.001) | ((norm <= max_distance) & (d_angle_th_low < d_angle) & (d_angle < d_angle_th_up))
+
+
+class ActorStateTable(object):
+    """
+    State of all the actors of one frame. Rows are sorted by actor id:
+    ids, kinds, locations (n, 3), yaws (degrees) and velocities (n, 3).
+    """
+
+    def __init__(self, world, snapshot, registry):
+        self.frame = snapshot.frame
+        self._actors = registry.actors
+
+        count = len(snapshot)
+        ids = np.empty(count, dtype=np.int64)
+        states = np.empty((count, 7), dtype=np.float64)
+
+        for row, actor_snapshot in enumerate(snapshot):
+            transform = actor_snapshot.get_transform()
+            velocity = actor_snapshot.get_velocity()
+            ids[row] = actor_snapshot.id
+            states[row] = (transform.location.x, transform.location.y, transform.location.z,
+                           transform.rotation.yaw, velocity.x, velocity.y, velocity.z)
+        registry.update(world, ids.tolist())
+
+        order = np.argsort(ids)
+        self.ids = ids[order]
+        self.kinds = np.array([registry.kinds.get(actor_id, OTHER) for actor_id in self.ids.tolist()], dtype=np.int8)
+        self.locations = states[order, 0:3]
+        self.yaws = states[order, 3]
+        self.velocities = states[order, 4:7]
+
+    def rows_of(self, actor_ids):
+        """
+        Rows of the given actor ids, -1 for the ids that are not in the table
+        """
+        actor_ids = np.asarray(actor_ids, dtype=np.int64)
+        rows = np.searchsorted(self.ids, actor_ids)
+        rows[rows >= len(self.ids)] = 0
+        found = len(self.ids) > 0 and self.ids[rows] == actor_ids
+        return np.where(found, rows, -1)
+
+    def within_radius(self, location, radius, kind=None, exclude_id=None):
+        """
+        Rows of the actors (of the given kind) closer than radius to location
+        """
+        delta = self.locations - np.array([location.x, location.y, location.z])
+        mask = np.einsum('ij,ij->i', delta, delta) < radius * radius
+        if kind is not None:
+            mask &= self.kinds == kind
+        if exclude_id is not None:
+            mask &= self.ids != exclude_id
+        return np.flatnonzero(mask)
+
+    def actors(self, rows):
+        """
+        carla.Actor objects of the given rows
+        """
+        return [self._actors[actor_id] for actor_id in self.ids[rows].tolist() if actor_id in self._actors]
+
+    def locations_of(self, actors):
+        """
+        (n, 3) array with the locations of the given actors, the ones that are not
+        in the table (e.g. spawned after the frame) are asked for their location
+        """
+        actors = list(actors)
+        rows = self.rows_of([actor.id for actor in actors])
+        locations = self.locations[np.maximum(rows, 0)] if len(self.ids) else np.zeros((len(actors), 3))
+        for i in np.flatnonzero(rows < 0):
+            location = actors[i].get_location()
+            locations[i] = (location.x, location.y, location.z)
+        return locations
+
+    def yaw_of(self, actor):
+        """
+        Yaw of the given actor in degrees
+        """
+        row = self.rows_of([actor.id])[0]
+        if row < 0:
+            return actor.get_transform().rotation.yaw
+        return float(self.yaws[row])
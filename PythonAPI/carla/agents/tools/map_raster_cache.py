@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Module with the on-disk cache of the map rasters drawn by the MapImage of the
+no_rendering_mode visualizers (PythonAPI/examples and scenario_runner).
+
+An entry is keyed by the hash of the OpenDRIVE content of the map, the pixels
+per meter, the renderer (which copy of MapImage, and the version of its drawing
+code) and the drawing options. It is stored as a .tga image and a .json
+metadata sidecar with the world offset, width and pixels per meter of the
+raster, so that a cache hit needs no waypoint generation. Both files are
+written to a temporary file and renamed, the sidecar last, so concurrent
+visualizers never read a partial entry.
+
+The cache directory is $CARLA_MAP_CACHE_DIR, ~/.cache/carla/no_rendering_mode
+by default.
+"""
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+
+import numpy as np
+import pygame
+
+CACHE_FORMAT_VERSION = 1
+
+
+def default_cache_dir():
+    """
+    Cache directory, $CARLA_MAP_CACHE_DIR or ~/.cache/carla/no_rendering_mode
+    """
+    return os.environ.get('CARLA_MAP_CACHE_DIR',
+                          os.path.join(os.path.expanduser('~'), '.cache', 'carla', 'no_rendering_mode'))
+
+
+def compute_map_bounds(carla_map, margin=50):
+    """
+    World offset (min x, min y) and width of the square that holds all the waypoints
+    of the map plus margin, from a single pass over the waypoints
+
+        :param carla_map: carla.Map
+        :param margin: meters added on every side
+        :return: ((min_x, min_y), width)
+    """
+    locations = np.array([(w.transform.location.x, w.transform.location.y)
+                          for w in carla_map.generate_waypoints(2)])
+    min_x, min_y = locations.min(axis=0) - margin
+    max_x, max_y = locations.max(axis=0) + margin
+    return (float(min_x), float(min_y)), float(max(max_x - min_x, max_y - min_y))
+
+
+class MapRasterCache(object):
+
+    """
+    Cache of the map rasters of one renderer
+
+        :param renderer: name and version of the drawing code, e.g. "scenario_runner-1".
+            Change the version whenever the drawing changes.
+        :param cache_dir: cache directory, default_cache_dir() if None
+    """
+
+    def __init__(self, renderer, cache_dir=None):
+        self.renderer = renderer
+        self.cache_dir = cache_dir if cache_dir is not None else default_cache_dir()
+
+    def key(self, carla_map, pixels_per_meter, options=()):
+        """
+        Key of the raster of the map, hashing its OpenDRIVE content with the other parameters
+        """
+        hash_func = hashlib.sha1()
+        hash_func.update(carla_map.to_opendrive().encode("UTF-8"))
+        hash_func.update(repr((CACHE_FORMAT_VERSION, self.renderer, pixels_per_meter, tuple(options))).encode("UTF-8"))
+        return "{}_{}".format(os.path.basename(carla_map.name), hash_func.hexdigest())
+
+    def _paths(self, key):
+        base = os.path.join(self.cache_dir, key)
+        return base + ".tga", base + ".json"
+
+    def load(self, key):
+        """
+        The cached (surface, metadata) of the key, None if there is no complete entry
+        """
+        image_path, metadata_path = self._paths(key)
+        try:
+            with io.open(metadata_path, encoding='utf-8') as metadata_file:
+                metadata = json.load(metadata_file)
+            surface = pygame.image.load(image_path)
+        except (IOError, OSError, ValueError, pygame.error):
+            return None
+
+        if metadata.get('format') != CACHE_FORMAT_VERSION:
+            return None
+        return surface, metadata
+
+    def save(self, key, surface, metadata):
+        """
+        Store the surface and its metadata (a JSON serializable dict) under the key
+        """
+        image_path, metadata_path = self._paths(key)
+        if not os.path.isdir(self.cache_dir):
+            try:
+                os.makedirs(self.cache_dir)
+            except OSError:
+                if not os.path.isdir(self.cache_dir):
+                    raise
+
+        metadata = dict(metadata, format=CACHE_FORMAT_VERSION, renderer=self.renderer)
+        self._write_atomic(image_path, lambda path: pygame.image.save(surface, path))
+        self._write_atomic(metadata_path, lambda path: self._dump_json(metadata, path))
+
+    @staticmethod
+    def _dump_json(metadata, path):
+        with io.open(path, 'w', encoding='utf-8') as metadata_file:
+            json.dump(metadata, metadata_file, indent=4, sort_keys=True)
+
+    def _write_atomic(self, path, write):
+        """
+        Write a temporary file of the cache directory with write(temporary path), then rename it to path
+        """
+        handle, temporary_path = tempfile.mkstemp(suffix=os.path.splitext(path)[1], dir=self.cache_dir)
+        os.close(handle)
+        try:
+            write(temporary_path)
+            # os.replace also overwrites on Windows, Python 2 only has os.rename
+            getattr(os, 'replace', os.rename)(temporary_path, path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
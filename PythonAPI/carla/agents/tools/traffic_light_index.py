@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Module with the traffic light index: the traffic lights of a world with their
+trigger waypoints and stop lines, built once per world and map and kept in
+grids, so that the checks that run every tick (Agent._is_light_red, the
+RunningRedLightTest criterion) only look at the lights close to the vehicle.
+
+The trigger waypoint of a light is computed when the index is built, the
+stop lines (the lanes the light controls, advanced up to the intersection)
+the first time they are asked for.
+"""
+
+import math
+from collections import defaultdict
+
+import numpy as np
+import carla
+
+_index = None  # index of the last world it was asked for
+
+
+def get_traffic_light_index(world, wmap=None):
+    """
+    Return the traffic light index of world, built the first time it is asked for
+
+        :param world: carla.World object
+        :param wmap: carla.Map of the world, fetched from the world if None
+        :return: TrafficLightIndex
+    """
+    global _index
+
+    if _index is None or _index.world_id != world.id:
+        _index = TrafficLightIndex(world, wmap if wmap is not None else world.get_map())
+    return _index
+
+
+def trigger_location(traffic_light):
+    """
+    Location that represents the trigger volume of a traffic light
+    """
+    # Agent._get_trafficlight_trigger_location rotates the point (0, 0, extent.z) by the yaw
+    # of the light and only adds its x and y, which leaves the center of the trigger volume
+    area_loc = traffic_light.get_transform().transform(traffic_light.trigger_volume.location)
+    return carla.Location(area_loc.x, area_loc.y, area_loc.z)
+
+
+def rotate_point(point, angle):
+    """
+    rotate a given point by a given angle (degrees)
+    """
+    x_ = math.cos(math.radians(angle)) * point.x - math.sin(math.radians(angle)) * point.y
+    y_ = math.sin(math.radians(angle)) * point.x + math.cos(math.radians(angle)) * point.y
+    return carla.Vector3D(x_, y_, point.z)
+
+
+def segments_intersect(p_start, p_end, q_starts, q_ends):
+    """
+    Vectorized test of the segment p against n segments q in the xy plane,
+    touching and collinear overlapping segments count as intersecting.
+
+        :param p_start, p_end: (2,) arrays
+        :param q_starts, q_ends: (n, 2) arrays
+        :return: boolean array, one value per segment q
+    """
+    def cross(origin, a, b):
+        return (a[..., 0] - origin[..., 0]) * (b[..., 1] - origin[..., 1]) - \
+            (a[..., 1] - origin[..., 1]) * (b[..., 0] - origin[..., 0])
+
+    def on_segment(start, end, point):
+        return (np.minimum(start[..., 0], end[..., 0]) <= point[..., 0]) & \
+            (point[..., 0] <= np.maximum(start[..., 0], end[..., 0])) & \
+            (np.minimum(start[..., 1], end[..., 1]) <= point[..., 1]) & \
+            (point[..., 1] <= np.maximum(start[..., 1], end[..., 1]))
+
+    p_start = np.broadcast_to(p_start, q_starts.shape)
+    p_end = np.broadcast_to(p_end, q_starts.shape)
+
+    d1 = cross(q_starts, q_ends, p_start)
+    d2 = cross(q_starts, q_ends, p_end)
+    d3 = cross(p_start, p_end, q_starts)
+    d4 = cross(p_start, p_end, q_ends)
+
+    proper = (((d1 > 0) & (d2 < 0)) | ((d1 < 0) & (d2 > 0))) & \
+        (((d3 > 0) & (d4 < 0)) | ((d3 < 0) & (d4 > 0)))
+    touching = ((d1 == 0) & on_segment(q_starts, q_ends, p_start)) | \
+        ((d2 == 0) & on_segment(q_starts, q_ends, p_end)) | \
+        ((d3 == 0) & on_segment(p_start, p_end, q_starts)) | \
+        ((d4 == 0) & on_segment(p_start, p_end, q_ends))
+    return proper | touching
+
+
+class _Grid(object):
+    """
+    Uniform grid of points in the xy plane, for radius queries
+    """
+
+    def __init__(self, points, cell_size):
+        self._cell_size = cell_size
+        self._points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        self._cells = defaultdict(list)
+        for row, (x, y, _) in enumerate(self._points):
+            self._cells[(int(math.floor(x / cell_size)), int(math.floor(y / cell_size)))].append(row)
+
+    def query(self, location, radius):
+        """
+        Rows of the points closer than radius to location in the xy plane
+        """
+        x_min = int(math.floor((location.x - radius) / self._cell_size))
+        x_max = int(math.floor((location.x + radius) / self._cell_size))
+        y_min = int(math.floor((location.y - radius) / self._cell_size))
+        y_max = int(math.floor((location.y + radius) / self._cell_size))
+
+        rows = []
+        for cell_x in range(x_min, x_max + 1):
+            for cell_y in range(y_min, y_max + 1):
+                rows.extend(self._cells.get((cell_x, cell_y), ()))
+        if not rows:
+            return np.zeros(0, dtype=np.int64)
+
+        rows = np.array(sorted(rows), dtype=np.int64)
+        offset = self._points[rows, :2] - np.array([location.x, location.y])
+        return rows[np.einsum('ij,ij->i', offset, offset) <= radius * radius]
+
+
+class TrafficLightIndex(object):
+    """
+    Traffic lights of a world with their trigger waypoints and stop lines
+    """
+
+    CELL_SIZE = 20.0  # m
+
+    def __init__(self, world, wmap):
+        self.world_id = world.id
+        self._map = wmap
+
+        self.lights = list(world.get_actors().filter('*traffic_light*'))
+        self._rows = {light.id: row for row, light in enumerate(self.lights)}
+
+        self._centers = []
+        self._trigger_waypoints = []
+        for light in self.lights:
+            self._centers.append(light.get_transform().transform(light.trigger_volume.location))
+            self._trigger_waypoints.append(self._map.get_waypoint(trigger_location(light)))
+
+        self._center_grid = _Grid([(c.x, c.y, c.z) for c in self._centers], self.CELL_SIZE)
+        trigger_locations = [wp.transform.location for wp in self._trigger_waypoints]
+        self._trigger_grid = _Grid([(l.x, l.y, l.z) for l in trigger_locations], self.CELL_SIZE)
+
+        self._stop_lines = dict()  # light id -> stop line data, filled on first use
+
+    def _row(self, traffic_light):
+        """
+        Row of a traffic light, lights created after the index was built are added (without grid entry)
+        """
+        row = self._rows.get(traffic_light.id)
+        if row is None:
+            row = len(self.lights)
+            self.lights.append(traffic_light)
+            self._rows[traffic_light.id] = row
+            self._centers.append(traffic_light.get_transform().transform(traffic_light.trigger_volume.location))
+            self._trigger_waypoints.append(self._map.get_waypoint(trigger_location(traffic_light)))
+        return row
+
+    def trigger_waypoint(self, traffic_light):
+        """
+        Waypoint of the trigger volume of a traffic light
+        """
+        return self._trigger_waypoints[self._row(traffic_light)]
+
+    def center(self, traffic_light):
+        """
+        Center of the trigger volume of a traffic light
+        """
+        return self._centers[self._row(traffic_light)]
+
+    def lights_near(self, location, radius):
+        """
+        Traffic lights whose trigger volume center is closer than radius to location in the xy plane
+        """
+        return [self.lights[row] for row in self._center_grid.query(location, radius)]
+
+    def light_ids_with_trigger_near(self, location, radius):
+        """
+        Ids of the traffic lights whose trigger waypoint is closer than radius to location in the xy plane
+        """
+        return set(self.lights[row].id for row in self._trigger_grid.query(location, radius))
+
+    def stop_waypoints(self, traffic_light):
+        """
+        Waypoints of the lanes affected by a traffic light, advanced up to the intersection
+        """
+        return self.stop_lines(traffic_light)['waypoints']
+
+    def stop_lines(self, traffic_light):
+        """
+        Stop lines of a traffic light, as a dictionary of arrays with one entry per affected lane:
+        waypoints, road_id, lane_id, forward (n, 3), start and end (n, 2) of the line across the lane
+        """
+        if traffic_light.id not in self._stop_lines:
+            self._stop_lines[traffic_light.id] = self._compute_stop_lines(traffic_light)
+        return self._stop_lines[traffic_light.id]
+
+    def _compute_stop_lines(self, traffic_light):
+        """
+        Discretize the trigger volume of the light into lanes and advance them until the intersection
+        """
+        base_transform = traffic_light.get_transform()
+        base_rot = base_transform.rotation.yaw
+        area_loc = base_transform.transform(traffic_light.trigger_volume.location)
+
+        # Discretize the trigger box into points
+        area_ext = traffic_light.trigger_volume.extent
+        x_values = np.arange(-0.9 * area_ext.x, 0.9 * area_ext.x, 1.0)  # 0.9 to avoid crossing to adjacent lanes
+
+        # Get the waypoints of these points, removing duplicates
+        ini_wps = []
+        for x in x_values:
+            point = rotate_point(carla.Vector3D(x, 0, area_ext.z), base_rot)
+            wpx = self._map.get_waypoint(area_loc + carla.Location(x=point.x, y=point.y))
+            # As x_values are arranged in order, only the last one has to be checked
+            if not ini_wps or ini_wps[-1].road_id != wpx.road_id or ini_wps[-1].lane_id != wpx.lane_id:
+                ini_wps.append(wpx)
+
+        # Advance them until the intersection
+        wps = []
+        for wpx in ini_wps:
+            while not wpx.is_intersection:
+                next_wp = wpx.next(0.5)[0]
+                if next_wp and not next_wp.is_intersection:
+                    wpx = next_wp
+                else:
+                    break
+            wps.append(wpx)
+
+        forward = np.zeros((len(wps), 3))
+        start = np.zeros((len(wps), 2))
+        end = np.zeros((len(wps), 2))
+        for i, wp in enumerate(wps):
+            wp_dir = wp.transform.get_forward_vector()
+            forward[i] = (wp_dir.x, wp_dir.y, wp_dir.z)
+
+            # line across the lane, at 40% of the lane width to each side
+            yaw_wp = wp.transform.rotation.yaw
+            location_wp = wp.transform.location
+            half_line = 0.4 * wp.lane_width
+            start[i] = (location_wp.x + half_line * math.cos(math.radians(yaw_wp + 90)),
+                        location_wp.y + half_line * math.sin(math.radians(yaw_wp + 90)))
+            end[i] = (location_wp.x + half_line * math.cos(math.radians(yaw_wp - 90)),
+                      location_wp.y + half_line * math.sin(math.radians(yaw_wp - 90)))
+
+        return {
+            'waypoints': wps,
+            'road_id': np.array([wp.road_id for wp in wps], dtype=np.int64),
+            'lane_id': np.array([wp.lane_id for wp in wps], dtype=np.int64),
+            'forward': forward,
+            'start': start,
+            'end': end,
+        }
@@ -46,6 +46,14 @@ try:
 except IndexError:
     pass
 
+# ==============================================================================
+# -- Add PythonAPI for release mode --------------------------------------------
+# ==============================================================================
+try:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + '/carla')
+except IndexError:
+    pass
+
 # ==============================================================================
 # -- imports -------------------------------------------------------------------
 # ==============================================================================
@@ -53,13 +61,14 @@ except IndexError:
 import carla
 from carla import TrafficLightState as tls
 
+from agents.tools.map_raster_cache import MapRasterCache, compute_map_bounds
+
 import argparse
 import logging
 import datetime
 import weakref
 import math
 import random
-import hashlib
 
 try:
     import pygame
@@ -144,6 +153,9 @@ TITLE_INPUT = 'INPUT'
 
 PIXELS_PER_METER = 12
 
+# Renderer of the map cache, the version has to change whenever MapImage.draw_road_map does
+MAP_RENDERER = 'examples-1'
+
 MAP_DEFAULT_SCALE = 0.1
 HERO_DEFAULT_SCALE = 1.0
 
@@ -427,58 +439,48 @@ class TrafficLightSurfaces(object):
 
 
 class MapImage(object):
-    """Class encharged of rendering a 2D image from top view of a carla world. Please note that a cache system is used, so if the OpenDrive content
-    of a Carla town has not changed, it will read and use the stored image if it was rendered in a previous execution"""
-
-    def __init__(self, carla_world, carla_map, pixels_per_meter, show_triggers, show_connections, show_spawn_points):
-        """ Renders the map image generated based on the world, its map and additional flags that provide extra information about the road network"""
+    """Class encharged of rendering a 2D image from top view of a carla world. Please note that a cache system is
+    used, so if the OpenDrive content of a Carla town and the rendering parameters have not changed, it will read and
+    use the stored image (and its offset and width) if it was rendered in a previous execution"""
+
+    def __init__(self, carla_world, carla_map, pixels_per_meter, show_triggers, show_connections, show_spawn_points,
+                 map_cache=None):
+        """ Renders the map image generated based on the world, its map and additional flags that provide extra
+        information about the road network. map_cache is the MapRasterCache to use, one in the default cache
+        directory if None"""
         self._pixels_per_meter = pixels_per_meter
         self.scale = 1.0
         self.show_triggers = show_triggers
         self.show_connections = show_connections
         self.show_spawn_points = show_spawn_points
 
-        waypoints = carla_map.generate_waypoints(2)
-        margin = 50
-        max_x = max(waypoints, key=lambda x: x.transform.location.x).transform.location.x + margin
-        max_y = max(waypoints, key=lambda x: x.transform.location.y).transform.location.y + margin
-        min_x = min(waypoints, key=lambda x: x.transform.location.x).transform.location.x - margin
-        min_y = min(waypoints, key=lambda x: x.transform.location.y).transform.location.y - margin
-
-        self.width = max(max_x - min_x, max_y - min_y)
-        self._world_offset = (min_x, min_y)
-
-        # Maximum size of a Pygame surface
-        width_in_pixels = (1 << 14) - 1
-
-        # Adapt Pixels per meter to make world fit in surface
-        surface_pixel_per_meter = int(width_in_pixels / self.width)
-        if surface_pixel_per_meter > PIXELS_PER_METER:
-            surface_pixel_per_meter = PIXELS_PER_METER
-
-        self._pixels_per_meter = surface_pixel_per_meter
-        width_in_pixels = int(self._pixels_per_meter * self.width)
-
-        self.big_map_surface = pygame.Surface((width_in_pixels, width_in_pixels)).convert()
+        # The rendered map is cached, along with its offset and width, so a cached map needs no waypoints
+        map_cache = map_cache if map_cache is not None else MapRasterCache(MAP_RENDERER)
+        cache_key = map_cache.key(carla_map, pixels_per_meter, (show_triggers, show_connections, show_spawn_points))
+        cached = map_cache.load(cache_key)
+
+        if cached is not None:
+            surface, metadata = cached
+            self.width = metadata['width']
+            self._world_offset = tuple(metadata['world_offset'])
+            self._pixels_per_meter = metadata['pixels_per_meter']
+            self.big_map_surface = surface.convert()
+        else:
+            self._world_offset, self.width = compute_map_bounds(carla_map)
 
-        # Load OpenDrive content
-        opendrive_content = carla_map.to_opendrive()
+            # Maximum size of a Pygame surface
+            width_in_pixels = (1 << 14) - 1
 
-        # Get hash based on content
-        hash_func = hashlib.sha1()
-        hash_func.update(opendrive_content.encode("UTF-8"))
-        opendrive_hash = str(hash_func.hexdigest())
+            # Adapt Pixels per meter to make world fit in surface
+            surface_pixel_per_meter = int(width_in_pixels / self.width)
+            if surface_pixel_per_meter > pixels_per_meter:
+                surface_pixel_per_meter = pixels_per_meter
 
-        # Build path for saving or loading the cached rendered map
-        filename = carla_map.name + "_" + opendrive_hash + ".tga"
-        dirname = os.path.join("cache", "no_rendering_mode")
-        full_path = str(os.path.join(dirname, filename))
+            self._pixels_per_meter = surface_pixel_per_meter
+            width_in_pixels = int(self._pixels_per_meter * self.width)
 
-        if os.path.isfile(full_path):
-            # Load Image
-            self.big_map_surface = pygame.image.load(full_path)
-        else:
             # Render map
+            self.big_map_surface = pygame.Surface((width_in_pixels, width_in_pixels)).convert()
             self.draw_road_map(
                 self.big_map_surface,
                 carla_world,
@@ -486,17 +488,13 @@ class MapImage(object):
                 self.world_to_pixel,
                 self.world_to_pixel_width)
 
-            # If folders path does not exist, create it
-            if not os.path.exists(dirname):
-                os.makedirs(dirname)
-
-            # Remove files if selected town had a previous version saved
-            list_filenames = glob.glob(os.path.join(dirname, carla_map.name) + "*")
-            for town_filename in list_filenames:
-                os.remove(town_filename)
-
-            # Save rendered map for next executions of same map
-            pygame.image.save(self.big_map_surface, full_path)
+            # Save rendered map for next executions of same map, the rendered one is used anyway
+            try:
+                map_cache.save(cache_key, self.big_map_surface, {'width': self.width,
+                                                                 'world_offset': list(self._world_offset),
+                                                                 'pixels_per_meter': self._pixels_per_meter})
+            except (IOError, OSError, pygame.error) as e:
+                logging.warning('could not cache the rendered map in %s: %s', map_cache.cache_dir, e)
 
         self.surface = self.big_map_surface
 
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Visual worlds of the driving agents, with the pygame HUD, keyboard control and
+the manual control sensors. Only imported by the agents when they visualize,
+the headless counterpart is agent_worlds.HeadlessWorld.
+"""
+
+from __future__ import print_function
+
+try:
+    import pygame
+    from pygame.locals import K_ESCAPE
+except ImportError:
+    raise RuntimeError('cannot import pygame, make sure pygame package is installed')
+
+from examples.manual_control import World, CameraManager, CollisionSensor, LaneInvasionSensor, GnssSensor, IMUSensor
+
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+
+from agent_worlds import FrontCamera, find_vehicle
+
+
+# ==============================================================================
+# -- KeyboardControl -----------------------------------------------------------
+# ==============================================================================
+
+class KeyboardControl(object):
+
+    """
+    Keyboard control of the visualizing agents, which only listens for quitting (window closed or Escape)
+    """
+
+    def __init__(self, world):
+        world.hud.notification("Press 'H' or '?' for help.", seconds=4.0)
+
+    def parse_events(self):
+        """
+        Returns True if the user asked to quit
+        """
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return True
+            if event.type == pygame.KEYUP:
+                if self._is_quit_shortcut(event.key):
+                    return True
+        return False
+
+    @staticmethod
+    def _is_quit_shortcut(key):
+        """Shortcut for quitting"""
+        return key == K_ESCAPE
+
+
+# ==============================================================================
+# -- Global functions ----------------------------------------------------------
+# ==============================================================================
+
+def get_actor_display_name(actor, truncate=250):
+    """
+    Display name of an actor, e.g. "Tesla Model3" for vehicle.tesla.model3
+    """
+    name = ' '.join(actor.type_id.replace('_', '.').title().split('.')[1:])
+    return (name[:truncate - 1] + '\u2026') if len(name) > truncate else name
+
+
+# ==============================================================================
+# -- World ---------------------------------------------------------------------
+# ==============================================================================
+
+class VisualWorld(World):  # World class inherited here, its init method calls our restart()
+
+    """
+    World of manual_control bound to the given vehicle (or the one with role name args.rolename),
+    with the manual control sensors and a FrontCamera if args.front_camera is set
+    """
+
+    restarted = False
+
+    def __init__(self, carla_world, hud, args, vehicle=None):
+        self.with_front_camera = getattr(args, 'front_camera', False)
+        self.camera = None
+        self._vehicle = vehicle
+
+        # Set by restart(), which World.__init__ calls
+        self.player = None
+        self.player_name = None
+        self.player_max_speed = None
+        self.player_max_speed_fast = None
+        self.collision_sensor = None
+        self.lane_invasion_sensor = None
+        self.gnss_sensor = None
+        self.imu_sensor = None
+        self.camera_manager = None
+        super(VisualWorld, self).__init__(carla_world, hud, args)
+
+    def restart(self):
+        """
+        Overrides World.restart: binds the world to the vehicle instead of spawning one, only once
+        """
+        if self.restarted:
+            return
+        self.restarted = True
+
+        self.player_max_speed = 1.589
+        self.player_max_speed_fast = 3.713
+
+        # Keep same camera config if the camera manager exists.
+        cam_index = self.camera_manager.index if self.camera_manager is not None else 0
+        cam_pos_index = self.camera_manager.transform_index if self.camera_manager is not None else 0
+
+        # Get the vehicle, role_name set in carla_data_provider.py
+        self.player = self._vehicle if self._vehicle is not None else find_vehicle(self.world, self.actor_role_name)
+        # The identifier of the blueprint this actor was based on, e.g. vehicle.ford.mustang.
+        self.player_name = self.player.type_id
+
+        if self.with_front_camera:
+            self.camera = FrontCamera(self.world, self.player)
+
+        # Set up the sensors.
+        self.collision_sensor = CollisionSensor(self.player, self.hud)
+        self.lane_invasion_sensor = LaneInvasionSensor(self.player, self.hud)
+        self.gnss_sensor = GnssSensor(self.player)
+        self.imu_sensor = IMUSensor(self.player)
+        # _gamma: gamma correction of the camera (default: 2.2)
+        self.camera_manager = CameraManager(self.player, self.hud, self._gamma)
+        self.camera_manager.transform_index = cam_pos_index
+        self.camera_manager.set_sensor(cam_index, notify=False)
+        actor_type = get_actor_display_name(self.player)
+        self.hud.notification(actor_type)
+
+    def tick(self, clock):
+        """
+        Ticks the HUD, returns False once the vehicle is gone
+        """
+        if len(self.world.get_actors().filter(self.player_name)) < 1:
+            return False
+
+        self.hud.tick(self, clock)
+        return True
+
+    def destroy(self):
+        """
+        Destroys the sensors and releases the vehicle
+        """
+        if self.camera is not None:
+            self.camera.destroy()
+        # World.destroy() only destroys the sensors then, the vehicle is released (parked if actor reuse is enabled)
+        player, self.player = self.player, None
+        super(VisualWorld, self).destroy()
+        CarlaDataProvider.release_actor(player)
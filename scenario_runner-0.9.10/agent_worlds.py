@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Headless worlds of the driving agents (automatic_control_agent_z8_ego.py and
+automatic_control_agent_z5_other_veh.py).
+
+A HeadlessWorld only binds the vehicle the agent drives and the sensors the
+driving logic reads (the front camera of the ego). There is no HUD, no pygame
+and none of the manual control sensors, so nothing here needs a display.
+The visual counterpart is agent_visual_worlds.VisualWorld.
+"""
+
+from __future__ import print_function
+
+import time
+
+import carla
+
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.tools.frame_ingestion import FrameRing
+
+
+def find_vehicle(carla_world, role_name):
+    """
+    Wait for the vehicle with the given role_name attribute and return it
+    """
+    while True:
+        for vehicle in carla_world.get_actors().filter('vehicle.*'):
+            if vehicle.attributes.get('role_name') == role_name:
+                print("Vehicle '{}' found".format(role_name))
+                return vehicle
+        print("Waiting for the vehicle '{}'...".format(role_name))
+        time.sleep(1)
+
+
+class FrontCamera(object):
+
+    """
+    RGB camera on the front of a vehicle. The latest frame (BGR, 800x450) is front_camera,
+    and every frame is handed to the perception worker, if one is set.
+    """
+
+    im_width = 800
+    im_height = 450
+
+    def __init__(self, carla_world, vehicle, show=False):
+        self.show = show  # show the raw camera frames in an OpenCV window
+        self.perception = None
+        self.front_camera = None
+        self.front_camera_frame = None
+
+        # BGRA -> BGR in a single copy into a preallocated ring buffer. The perception worker copies the frames
+        # it keeps, so the ring only has to outlive the readers of front_camera
+        self.frame_ring = FrameRing(ring_size=3, channels=3)
+
+        rgb_cam = carla_world.get_blueprint_library().find("sensor.camera.rgb")
+        rgb_cam.set_attribute("image_size_x", "{}".format(self.im_width))
+        rgb_cam.set_attribute("image_size_y", "{}".format(self.im_height))
+        rgb_cam.set_attribute("fov", "100")
+
+        transform = carla.Transform(carla.Location(x=2.5, z=1.0))
+        self.sensor = carla_world.spawn_actor(rgb_cam, transform, attach_to=vehicle)
+        self.sensor.listen(self.process_img)
+
+    def process_img(self, image):
+        """
+        Camera callback
+        """
+        frame = self.frame_ring.ingest(image)
+        if self.show:
+            import cv2
+            cv2.imshow("", frame)
+            cv2.waitKey(1)
+        self.front_camera = frame
+        self.front_camera_frame = image.frame
+        if self.perception is not None:
+            self.perception.submit(image.frame, frame)  # object detection runs asynchronously on the latest frame
+
+    def destroy(self):
+        """
+        Stop and destroy the camera
+        """
+        if self.sensor is not None:
+            self.sensor.stop()
+            self.sensor.destroy()
+            self.sensor = None
+
+
+class HeadlessWorld(object):
+
+    """
+    Binds the vehicle (the one with the given role name if none is given), plus a FrontCamera if asked for
+    """
+
+    def __init__(self, carla_world, role_name, front_camera=False, vehicle=None):
+        self.world = carla_world
+        self.hud = None
+
+        self.player = vehicle if vehicle is not None else find_vehicle(carla_world, role_name)
+        self.player_name = self.player.type_id
+        self.camera = FrontCamera(carla_world, self.player) if front_camera else None
+
+    def tick(self, clock=None):  # pylint: disable=unused-argument
+        """
+        False once the vehicle is gone
+        """
+        return self.player.is_alive
+
+    def destroy(self):
+        """
+        Destroy the sensors and release the vehicle (parked if actor reuse is enabled), as World.destroy() does
+        """
+        if self.camera is not None:
+            self.camera.destroy()
+        if self.player is not None:
+            CarlaDataProvider.release_actor(self.player)
@@ -11,38 +11,6 @@
 from __future__ import print_function
 
 
-# ==============================================================================
-# -- KeyboardControl -----------------------------------------------------------
-# ==============================================================================
-
-try: 
-    import pygame
-    from pygame.locals import K_ESCAPE
-    from pygame.locals import KMOD_CTRL
-    from pygame.locals import K_q
-
-except ImportError:
-    raise RuntimeError('cannot import pygame, make sure pygame package is installed')
-
-class KeyboardControl(object):
-    def __init__(self, world):
-        world.hud.notification("Press 'H' or '?' for help.", seconds=4.0)
-
-    def parse_events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return True
-            if event.type == pygame.KEYUP:
-                if self._is_quit_shortcut(event.key):
-                    return True
-
-    @staticmethod
-    def _is_quit_shortcut(key):
-        """Shortcut for quitting"""
-        #return (key == K_ESCAPE) or (key == K_q and pygame.key.get_mods() & KMOD_CTRL)
-        return (key == K_ESCAPE)# or (key == K_q and pygame.key.get_mods() & KMOD_CTRL)
-        # ADDED
-
 # ==============================================================================
 # -- imports -------------------------------------------------------------------
 # ==============================================================================
@@ -59,9 +27,6 @@ import weakref
 
 import carla
 
-from examples.manual_control import (World, HUD, CameraManager, CollisionSensor, LaneInvasionSensor, GnssSensor, IMUSensor)  
-# keyboardcontrol class removed
-                
 from carla import ColorConverter as cc
 
 
@@ -70,80 +35,17 @@ from agents.navigation.behavior_agent_z4 import BehaviorAgentZ4  # pylint: disab
 from agents.navigation.roaming_agent_z import RoamingAgentZ  # pylint: disable=import-error
 from agents.navigation.basic_agent_z import BasicAgentZ  # pylint: disable=import-error
 
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+
 import os
 import argparse
 import logging
 import time
-import pygame
 import traceback
 
+from agent_worlds import HeadlessWorld
 
 
-# *********** START from Srunner Manual_control.py ********************************* 
-
-# ==============================================================================
-# -- Global functions ----------------------------------------------------------
-# ==============================================================================
-
-
-def get_actor_display_name(actor, truncate=250):
-    name = ' '.join(actor.type_id.replace('_', '.').title().split('.')[1:])
-    return (name[:truncate - 1] + u'\u2026') if len(name) > truncate else name
-
-
-# ==============================================================================
-# -- World ---------------------------------------------------------------------
-# ==============================================================================
-
-class WorldSR(World):  # World class inherited here, so the self.args to WORLDSR object are used by the init method of parent class World cx there is no init method here I presume. Yeah I was right Alhmd.
-
-    restarted = False
-
-    def restart(self):  # overwritten parent restart() method
-
-        if self.restarted:
-            return
-        self.restarted = True
-
-        self.player_max_speed = 1.589
-        self.player_max_speed_fast = 3.713
-
-        # Keep same camera config if the camera manager exists.
-        cam_index = self.camera_manager.index if self.camera_manager is not None else 0
-        cam_pos_index = self.camera_manager.transform_index if self.camera_manager is not None else 0
-
-        # Get the ego vehicle
-        while self.player is None:
-            print("Waiting for the ego vehicle...")  # yep this is entered.
-            time.sleep(1)
-            possible_vehicles = self.world.get_actors().filter('vehicle.*')  # all of em.
-            for vehicle in possible_vehicles:
-                if vehicle.attributes['role_name'] == "scenario":  # set_attribute to scenario in carla_data_provider.py, so that role_name attribute has been changed on the server side even! FOR THE OTHER VEHICLE :3
-                    print("Ego vehicle found")
-                    self.player = vehicle
-                    break
-        
-        self.player_name = self.player.type_id  # The identifier of the blueprint this actor was based on, e.g. vehicle.ford.mustang.
-
-        # Set up the sensors.
-        self.collision_sensor = CollisionSensor(self.player, self.hud)
-        self.lane_invasion_sensor = LaneInvasionSensor(self.player, self.hud)
-        self.gnss_sensor = GnssSensor(self.player)
-        self.imu_sensor = IMUSensor(self.player)
-        self.camera_manager = CameraManager(self.player, self.hud, self._gamma)  # 'Gamma correction of the camera (default: 2.2)'
-        self.camera_manager.transform_index = cam_pos_index
-        self.camera_manager.set_sensor(cam_index, notify=False)
-        actor_type = get_actor_display_name(self.player)
-        self.hud.notification(actor_type)
-
-    def tick(self, clock):
-        if len(self.world.get_actors().filter(self.player_name)) < 1:
-            return False
-
-        self.hud.tick(self, clock)
-        return True
-
-# *********** END from Srunner Manual_control.py ********************************* 
 
 # Ego Control Agent class
 
@@ -155,90 +57,105 @@ class OtherVehControlAgent:
     def __init__ (self): 
 
         self.args = ArgsOverwrite()  # parse the arguments that were previously in the main method using overwrite class
-        pygame.init()
-        pygame.font.init()
+        self.client = None
         self.world = None  
+        self.controller = None
+        self.clock = None
+        self.hud = None
         
 
   
-    def game_loop_init(self, goal_carla_location, visualize=False):  # Ideally I would want the carla client and carla world to be passed through the arguments here
-
-        self.visualize = visualize
-
-        print("goal location of OTHER vehicle is", goal_carla_location)
+    def setup(self, visualize=False):
+        """
+        Everything that outlives a repetition: the client and, to visualize, pygame and the HUD.
+        Done once, the agent is then bound to a vehicle with reset().
+        """
 
-        if self.visualize == True:
-
-            try:
-                client = carla.Client(self.args.host, self.args.port)  
-                client.set_timeout(4.0)
-
-                self.display = pygame.display.set_mode(
-                    (self.args.width, self.args.height),
-                    pygame.HWSURFACE | pygame.DOUBLEBUF)
-
-                hud = HUD(self.args.width, self.args.height)  # HUD object created here
-                self.world = WorldSR(client.get_world(), hud, self.args)  # world is freaking set in this with the pygame display camz and sensors etc
-
-                self.controller = KeyboardControl(self.world)  # using KeyboardControl in this file
-
-                #sys.exit("reached here")
-
-                if self.args.agent == "Behavior":
-                    self.agent = BehaviorAgentZ4(self.world.player, behavior=self.args.behavior)  # world.player is the ego vehicle on the server side who's rolename attribute we overwrote as 'hero' and the WorldSR class grabs that vehicle as world.player
+        if visualize not in (True, False):
 
-                    # end_condition ego trigger location
-                    destination = goal_carla_location  # carla.Location(-80, -163, 0)
-
-                    #self.agent.set_destination(self.agent.vehicle.get_location(), destination, clean=True)
-
-                
-            except Exception as e:
-                traceback.print_exc()
-                print("Could not setup EgoControlAgent due to {}".format(e))
+            #sys.exit("reached here")
+            raise ValueError("Select proper visualization option")
 
-        elif self.visualize == False:  # we won't run the world.render commands in the game_loop_step method to decrease the computation load. Will edit the World class to not initialize the camera manager or anything later for further optimization
+        if self.client is not None and self.visualize == visualize:
+            return
+        if self.client is not None:
+            self.close()
 
+        self.visualize = visualize
 
-            try:
-                client = carla.Client(self.args.host, self.args.port)
-                client.set_timeout(4.0)
+        self.client = carla.Client(self.args.host, self.args.port)  
+        self.client.set_timeout(4.0)
 
-                # No display as there is no visualization
+        if self.visualize == True:
+            # pygame, the HUD and the manual control sensors are only needed (and imported) to visualize
+            import pygame
+            from examples.manual_control import HUD
+
+            pygame.init()
+            pygame.font.init()
+            self.clock = pygame.time.Clock()  # same as the manual control . py
+            self.display = pygame.display.set_mode(
+                (self.args.width, self.args.height),
+                pygame.HWSURFACE | pygame.DOUBLEBUF)
+
+            self.hud = HUD(self.args.width, self.args.height)  # HUD object created here
+
+    def reset(self, vehicle, goal_carla_location):
+        """
+        Bind the agent to the other vehicle of a new repetition. vehicle is the actor returned by
+        CarlaDataProvider.request_new_actor, if None the agent waits for the vehicle with the 'scenario' role name.
+        The route to goal_carla_location is set by the KeepVelocity behavior.
+        """
 
-                # display = pygame.display.set_mode(
-                #     (self.args.width, self.args.height),
-                #     pygame.HWSURFACE | pygame.DOUBLEBUF)
+        print("goal location of OTHER vehicle is", goal_carla_location)
 
-                hud = HUD(self.args.width, self.args.height)  # HUD object created here
-                self.world = WorldSR(client.get_world(), hud, self.args)  # world is freaking set in this with the pygame display camz and sensors etc
+        self.goal = goal_carla_location
 
-                self.controller = KeyboardControl(self.world)  # using KeyboardControl in this file
+        carla_world = vehicle.get_world() if vehicle is not None else self.client.get_world()
 
+        if self.visualize == True:
+            from agent_visual_worlds import VisualWorld, KeyboardControl
 
-                #sys.exit("reached here")
+            self.world = VisualWorld(carla_world, self.hud, self.args, vehicle)  # world is freaking set in this with the pygame display camz and sensors etc
+            self.controller = KeyboardControl(self.world)  # using KeyboardControl in this file
 
-                if self.args.agent == "Behavior":
-                    self.agent = BehaviorAgentZ4(self.world.player, behavior=self.args.behavior)  # world.player is the ego vehicle on the server side who's rolename attribute we overwrote as 'hero' and the WorldSR class grabs that vehicle as world.player
+        else:  # we won't run the world.render commands in the game_loop_step method to decrease the computation load
+            # Headless: only the other vehicle, the driving logic does not read any sensor
+            self.world = HeadlessWorld(carla_world, self.args.rolename, vehicle=vehicle)
 
-                    # end_condition ego trigger location
-                    destination = goal_carla_location  # carla.Location(-80, -163, 0)
+        if self.args.agent == "Behavior":
+            if self.agent is None:
+                self.agent = BehaviorAgentZ4(self.world.player, behavior=self.args.behavior)  # world.player is the other vehicle on the server side, found by its 'scenario' role name
+            else:
+                self.agent.reset(self.world.player)  # keeps the route planner and the map warm
 
-                    #self.goal = destination
+    def game_loop_init(self, goal_carla_location, visualize=False, vehicle=None):  # Ideally I would want the carla client and carla world to be passed through the arguments here
+        """
+        Set the agent up (only the first time) and bind it to vehicle, see setup() and reset()
+        """
 
-                    #self.agent.set_destination(self.agent.vehicle.get_location(), destination, clean=True)
+        setup_start_time = time.time()
+        warm = self.client is not None and self.visualize == visualize
 
-                   
-            except Exception as e:
-                traceback.print_exc()
-                print("Could not setup EgoControlAgent due to {}".format(e))
+        try:
+            self.setup(visualize)
+            self.reset(vehicle, goal_carla_location)
 
-        else:
+        except ValueError:
+            raise
+        except Exception as e:
+            traceback.print_exc()
+            print("Could not setup OtherVehControlAgent due to {}".format(e))
 
-            #sys.exit("reached here")
-            raise ValueError("Select proper visualization option")
+        self.setup_latency = time.time() - setup_start_time
+        print("OtherVehControlAgent setup took {:.2f} s ({}, {})".format(
+            self.setup_latency, "visual" if self.visualize else "headless", "warm" if warm else "cold"))
 
-    def game_loop_step(self, target_velocity):  # will run just once so no while loop
+    def game_loop_step(self, target_velocity, snapshot=None):  # will run just once so no while loop
+        """
+        Drive one frame. snapshot is the frame handed out by the scenario manager's TickDriver,
+        without it (standalone use) the agent waits for the next frame itself.
+        """
 
         #sys.exit("reached here")
 
@@ -246,19 +163,21 @@ class OtherVehControlAgent:
 
             while True:
 
-                clock = pygame.time.Clock()  # same as the manual control . py    
-                clock.tick_busy_loop(60)  # Check out behavior after commenting this out
+                if self.clock is not None:
+                    self.clock.tick()  # only measures the frame rate for the HUD, the frame pacing is done by the simulator
 
 
 
-                if self.controller.parse_events():  # if quit key is pressed 
+                if self.controller is not None and self.controller.parse_events():  # if quit key is pressed 
                   return  
 
                 # As soon as the server is ready continue!
-                if not self.world.world.wait_for_tick(10.0):
-                    continue
+                if snapshot is None:
+                    snapshot = self.world.world.wait_for_tick(10.0)
+                    if not snapshot:
+                        continue
 
-                if not self.world.tick(clock):  # doesn't enter this if our ego has been spawned  # if len(self.world.get_actors().filter(self.player_name)) < 1:
+                if not self.world.tick(self.clock):  # doesn't enter this if our ego has been spawned  # if len(self.world.get_actors().filter(self.player_name)) < 1:
                     return
 
                 if self.args.agent == "Behavior":
@@ -266,6 +185,7 @@ class OtherVehControlAgent:
                     #sys.exit("here")  # yes enters this
 
                     if self.visualize:
+                        import pygame
                         self.world.render(self.display)
                         pygame.display.flip()
 
@@ -291,7 +211,7 @@ class OtherVehControlAgent:
                     # Maybe change this speed limit method as well to terminate these kinds of limits
 
                     control = self.agent.run_step()
-                    self.world.player.apply_control(control)
+                    CarlaDataProvider.apply_control(self.world.player, control)  # sent with the controls of the tick
 
                     break
 
@@ -300,11 +220,33 @@ class OtherVehControlAgent:
             print(e)
 
     def game_loop_end(self):
+        """
+        End of a repetition: the sensors and the vehicle are destroyed, the rest is kept for the next reset()
+        """
 
         try:
-            self.world.destroy()  # World object returned by WorldSR class
+            self.world.destroy()  # VisualWorld or HeadlessWorld
             print("***************########## destroying other vehicle and it's sensors #######*****************")
-            pygame.quit()
+            self.world = None
+            self.controller = None
+
+        except Exception as e: 
+            traceback.print_exc()
+            print(e)
+
+    def close(self):
+        """
+        Release what setup() created, once no more repetitions are run
+        """
+
+        try:
+            if self.visualize and self.client is not None:
+                import pygame
+                pygame.quit()
+            self.client = None
+            self.hud = None
+            self.clock = None
+            self.agent = None
 
         except Exception as e: 
             traceback.print_exc()
@@ -313,7 +255,7 @@ class OtherVehControlAgent:
     
 class ArgsOverwrite:
 
-    rolename = 'hero'
+    rolename = 'scenario'  # role_name of the other vehicle, set in carla_data_provider.py
     gamma = 2.2 
     width = 1280
     height = 720
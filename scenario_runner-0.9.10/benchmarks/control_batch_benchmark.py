@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Benchmark of the control batching of the CarlaDataProvider.
+
+Every scenario actor receives one control per tick, given through
+CarlaDataProvider.apply_control as the behaviors do. This is run once with the
+controls applied directly and once batched (start_control_batch / flush_control_batch,
+as ScenarioManager._tick_scenario does), against a fake client that counts the calls
+to the server and waits a simulated round trip for each one.
+
+Usage (from the scenario_runner root):
+python benchmarks/control_batch_benchmark.py [--ticks 100] [--rpc-latency 0.2]
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import carla  # pylint: disable=wrong-import-position
+
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider  # pylint: disable=wrong-import-position
+
+
+class FakeServer(object):
+
+    """
+    Counts the calls made to the server, each one taking the given latency
+    """
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+        self.commands = 0
+
+    def call(self, commands=1):
+        """
+        One call to the server carrying the given number of commands
+        """
+        self.calls += 1
+        self.commands += commands
+        if self.latency:
+            time.sleep(self.latency)
+
+
+class FakeClient(object):
+
+    """
+    carla.Client with only apply_batch
+    """
+
+    def __init__(self, server):
+        self._server = server
+
+    def apply_batch(self, commands):
+        """
+        Sends all the commands with a single call
+        """
+        self._server.call(len(commands))
+
+
+class FakeActor(object):
+
+    """
+    carla.Actor with only id and apply_control
+    """
+
+    def __init__(self, actor_id, server):
+        self.id = actor_id
+        self._server = server
+
+    def apply_control(self, control):   # pylint: disable=unused-argument
+        """
+        Sends the control with its own call
+        """
+        self._server.call()
+
+
+def run(num_actors, ticks, latency, batched):
+    """
+    Give a control to every actor at every tick, returns (calls per tick, milliseconds per tick)
+    """
+    server = FakeServer(latency)
+    actors = [FakeActor(actor_id, server) for actor_id in range(num_actors)]
+    control = carla.VehicleControl(throttle=0.5)
+
+    CarlaDataProvider.set_client(FakeClient(server))
+    CarlaDataProvider.set_control_batching(batched)
+
+    start_time = time.time()
+    for _ in range(ticks):
+        CarlaDataProvider.start_control_batch()
+        for actor in actors:
+            CarlaDataProvider.apply_control(actor, control)
+        CarlaDataProvider.flush_control_batch()
+    elapsed_time = time.time() - start_time
+
+    CarlaDataProvider.set_client(None)
+    CarlaDataProvider.set_control_batching(True)
+
+    return float(server.calls) / ticks, 1000 * elapsed_time / ticks
+
+
+def main():
+    """
+    main function
+    """
+    parser = argparse.ArgumentParser(description="Control batching benchmark")
+    parser.add_argument('--ticks', type=int, default=100, help='Ticks per run')
+    parser.add_argument('--rpc-latency', type=float, default=0.2, help='Simulated round trip per call, in ms')
+    parser.add_argument('--actors', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32, 64],
+                        help='Number of actors of each run')
+    args = parser.parse_args()
+
+    latency = args.rpc_latency / 1000.0
+
+    print("{:>7} {:>14} {:>14} {:>14} {:>14}".format(
+        "actors", "direct[calls]", "batched[calls]", "direct[ms]", "batched[ms]"))
+    for num_actors in args.actors:
+        direct_calls, direct_time = run(num_actors, args.ticks, latency, batched=False)
+        batched_calls, batched_time = run(num_actors, args.ticks, latency, batched=True)
+        print("{:>7} {:>14.1f} {:>14.1f} {:>14.3f} {:>14.3f}".format(
+            num_actors, direct_calls, batched_calls, direct_time, batched_time))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Check of the map raster cache (agents/tools/map_raster_cache.py) of the
+no_rendering_mode visualizers, against a running CARLA server.
+
+For each copy of no_rendering_mode.py (the one of scenario_runner and, if
+found, the one of PythonAPI/examples), MapImage is built twice on the map of
+the server with an empty cache directory: the first time renders the map and
+fills the cache, the second reads it. Both rasters must match pixel for pixel,
+with the same world offset, width and pixels per meter, and the second one
+must not have generated any waypoint. The time of both is printed.
+
+Usage (from the scenario_runner root, with PythonAPI/carla in the PYTHONPATH):
+python benchmarks/map_cache_check.py [--host 127.0.0.1] [--port 2000]
+    [--examples $CARLA_ROOT/PythonAPI/examples]
+"""
+
+from __future__ import print_function
+
+import argparse
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import carla  # pylint: disable=wrong-import-position
+import numpy as np  # pylint: disable=wrong-import-position
+import pygame  # pylint: disable=wrong-import-position
+
+from agents.tools.map_raster_cache import MapRasterCache  # pylint: disable=wrong-import-position
+
+
+class CountingMap(object):
+
+    """
+    carla.Map that counts the calls to generate_waypoints
+    """
+
+    def __init__(self, carla_map):
+        self._map = carla_map
+        self.generated_waypoints = 0
+
+    def generate_waypoints(self, distance):
+        """
+        Counted carla.Map.generate_waypoints
+        """
+        self.generated_waypoints += 1
+        return self._map.generate_waypoints(distance)
+
+    def __getattr__(self, name):
+        return getattr(self._map, name)
+
+
+def load_module(name, path):
+    """
+    Import the file at path as a module with the given name
+    """
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def render_map(module, world, carla_map, cache_dir):
+    """
+    Build the MapImage of the module with the cache directory, returns it with
+    the number of waypoint generations and the time it took
+    """
+    counting_map = CountingMap(carla_map)
+    map_cache = MapRasterCache(module.MAP_RENDERER, cache_dir)
+    start_time = time.time()
+    map_image = module.MapImage(world, counting_map, module.PIXELS_PER_METER, False, False, False, map_cache)
+    return map_image, counting_map.generated_waypoints, time.time() - start_time
+
+
+def check_copy(module, world, carla_map):
+    """
+    Build MapImage twice with an empty cache, returns the number of failed checks
+    """
+    cache_dir = tempfile.mkdtemp(prefix='map_cache_check_')
+    failures = 0
+    try:
+        fresh, _, fresh_time = render_map(module, world, carla_map, cache_dir)
+        cached, cached_waypoints, cached_time = render_map(module, world, carla_map, cache_dir)
+        print("  rendered in {:.2f} s, read from the cache in {:.2f} s".format(fresh_time, cached_time))
+
+        # pylint: disable=protected-access
+        checks = [
+            (cached_waypoints == 0, "no waypoints are generated on a cache hit"),
+            (fresh.width == cached.width, "same width"),
+            (fresh._world_offset == cached._world_offset, "same world offset"),
+            (fresh._pixels_per_meter == cached._pixels_per_meter, "same pixels per meter"),
+            (fresh.big_map_surface.get_size() == cached.big_map_surface.get_size(), "same raster size"),
+        ]
+        if checks[-1][0]:
+            fresh_pixels = pygame.surfarray.array3d(fresh.big_map_surface)
+            cached_pixels = pygame.surfarray.array3d(cached.big_map_surface)
+            checks.append((np.array_equal(fresh_pixels, cached_pixels), "same pixels"))
+
+        map_cache = MapRasterCache(module.MAP_RENDERER, cache_dir)
+        other_key = map_cache.key(carla_map, module.PIXELS_PER_METER + 1, (False, False, False))
+        checks.append((other_key != map_cache.key(carla_map, module.PIXELS_PER_METER, (False, False, False)),
+                       "the pixels per meter change the key"))
+
+        for passed, message in checks:
+            print("  {}: {}".format("ok" if passed else "FAILED", message))
+            failures += not passed
+    finally:
+        shutil.rmtree(cache_dir)
+
+    return failures
+
+
+def main():
+    """
+    main function
+    """
+    parser = argparse.ArgumentParser(description="Map raster cache check")
+    parser.add_argument('--host', default='127.0.0.1', help='IP of the host server (default: 127.0.0.1)')
+    parser.add_argument('--port', default=2000, type=int, help='TCP port to listen to (default: 2000)')
+    parser.add_argument('--examples', default=os.path.join(os.environ.get('CARLA_ROOT', ''), 'PythonAPI', 'examples'),
+                        help='Directory of the PythonAPI examples (default: $CARLA_ROOT/PythonAPI/examples)')
+    args = parser.parse_args()
+
+    client = carla.Client(args.host, args.port)
+    client.set_timeout(20.0)
+    world = client.get_world()
+    carla_map = world.get_map()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    copies = [('scenario_runner', os.path.join(ROOT, 'no_rendering_mode.py'))]
+    examples_copy = os.path.join(args.examples, 'no_rendering_mode.py')
+    if os.path.isfile(examples_copy):
+        copies.append(('PythonAPI/examples', examples_copy))
+    else:
+        print("No {}, only the copy of scenario_runner is checked".format(examples_copy))
+
+    failures = 0
+    for index, (name, path) in enumerate(copies):
+        print("{} ({})".format(name, carla_map.name))
+        failures += check_copy(load_module('no_rendering_mode_{}'.format(index), path), world, carla_map)
+
+    pygame.quit()
+    print("{} failed checks".format(failures))
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
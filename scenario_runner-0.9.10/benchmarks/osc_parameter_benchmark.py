@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Micro-benchmark of the OpenSCENARIO parameter substitution.
+
+Runs OpenScenarioParser.replace_parameter_references and the previous implementation
+(every attribute checked against every parameter) on the bundled examples and
+catalogs, checks that both give the same trees and prints their times.
+
+Usage (from the scenario_runner root):
+python benchmarks/osc_parameter_benchmark.py [--repetitions 200] [files ...]
+"""
+
+from __future__ import print_function
+
+import argparse
+import copy
+import glob
+import os
+import sys
+import timeit
+import xml.etree.ElementTree as ET
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from srunner.tools.openscenario_parser import OpenScenarioParser  # pylint: disable=wrong-import-position
+
+
+def replace_parameter_references_reference(xml_tree, parameter_dict):
+    """
+    Previous implementation of OpenScenarioParser.replace_parameter_references
+    """
+    for node in xml_tree.iter():
+        for key in node.attrib:
+            for param in sorted(parameter_dict, key=len, reverse=True):
+                if "$" + param in node.attrib[key]:
+                    node.attrib[key] = node.attrib[key].replace("$" + param, parameter_dict[param])
+
+
+def get_parameters(xml_tree):
+    """
+    All the parameter declarations of a tree (scenario or catalog entries) as a dict
+    """
+    parameter_dict = dict()
+    for parameters in xml_tree.iter('ParameterDeclarations'):
+        for parameter in parameters:
+            parameter_dict[parameter.attrib.get('name')] = parameter.attrib.get('value')
+    return parameter_dict
+
+
+def main():
+    """
+    main function
+    """
+    examples = os.path.join(ROOT, "srunner", "examples")
+    default_files = sorted(glob.glob(os.path.join(examples, "*.xosc")) +
+                           glob.glob(os.path.join(examples, "catalogs", "*.xosc")))
+
+    parser = argparse.ArgumentParser(description="OpenSCENARIO parameter substitution benchmark")
+    parser.add_argument('files', nargs='*', default=default_files, help='.xosc files (default: bundled examples)')
+    parser.add_argument('--repetitions', type=int, default=200, help='Substitutions timed per file')
+    args = parser.parse_args()
+
+    total_reference = 0.0
+    total_current = 0.0
+
+    print("{:<40} {:>7} {:>7} {:>12} {:>12} {:>8}".format(
+        "file", "nodes", "params", "previous[ms]", "current[ms]", "speedup"))
+
+    for filename in args.files:
+        xml_tree = ET.parse(filename).getroot()
+        parameter_dict = get_parameters(xml_tree)
+        if not parameter_dict:
+            continue
+
+        # Same output
+        reference_tree = copy.deepcopy(xml_tree)
+        current_tree = copy.deepcopy(xml_tree)
+        replace_parameter_references_reference(reference_tree, parameter_dict)
+        OpenScenarioParser.replace_parameter_references(current_tree, parameter_dict)
+        if ET.tostring(reference_tree) != ET.tostring(current_tree):
+            print("ERROR: Different substitution for {}".format(filename))
+            return 1
+
+        # Each run works on its own copy, made outside of the timed calls
+        trees = [copy.deepcopy(xml_tree) for _ in range(args.repetitions)]
+        reference_time = timeit.timeit(
+            lambda: replace_parameter_references_reference(trees.pop(), parameter_dict), number=args.repetitions)
+        trees = [copy.deepcopy(xml_tree) for _ in range(args.repetitions)]
+        current_time = timeit.timeit(
+            lambda: OpenScenarioParser.replace_parameter_references(trees.pop(), parameter_dict),
+            number=args.repetitions)
+
+        total_reference += reference_time
+        total_current += current_time
+        print("{:<40} {:>7} {:>7} {:>12.3f} {:>12.3f} {:>7.1f}x".format(
+            os.path.basename(filename), len(list(xml_tree.iter())), len(parameter_dict),
+            1000 * reference_time / args.repetitions, 1000 * current_time / args.repetitions,
+            reference_time / current_time if current_time else float('inf')))
+
+    if total_current:
+        print("Total: {:.1f}x faster".format(total_reference / total_current))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
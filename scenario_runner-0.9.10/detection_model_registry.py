@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Process wide registry of the object detection (SSD) models used by the ego agent
+(automatic_control_agent_z8_ego.py) and by object_detection_grabscreen.py.
+
+A model is loaded lazily on first use, warmed up with one inference and then
+shared by everything in the process, so repetitions do not pay the load again.
+
+The model directory can be set with the DETECTION_MODEL_DIR environment variable
+(default: models/research/object_detection/models/ below the working directory).
+Without a GPU the models run on the CPU.
+"""
+
+from __future__ import print_function
+
+import os
+import pathlib
+import threading
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from object_detection.utils import ops as utils_ops
+from object_detection.utils import label_map_util
+
+
+DEFAULT_MODEL_NAME = 'ssd_mobilenet_v1_coco_2017_11_17'
+DEFAULT_MODEL_DIR = os.path.join('models', 'research', 'object_detection', 'models')
+DEFAULT_LABEL_MAP = os.path.join('models', 'research', 'object_detection', 'data', 'mscoco_label_map.pbtxt')
+MODEL_BASE_URL = 'http://download.tensorflow.org/models/object_detection/'
+
+WARM_UP_IMAGE_SHAPE = (450, 800, 3)  # size of the ego camera images fed to the model
+
+_lock = threading.Lock()
+_models = dict()
+_devices_configured = False
+
+# load_time / warm_up_time per model, plus the setup latencies reported by the agents (visual and headless)
+metrics = {"load_time": dict(), "warm_up_time": dict(), "setup_latency": [], "setup_latency_headless": []}
+
+
+def configure_devices():
+    """
+    Enable GPU memory growth, or fall back to the CPU if there is no GPU.
+    Has to run before TensorFlow initializes the devices, it is only done once per process.
+    """
+    global _devices_configured
+    if _devices_configured:
+        return
+    _devices_configured = True
+
+    physical_devices = tf.config.experimental.list_physical_devices('GPU')
+    if not physical_devices:
+        print("No GPU available, running the detection model on the CPU")
+        return
+
+    try:
+        for device in physical_devices:
+            tf.config.experimental.set_memory_growth(device, True)
+    except RuntimeError as e:
+        # devices were already initialized, e.g. by another TensorFlow user in this process
+        print("Could not enable GPU memory growth: {}".format(e))
+
+
+def download_model(model_name, model_dir):
+    """
+    Download and untar the model into model_dir/model_name, unless it is already there.
+    Returns the absolute path of the untarred model.
+    """
+    # Keras puts the file in cache_dir/cache_subdir/fname, so with a relative directory in fname
+    # or the default 'datasets' subdirectory the model would end up below the wrong path
+    return tf.keras.utils.get_file(
+        fname=model_name,
+        origin=MODEL_BASE_URL + model_name + '.tar.gz',
+        untar=True,
+        cache_dir=os.path.abspath(model_dir),
+        cache_subdir='')
+
+
+class DetectionModel(object):
+
+    """
+    A loaded SSD model with its label map and inference function
+    """
+
+    def __init__(self, model_name, model_dir, label_map):
+        self.model_name = model_name
+
+        model_path = download_model(model_name, model_dir)
+        self.model = tf.saved_model.load(str(pathlib.Path(model_path) / "saved_model"))
+
+        # the concrete function is looked up once instead of with every inference
+        self.model_fn = self.model.signatures['serving_default']
+
+        self.category_index = label_map_util.create_category_index_from_labelmap(label_map, use_display_name=True)
+
+    def warm_up(self, image_shape=WARM_UP_IMAGE_SHAPE):
+        """
+        Run one inference on a blank image, so that the first real frame does not pay for tracing and allocations
+        """
+        self.run_inference(np.zeros(image_shape, dtype=np.uint8))
+
+    def run_inference(self, image):
+        """
+        Detect the objects in a single image (HxWx3 uint8 array).
+        Returns the detections as a dictionary of numpy arrays.
+        """
+        image = np.asarray(image)
+        # The model expects a batch of images, so add an axis with `tf.newaxis`.
+        input_tensor = tf.convert_to_tensor(image)[tf.newaxis, ...]
+
+        with tf.device('/cpu:0'):
+            output_dict = self.model_fn(input_tensor)
+
+        # All outputs are batches tensors.
+        # Convert to numpy arrays, and take index [0] to remove the batch dimension.
+        # We're only interested in the first num_detections.
+        num_detections = int(output_dict.pop('num_detections'))
+        output_dict = {key: value[0, :num_detections].numpy() for key, value in output_dict.items()}
+        output_dict['num_detections'] = num_detections
+
+        # detection_classes should be ints.
+        output_dict['detection_classes'] = output_dict['detection_classes'].astype(np.int64)
+
+        # Handle models with masks:
+        if 'detection_masks' in output_dict:
+            # Reframe the the bbox mask to the image size.
+            detection_masks_reframed = utils_ops.reframe_box_masks_to_image_masks(
+                output_dict['detection_masks'], output_dict['detection_boxes'], image.shape[0], image.shape[1])
+            detection_masks_reframed = tf.cast(detection_masks_reframed > 0.5, tf.uint8)
+            output_dict['detection_masks_reframed'] = detection_masks_reframed.numpy()
+
+        return output_dict
+
+
+def get_detection_model(model_name=DEFAULT_MODEL_NAME, model_dir=None, label_map=DEFAULT_LABEL_MAP):
+    """
+    Return the DetectionModel for model_name, loading and warming it up on the first call in this process
+    """
+    if model_dir is None:
+        model_dir = os.environ.get('DETECTION_MODEL_DIR', DEFAULT_MODEL_DIR)
+    key = (model_name, os.path.abspath(model_dir), label_map)
+
+    with _lock:
+        if key not in _models:
+            configure_devices()
+
+            start_time = time.time()
+            detection_model = DetectionModel(model_name, model_dir, label_map)
+            metrics["load_time"][model_name] = time.time() - start_time
+
+            start_time = time.time()
+            detection_model.warm_up()
+            metrics["warm_up_time"][model_name] = time.time() - start_time
+
+            print("Loaded detection model {} in {:.2f} s (warm up {:.2f} s)".format(
+                model_name, metrics["load_time"][model_name], metrics["warm_up_time"][model_name]))
+
+            _models[key] = detection_model
+
+        return _models[key]
+
+
+def record_setup_latency(seconds, headless=False):
+    """
+    Record how long an agent took to get ready for a repetition
+    """
+    metrics["setup_latency_headless" if headless else "setup_latency"].append(seconds)
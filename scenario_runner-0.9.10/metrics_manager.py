@@ -21,11 +21,14 @@ import sys
 import importlib
 import inspect
 import json
+import time
 import argparse
 from argparse import RawTextHelpFormatter
 
 import carla
+from srunner.metrics.tools.metrics_cache import load_log_cache, save_log_cache
 from srunner.metrics.tools.metrics_log import MetricsLog
+from srunner.metrics.tools.metrics_parser import MetricsParser
 
 
 class MetricsManager(object):
@@ -40,30 +43,47 @@ class MetricsManager(object):
         the information from the recorder, extract the metrics class, and runs it
         """
         self._args = args
+        self._client = None
 
         # Parse the arguments
-        recorder_str = self._get_recorder(self._args.log)
+        recorder_file = self._get_recorder_file(self._args.log)
         criteria_dict = self._get_criteria(self._args.criteria)
 
-        # Get the correct world and load it
-        map_name = self._get_recorder_map(recorder_str)
-        world = self._client.load_world(map_name)
-        town_map = world.get_map()
+        # Use the cached log if it is there, no simulator needed
+        start_time = time.time()
+        cached_log = None if self._args.no_cache else load_log_cache(recorder_file)
+
+        if cached_log:
+            recorder_info, opendrive = cached_log
+            town_map = carla.Map(recorder_info[0]["map"], opendrive)
+            print("Opened the cached log in {:.3f} seconds".format(time.time() - start_time))
+
+        else:
+            recorder_str = self._get_recorder(recorder_file)
+
+            # Get the correct world and load it
+            map_name = self._get_recorder_map(recorder_str)
+            world = self._client.load_world(map_name)
+            town_map = world.get_map()
+
+            parser = MetricsParser(recorder_str, keep_event_lines=True)
+            recorder_info = parser.parse_recorder_info()
+            try:
+                save_log_cache(recorder_file, recorder_info, parser.event_lines, town_map.to_opendrive())
+            except (IOError, OSError) as e:
+                print("WARNING: Couldn't cache the parsed log: {}".format(e))
 
         # Instanciate the MetricsLog, used to querry the needed information
-        log = MetricsLog(recorder_str)
+        log = MetricsLog(recorder_info=recorder_info)
 
         # Read and run the metric class
         metric_class = self._get_metric_class(self._args.metric)
         metric_class(town_map, log, criteria_dict)
 
-    def _get_recorder(self, log):
+    def _get_recorder_file(self, log):
         """
-        Parses the log argument into readable information
+        Returns the path to the log file
         """
-
-        # Get the log information.
-        self._client = carla.Client(self._args.host, self._args.port)
         recorder_file = "{}/{}".format(os.getenv('SCENARIO_RUNNER_ROOT', "./"), log)
 
         # Check that the file is correct
@@ -74,6 +94,15 @@ class MetricsManager(object):
             print("ERROR: The specified log file does not exist")
             sys.exit(-1)
 
+        return recorder_file
+
+    def _get_recorder(self, recorder_file):
+        """
+        Parses the log file into readable information
+        """
+
+        # Get the log information.
+        self._client = carla.Client(self._args.host, self._args.port)
         recorder_str = self._client.show_recorder_file_info(recorder_file, True)
 
         return recorder_str
@@ -144,6 +173,8 @@ def main():
                         help='Path to the .py file defining the used metric.\nSome examples at srunner/metrics')
     parser.add_argument('--criteria', default="",
                         help='Path to the .json file with the criteria information.\nThis file is created by the record functionality at ScenarioRunner')
+    parser.add_argument('--no-cache', action="store_true",
+                        help='Parse the log with the simulator even if it has been cached (next to the .log file)')
     # pylint: enable=line-too-long
 
     args = parser.parse_args()
@@ -53,6 +53,8 @@ except IndexError:
 import carla
 from carla import TrafficLightState as tls
 
+from agents.tools.map_raster_cache import MapRasterCache, compute_map_bounds
+
 import argparse
 import logging
 import datetime
@@ -144,6 +146,9 @@ MODULE_INPUT = 'INPUT'
 
 PIXELS_PER_METER = 12
 
+# Renderer of the map cache, the version has to change whenever MapImage.draw_road_map does
+MAP_RENDERER = 'scenario_runner-1'
+
 MAP_DEFAULT_SCALE = 0.1
 HERO_DEFAULT_SCALE = 1.0
 
@@ -432,27 +437,39 @@ class TrafficLightSurfaces(object):
 
 
 class MapImage(object):
-    def __init__(self, carla_world, carla_map, pixels_per_meter, show_triggers, show_connections, show_spawn_points):
+    def __init__(self, carla_world, carla_map, pixels_per_meter, show_triggers, show_connections, show_spawn_points,
+                 map_cache=None):
         self._pixels_per_meter = pixels_per_meter
         self.scale = 1.0
         self.show_triggers = show_triggers
         self.show_connections = show_connections
         self.show_spawn_points = show_spawn_points
 
-        waypoints = carla_map.generate_waypoints(2)
-        margin = 50
-        max_x = max(waypoints, key=lambda x: x.transform.location.x).transform.location.x + margin
-        max_y = max(waypoints, key=lambda x: x.transform.location.y).transform.location.y + margin
-        min_x = min(waypoints, key=lambda x: x.transform.location.x).transform.location.x - margin
-        min_y = min(waypoints, key=lambda x: x.transform.location.y).transform.location.y - margin
-
-        self.width = max(max_x - min_x, max_y - min_y)
-        self._world_offset = (min_x, min_y)
+        # The rendered map is cached, along with its offset and width, so a cached map needs no waypoints
+        map_cache = map_cache if map_cache is not None else MapRasterCache(MAP_RENDERER)
+        cache_key = map_cache.key(carla_map, pixels_per_meter, (show_triggers, show_connections, show_spawn_points))
+        cached = map_cache.load(cache_key)
 
-        width_in_pixels = int(self._pixels_per_meter * self.width)
-
-        self.big_map_surface = pygame.Surface((width_in_pixels, width_in_pixels)).convert()
-        self.draw_road_map(self.big_map_surface, carla_world, carla_map, self.world_to_pixel, self.world_to_pixel_width)
+        if cached is not None:
+            surface, metadata = cached
+            self.width = metadata['width']
+            self._world_offset = tuple(metadata['world_offset'])
+            self.big_map_surface = surface.convert()
+        else:
+            self._world_offset, self.width = compute_map_bounds(carla_map)
+
+            width_in_pixels = int(self._pixels_per_meter * self.width)
+
+            self.big_map_surface = pygame.Surface((width_in_pixels, width_in_pixels)).convert()
+            self.draw_road_map(self.big_map_surface, carla_world, carla_map,
+                               self.world_to_pixel, self.world_to_pixel_width)
+            # A cache that can't be written (read-only or full disk) only costs the rendering next time
+            try:
+                map_cache.save(cache_key, self.big_map_surface, {'width': self.width,
+                                                                 'world_offset': list(self._world_offset),
+                                                                 'pixels_per_meter': self._pixels_per_meter})
+            except (IOError, OSError, pygame.error) as e:
+                logging.warning('could not cache the rendered map in %s: %s', map_cache.cache_dir, e)
         self.surface = self.big_map_surface
 
     def draw_road_map(self, map_surface, carla_world, carla_map, world_to_pixel, world_to_pixel_width):
@@ -30,10 +30,7 @@ from object_detection.utils import ops as utils_ops
 from object_detection.utils import label_map_util
 from object_detection.utils import visualization_utils as vis_util
 
-if tf.test.gpu_device_name(): 
-    print('Default GPU Device:{}'.format(tf.test.gpu_device_name()))
-else:
-   print("Please install GPU version of TF")
+from detection_model_registry import get_detection_model
 
 # If memory growth is enabled for a PhysicalDevice, the runtime initialization will not allocate all memory on the device. Memory growth cannot be configured on a PhysicalDevice with virtual devices configured.
 # physical_devices = tf.config.list_physical_devices('GPU')
@@ -44,9 +41,7 @@ else:
 # 	print("couldn't enable GPU memory growth")
   #pass
 
-physical_devices = tf.config.experimental.list_physical_devices('GPU')
-assert len(physical_devices) > 0, "Not enough GPU hardware devices available"
-tf.config.experimental.set_memory_growth(physical_devices[0], True)
+# GPU memory growth (or the CPU fallback) is set up by the detection model registry
 
 
 # try:
@@ -58,46 +53,17 @@ tf.config.experimental.set_memory_growth(physical_devices[0], True)
 
 
 
-def load_model3(model_name):
-  base_url = 'http://download.tensorflow.org/models/object_detection/'
-  model_file = model_name + '.tar.gz'
-  dir_loc = 'D://scenario_runner-0.9.10//models//research//object_detection//models//'
-
-  model_dir = tf.keras.utils.get_file(
-    fname= dir_loc + model_name, 
-    origin=base_url + model_file,
-    untar=True,
-    cache_dir=dir_loc)
-    
-
-   
-  print(model_dir)
-
-  model_dir = pathlib.Path(model_dir)/"saved_model"
-  #model_dir = str(pathlib.Path(model_dir))
- 
-  #model_dir = model_dir + "//" + "saved_model"
- 
-  print(model_dir)
-
-  model = tf.saved_model.load(str(model_dir))
-
-  return model
+model_name = 'ssd_mobilenet_v1_coco_2017_11_17'
+# loaded from DETECTION_MODEL_DIR (default: models/research/object_detection/models/) and warmed up
+detection_model = get_detection_model(model_name)
+#print(detection_model.model_fn.inputs)
+#print(detection_model.model_fn.output_dtypes)
+#print(detection_model.model_fn.output_shapes)
 
 # List of the strings that is used to add correct label for each box.
-PATH_TO_LABELS = 'models/research/object_detection/data/mscoco_label_map.pbtxt'
-category_index = label_map_util.create_category_index_from_labelmap(PATH_TO_LABELS, use_display_name=True)
-
-model_name = 'ssd_mobilenet_v1_coco_2017_11_17'
-#detection_model = load_model(model_name)
-detection_model = load_model3(model_name)
-#print(detection_model.signatures['serving_default'].inputs)
-#print(detection_model.signatures['serving_default'].output_dtypes)
-#print(detection_model.signatures['serving_default'].output_shapes)
+category_index = detection_model.category_index
 
 ## Main loop3 GrabScreen with vehicle proximity detection 
-model = detection_model
-
 while True:
     #for image_path in TEST_IMAGE_PATHS:
     # the array based representation of the image will be used later in order to prepare the
@@ -108,47 +74,9 @@ while True:
     #screen = cv2.resize(grab_screen(region=(0,40, 2569, 1440)), (800,450))
     image_np = cv2.cvtColor(screen, cv2.COLOR_BGR2RGB)
     # Actual detection.
-    image = image_np
-    image = np.asarray(image)
-    # The input needs to be a tensor, convert it using `tf.convert_to_tensor`.
-    input_tensor = tf.convert_to_tensor(image)
-    # The model expects a batch of images, so add an axis with `tf.newaxis`.
-    input_tensor = input_tensor[tf.newaxis,...]
-
-    # Run inference
-    #model_fn = model.signatures['serving_default']
-
-    #input("Press Enter to continue...")
-    with tf.device('/cpu:0'):
-      model_fn = model.signatures['serving_default']
-    	output_dict = model_fn(input_tensor)
-
-    #input("Press Enter to continue...")
-
-
-    # All outputs are batches tensors.
-    # Convert to numpy arrays, and take index [0] to remove the batch dimension.
-    # We're only interested in the first num_detections.
-    num_detections = int(output_dict.pop('num_detections'))
-    output_dict = {key:value[0, :num_detections].numpy() 
-                 for key,value in output_dict.items()}
-    output_dict['num_detections'] = num_detections
-
-    # detection_classes should be ints.
-    output_dict['detection_classes'] = output_dict['detection_classes'].astype(np.int64)
-
-    # Handle models with masks:
-    if 'detection_masks' in output_dict:
-        # Reframe the the bbox mask to the image size.
-        detection_masks_reframed = utils_ops.reframe_box_masks_to_image_masks(
-                  output_dict['detection_masks'], output_dict['detection_boxes'],
-                   image.shape[0], image.shape[1])      
-        detection_masks_reframed = tf.cast(detection_masks_reframed > 0.5,
-                                           tf.uint8)
-        output_dict['detection_masks_reframed'] = detection_masks_reframed.numpy()
-
-
-    #output_dict = run_inference_for_single_image(model, image_np)
+    output_dict = detection_model.run_inference(image_np)
+
+
     # Visualization of the results of a detection.
     vis_util.visualize_boxes_and_labels_on_image_array(
       image_np,
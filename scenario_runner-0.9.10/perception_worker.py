@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Asynchronous perception stage for the ego agent.
+
+The camera callback submits frames, the worker thread runs the detection model on
+the most recent one and publishes the result tagged with the frame id. Frames that
+arrive while the model is busy replace the waiting frame (a latest-frame queue of
+size one), so the simulation never waits for inference and perception never falls
+behind by more than one frame.
+
+submit() copies the frame into a buffer owned by the worker, so the caller can
+reuse its own buffer (e.g. a FrameRing) right away, and the image of a Detection
+is always the frame that was detected. The buffer of a dropped frame is reused
+for the next one.
+
+Usage:
+perception = PerceptionWorker(get_detection_model())
+perception.submit(frame_id, image)      # e.g. from the camera callback
+detection = perception.latest()         # most recent Detection, or None
+perception.reset()                      # e.g. before the next repetition
+perception.stop()
+"""
+
+from __future__ import print_function
+
+import collections
+import threading
+import time
+
+import numpy as np
+
+
+Detection = collections.namedtuple('Detection', ['frame_id', 'image', 'output_dict', 'inference_time'])
+
+
+class PerceptionWorker(object):
+
+    """
+    Runs the detection model in a worker thread on the latest submitted frame
+    """
+
+    def __init__(self, detection_model, visualize=True):
+        self.detection_model = detection_model
+        self.visualize = visualize  # draw the detections into the published image
+
+        self._condition = threading.Condition()
+        self._pending = None        # (frame_id, image) waiting for the worker
+        self._latest = None         # last published Detection
+        self._running = True
+        self._generation = 0        # incremented by reset(), detections of older generations are dropped
+
+        self.frames_submitted = 0
+        self.frames_dropped = 0
+        self.inference_times = []
+        self.detection_ages = []    # in frames, recorded by the consumer with record_age()
+
+        self._thread = threading.Thread(target=self._run, name="perception-worker")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def submit(self, frame_id, image):
+        """
+        Hand a copy of a new frame to the worker, replacing the frame still waiting (if any)
+        """
+        buffer = None
+        with self._condition:
+            if self._pending is not None:
+                # the waiting frame was never seen by anyone else, its buffer can take the new one
+                self.frames_dropped += 1
+                buffer = self._pending[1]
+                self._pending = None
+            generation = self._generation
+
+        if buffer is None or buffer.shape != image.shape or buffer.dtype != image.dtype:
+            buffer = np.empty_like(image)
+        np.copyto(buffer, image)
+
+        with self._condition:
+            if self._pending is not None:
+                self.frames_dropped += 1
+            if generation == self._generation:
+                self._pending = (frame_id, buffer)
+            self.frames_submitted += 1
+            self._condition.notify()
+
+    def latest(self):
+        """
+        Return the most recent Detection, None if nothing has been detected yet
+        """
+        with self._condition:
+            return self._latest
+
+    def reset(self):
+        """
+        Forget the frame waiting and the last detection, e.g. when the agent is bound
+        to a new vehicle. The worker thread (and the model) stay warm.
+        """
+        with self._condition:
+            self._generation += 1
+            self._pending = None
+            self._latest = None
+
+    def record_age(self, current_frame_id, detection):
+        """
+        Record (and return) how many frames old a detection is when it is used
+        """
+        age = current_frame_id - detection.frame_id
+        self.detection_ages.append(age)
+        return age
+
+    def _run(self):
+        """
+        Worker loop: wait for a frame, detect, publish
+        """
+        while True:
+            with self._condition:
+                while self._running and self._pending is None:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                frame_id, image = self._pending
+                self._pending = None
+                generation = self._generation
+
+            start_time = time.time()
+            try:
+                output_dict = self.detection_model.run_inference(image)
+            except Exception as e:                  # pylint: disable=broad-except
+                print("Object detection failed for frame {}: {}".format(frame_id, e))
+                continue
+            inference_time = time.time() - start_time
+
+            if self.visualize:
+                # the worker owns the frame, so the boxes are drawn into it directly
+                from object_detection.utils import visualization_utils as vis_util
+                vis_util.visualize_boxes_and_labels_on_image_array(
+                    image,
+                    output_dict['detection_boxes'],
+                    output_dict['detection_classes'],
+                    output_dict['detection_scores'],
+                    self.detection_model.category_index,
+                    instance_masks=output_dict.get('detection_masks_reframed', None),
+                    use_normalized_coordinates=True,
+                    line_thickness=8)
+
+            with self._condition:
+                self.inference_times.append(inference_time)
+                if generation == self._generation:
+                    self._latest = Detection(frame_id, image, output_dict, inference_time)
+
+    def stop(self):
+        """
+        Stop the worker thread, the frame waiting (if any) is discarded
+        """
+        with self._condition:
+            self._running = False
+            self._pending = None
+            self._condition.notify()
+        self._thread.join()
+
+    def summary(self):
+        """
+        Perception latency statistics as a dictionary
+        """
+        with self._condition:
+            inference_times = list(self.inference_times)
+        ages = self.detection_ages
+        return {
+            "frames_submitted": self.frames_submitted,
+            "frames_dropped": self.frames_dropped,
+            "detections": len(inference_times),
+            "mean_inference_time": sum(inference_times) / len(inference_times) if inference_times else None,
+            "max_inference_time": max(inference_times) if inference_times else None,
+            "mean_detection_age": float(sum(ages)) / len(ages) if ages else None,
+            "max_detection_age": max(ages) if ages else None,
+        }
@@ -17,6 +17,9 @@ from __future__ import print_function
 
 import glob
 import traceback
+import copy
+import collections
+import functools
 import argparse
 from argparse import RawTextHelpFormatter
 from datetime import datetime
@@ -29,11 +32,8 @@ import sys
 import time
 import json
 import pkg_resources
-from random import seed
-from random import randint
 import scipy
 import numpy as np
-from scipy.special import softmax
 
 import carla
 
@@ -44,6 +44,11 @@ from srunner.scenarios.open_scenario import OpenScenario
 from srunner.scenarios.route_scenario import RouteScenario
 from srunner.tools.scenario_parser import ScenarioConfigurationParser
 from srunner.tools.route_parser import RouteParser
+from srunner.tools.coverage_store import CoverageStore
+from srunner.tools.coverage_sampler import CoverageSampler
+from srunner.tools.intersection_situations import IntersectionSituations
+from srunner.tools.campaign_executor import CampaignExecutor, parse_endpoints
+from srunner.tools.world_reset import WorldResetter
 from automatic_control_agent_z5_other_veh import *  # OtherVehControlAgent() imported from here
 
 from openpyxl import Workbook
@@ -84,6 +89,10 @@ class ScenarioRunner(object):
 
     agent_instance = None
     module_agent = None
+    other_veh_agentZ_ogg = None  # OtherVehControlAgent, reused across repetitions
+
+    # Append-only store of the situation coverage counters (--coverageStore/--resume)
+    coverage_store = None
 
     def __init__(self, args):
         """
@@ -119,6 +128,13 @@ class ScenarioRunner(object):
         # Create the ScenarioManager
         self.manager = ScenarioManager(self._args.debug, self._args.sync, self._args.timeout)
 
+        # Vehicles removed at the end of a repetition are parked and reused by the next one
+        CarlaDataProvider.set_actor_reuse(self._args.reuseActors)
+
+        # With --reloadWorld, the town is only loaded again if it changes (or every --coldResetEvery runs),
+        # the world is reset before every repetition
+        self.world_resetter = WorldResetter(self.client, self._args.warmReset, self._args.coldResetEvery)
+
         # Create signal handler for SIGINT
         self._shutdown_requested = False
         if sys.platform != 'win32':
@@ -136,7 +152,18 @@ class ScenarioRunner(object):
         """
 
         self._cleanup()
+        CarlaDataProvider.destroy_parked_actors()
+        if self._args.reloadWorld:
+            print(self.world_resetter.summary())
+        if self.coverage_store is not None:
+            self.coverage_store.close()
+            self.coverage_store = None
+        if self.other_veh_agentZ_ogg is not None:
+            self.other_veh_agentZ_ogg.close()
+            self.other_veh_agentZ_ogg = None
         if self.manager is not None:
+            if self.manager.ego_agentZ is not None:
+                self.manager.ego_agentZ.close()
             del self.manager
         if self.world is not None:
             del self.world
@@ -282,8 +309,8 @@ class ScenarioRunner(object):
         for i, _ in enumerate(self.ego_vehicles):
             if self.ego_vehicles[i]:
                 if not self._args.waitForEgo:
-                    print("Destroying ego vehicle {}".format(self.ego_vehicles[i].id))
-                    self.ego_vehicles[i].destroy()
+                    print("Releasing ego vehicle {}".format(self.ego_vehicles[i].id))
+                    CarlaDataProvider.release_actor(self.ego_vehicles[i])  # parked for the next repetition with --reuseActors
                 self.ego_vehicles[i] = None
         self.ego_vehicles = []
 
@@ -422,7 +449,7 @@ class ScenarioRunner(object):
         """
 
         if self._args.reloadWorld:
-            self.world = self.client.load_world(town)  # particular town loaded in the world
+            self.world = self.world_resetter.reset(town)  # particular town loaded in the world, or reset if already loaded (--warmReset)
         else:
             # if the world should not be reloaded, wait at least until all ego vehicles are ready
             ego_vehicle_found = False
@@ -561,7 +588,9 @@ class ScenarioRunner(object):
                 
                 
                 ################################ Initialize Other Vehicle Agent here!!!!!!!!!!!!! ##############################
-                self.other_veh_agentZ_ogg = OtherVehControlAgent()
+                # created once, the scenario binds it to its new other vehicle every repetition
+                if self.other_veh_agentZ_ogg is None:
+                    self.other_veh_agentZ_ogg = OtherVehControlAgent()
 
 
 
@@ -657,6 +686,92 @@ class ScenarioRunner(object):
         self._cleanup()
         return result
 
+    def _set_config_from_situation(self, config, intersection_situations):
+        """
+        Overwrite the actor transforms, trigger point and weather of config with the selected situation
+        """
+
+        # Pass parameters to config file below!! :3
+        # So we have the config file which is a ScenarioConfiguration() object.
+        # ego_vehicles inside ScenarioConfiguration() object is a list. So "for vehicle in ego_vehicles:"" is done to do requestactor from carla data manger.
+        # I can do ego_vehicle = ego_vehicles[-1]. And then I have the ActorConfigurationData(object): of the ego vehicle.
+        # I can then do self.transform = transform
+
+        # Ego Vehicle ActorConfigurationData(object):
+        #self.ego_vehicle_actor_config_object = config.ego_vehicles[-1]
+
+        # Overwrite the transform of the ego vehicle ActorConfigObject isnide the config file instead of making a new copy of it as above
+        config.ego_vehicles[-1].transform = intersection_situations.ego_veh.ego_start_carla_transform_dict["key_transform"]
+        
+        print(config.ego_vehicles[-1].transform)
+        print("Ego Veh Location from top is",intersection_situations.ego_veh.ego_start_carla_transform_dict["key_location_string"])
+        # sys.exit("Sys.exit at _load_and_run_scenario, main script. IntersectionSituations executed successfully")  # Successfull!
+
+        # Overwrite the transform of the Other vehicle ActorConfigObject isnide the config file
+        config.other_actors[-1].transform = intersection_situations.other_veh.other_vehicle_start_carla_transform_dict["key_transform"]
+
+        print(config.other_actors[-1].transform)
+        print("Other Veh Location from top is",intersection_situations.other_veh.other_vehicle_start_carla_transform_dict["key_location_string"])
+        # sys.exit("Sys.exit at _load_and_run_scenario, main script. IntersectionSituations executed successfully")
+
+
+        # Overwrite the transform of ego veh location in config.triggerpoints list
+        # Using 0 for the index because in basic_scenario.py zero is used for the index there
+        config.trigger_points[0] = config.ego_vehicles[-1].transform  # This came from above
+
+        # Overwriting config environemntal conditions values
+        config.weather.cloudiness = intersection_situations.env_conditions.cloudiness
+        config.weather.precipitation = intersection_situations.env_conditions.precipitation
+        config.weather.precipitation_deposits = intersection_situations.env_conditions.precipitation_deposits
+        config.weather.wind_intensity = intersection_situations.env_conditions.wind_intensity
+        config.weather.sun_azimuth_angle = intersection_situations.env_conditions.sun_azimuth_angle
+        config.weather.sun_altitude_angle = intersection_situations.env_conditions.sun_altitude_angle
+        config.weather.fog_density = intersection_situations.env_conditions.fog_density
+        config.weather.fog_distance = intersection_situations.env_conditions.fog_distance
+        config.weather.wetness = intersection_situations.env_conditions.wetness
+        config.weather.friction = intersection_situations.env_conditions.friction
+
+        print("friction is", config.weather.friction)
+        #sys.exit("block")
+
+        # This parameter isn't included yet in the config class. Edit and test it later
+        #config.weather.fog_falloff = intersection_situations.env_conditions.fog_falloff
+
+    def run_situation(self, config, intersection_situations):
+        """
+        Run one repetition of config in the situation that intersection_situations is set up for.
+        Returns the results of the repetition as a dictionary.
+        """
+        self._set_config_from_situation(config, intersection_situations)
+        result = self._load_and_run_scenario(config, intersection_situations)
+
+        return {"result": result,
+                "situation": str(intersection_situations.key_ego_other_veh_interaction_key),
+                "collision_counts": self.manager.collision_counts,
+                "collision_test_result": self.manager.collision_test_result}
+
+    @staticmethod
+    def open_coverage_store(args, intersection_situations):
+        """
+        Open the coverage store given by --resume or --coverageStore (None if there is none)
+        and restore its counters into intersection_situations
+        """
+        if not args.resume and not args.coverageStore:
+            return None
+
+        store_file = args.resume if args.resume else args.coverageStore
+        if args.resume and not os.path.isfile(store_file):
+            raise ValueError("Coverage store {} not found, nothing to resume".format(store_file))
+        if not args.resume and os.path.isfile(store_file):
+            raise ValueError("Coverage store {} already exists, use --resume to continue it".format(store_file))
+
+        coverage_store = CoverageStore(store_file)
+        intersection_situations.set_coverage_counters(coverage_store.counters)
+        if coverage_store.repetitions > 0:
+            print("Resuming after {} repetitions from {}".format(coverage_store.repetitions, store_file))
+
+        return coverage_store
+
     def _run_scenarios(self):
         """
         Run conventional scenarios (e.g. implemented using the Python API of ScenarioRunner)
@@ -691,7 +806,8 @@ class ScenarioRunner(object):
             # Initialize the Sit Generation object
             #self.intersection_situations = IntersectionSituations()
             #self.intersection_situations = IntersectionSituations(self._args.Activate_IntersectionScenario_Seed, self._args.IntersectionScenario_Seed, self._args.use_sit_cov)  # default value of self._args.use_sit_cov is False!!!!!
-            self.intersection_situations = IntersectionSituations(self._args.Activate_IntersectionScenario_Seed, self._args.IntersectionScenario_Seed)  # default value of self._args.use_sit_cov is False!!!!!
+            self.intersection_situations = IntersectionSituations(self._args.Activate_IntersectionScenario_Seed, self._args.IntersectionScenario_Seed,
+                                                                  self._args.sitcovWeighting, self._args.sitcovTemperature)  # default value of self._args.use_sit_cov is False!!!!!
         except Exception as e: 
             traceback.print_exc()
             print("Could not setup IntersectionSituations due to {}".format(e))
@@ -699,13 +815,31 @@ class ScenarioRunner(object):
             return False 
 
         self.counting_reps = 0 
+
+        # Restore the coverage counters of an interrupted campaign, or start recording a new one
+        try:
+            self.coverage_store = self.open_coverage_store(self._args, self.intersection_situations)
+        except ValueError as e:
+            print(e)
+            return False
+        if self.coverage_store is not None:
+            self.counting_reps = self.coverage_store.repetitions
+
         # Execute each configuration
-        for config in scenario_configurations:
+        for config_index, config in enumerate(scenario_configurations):
             
             # ************************************** THIS IS THE LOOP THAT CONTROLS repititions!!!!!!!! #####################################################
             
-            for _ in range(self._args.repetitions):  #  put 2 in this and it repeated from 00! # lets see what happens in reptitions
-                
+            for repetition_of_config in range(self._args.repetitions):  #  put 2 in this and it repeated from 00! # lets see what happens in reptitions
+
+                # repetitions already done in the resumed campaign are skipped
+                repetition = config_index * self._args.repetitions + repetition_of_config
+                if self.coverage_store is not None and repetition in self.coverage_store.completed:
+                    continue
+
+                # counter values before this repetition's situation is generated
+                coverage_counters_before = self.intersection_situations.get_coverage_counters()
+
                 # default repetitions = 1 :3
 
                 #So config is the iterator through the list of different scenario configurations in the scenario_configurations list 
@@ -752,64 +886,20 @@ class ScenarioRunner(object):
                     self._cleanup()
                     return False              
 
-                # Pass parameters to config file below!! :3
-                # So we have the config file which is a ScenarioConfiguration() object.
-                # ego_vehicles inside ScenarioConfiguration() object is a list. So "for vehicle in ego_vehicles:"" is done to do requestactor from carla data manger.
-                # I can do ego_vehicle = ego_vehicles[-1]. And then I have the ActorConfigurationData(object): of the ego vehicle.
-                # I can then do self.transform = transform
-
-                # Ego Vehicle ActorConfigurationData(object):
-                #self.ego_vehicle_actor_config_object = config.ego_vehicles[-1]
-
-                # Overwrite the transform of the ego vehicle ActorConfigObject isnide the config file instead of making a new copy of it as above
-                config.ego_vehicles[-1].transform = self.intersection_situations.ego_veh.ego_start_carla_transform_dict["key_transform"]
-                
-                print(config.ego_vehicles[-1].transform)
-                print("Ego Veh Location from top is",self.intersection_situations.ego_veh.ego_start_carla_transform_dict["key_location_string"])
-                # sys.exit("Sys.exit at _load_and_run_scenario, main script. IntersectionSituations executed successfully")  # Successfull!
-
-                # Overwrite the transform of the Other vehicle ActorConfigObject isnide the config file
-                config.other_actors[-1].transform = self.intersection_situations.other_veh.other_vehicle_start_carla_transform_dict["key_transform"]
-
-                print(config.other_actors[-1].transform)
-                print("Other Veh Location from top is",self.intersection_situations.other_veh.other_vehicle_start_carla_transform_dict["key_location_string"])
-                # sys.exit("Sys.exit at _load_and_run_scenario, main script. IntersectionSituations executed successfully")
-
-
-                # Overwrite the transform of ego veh location in config.triggerpoints list
-                # Using 0 for the index because in basic_scenario.py zero is used for the index there
-                config.trigger_points[0] = config.ego_vehicles[-1].transform  # This came from above
-
-                # Overwriting config environemntal conditions values
-                config.weather.cloudiness = self.intersection_situations.env_conditions.cloudiness
-                config.weather.precipitation = self.intersection_situations.env_conditions.precipitation
-                config.weather.precipitation_deposits = self.intersection_situations.env_conditions.precipitation_deposits
-                config.weather.wind_intensity = self.intersection_situations.env_conditions.wind_intensity
-                config.weather.sun_azimuth_angle = self.intersection_situations.env_conditions.sun_azimuth_angle
-                config.weather.sun_altitude_angle = self.intersection_situations.env_conditions.sun_altitude_angle
-                config.weather.fog_density = self.intersection_situations.env_conditions.fog_density
-                config.weather.fog_distance = self.intersection_situations.env_conditions.fog_distance
-                config.weather.wetness = self.intersection_situations.env_conditions.wetness
-                config.weather.friction = self.intersection_situations.env_conditions.friction
-
-                print("friction is", config.weather.friction)
-                #sys.exit("block")
-
-                # This parameter isn't included yet in the config class. Edit and test it later
-                #config.weather.fog_falloff = self.intersection_situations.env_conditions.fog_falloff
-
-
-
-
-
-
-
+                self._set_config_from_situation(config, self.intersection_situations)
 
                 # Ego Vehicle and Other Vehicle transforms have been overwritten successfully.
                 # Now to pass on the Different trigger locations to IntersectionScenarioZ_# class
                 # To do that I will pass on the IntersectionSiuations object to the load and run scenario and from there I will pass it on to IntersectionScenarioZ_# class initialization iA :3
 
                 result = self._load_and_run_scenario(config, self.intersection_situations)
+
+                # commit this repetition's counter increments to disk
+                if self.coverage_store is not None:
+                    coverage_counters = self.intersection_situations.get_coverage_counters()
+                    self.coverage_store.record_repetition(
+                        {path: coverage_counters[path] - coverage_counters_before.get(path, 0) for path in coverage_counters}, repetition)
+
                 self.counting_reps = self.counting_reps + 1
                 print(f"````````` Counter Reps = {self.counting_reps}`````````````")
 
@@ -887,7 +977,7 @@ class ScenarioRunner(object):
         
         Sr_no_column = 1
 
-        pad_rows = 0 + 20 + 20 + 20 + 20 # this is for if simulation breaks before all repititions are completed
+        pad_rows = 0  # resumed campaigns (--resume) continue counting_reps, so no manual padding is needed
 
         if self.manager.collision_counts > 0:
             collision = 1
@@ -1140,2693 +1230,288 @@ class ScenarioRunner(object):
         wb.save(filename = dest_filename)
 
 
+class CampaignWorker(object):
 
-class IntersectionSituations:
-# SituationGeneration Engine!
-    #def __init__(self, approach="random"):  # approach can either be "random" or "sitcov"
-
-    # self.key_ego_other_veh_interaction_key is for outputting the key used for the base concrete situation
-
-
-    def __init__(self, seed_boolean, seedz):  
-
-        # Generate the ego_veh object upon initialization of the int sit framework
-        # this class will give the carla transforms of ego vehicle start and goal locations, based on which intersection leg
-        # is selected as the START location of ego and then based upon the start, we will further select which
-        # GOAL location to choose and we will query this ego_veh object to get those carla transform of the goal location
-        self.ego_veh = EgoVehicle()
-        self.other_veh = OtherVehicle()
-        self.env_conditions = EnvironmentalConditions()
-
-        self.initialize_situation_dictionaries()
-
-        if seed_boolean:
-            seed(seedz)
-            np.random.seed(seedz)
-
-    # approach can either be "random" or "sitcov"
-    def start_sit_config_gen(self, approach, activate_env_cond_generation=False):  #Use this method again and again with each repetition of the scenario class
-
-        # shifting this to the end of this method so that I can generate the same random situations using the seeds I have. But first leme debug this
-        self.env_conditions.generate_environmental_conditions(approach, activate_env_cond_generation);
-
-        self.cloudiness_key = self.env_conditions.cloudiness_key
-        self.precipitation_key = self.env_conditions.precipitation_key
-        self.precipitation_deposits_key = self.env_conditions.precipitation_deposits_key
-        self.wind_intensity_key = self.env_conditions.wind_intensity_key
-        self.fog_density_key = self.env_conditions.fog_density_key
-        self.fog_distance_key = self.env_conditions.fog_distance_key
-        self.wetness_key = self.env_conditions.wetness_key
-        self.fog_falloff_key = self.env_conditions.fog_falloff_key
-        self.friction_key = self.env_conditions.friction_key
-
-        if approach == "random":
-
-
-            # ******** this line only written to run the file, or it throws an error at the moment.
-            #self.ego_veh.select_ego_start_loc("left")  # just testing. Comment out when not debugging.
-            #pass
-
-            key_ego_start_index_list = []
-            
-            for key in self.ego_start_count_plus_other_dict.keys():
-
-                #print(key)
-
-                #sys.exit("off")
-
-
-                #if key == "key_ego_start_left_count" or "key_ego_start_base_count" or "key_ego_start_right_count":
-                if key == "key_ego_start_left_count" or key == "key_ego_start_base_count" or key == "key_ego_start_right_count":
-                
-                #if key == "key_ego_start_left_count":  # yes!
-
-                    key_ego_start_index_list.append(key)
-                    #print("ego start keys are as follows :3",key_ego_start_index_list)  # Works!!
-                    
-            
-            # we have a dictionary of keys of start locations and we will randomly select one of the start locations
-
-            #sys.exit("off")
-
-            #seed(1)  # seed works. always generates same random numbers. great for re-creating situations.
-            #key_index = randint(0,2) # works, all three conditions appear
-            #key_index = randint(0,(len(key_ego_start_index_list)-1)) # works, all three conditions appear
-
-            if len(key_ego_start_index_list) == 1:
-                key_index = 0  # only one value to choose from
-            elif len(key_ego_start_index_list) > 1:
-                key_index = randint(0,len(key_ego_start_index_list)-1) # works, all three conditions appear
-            else:
-                raise ValueError("Unexpected value of key_index")
-
-            key_ego_start_loc = key_ego_start_index_list[key_index]
-
-            print("following key was selected :3", key_ego_start_loc)
-
-            if key_ego_start_loc == "key_ego_start_left_count":
-                # Increment this situation by one since it has been selected for situation generation. Do this for the rest of the dictionaries as well, to get multi-level situation coverage. 
-                self.ego_start_count_plus_other_dict["key_ego_start_left_count"] = self.ego_start_count_plus_other_dict["key_ego_start_left_count"] + 1
-                print("key_ego_start_left_count", self.ego_start_count_plus_other_dict["key_ego_start_left_count"])
-                # Here we are setting the start location of ego veh object to the left. Need to pass this start location value to the configuation file as well
-
-                self.ego_veh.select_ego_start_loc("left")  # ego_start_carla_transform_dict is set to left int leg transform                
-                # This gives us the whole transform for the start location of ego vehicle
-                #self.ego_veh.ego_start_carla_transform_dict["key_transform"]
-
-                # So for a certain start locaiton, we have some triggers to set that depend upon that start location of the ego veh, they are as follows:
-
-                # initialize passthroughtrigger locs wih this as well. Use their dictionaries like the start location dictionary inside the ego veh object. 
-                self.ego_veh.select_ego_passthroughtrigger_loc("left")
-
-                # initialize startothertrigger (for ego veh) locs wih this as well
-                self.ego_veh.select_ego_startothertrigger_loc("left")
-
-                # randomly choosing goal loc for ego veh
-                key_ego_goal_index_list = []
-
-                for key in self.ego_left_start_goal_count_dict.keys():
-                    if key == "key_ego_goal_base_count" or key == "key_ego_goal_right_count":
-                        key_ego_goal_index_list.append(key)
-
-                
-                if len(key_ego_goal_index_list) == 1:
-                    key_index = 0  # only one value to choose from
-                elif len(key_ego_goal_index_list) > 1:
-                    key_index = randint(0,len(key_ego_goal_index_list)-1) # works, all three conditions appear
-                else:
-                    raise ValueError("Unexpected value of key_index")
-
-
-                #key_index = randint(0,(len(key_ego_goal_index_list)-1))  # len(key_ego_goal_index_list) is 2, but we can not make the range for randint to be 0 - 2. Have to add a minus 1 with that in all cases.
-                key_ego_goal_loc = key_ego_goal_index_list[key_index]
-
-                if key_ego_goal_loc == "key_ego_goal_base_count":
-                    # will add counters here later
-                    self.ego_left_start_goal_count_dict["key_ego_goal_base_count"] = self.ego_left_start_goal_count_dict["key_ego_goal_base_count"] + 1 
-
-                    # Set ego veh goal loc/endconditiontrigger here
-                    self.ego_veh.select_ego_endconditiontrigger_loc("base")
-
-                    list_of_ego_interaction_dicts = self.ego_left_start_goal_count_dict["key_ego_goal_base_interactions_dict"]
-
-                    #RANDOMLY chose the dictionary
-                    
-                    if len(list_of_ego_interaction_dicts) == 1:
-                        key_index = 0  # only one value to choose from
-                    elif len(list_of_ego_interaction_dicts) > 1:
-                        key_index = randint(0,len(list_of_ego_interaction_dicts)-1) # works, all three conditions appear
-                    else:
-                        raise ValueError("Unexpected value of key_index")
-                    #key_index = randint(0,(len(list_of_ego_interaction_dicts)-1))
-
-                    ego_interaction_dict = list_of_ego_interaction_dicts[key_index]  # only 1 option for this case :3
-                    # use conflict point to identify which interaction is taking place
-
-                    key_ego_other_veh_interaction_list = []
-
-                    if ego_interaction_dict["key_conflict_point"] == "c4":  # conflict point tells us which situation dictionary was selected
-
-                        # Set the conflictpoint/SyncArrivalLoc
-                        self.select_conflictpoint_syncarrival_loc("c4")
-
-                        for key in ego_interaction_dict.keys():
-                            if key == "key_SAVL_GBAVxSOVR_GBOV":
-                                key_ego_other_veh_interaction_list.append(key)
-
-                        if len(key_ego_other_veh_interaction_list) == 1:
-                            key_index = 0  # only one value to choose from
-                        elif len(key_ego_other_veh_interaction_list) > 1:
-                            key_index = randint(0,len(key_ego_other_veh_interaction_list)-1) # works, all three conditions appear
-                        else:
-                            raise ValueError("Unexpected value of key_index")
-
-
-                        #key_index = randint(0,(len(key_ego_other_veh_interaction_list)-1))
-                        key_ego_other_veh_interaction = key_ego_other_veh_interaction_list[key_index]
-
-                        if key_ego_other_veh_interaction == "key_SAVL_GBAVxSOVR_GBOV":
-                            ego_interaction_dict["key_SAVL_GBAVxSOVR_GBOV"] = ego_interaction_dict["key_SAVL_GBAVxSOVR_GBOV"] + 1
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
-
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("right")
-
-                            # I will set the stopothertrigger to the goal location of the other vehicle but rightnow we have not setup controls to steer the othervehicle to it's goal locations.
-                            # I will set up the other vehicle controls to steer it to it's goal location in later stages. Maybe use a driving agent for that, but will have to see how to use that
-                            # with pytrees.
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("base")
-                        
-                        # no other situations possible in this case
-                        else:
-                            raise ValueError("Unexpected value of key_ego_other_veh_interaction selected")
-                    
-                    else:
-                        raise ValueError("Unexpected value of conflict point selected")
-
-                elif key_ego_goal_loc == "key_ego_goal_right_count":
-                    self.ego_left_start_goal_count_dict["key_ego_goal_right_count"] = self.ego_left_start_goal_count_dict["key_ego_goal_right_count"] + 1
-
-                    # Set ego veh goalloc/endconditiontrigger here
-                    self.ego_veh.select_ego_endconditiontrigger_loc("right")
-
-                    list_of_ego_interaction_dicts = self.ego_left_start_goal_count_dict["key_ego_goal_right_interactions_dict"]
-
-                    #RANDOMLY chose the dictionary
-                    
-                    if len(list_of_ego_interaction_dicts) == 1:
-                        key_index = 0  # only one value to choose from
-                    elif len(list_of_ego_interaction_dicts) > 1:
-                        key_index = randint(0,len(list_of_ego_interaction_dicts)-1) # works, all three conditions appear
-                    else:
-                        raise ValueError("Unexpected value of key_index")
-
-                    #key_index = randint(0,(len(list_of_ego_interaction_dicts)-1))
-
-                    ego_interaction_dict = list_of_ego_interaction_dicts[key_index]  # 2 option for this case :3
-                    # use conflict point to identify which interaction is taking place
-
-                    key_ego_other_veh_interaction_list = []
-
-                    if ego_interaction_dict["key_conflict_point"] == "c4":
-
-                        # Set the conflictpoint/SyncArrivalLoc
-                        self.select_conflictpoint_syncarrival_loc("c4")
-
-                        for key in ego_interaction_dict.keys():
-                            #if key == "key_SAVL_GBAVxSOVR_GBOV":  # only 1 here as well
-                            # ************* In scenario_runnerZ5 Big mistake here above, caught by raise ValueError! :3 ************
-                            #if key == "key_SAVL_GRAVxSOVR_GBOV":  # only 1 here as well
-
-                            if key == "key_SAVL_GRAVxSOVR_GBOV":  # only 1 here as well
-                                key_ego_other_veh_interaction_list.append(key)
-
-                        if len(key_ego_other_veh_interaction_list) == 1:
-                            key_index = 0  # only one value to choose from and it is at index 0 :3
-                        elif len(key_ego_other_veh_interaction_list) > 1:
-                            key_index = randint(0,len(key_ego_other_veh_interaction_list)-1) # works, all three conditions appear
-                        else:
-                            raise ValueError("Unexpected value of key_index")
-
-                        #key_index = randint(0,(len(key_ego_other_veh_interaction_list)-1))
-                        key_ego_other_veh_interaction = key_ego_other_veh_interaction_list[key_index]
-
-                        #if key_ego_other_veh_interaction == "key_SAVL_GBAVxSOVR_GBOV":  # mistake in scenario_runnerZ5:3
-                        if key_ego_other_veh_interaction == "key_SAVL_GRAVxSOVR_GBOV":
-                            ego_interaction_dict["key_SAVL_GRAVxSOVR_GBOV"] = ego_interaction_dict["key_SAVL_GRAVxSOVR_GBOV"] + 1
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
-
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("right")
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("base")
-                         
-                        # no other situations possible in this case
-                        else:
-                            raise ValueError("Unexpected value of key_ego_other_veh_interaction selected")
-
-                    elif ego_interaction_dict["key_conflict_point"] == "c1":
-
-                        # Set the conflictpoint/SyncArrivalLoc
-                        self.select_conflictpoint_syncarrival_loc("c1")
-
-                        for key in ego_interaction_dict.keys():
-                            if key == "key_SAVL_GRAVxSOVB_GROV" or key == "key_SAVL_GRAVxSOVB_GLOV":  # only 1 here as well
-                                key_ego_other_veh_interaction_list.append(key)
-
-                        if len(key_ego_other_veh_interaction_list) == 1:
-                            key_index = 0  # only one value to choose from and it is at index 0 :3
-                        elif len(key_ego_other_veh_interaction_list) > 1:
-                            key_index = randint(0,len(key_ego_other_veh_interaction_list)-1) # works, all three conditions appear
-                        else:
-                            raise ValueError("Unexpected value of key_index")
-
-                        #key_index = randint(0,(len(key_ego_other_veh_interaction_list)-1))
-                        key_ego_other_veh_interaction = key_ego_other_veh_interaction_list[key_index]
-
-                        if key_ego_other_veh_interaction == "key_SAVL_GRAVxSOVB_GROV":
-                            ego_interaction_dict["key_SAVL_GRAVxSOVB_GROV"] = ego_interaction_dict["key_SAVL_GRAVxSOVB_GROV"] + 1 
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
-
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("base")
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("right")
-                        
-                        elif key_ego_other_veh_interaction == "key_SAVL_GRAVxSOVB_GLOV":
-                            ego_interaction_dict["key_SAVL_GRAVxSOVB_GLOV"] = ego_interaction_dict["key_SAVL_GRAVxSOVB_GLOV"] + 1
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
-
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("base_left_lane")  # added for lane problems with goal locations
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("left")
-
-                        # no other situations possible in this case
-                        else:
-                            raise ValueError("Unexpected value of key_ego_other_veh_interaction selected")
+    """
+    Runs the repetitions handed out by a CampaignCoordinator on one CARLA server,
+    inside a worker process of the CampaignExecutor.
+    """
 
-                    else:
-                        raise ValueError("Unexpected value of conflict point selected")    
+    def __init__(self, args, endpoint):
+        """
+        Setup a ScenarioRunner connected to the given server endpoint
+        """
+        args = copy.copy(args)
+        args.host = endpoint.host
+        args.port = str(endpoint.port)
+        args.trafficManagerPort = str(endpoint.tm_port)
 
-                else:
-                    raise ValueError("Unexpected value of goal loc of ego veh selected")
+        self.scenario_runner = ScenarioRunner(args)
+        self.scenario_configurations = ScenarioConfigurationParser.parse_scenario_configuration(args.scenario, args.configFile)
 
+        # Only used to set up the situations selected by the coordinator, its counts are never used here
+        self.intersection_situations = IntersectionSituations(False, 0, args.sitcovWeighting, args.sitcovTemperature)
 
-            elif key_ego_start_loc == "key_ego_start_base_count":
-                self.ego_start_count_plus_other_dict["key_ego_start_base_count"] = self.ego_start_count_plus_other_dict["key_ego_start_base_count"] + 1
-                print("key_ego_start_base_count", self.ego_start_count_plus_other_dict["key_ego_start_base_count"])
+    def run_job(self, job):
+        """
+        Run one repetition
+        """
+        config = self.scenario_configurations[job["config_index"]]
+        self.intersection_situations.apply_situation(job["situation"], job["env_bins"])
+        return self.scenario_runner.run_situation(config, self.intersection_situations)
 
+    def close(self):
+        """
+        Cleanup the ScenarioRunner
+        """
+        self.scenario_runner.destroy()
 
-                self.ego_veh.select_ego_start_loc("base")
 
-                # initialize passthroughtrigger locs wih this as well. Use their dictionaries like the start location dictionary inside the ego veh object. 
-                self.ego_veh.select_ego_passthroughtrigger_loc("base")
+class CampaignCoordinator(object):
 
-                # initialize startothertrigger (for ego) locs wih this as well
-                self.ego_veh.select_ego_startothertrigger_loc("base")
+    """
+    Runs a campaign of conventional scenarios (--scenario) on several CARLA servers (--servers) in parallel.
 
-                # randomly choosing goal loc for ego veh
-                key_ego_goal_index_list = []
+    All situations are generated here, one at a time whenever a server becomes free, so that the
+    situation coverage counters stay globally consistent. Every server runs one CampaignWorker in its own process.
+    The results of all repetitions are merged into one file in --outputDir.
 
-                for key in self.ego_base_start_goal_count_dict.keys():
-                    if key == "key_ego_goal_left_count" or key == "key_ego_goal_right_count":
-                        key_ego_goal_index_list.append(key)
+    Usage:
+    coordinator = CampaignCoordinator(args)
+    coordinator.run()
+    """
 
-                if len(key_ego_goal_index_list) == 1:
-                    key_index = 0  # only one value to choose from and it is at index 0 :3
-                elif len(key_ego_goal_index_list) > 1:
-                    key_index = randint(0,len(key_ego_goal_index_list)-1) # works, all three conditions appear
-                else:
-                    raise ValueError("Unexpected value of key_index")
+    results_file = 'campaign_results.json'
 
-                #key_index = randint(0,(len(key_ego_goal_index_list)-1))
-                key_ego_goal_loc = key_ego_goal_index_list[key_index]
+    def __init__(self, args):
+        """
+        Setup the situation generation and the coverage store of the campaign
+        """
+        self._args = args
+        self.endpoints = parse_endpoints(args.servers)
 
-                if key_ego_goal_loc == "key_ego_goal_left_count":
-                    self.ego_base_start_goal_count_dict["key_ego_goal_left_count"] = self.ego_base_start_goal_count_dict["key_ego_goal_left_count"] + 1
-                    # will add counters here later
+        self.scenario_configurations = ScenarioConfigurationParser.parse_scenario_configuration(args.scenario, args.configFile)
+        if not self.scenario_configurations:
+            raise ValueError("Configuration for scenario {} cannot be found!".format(args.scenario))
 
-                    # Set ego veh goal loc/endconditiontrigger here
-                    self.ego_veh.select_ego_endconditiontrigger_loc("left")
+        self.intersection_situations = IntersectionSituations(args.Activate_IntersectionScenario_Seed, args.IntersectionScenario_Seed,
+                                                              args.sitcovWeighting, args.sitcovTemperature)
+        self.approach = "sitcov" if args.use_sit_cov else "random"
+        self.activate_env_cond_generation = args.disable_env_cond_gen
 
-                    list_of_ego_interaction_dicts = self.ego_base_start_goal_count_dict["key_ego_goal_left_interactions_dict"]
+        self.coverage_store = ScenarioRunner.open_coverage_store(args, self.intersection_situations)
+        self.total_repetitions = len(self.scenario_configurations) * args.repetitions
 
-                    #RANDOMLY chose the dictionary
-                    
-                    if len(list_of_ego_interaction_dicts) == 1:
-                        key_index = 0  # only one value to choose from and it is at index 0 :3
-                    elif len(list_of_ego_interaction_dicts) > 1:
-                        key_index = randint(0,len(list_of_ego_interaction_dicts)-1) # works, all three conditions appear
-                    else:
-                        raise ValueError("Unexpected value of key_index")
+        # only the repetitions missing from a resumed campaign are run, whichever order the others finished in
+        if self.coverage_store is not None:
+            self._repetitions = collections.deque(self.coverage_store.missing_repetitions(self.total_repetitions))
+        else:
+            self._repetitions = collections.deque(range(self.total_repetitions))
+        self.resumed_repetitions = self.total_repetitions - len(self._repetitions)
 
+        self._increments = dict()  # repetition -> coverage counter increments of its situation
+        self.failed_repetitions = []
+        self.results = []
 
-                    #key_index = randint(0,(len(list_of_ego_interaction_dicts)-1))
+    def _next_job(self):
+        """
+        Generate the situation of the next repetition
+        """
+        if not self._repetitions:
+            return None
 
-                    ego_interaction_dict = list_of_ego_interaction_dicts[key_index]  # only 1 option for this case :3
-                    # use conflict point to identify which interaction is taking place
+        repetition = self._repetitions.popleft()
 
-                    key_ego_other_veh_interaction_list = []
-                    
-                    if ego_interaction_dict["key_conflict_point"] == "c1":
-
-                        # Set the conflictpoint/SyncArrivalLoc
-                        self.select_conflictpoint_syncarrival_loc("c1")
-
-                        for key in ego_interaction_dict.keys():
-                            if key == "key_SAVB_GLAV_SOVL_GROV":  # only 1 here
-                                key_ego_other_veh_interaction_list.append(key)
-
-                        
-                        if len(key_ego_other_veh_interaction_list) == 1:
-                            key_index = 0  # only one value to choose from and it is at index 0 :3
-                        elif len(key_ego_other_veh_interaction_list) > 1:
-                            key_index = randint(0,len(key_ego_other_veh_interaction_list)-1) # works, all three conditions appear
-                        else:
-                            raise ValueError("Unexpected value of key_index")
-
-                        #key_index = randint(0,(len(key_ego_other_veh_interaction_list)-1))
-                        key_ego_other_veh_interaction = key_ego_other_veh_interaction_list[key_index]
-
-                        if key_ego_other_veh_interaction == "key_SAVB_GLAV_SOVL_GROV":
-                            ego_interaction_dict["key_SAVB_GLAV_SOVL_GROV"] = ego_interaction_dict["key_SAVB_GLAV_SOVL_GROV"] + 1
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
-
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("left")
-
-                            # I will set the stopothertrigger to the goal location of the other vehicle but rightnow we have not setup controls to steer the othervehicle to it's goal locations.
-                            # I will set up the other vehicle controls to steer it to it's goal location in later stages. Maybe use a driving agent for that, but will have to see how to use that
-                            # with pytrees.
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("right")
-                        
-                        # no other situations possible in this case
-                        else:
-                            raise ValueError("Unexpected value of key_ego_other_veh_interaction selected")
-
-                    elif ego_interaction_dict["key_conflict_point"] == "c2":
-
-                        # Set the conflictpoint/SyncArrivalLoc
-                        self.select_conflictpoint_syncarrival_loc("c2")
-
-                        for key in ego_interaction_dict.keys():
-                            if key == "key_SAVB_GLAV_SOVR_GLOV" or key == "key_SAVB_GLAVxSOVR_GBOV":  # 2 here
-                                key_ego_other_veh_interaction_list.append(key)
-
-                        if len(key_ego_other_veh_interaction_list) == 1:
-                            key_index = 0  # only one value to choose from and it is at index 0 :3
-                        elif len(key_ego_other_veh_interaction_list) > 1:
-                            key_index = randint(0,len(key_ego_other_veh_interaction_list)-1) # works, all three conditions appear
-                        else:
-                            raise ValueError("Unexpected value of key_index")
-
-                        #key_index = randint(0,(len(key_ego_other_veh_interaction_list)-1))
-                        key_ego_other_veh_interaction = key_ego_other_veh_interaction_list[key_index]
-
-                        if key_ego_other_veh_interaction == "key_SAVB_GLAV_SOVR_GLOV":
-                            ego_interaction_dict["key_SAVB_GLAV_SOVR_GLOV"] = ego_interaction_dict["key_SAVB_GLAV_SOVR_GLOV"] + 1
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
-
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("right")
-
-                            # I will set the stopothertrigger to the goal location of the other vehicle but rightnow we have not setup controls to steer the othervehicle to it's goal locations.
-                            # I will set up the other vehicle controls to steer it to it's goal location in later stages. Maybe use a driving agent for that, but will have to see how to use that
-                            # with pytrees.
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("left")
-                        
-                        elif key_ego_other_veh_interaction == "key_SAVB_GLAVxSOVR_GBOV":
-                            ego_interaction_dict["key_SAVB_GLAVxSOVR_GBOV"] = ego_interaction_dict["key_SAVB_GLAVxSOVR_GBOV"] + 1
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
-
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("right")
-
-                            # I will set the stopothertrigger to the goal location of the other vehicle but rightnow we have not setup controls to steer the othervehicle to it's goal locations.
-                            # I will set up the other vehicle controls to steer it to it's goal location in later stages. Maybe use a driving agent for that, but will have to see how to use that
-                            # with pytrees.
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("base")
-
-
-                        # no other situations possible in this case
-                        else:
-                            raise ValueError("Unexpected value of key_ego_other_veh_interaction selected")
+        coverage_counters_before = self.intersection_situations.get_coverage_counters()
+        situation = self.intersection_situations.start_sit_config_gen(self.approach, self.activate_env_cond_generation)
+        coverage_counters = self.intersection_situations.get_coverage_counters()
+        self._increments[repetition] = {path: coverage_counters[path] - coverage_counters_before.get(path, 0) for path in coverage_counters}
 
-                    else:
-                        raise ValueError("Unexpected value of conflict point selected") 
+        return {"repetition": repetition,
+                "config_index": repetition // self._args.repetitions,
+                "situation": int(situation),
+                "env_bins": self.intersection_situations.env_conditions.current_bins()}
 
-                elif key_ego_goal_loc == "key_ego_goal_right_count":
-                    self.ego_base_start_goal_count_dict["key_ego_goal_right_count"] = self.ego_base_start_goal_count_dict["key_ego_goal_right_count"] + 1
-                    # will add counters here later
+    def _job_done(self, job, result, error):
+        """
+        Commit the coverage counters of a finished repetition and keep its results.
+        A repetition that failed to run is not committed, so a resumed campaign runs it again.
+        """
+        increments = self._increments.pop(job["repetition"])
 
-                    # Set ego veh goal loc/endconditiontrigger here
-                    self.ego_veh.select_ego_endconditiontrigger_loc("right")
+        if error is not None:
+            print("Repetition {} failed:\n{}".format(job["repetition"], error))
+            result = {"result": False, "error": error}
+            self.failed_repetitions.append(job["repetition"])
 
-                    list_of_ego_interaction_dicts = self.ego_base_start_goal_count_dict["key_ego_goal_right_interactions_dict"]
+            # its situation was not covered, so its counter increments are taken back
+            coverage_counters = self.intersection_situations.get_coverage_counters()
+            self.intersection_situations.set_coverage_counters(
+                {path: coverage_counters[path] - increments.get(path, 0) for path in coverage_counters})
+        elif self.coverage_store is not None:
+            self.coverage_store.record_repetition(increments, job["repetition"])
 
-                    #RANDOMLY chose the dictionary
-                    
-                    if len(list_of_ego_interaction_dicts) == 1:
-                        key_index = 0  # only one value to choose from and it is at index 0 :3
-                    elif len(list_of_ego_interaction_dicts) > 1:
-                        key_index = randint(0,len(list_of_ego_interaction_dicts)-1) # works, all three conditions appear
-                    else:
-                        raise ValueError("Unexpected value of key_index")
+        result = dict(result)
+        result.update(repetition=job["repetition"], config=self.scenario_configurations[job["config_index"]].name,
+                      env_bins=job["env_bins"])
+        self.results.append(result)
 
-                    #key_index = randint(0,(len(list_of_ego_interaction_dicts)-1))
+        print("````````` Finished repetition {} ({}/{}) `````````````".format(
+            job["repetition"] + 1, len(self.results) + self.resumed_repetitions, self.total_repetitions))
 
-                    ego_interaction_dict = list_of_ego_interaction_dicts[key_index]  # only 1 option for this case :3
-                    # use conflict point to identify which interaction is taking place
+    def run(self):
+        """
+        Run all repetitions of the campaign and write the merged results
+        """
+        start_time = time.time()
 
-                    key_ego_other_veh_interaction_list = []
+        executor = CampaignExecutor(self.endpoints, functools.partial(CampaignWorker, self._args), self._next_job, self._job_done)
+        finished_per_server = executor.run()
 
-                    if ego_interaction_dict["key_conflict_point"] == "c1":  # only 1
+        duration = time.time() - start_time
+        if self.coverage_store is not None:
+            self.coverage_store.close()
 
-                        # Set the conflictpoint/SyncArrivalLoc
-                        self.select_conflictpoint_syncarrival_loc("c1")
+        self.results.sort(key=lambda result: result["repetition"])
+        output = {"servers": ["{}:{}:{}".format(*endpoint) for endpoint in self.endpoints],
+                  "repetitions_per_server": finished_per_server,
+                  "duration": duration,
+                  "repetitions_per_second": len(self.results) / duration if duration > 0 else 0.0,
+                  "results": self.results}
 
-                        for key in ego_interaction_dict.keys():
-                            if key == "key_SAVB_GRAV_SOVL_GROV":  # only 1 here
-                                key_ego_other_veh_interaction_list.append(key)
+        results_file = os.path.join(self._args.outputDir, self.results_file)
+        with open(results_file, 'w') as fp:
+            json.dump(output, fp, indent=4)
 
-                        
-                        if len(key_ego_other_veh_interaction_list) == 1:
-                            key_index = 0  # only one value to choose from and it is at index 0 :3
-                        elif len(key_ego_other_veh_interaction_list) > 1:
-                            key_index = randint(0,len(key_ego_other_veh_interaction_list)-1) # works, all three conditions appear
-                        else:
-                            raise ValueError("Unexpected value of key_index")
+        print("Ran {} repetitions on {} servers in {:.1f} seconds ({:.3f} repetitions/s), results written to {}".format(
+            len(self.results), len(self.endpoints), duration, output["repetitions_per_second"], results_file))
+        if self.failed_repetitions:
+            print("Repetitions {} failed to run, resume the campaign to run them again".format(sorted(self.failed_repetitions)))
 
+        return len(self.results) + self.resumed_repetitions == self.total_repetitions and \
+            not self.failed_repetitions and all(result["result"] for result in self.results)
 
-                        #key_index = randint(0,(len(key_ego_other_veh_interaction_list)-1))
-                        key_ego_other_veh_interaction = key_ego_other_veh_interaction_list[key_index]
-                                    
-                        if key_ego_other_veh_interaction == "key_SAVB_GRAV_SOVL_GROV":
-                            ego_interaction_dict["key_SAVB_GRAV_SOVL_GROV"] = ego_interaction_dict["key_SAVB_GRAV_SOVL_GROV"] + 1
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
 
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("left")
+def main():
+    """
+    main function
+    """
+    description = ("CARLA Scenario Runner: Setup, Run and Evaluate scenarios using CARLA\n"
+                   "Current version: " + VERSION)
 
-                            # I will set the stopothertrigger to the goal location of the other vehicle but rightnow we have not setup controls to steer the othervehicle to it's goal locations.
-                            # I will set up the other vehicle controls to steer it to it's goal location in later stages. Maybe use a driving agent for that, but will have to see how to use that
-                            # with pytrees.
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("right")
+    # pylint: disable=line-too-long
+    parser = argparse.ArgumentParser(description=description,
+                                     formatter_class=RawTextHelpFormatter)
+    parser.add_argument('-v', '--version', action='version', version='%(prog)s ' + VERSION)
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='IP of the host server (default: localhost)')
+    parser.add_argument('--port', default='2000',
+                        help='TCP port to listen to (default: 2000)')
+    parser.add_argument('--timeout', default="10.0",
+                        help='Set the CARLA client timeout value in seconds')
+    parser.add_argument('--trafficManagerPort', default='8000',
+                        help='Port to use for the TrafficManager (default: 8000)')
+    parser.add_argument('--trafficManagerSeed', default='0',
+                        help='Seed used by the TrafficManager (default: 0)')
+    parser.add_argument('--sync', action='store_true',
+                        help='Forces the simulation to run synchronously')
+    parser.add_argument('--list', action="store_true", help='List all supported scenarios and exit')
 
-                        # no other situations possible in this case
-                        else:
-                            raise ValueError("Unexpected value of key_ego_other_veh_interaction selected")
+    parser.add_argument(
+        '--scenario', help='Name of the scenario to be executed. Use the preposition \'group:\' to run all scenarios of one class, e.g. ControlLoss or FollowLeadingVehicle')
+    parser.add_argument('--openscenario', help='Provide an OpenSCENARIO definition')
+    parser.add_argument(
+        '--route', help='Run a route as a scenario (input: (route_file,scenario_file,[route id]))', nargs='+', type=str)  # route file (routes_debug.xml) and scenario file (all_towns_traffic_scenarios1_3_4.json) and route id (0) required
 
-                    else:
-                        raise ValueError("Unexpected value of conflict point selected")
+    parser.add_argument(
+        '--agent', help="Agent used to execute the scenario. Currently only compatible with route-based scenarios.")  # can be npc_agent.py or even a humancontroller agent that uses manual_control.py or a custon defined agent :)
+    parser.add_argument('--agentConfig', type=str, help="Path to Agent's configuration file", default="")
 
-                else:
-                    raise ValueError("Unexpected value of goal loc of ego veh selected")        
+    parser.add_argument('--output', action="store_true", help='Provide results on stdout')
+    parser.add_argument('--file', action="store_true", help='Write results into a txt file')
+    parser.add_argument('--junit', action="store_true", help='Write results into a junit file')
+    parser.add_argument('--outputDir', default='', help='Directory for output files (default: this directory)')
 
+    parser.add_argument('--configFile', default='', help='Provide an additional scenario configuration file (*.xml)')
+    parser.add_argument('--additionalScenario', default='', help='Provide additional scenario implementations (*.py)')
 
-            elif key_ego_start_loc == "key_ego_start_right_count":
-                self.ego_start_count_plus_other_dict["key_ego_start_right_count"] = self.ego_start_count_plus_other_dict["key_ego_start_right_count"] + 1    
-                print("key_ego_start_right_count", self.ego_start_count_plus_other_dict["key_ego_start_right_count"])
-                
-                self.ego_veh.select_ego_start_loc("right")
+    parser.add_argument('--debug', action="store_true", help='Run with debug output')
+    parser.add_argument('--reloadWorld', action="store_true",
+                        help='Reload the CARLA world before starting a scenario (default=True)')
+    parser.add_argument('--warmReset', action="store_true",
+                        help='With --reloadWorld, reset the loaded world instead of loading it again when the town does not change')
+    parser.add_argument('--coldResetEvery', default=0, type=int,
+                        help='With --warmReset, load the town again after this many scenario runs, repetitions included (default: 0, never)')
+    parser.add_argument('--reuseActors', action="store_true",
+                        help='Park the vehicles of a repetition and reuse them in the next one instead of destroying and respawning them')
+    parser.add_argument('--record', type=str, default='',
+                        help='Path were the files will be saved, relative to SCENARIO_RUNNER_ROOT.\nActivates the CARLA recording feature and saves to file all the criteria information.')
+    parser.add_argument('--randomize', action="store_true", help='Scenario parameters are randomized')
+    parser.add_argument('--repetitions', default=1, type=int, help='Number of scenario executions')
+    parser.add_argument('--waitForEgo', action="store_true", help='Connect the scenario to an existing ego vehicle')
+    parser.add_argument('--show_int_wps', action="store_true", help='Show intersection waypoints')
+    parser.add_argument('--show_int_wp_locs', action="store_true", help='Show waypoint locations, just command works if show_int_wps is activated')
+    parser.add_argument('--not_visualize', action="store_false", help='Do not show pygame window for ego veh driving')
+    parser.add_argument('--Activate_IntersectionScenario_Seed', action="store_true", help='Use Intersection random num see or not')
+    parser.add_argument('--IntersectionScenario_Seed', default=0, type=int,
+                            help='Seed used by the IntersectionScenarios (default: 0)')
+    parser.add_argument('--use_sit_cov', action="store_true", help='Do situation coverage based generation')
+    parser.add_argument('--disable_env_cond_gen', action="store_false", help='Disable environemntal conditions generation')
+    parser.add_argument('--sitcovWeighting', default='softmax', choices=CoverageSampler.WEIGHTINGS,
+                        help='Weighting of the counts for situation coverage based generation (default: softmax)')
+    parser.add_argument('--sitcovTemperature', default=1.0, type=float,
+                        help='Temperature of the softmax weighting, higher values favour low counts less (default: 1.0)')
+    parser.add_argument('--coverageStore', default='', help='Record the situation coverage counters of this campaign in a new store file')
+    parser.add_argument('--resume', default='', help='Resume the campaign recorded in this coverage store file (restores all counters)')
+    parser.add_argument('--servers', nargs='+', default=[],
+                        help='Run the repetitions in parallel on these CARLA servers, given as host:port[:trafficManagerPort]')
 
-                # initialize passthroughtrigger locs wih this as well. Use their dictionaries like the start location dictionary inside the ego veh object. 
-                self.ego_veh.select_ego_passthroughtrigger_loc("right")
+    #parser.add_argument('--IntersectionScenario_Seed', default='0',
+                            #help='Seed used by the IntersectionScenarios (default: 0)')
 
-                # initialize startothertrigger (for ego) locs wih this as well
-                self.ego_veh.select_ego_startothertrigger_loc("right")
 
-                # randomly choosing goal loc for ego veh
-                key_ego_goal_index_list = []
 
-                for key in self.ego_right_start_goal_count_dict.keys():
-                    if key == "key_ego_goal_left_count" or key == "key_ego_goal_base_count":
-                        key_ego_goal_index_list.append(key)
+    arguments = parser.parse_args()
+    # pylint: enable=line-too-long
 
-                if len(key_ego_goal_index_list) == 1:
-                    key_index = 0  # only one value to choose from and it is at index 0 :3
-                elif len(key_ego_goal_index_list) > 1:
-                    key_index = randint(0,len(key_ego_goal_index_list)-1) # works, all three conditions appear
-                else:
-                    raise ValueError("Unexpected value of key_index")
+    if arguments.list:
+        print("Currently the following scenarios are supported:")
+        print(*ScenarioConfigurationParser.get_list_of_scenarios(arguments.configFile), sep='\n')
+        return 1
 
-                #key_index = randint(0,(len(key_ego_goal_index_list)-1))
-                key_ego_goal_loc = key_ego_goal_index_list[key_index]
+    if not arguments.scenario and not arguments.openscenario and not arguments.route:
+        print("Please specify either a scenario or use the route mode\n\n")
+        parser.print_help(sys.stdout)
+        return 1
 
-                if key_ego_goal_loc == "key_ego_goal_left_count":
-                    self.ego_right_start_goal_count_dict["key_ego_goal_left_count"] = self.ego_right_start_goal_count_dict["key_ego_goal_left_count"] + 1
-                    # will add counters here later
+    if arguments.route and (arguments.openscenario or arguments.scenario):
+        print("The route mode cannot be used together with a scenario (incl. OpenSCENARIO)'\n\n")
+        parser.print_help(sys.stdout)
+        return 1
 
-                    # Set ego veh goal loc/endconditiontrigger here
-                    self.ego_veh.select_ego_endconditiontrigger_loc("left")
+    if arguments.agent and (arguments.openscenario or arguments.scenario):
+        print("Agents are currently only compatible with route scenarios'\n\n")
+        parser.print_help(sys.stdout)
+        return 1
 
-                    list_of_ego_interaction_dicts = self.ego_right_start_goal_count_dict["key_ego_goal_left_interactions_dict"]
+    if arguments.route:
+        arguments.reloadWorld = True
 
-                    #RANDOMLY chose the dictionary
-                    
-                    if len(list_of_ego_interaction_dicts) == 1:
-                        key_index = 0  # only one value to choose from and it is at index 0 :3
-                    elif len(list_of_ego_interaction_dicts) > 1:
-                        key_index = randint(0,len(list_of_ego_interaction_dicts)-1) # works, all three conditions appear
-                    else:
-                        raise ValueError("Unexpected value of key_index")
+    if arguments.agent:
+        arguments.sync = True
 
-                    #key_index = randint(0,(len(list_of_ego_interaction_dicts)-1))
+    if arguments.servers:
+        if not arguments.scenario:
+            print("Parallel campaigns (--servers) are only supported for conventional scenarios (--scenario)\n\n")
+            parser.print_help(sys.stdout)
+            return 1
 
-                    ego_interaction_dict = list_of_ego_interaction_dicts[key_index]  # only 1 option for this case :3
-                    # use conflict point to identify which interaction is taking place
-
-                    key_ego_other_veh_interaction_list = []
-
-                    if ego_interaction_dict["key_conflict_point"] == "c2":
-
-                        # Set the conflictpoint/SyncArrivalLoc
-                        self.select_conflictpoint_syncarrival_loc("c2")
-
-                        for key in ego_interaction_dict.keys():
-                            if key == "key_SAVR_GLAVxSOVB_GLOV":  # only 1 here
-                                key_ego_other_veh_interaction_list.append(key)
-
-                        if len(key_ego_other_veh_interaction_list) == 1:
-                            key_index = 0  # only one value to choose from and it is at index 0 :3
-                        elif len(key_ego_other_veh_interaction_list) > 1:
-                            key_index = randint(0,len(key_ego_other_veh_interaction_list)-1) # works, all three conditions appear
-                        else:
-                            raise ValueError("Unexpected value of key_index")
-
-                        #key_index = randint(0,(len(key_ego_other_veh_interaction_list)-1))
-                        key_ego_other_veh_interaction = key_ego_other_veh_interaction_list[key_index]
-
-                        if key_ego_other_veh_interaction == "key_SAVR_GLAVxSOVB_GLOV":
-                            ego_interaction_dict["key_SAVR_GLAVxSOVB_GLOV"] = ego_interaction_dict["key_SAVR_GLAVxSOVB_GLOV"] + 1
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
-
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("base_left_lane")  # added
-
-                            # I will set the stopothertrigger to the goal location of the other vehicle but rightnow we have not setup controls to steer the othervehicle to it's goal locations.
-                            # I will set up the other vehicle controls to steer it to it's goal location in later stages. Maybe use a driving agent for that, but will have to see how to use that
-                            # with pytrees.
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("left")
-                        
-                        # no other situations possible in this case
-                        else:
-                            raise ValueError("Unexpected value of key_ego_other_veh_interaction selected")
-                
-                    else:
-                        raise ValueError("Unexpected value of conflict point selected")
-
-                elif key_ego_goal_loc == "key_ego_goal_base_count":
-
-                    # will add counters here later
-
-                    # Set ego veh goal loc/endconditiontrigger here
-                    self.ego_veh.select_ego_endconditiontrigger_loc("base")
-
-                    list_of_ego_interaction_dicts = self.ego_right_start_goal_count_dict["key_ego_goal_base_interactions_dict"]
-
-                    #RANDOMLY chose the dictionary
-                    
-                    if len(list_of_ego_interaction_dicts) == 1:
-                        key_index = 0  # only one value to choose from and it is at index 0 :3
-                    elif len(list_of_ego_interaction_dicts) > 1:
-                        key_index = randint(0,len(list_of_ego_interaction_dicts)-1) # works, all three conditions appear
-                    else:
-                        raise ValueError("Unexpected value of key_index")
-
-                    #key_index = randint(0,(len(list_of_ego_interaction_dicts)-1))
-
-                    ego_interaction_dict = list_of_ego_interaction_dicts[key_index]  # 2 option for this case :3
-                    # use conflict point to identify which interaction is taking place
-
-                    key_ego_other_veh_interaction_list = []
-
-                    if ego_interaction_dict["key_conflict_point"] == "c2":
-
-                        # Set the conflictpoint/SyncArrivalLoc
-                        self.select_conflictpoint_syncarrival_loc("c2")
-
-                        for key in ego_interaction_dict.keys():
-                            if key == "key_SAVR_GBAVxSOVB_GLOV":  # only 1 here
-                                key_ego_other_veh_interaction_list.append(key)
-
-                        if len(key_ego_other_veh_interaction_list) == 1:
-                            key_index = 0  # only one value to choose from and it is at index 0 :3
-                        elif len(key_ego_other_veh_interaction_list) > 1:
-                            key_index = randint(0,len(key_ego_other_veh_interaction_list)-1) # works, all three conditions appear
-                        else:
-                            raise ValueError("Unexpected value of key_index")
-
-
-                        #key_index = randint(0,(len(key_ego_other_veh_interaction_list)-1))
-                        key_ego_other_veh_interaction = key_ego_other_veh_interaction_list[key_index]
-
-                        if key_ego_other_veh_interaction == "key_SAVR_GBAVxSOVB_GLOV":
-                            ego_interaction_dict["key_SAVR_GBAVxSOVB_GLOV"] = ego_interaction_dict["key_SAVR_GBAVxSOVB_GLOV"] + 1
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
-
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("base_left_lane")
-
-                            # I will set the stopothertrigger to the goal location of the other vehicle but rightnow we have not setup controls to steer the othervehicle to it's goal locations.
-                            # I will set up the other vehicle controls to steer it to it's goal location in later stages. Maybe use a driving agent for that, but will have to see how to use that
-                            # with pytrees.
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("left")
-                        
-                        # no other situations possible in this case
-                        else:
-                            raise ValueError("Unexpected value of key_ego_other_veh_interaction selected")
-
-                    elif ego_interaction_dict["key_conflict_point"] == "c4": 
-
-                        # Set the conflictpoint/SyncArrivalLoc
-                        self.select_conflictpoint_syncarrival_loc("c4")
-
-                        for key in ego_interaction_dict.keys():
-                            if key == "key_SAVR_GBAVxSOVL_GROV" or key == "key_SAVR_GBAV_SOVL_GBOV":  # only 1 here
-                                key_ego_other_veh_interaction_list.append(key)
-
-                        
-                        if len(key_ego_other_veh_interaction_list) == 1:
-                            key_index = 0  # only one value to choose from and it is at index 0 :3
-                        elif len(key_ego_other_veh_interaction_list) > 1:
-                            key_index = randint(0,len(key_ego_other_veh_interaction_list)-1) # works, all three conditions appear
-                        else:
-                            raise ValueError("Unexpected value of key_index")
-
-                        #key_index = randint(0,(len(key_ego_other_veh_interaction_list)-1))
-                        key_ego_other_veh_interaction = key_ego_other_veh_interaction_list[key_index]
-
-                        if key_ego_other_veh_interaction == "key_SAVR_GBAVxSOVL_GROV":
-                            ego_interaction_dict["key_SAVR_GBAVxSOVL_GROV"] = ego_interaction_dict["key_SAVR_GBAVxSOVL_GROV"] + 1
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
-
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("left")
-
-                            # I will set the stopothertrigger to the goal location of the other vehicle but rightnow we have not setup controls to steer the othervehicle to it's goal locations.
-                            # I will set up the other vehicle controls to steer it to it's goal location in later stages. Maybe use a driving agent for that, but will have to see how to use that
-                            # with pytrees.
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("right")
-                        
-                        elif key_ego_other_veh_interaction == "key_SAVR_GBAV_SOVL_GBOV":
-                            ego_interaction_dict["key_SAVR_GBAV_SOVL_GBOV"] = ego_interaction_dict["key_SAVR_GBAV_SOVL_GBOV"] + 1
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
-
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("left")
-
-                            # I will set the stopothertrigger to the goal location of the other vehicle but rightnow we have not setup controls to steer the othervehicle to it's goal locations.
-                            # I will set up the other vehicle controls to steer it to it's goal location in later stages. Maybe use a driving agent for that, but will have to see how to use that
-                            # with pytrees.
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("base")
-
-                        # no other situations possible in this case
-                        else:
-                            raise ValueError("Unexpected value of key_ego_other_veh_interaction selected")
-                    else:
-                        raise ValueError("Unexpected value of conflict point selected")
-
-                else:
-                    raise ValueError("Unexpected value of goal loc of ego veh selected")
-
-            else:
-
-                print("Please select appropriate starting location")
-                #return 0
-                raise ValueError("Unexpected value for appropriate starting location")
-
-        elif approach == "sitcov":
-
-            key_ego_start_index_list = []
-                        
-            for key, value in self.ego_start_count_plus_other_dict.items():
-
-                #print(key)
-
-                #sys.exit("off")
-
-
-                #if key == "key_ego_start_left_count" or "key_ego_start_base_count" or "key_ego_start_right_count":
-                if key == "key_ego_start_left_count" or key == "key_ego_start_base_count" or key == "key_ego_start_right_count":
-                
-                #if key == "key_ego_start_left_count":  # yes!
-
-                    key_ego_start_index_list.append(key)
-                    #key_ego_start_count_list.append(value)  # appending the count values of the respective keys in here
-                    #print("ego start keys are as follows :3",key_ego_start_index_list)  # Works!!
-                    
-            # make a new dictionary out of the larger dictionary elf.ego_start_count_plus_other_dict, so that we are only dealing with the counts of situations and not the further situations that arise from this larger dict
-            ego_start_counts_only_dict = {keys:self.ego_start_count_plus_other_dict[keys] for keys in  key_ego_start_index_list}  # getting the original count values from the self.ego_start_count_plus_other_dict dictionary
-
-            if len(key_ego_start_index_list) == 1:
-                #key_index = 0  # only one value to choose from
-                #key_ego_start_loc = key_ego_start_index_list[key_index]
-                raise ValueError("Unexpected value of key_index")  # as its len is not 1
-
-            elif len(key_ego_start_index_list) > 1:
-                #key_index = randint(0,len(key_ego_start_index_list)-1) # works, all three conditions appear
-
-                key_ego_start_loc = self.low_count_to_higher_prob_converter_for_situation_coverage(ego_start_counts_only_dict)
-
-            else:
-                raise ValueError("Unexpected value of key_index")
-
-            #key_ego_start_loc = key_ego_start_index_list[key_index]
-
-            print("following key was selected :3", key_ego_start_loc)
-
-            if key_ego_start_loc == "key_ego_start_left_count":
-                # Increment this situation by one since it has been selected for situation generation. Do this for the rest of the dictionaries as well, to get multi-level situation coverage. 
-                self.ego_start_count_plus_other_dict["key_ego_start_left_count"] = self.ego_start_count_plus_other_dict["key_ego_start_left_count"] + 1
-                print("key_ego_start_left_count", self.ego_start_count_plus_other_dict["key_ego_start_left_count"])
-                # Here we are setting the start location of ego veh object to the left. Need to pass this start location value to the configuation file as well
-
-                self.ego_veh.select_ego_start_loc("left")  # ego_start_carla_transform_dict is set to left int leg transform                
-                # This gives us the whole transform for the start location of ego vehicle
-                #self.ego_veh.ego_start_carla_transform_dict["key_transform"]
-
-                # So for a certain start locaiton, we have some triggers to set that depend upon that start location of the ego veh, they are as follows:
-
-                # initialize passthroughtrigger locs wih this as well. Use their dictionaries like the start location dictionary inside the ego veh object. 
-                self.ego_veh.select_ego_passthroughtrigger_loc("left")
-
-                # initialize startothertrigger (for ego veh) locs wih this as well
-                self.ego_veh.select_ego_startothertrigger_loc("left")
-
-                # randomly choosing goal loc for ego veh
-                key_ego_goal_index_list = []
-
-                for key in self.ego_left_start_goal_count_dict.keys():
-                    if key == "key_ego_goal_base_count" or key == "key_ego_goal_right_count":
-                        key_ego_goal_index_list.append(key)
-
-                ego_goal_counts_only_dict = {keys:self.ego_left_start_goal_count_dict[keys] for keys in  key_ego_goal_index_list}  # getting the original count values from the self.ego_start_count_plus_other_dict dictionary
-                
-                if len(key_ego_goal_index_list) == 1:
-                    #key_index = 0  # only one value to choose from
-                    #key_ego_goal_loc = key_ego_goal_index_list[key_index]
-                    raise ValueError("Unexpected value of key_index")
-
-
-                elif len(key_ego_goal_index_list) > 1:
-                    #key_index = randint(0,len(key_ego_goal_index_list)-1) # works, all three conditions appear
-
-                    key_ego_goal_loc = self.low_count_to_higher_prob_converter_for_situation_coverage(ego_goal_counts_only_dict)
-                    # Will increment the counter for base goal location by 3 each time as the right goal location has 3 combinations to go to whereas the base goal location has only one combo. So to balance it out we have to increment its counter by 3 :3
-                else:
-                    raise ValueError("Unexpected value of key_index")
-
-
-
-
-                #key_index = randint(0,(len(key_ego_goal_index_list)-1))  # len(key_ego_goal_index_list) is 2, but we can not make the range for randint to be 0 - 2. Have to add a minus 1 with that in all cases.
-                #key_ego_goal_loc = key_ego_goal_index_list[key_index]
-
-                if key_ego_goal_loc == "key_ego_goal_base_count":
-                    # will add counters here later
-                    
-
-
-                    #self.ego_left_start_goal_count_dict["key_ego_goal_base_count"] = self.ego_left_start_goal_count_dict["key_ego_goal_base_count"] + 1 
-                    self.ego_left_start_goal_count_dict["key_ego_goal_base_count"] = self.ego_left_start_goal_count_dict["key_ego_goal_base_count"] + 3 
-                    # Will increment the counter for base goal location each time as the right goal location has 3 combinations to go to whereas the base goal location has only one combo. So to balance it out we have to increment its counter by 3 :3
-                        #But we will increase the counter inside this row, the discrete situation by 1 only as we want to have correct statistics at the end which we can also have by incrementing by 3, we'd only have to divide the total counts by 3 then!
-
-
-
-                    # Set ego veh goal loc/endconditiontrigger here
-                    self.ego_veh.select_ego_endconditiontrigger_loc("base")
-
-                    list_of_ego_interaction_dicts = self.ego_left_start_goal_count_dict["key_ego_goal_base_interactions_dict"]
-                    # only one possible interaction here. 1 item in list.
-
-
-                    #RANDOMLY chose the dictionary
-                    
-                    if len(list_of_ego_interaction_dicts) == 1:
-                        key_index = 0  # only one value to choose from
-
-                    # remove this here below as only one possible interaction here. 1 item in list.
-                    
-                    #elif len(list_of_ego_interaction_dicts) > 1:
-                    #    key_index = randint(0,len(list_of_ego_interaction_dicts)-1) # works, all three conditions appear
-                    
-
-                    else:
-                        raise ValueError("Unexpected value of key_index")
-                    #key_index = randint(0,(len(list_of_ego_interaction_dicts)-1))
-
-                    ego_interaction_dict = list_of_ego_interaction_dicts[key_index]  # only 1 option for this case :3
-                    # use conflict point to identify which interaction is taking place
-
-                    key_ego_other_veh_interaction_list = []
-
-                    if ego_interaction_dict["key_conflict_point"] == "c4":  # conflict point tells us which situation dictionary was selected
-
-                        # Set the conflictpoint/SyncArrivalLoc
-                        self.select_conflictpoint_syncarrival_loc("c4")
-
-                        for key in ego_interaction_dict.keys():
-                            if key == "key_SAVL_GBAVxSOVR_GBOV":
-                                key_ego_other_veh_interaction_list.append(key)
-
-                        if len(key_ego_other_veh_interaction_list) == 1:
-                            key_index = 0  # only one value to choose from
-                        
-                        # remove this here as only one possible interaction here. 1 item in list.
-
-                        #elif len(key_ego_other_veh_interaction_list) > 1:
-                        #    key_index = randint(0,len(key_ego_other_veh_interaction_list)-1) # works, all three conditions appear
-                        
-
-
-                        else:
-                            raise ValueError("Unexpected value of key_index")
-
-
-                        #key_index = randint(0,(len(key_ego_other_veh_interaction_list)-1))
-                        key_ego_other_veh_interaction = key_ego_other_veh_interaction_list[key_index]
-
-                        if key_ego_other_veh_interaction == "key_SAVL_GBAVxSOVR_GBOV":
-                            ego_interaction_dict["key_SAVL_GBAVxSOVR_GBOV"] = ego_interaction_dict["key_SAVL_GBAVxSOVR_GBOV"] + 1  # incrementing by 1 only 
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
-
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("right")
-
-                            # I will set the stopothertrigger to the goal location of the other vehicle but rightnow we have not setup controls to steer the othervehicle to it's goal locations.
-                            # I will set up the other vehicle controls to steer it to it's goal location in later stages. Maybe use a driving agent for that, but will have to see how to use that
-                            # with pytrees.
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("base")
-                        
-                        # no other situations possible in this case
-                        else:
-                            raise ValueError("Unexpected value of key_ego_other_veh_interaction selected")
-                    
-                    else:
-                        raise ValueError("Unexpected value of conflict point selected")
-
-                elif key_ego_goal_loc == "key_ego_goal_right_count":
-                    self.ego_left_start_goal_count_dict["key_ego_goal_right_count"] = self.ego_left_start_goal_count_dict["key_ego_goal_right_count"] + 1
-                    # increment the left start right goal by one only as this has 3 options as compared to the left start base goal location
-
-
-                    # Set ego veh goalloc/endconditiontrigger here
-                    self.ego_veh.select_ego_endconditiontrigger_loc("right")
-
-                    list_of_ego_interaction_dicts = self.ego_left_start_goal_count_dict["key_ego_goal_right_interactions_dict"]
-
-                    #RANDOMLY chose the dictionary
-                    
-                    if len(list_of_ego_interaction_dicts) == 1:
-                        #key_index = 0  # only one value to choose from
-                        raise ValueError("Unexpected value of key_index")  # as there are 2 options for dict
-                        #ego_interaction_dict = list_of_ego_interaction_dicts[key_index]  # 2 option for this case :3
-                    
-                    elif len(list_of_ego_interaction_dicts) > 1:
-
-                        ego_interaction_dict = self.selection_of_lower_counts_dict_from_list_of_two(list_of_ego_interaction_dicts)
-
-                        #key_index = randint(0,len(list_of_ego_interaction_dicts)-1) # works, all three conditions appear
-                    else:
-                        raise ValueError("Unexpected value of key_index")
-
-                    #key_index = randint(0,(len(list_of_ego_interaction_dicts)-1))
-                    #ego_interaction_dict = list_of_ego_interaction_dicts[key_index]  # 2 option for this case :3
-                    #ego_interaction_dict = list_of_ego_interaction_dicts[key_index]  # 2 option for this case :3
-                    # use conflict point to identify which interaction is taking place
-
-                    key_ego_other_veh_interaction_list = []
-
-                    if ego_interaction_dict["key_conflict_point"] == "c4":  # dictionaries seperated by the conflict points
-
-                        # Set the conflictpoint/SyncArrivalLoc
-                        self.select_conflictpoint_syncarrival_loc("c4")
-
-                        for key in ego_interaction_dict.keys():
-                            #if key == "key_SAVL_GBAVxSOVR_GBOV":  # only 1 here as well
-                            # ************* In scenario_runnerZ5 Big mistake here above, caught by raise ValueError! :3 ************
-                            #if key == "key_SAVL_GRAVxSOVR_GBOV":  # only 1 here as well
-
-                            if key == "key_SAVL_GRAVxSOVR_GBOV":  # only 1 here as well
-                                key_ego_other_veh_interaction_list.append(key)
-
-                        if len(key_ego_other_veh_interaction_list) == 1:
-                            key_index = 0  # only one value to choose from and it is at index 0 :3
-                        # it's length is 1 
-
-                        #elif len(key_ego_other_veh_interaction_list) > 1:
-                        #    key_index = randint(0,len(key_ego_other_veh_interaction_list)-1) # works, all three conditions appear
-                        
-
-                        else:
-                            raise ValueError("Unexpected value of key_index")
-
-                        #key_index = randint(0,(len(key_ego_other_veh_interaction_list)-1))
-                        key_ego_other_veh_interaction = key_ego_other_veh_interaction_list[key_index]
-
-                        #if key_ego_other_veh_interaction == "key_SAVL_GBAVxSOVR_GBOV":  # mistake in scenario_runnerZ5:3
-                        if key_ego_other_veh_interaction == "key_SAVL_GRAVxSOVR_GBOV":
-                            ego_interaction_dict["key_SAVL_GRAVxSOVR_GBOV"] = ego_interaction_dict["key_SAVL_GRAVxSOVR_GBOV"] + 1
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
-
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("right")
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("base")
-                         
-                        # no other situations possible in this case
-                        else:
-                            raise ValueError("Unexpected value of key_ego_other_veh_interaction selected")
-
-                    elif ego_interaction_dict["key_conflict_point"] == "c1":
-
-                        # Set the conflictpoint/SyncArrivalLoc
-                        self.select_conflictpoint_syncarrival_loc("c1")
-
-                        '''
-                        # randomly choosing goal loc for ego veh
-                        key_ego_goal_index_list = []
-
-                        for key in self.ego_left_start_goal_count_dict.keys():
-                            if key == "key_ego_goal_base_count" or key == "key_ego_goal_right_count":
-                                key_ego_goal_index_list.append(key)
-
-                        ego_goal_counts_only_dict = {keys:self.self.ego_left_start_goal_count_dict[keys] for keys in  key_ego_goal_index_list}  # getting the original count values from the self.ego_start_count_plus_other_dict dictionary
-                        
-                        if len(key_ego_goal_index_list) == 1:
-                            key_index = 0  # only one value to choose from
-                            key_ego_goal_loc = key_ego_goal_index_list[key_index]
-                        elif len(key_ego_goal_index_list) > 1:
-                            #key_index = randint(0,len(key_ego_goal_index_list)-1) # works, all three conditions appear
-
-                            key_ego_goal_loc = low_count_to_higher_prob_converter_for_situation_coverage(ego_goal_counts_only_dict)
-                            
-
-                            # Will increment the counter for base goal location by 3 each time as the right goal location has 3 combinations to go to whereas the base goal location has only one combo. So to balance it out we have to increment its counter by 3 :3
-                        else:
-                            raise ValueError("Unexpected value of key_index")
-
-                        '''
-
-                        for key in ego_interaction_dict.keys():
-                            if key == "key_SAVL_GRAVxSOVB_GROV" or key == "key_SAVL_GRAVxSOVB_GLOV":  # only 1 here as well
-                                key_ego_other_veh_interaction_list.append(key)
-
-
-                        ego_interaction_counts_only_dict = {keys:ego_interaction_dict[keys] for keys in  key_ego_other_veh_interaction_list}  # getting the original count values from the self.ego_start_count_plus_other_dict dictionary
-
-                        if len(key_ego_other_veh_interaction_list) == 1:
-                            #key_index = 0  # only one value to choose from and it is at index 0 :3
-                            raise ValueError("Unexpected value of key_index")  # As for this case length is greater than 1
-                       
-                        elif len(key_ego_other_veh_interaction_list) > 1:
-                            #key_index = randint(0,len(key_ego_other_veh_interaction_list)-1) # works, all three conditions appear
-                       
-                            key_ego_other_veh_interaction = self.low_count_to_higher_prob_converter_for_situation_coverage(ego_interaction_counts_only_dict)
-                            # key is returned above
-
-                        else:
-                            raise ValueError("Unexpected value of key_index")
-
-                        #key_index = randint(0,(len(key_ego_other_veh_interaction_list)-1))
-                        #key_ego_other_veh_interaction = key_ego_other_veh_interaction_list[key_index]
-
-                        if key_ego_other_veh_interaction == "key_SAVL_GRAVxSOVB_GROV":
-                            ego_interaction_dict["key_SAVL_GRAVxSOVB_GROV"] = ego_interaction_dict["key_SAVL_GRAVxSOVB_GROV"] + 1 
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
-
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("base")
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("right")
-                        
-                        elif key_ego_other_veh_interaction == "key_SAVL_GRAVxSOVB_GLOV":
-                            ego_interaction_dict["key_SAVL_GRAVxSOVB_GLOV"] = ego_interaction_dict["key_SAVL_GRAVxSOVB_GLOV"] + 1
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
-
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("base_left_lane")  # added for lane problems with goal locations
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("left")
-
-                        # no other situations possible in this case
-                        else:
-                            raise ValueError("Unexpected value of key_ego_other_veh_interaction selected")
-
-                    else:
-                        raise ValueError("Unexpected value of conflict point selected")    
-
-                else:
-                    raise ValueError("Unexpected value of goal loc of ego veh selected")
-
-
-            elif key_ego_start_loc == "key_ego_start_base_count":
-                self.ego_start_count_plus_other_dict["key_ego_start_base_count"] = self.ego_start_count_plus_other_dict["key_ego_start_base_count"] + 1
-                print("key_ego_start_base_count", self.ego_start_count_plus_other_dict["key_ego_start_base_count"])
-
-
-                self.ego_veh.select_ego_start_loc("base")
-
-                # initialize passthroughtrigger locs wih this as well. Use their dictionaries like the start location dictionary inside the ego veh object. 
-                self.ego_veh.select_ego_passthroughtrigger_loc("base")
-
-                # initialize startothertrigger (for ego) locs wih this as well
-                self.ego_veh.select_ego_startothertrigger_loc("base")
-
-                # randomly choosing goal loc for ego veh
-                key_ego_goal_index_list = []
-
-                for key in self.ego_base_start_goal_count_dict.keys():
-                    if key == "key_ego_goal_left_count" or key == "key_ego_goal_right_count":
-                        key_ego_goal_index_list.append(key)
-
-                ego_goal_counts_only_dict = {keys:self.ego_base_start_goal_count_dict[keys] for keys in  key_ego_goal_index_list}  # getting the original count values from the self.ego_start_count_plus_other_dict dictionary
-
-                if len(key_ego_goal_index_list) == 1:
-                    #key_index = 0  # only one value to choose from and it is at index 0 :3
-                    raise ValueError("Unexpected value of key_index")
-
-
-                elif len(key_ego_goal_index_list) > 1:
-                    #key_index = randint(0,len(key_ego_goal_index_list)-1) # works, all three conditions appear
-                    key_ego_goal_loc = self.low_count_to_higher_prob_converter_for_situation_coverage(ego_goal_counts_only_dict)
-
-                
-
-                else:
-                    raise ValueError("Unexpected value of key_index")
-
-                #key_index = randint(0,(len(key_ego_goal_index_list)-1))
-                #key_ego_goal_loc = key_ego_goal_index_list[key_index]
-
-                if key_ego_goal_loc == "key_ego_goal_left_count":
-                    self.ego_base_start_goal_count_dict["key_ego_goal_left_count"] = self.ego_base_start_goal_count_dict["key_ego_goal_left_count"] + 1
-                    # will add counters here later
-
-                    # Set ego veh goal loc/endconditiontrigger here
-                    self.ego_veh.select_ego_endconditiontrigger_loc("left")
-
-                    list_of_ego_interaction_dicts = self.ego_base_start_goal_count_dict["key_ego_goal_left_interactions_dict"]
-
-                    #RANDOMLY chose the dictionary
-                    
-                    if len(list_of_ego_interaction_dicts) == 1:
-                        #key_index = 0  # only one value to choose from and it is at index 0 :3
-                        raise ValueError("Unexpected value of key_index")
-
-                    elif len(list_of_ego_interaction_dicts) > 1:
-                        #key_index = randint(0,len(list_of_ego_interaction_dicts)-1) # works, all three conditions appear
-                        ego_interaction_dict = self.selection_of_lower_counts_dict_from_list_of_two(list_of_ego_interaction_dicts)
-
-                    else:
-                        raise ValueError("Unexpected value of key_index")
-
-
-                    #key_index = randint(0,(len(list_of_ego_interaction_dicts)-1))
-
-                    #ego_interaction_dict = list_of_ego_interaction_dicts[key_index]  # only 1 option for this case :3
-                    # use conflict point to identify which interaction is taking place
-
-                    key_ego_other_veh_interaction_list = []
-                    
-                    if ego_interaction_dict["key_conflict_point"] == "c1":  # which ever dict was chosen, checking it's conflict point now.
-
-                        # Set the conflictpoint/SyncArrivalLoc
-                        self.select_conflictpoint_syncarrival_loc("c1")
-
-                        for key in ego_interaction_dict.keys():
-                            if key == "key_SAVB_GLAV_SOVL_GROV":  # only 1 here
-                                key_ego_other_veh_interaction_list.append(key)
-
-                        
-                        if len(key_ego_other_veh_interaction_list) == 1:
-                            key_index = 0  # only one value to choose from and it is at index 0 :3
-                        
-
-                        #elif len(key_ego_other_veh_interaction_list) > 1:
-                        #    key_index = randint(0,len(key_ego_other_veh_interaction_list)-1) # works, all three conditions appear
-                        
-
-                        else:
-                            raise ValueError("Unexpected value of key_index")
-
-                        #key_index = randint(0,(len(key_ego_other_veh_interaction_list)-1))
-                        key_ego_other_veh_interaction = key_ego_other_veh_interaction_list[key_index]
-
-                        if key_ego_other_veh_interaction == "key_SAVB_GLAV_SOVL_GROV":
-                            ego_interaction_dict["key_SAVB_GLAV_SOVL_GROV"] = ego_interaction_dict["key_SAVB_GLAV_SOVL_GROV"] + 1
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
-
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("left")
-
-                            # I will set the stopothertrigger to the goal location of the other vehicle but rightnow we have not setup controls to steer the othervehicle to it's goal locations.
-                            # I will set up the other vehicle controls to steer it to it's goal location in later stages. Maybe use a driving agent for that, but will have to see how to use that
-                            # with pytrees.
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("right")
-                        
-                        # no other situations possible in this case
-                        else:
-                            raise ValueError("Unexpected value of key_ego_other_veh_interaction selected")
-
-                    elif ego_interaction_dict["key_conflict_point"] == "c2":
-
-                        # Set the conflictpoint/SyncArrivalLoc
-                        self.select_conflictpoint_syncarrival_loc("c2")
-
-                        for key in ego_interaction_dict.keys():
-                            if key == "key_SAVB_GLAV_SOVR_GLOV" or key == "key_SAVB_GLAVxSOVR_GBOV":  # 2 here
-                                key_ego_other_veh_interaction_list.append(key)
-
-                        ego_interaction_counts_only_dict = {keys:ego_interaction_dict[keys] for keys in  key_ego_other_veh_interaction_list}  # getting the original count values from the self.ego_start_count_plus_other_dict dictionary
-
-                        if len(key_ego_other_veh_interaction_list) == 1:
-                            #key_index = 0  # only one value to choose from and it is at index 0 :3
-                            raise ValueError("Unexpected value of key_index")
-
-
-                        elif len(key_ego_other_veh_interaction_list) > 1:
-                            #key_index = randint(0,len(key_ego_other_veh_interaction_list)-1) # works, all three conditions appear
-                            key_ego_other_veh_interaction = self.low_count_to_higher_prob_converter_for_situation_coverage(ego_interaction_counts_only_dict)
-
-                        else:
-                            raise ValueError("Unexpected value of key_index")
-
-                        #key_index = randint(0,(len(key_ego_other_veh_interaction_list)-1))
-                        #key_ego_other_veh_interaction = key_ego_other_veh_interaction_list[key_index]
-
-                        if key_ego_other_veh_interaction == "key_SAVB_GLAV_SOVR_GLOV":
-                            ego_interaction_dict["key_SAVB_GLAV_SOVR_GLOV"] = ego_interaction_dict["key_SAVB_GLAV_SOVR_GLOV"] + 1
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
-
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("right")
-
-                            # I will set the stopothertrigger to the goal location of the other vehicle but rightnow we have not setup controls to steer the othervehicle to it's goal locations.
-                            # I will set up the other vehicle controls to steer it to it's goal location in later stages. Maybe use a driving agent for that, but will have to see how to use that
-                            # with pytrees.
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("left")
-                        
-                        elif key_ego_other_veh_interaction == "key_SAVB_GLAVxSOVR_GBOV":
-                            ego_interaction_dict["key_SAVB_GLAVxSOVR_GBOV"] = ego_interaction_dict["key_SAVB_GLAVxSOVR_GBOV"] + 1
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
-
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("right")
-
-                            # I will set the stopothertrigger to the goal location of the other vehicle but rightnow we have not setup controls to steer the othervehicle to it's goal locations.
-                            # I will set up the other vehicle controls to steer it to it's goal location in later stages. Maybe use a driving agent for that, but will have to see how to use that
-                            # with pytrees.
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("base")
-
-
-                        # no other situations possible in this case
-                        else:
-                            raise ValueError("Unexpected value of key_ego_other_veh_interaction selected")
-
-                    else:
-                        raise ValueError("Unexpected value of conflict point selected") 
-
-                elif key_ego_goal_loc == "key_ego_goal_right_count":
-                    self.ego_base_start_goal_count_dict["key_ego_goal_right_count"] = self.ego_base_start_goal_count_dict["key_ego_goal_right_count"] + 3
-                    # Will increment the counter for base goal location each time as the right goal location has 3 combinations to go to whereas the base goal location has only one combo. So to balance it out we have to increment its counter by 3 :3
-                                           #But we will increase the counter inside this row, the discrete situation by 1 only as we want to have correct statistics at the end which we can also have by incrementing by 3, we'd only have to divide the total counts by 3 then!
-
-                    # Set ego veh goal loc/endconditiontrigger here
-                    self.ego_veh.select_ego_endconditiontrigger_loc("right")
-
-                    list_of_ego_interaction_dicts = self.ego_base_start_goal_count_dict["key_ego_goal_right_interactions_dict"]
-
-                    #RANDOMLY chose the dictionary
-                    
-                    if len(list_of_ego_interaction_dicts) == 1:
-                        key_index = 0  # only one value to choose from and it is at index 0 :3
-
-
-                    #elif len(list_of_ego_interaction_dicts) > 1:
-                    #   key_index = randint(0,len(list_of_ego_interaction_dicts)-1) # works, all three conditions appear
-
-                    else:
-                        raise ValueError("Unexpected value of key_index")
-
-                    #key_index = randint(0,(len(list_of_ego_interaction_dicts)-1))
-
-                    ego_interaction_dict = list_of_ego_interaction_dicts[key_index]  # only 1 option for this case :3
-                    # use conflict point to identify which interaction is taking place
-
-                    key_ego_other_veh_interaction_list = []
-
-                    if ego_interaction_dict["key_conflict_point"] == "c1":  # only 1
-
-                        # Set the conflictpoint/SyncArrivalLoc
-                        self.select_conflictpoint_syncarrival_loc("c1")
-
-                        for key in ego_interaction_dict.keys():
-                            if key == "key_SAVB_GRAV_SOVL_GROV":  # only 1 here
-                                key_ego_other_veh_interaction_list.append(key)
-
-                        
-                        if len(key_ego_other_veh_interaction_list) == 1:
-                            key_index = 0  # only one value to choose from and it is at index 0 :3
-                        #elif len(key_ego_other_veh_interaction_list) > 1:
-                        #    key_index = randint(0,len(key_ego_other_veh_interaction_list)-1) # works, all three conditions appear
-                        else:
-                            raise ValueError("Unexpected value of key_index")
-
-
-                        #key_index = randint(0,(len(key_ego_other_veh_interaction_list)-1))
-                        key_ego_other_veh_interaction = key_ego_other_veh_interaction_list[key_index]
-                                    
-                        if key_ego_other_veh_interaction == "key_SAVB_GRAV_SOVL_GROV":
-                            ego_interaction_dict["key_SAVB_GRAV_SOVL_GROV"] = ego_interaction_dict["key_SAVB_GRAV_SOVL_GROV"] + 1
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
-
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("left")
-
-                            # I will set the stopothertrigger to the goal location of the other vehicle but rightnow we have not setup controls to steer the othervehicle to it's goal locations.
-                            # I will set up the other vehicle controls to steer it to it's goal location in later stages. Maybe use a driving agent for that, but will have to see how to use that
-                            # with pytrees.
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("right")
-
-                        # no other situations possible in this case
-                        else:
-                            raise ValueError("Unexpected value of key_ego_other_veh_interaction selected")
-
-                    else:
-                        raise ValueError("Unexpected value of conflict point selected")
-
-                else:
-                    raise ValueError("Unexpected value of goal loc of ego veh selected")        
-
-
-            elif key_ego_start_loc == "key_ego_start_right_count":
-                self.ego_start_count_plus_other_dict["key_ego_start_right_count"] = self.ego_start_count_plus_other_dict["key_ego_start_right_count"] + 1    
-                print("key_ego_start_right_count", self.ego_start_count_plus_other_dict["key_ego_start_right_count"])
-                
-                self.ego_veh.select_ego_start_loc("right")
-
-                # initialize passthroughtrigger locs wih this as well. Use their dictionaries like the start location dictionary inside the ego veh object. 
-                self.ego_veh.select_ego_passthroughtrigger_loc("right")
-
-                # initialize startothertrigger (for ego) locs wih this as well
-                self.ego_veh.select_ego_startothertrigger_loc("right")
-
-                # randomly choosing goal loc for ego veh
-                key_ego_goal_index_list = []
-
-                for key in self.ego_right_start_goal_count_dict.keys():
-                    if key == "key_ego_goal_left_count" or key == "key_ego_goal_base_count":
-                        key_ego_goal_index_list.append(key)
-
-                ego_goal_counts_only_dict = {keys:self.ego_right_start_goal_count_dict[keys] for keys in  key_ego_goal_index_list}  # getting the original count values from the self.ego_start_count_plus_other_dict dictionary        
-
-                if len(key_ego_goal_index_list) == 1:
-                    #key_index = 0  # only one value to choose from and it is at index 0 :3
-                    raise ValueError("Unexpected value of key_index")
-
-                elif len(key_ego_goal_index_list) > 1:
-                    #key_index = randint(0,len(key_ego_goal_index_list)-1) # works, all three conditions appear
-                    key_ego_goal_loc = self.low_count_to_higher_prob_converter_for_situation_coverage(ego_goal_counts_only_dict)
-
-                else:
-                    raise ValueError("Unexpected value of key_index")
-
-                #key_index = randint(0,(len(key_ego_goal_index_list)-1))
-                #key_ego_goal_loc = key_ego_goal_index_list[key_index]
-
-                if key_ego_goal_loc == "key_ego_goal_left_count":
-                    self.ego_right_start_goal_count_dict["key_ego_goal_left_count"] = self.ego_right_start_goal_count_dict["key_ego_goal_left_count"] + 3
-                    # Will increment the counter for base goal location each time as the right goal location has 3 combinations to go to whereas the base goal location has only one combo. So to balance it out we have to increment its counter by 3 :3
-                                                               #But we will increase the counter inside this row, the discrete situation by 1 only as we want to have correct statistics at the end which we can also have by incrementing by 3, we'd only have to divide the total counts by 3 then!
-
-
-                    # Set ego veh goal loc/endconditiontrigger here
-                    self.ego_veh.select_ego_endconditiontrigger_loc("left")
-
-                    list_of_ego_interaction_dicts = self.ego_right_start_goal_count_dict["key_ego_goal_left_interactions_dict"]
-
-                    #RANDOMLY chose the dictionary
-                    
-                    if len(list_of_ego_interaction_dicts) == 1:
-                        key_index = 0  # only one value to choose from and it is at index 0 :3
-
-
-                    #elif len(list_of_ego_interaction_dicts) > 1:
-                    #    key_index = randint(0,len(list_of_ego_interaction_dicts)-1) # works, all three conditions appear
-                    
-
-                    else:
-                        raise ValueError("Unexpected value of key_index")
-
-                    #key_index = randint(0,(len(list_of_ego_interaction_dicts)-1))
-
-                    ego_interaction_dict = list_of_ego_interaction_dicts[key_index]  # only 1 option for this case :3
-                    # use conflict point to identify which interaction is taking place
-
-                    key_ego_other_veh_interaction_list = []
-
-                    if ego_interaction_dict["key_conflict_point"] == "c2":
-
-                        # Set the conflictpoint/SyncArrivalLoc
-                        self.select_conflictpoint_syncarrival_loc("c2")
-
-                        for key in ego_interaction_dict.keys():
-                            if key == "key_SAVR_GLAVxSOVB_GLOV":  # only 1 here
-                                key_ego_other_veh_interaction_list.append(key)
-
-                        if len(key_ego_other_veh_interaction_list) == 1:
-                            key_index = 0  # only one value to choose from and it is at index 0 :3
-                        #elif len(key_ego_other_veh_interaction_list) > 1:
-                        #    key_index = randint(0,len(key_ego_other_veh_interaction_list)-1) # works, all three conditions appear
-                        else:
-                            raise ValueError("Unexpected value of key_index")
-
-                        #key_index = randint(0,(len(key_ego_other_veh_interaction_list)-1))
-                        key_ego_other_veh_interaction = key_ego_other_veh_interaction_list[key_index]
-
-                        if key_ego_other_veh_interaction == "key_SAVR_GLAVxSOVB_GLOV":
-                            ego_interaction_dict["key_SAVR_GLAVxSOVB_GLOV"] = ego_interaction_dict["key_SAVR_GLAVxSOVB_GLOV"] + 1
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
-
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("base_left_lane")  # added
-
-                            # I will set the stopothertrigger to the goal location of the other vehicle but rightnow we have not setup controls to steer the othervehicle to it's goal locations.
-                            # I will set up the other vehicle controls to steer it to it's goal location in later stages. Maybe use a driving agent for that, but will have to see how to use that
-                            # with pytrees.
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("left")
-                        
-                        # no other situations possible in this case
-                        else:
-                            raise ValueError("Unexpected value of key_ego_other_veh_interaction selected")
-                
-                    else:
-                        raise ValueError("Unexpected value of conflict point selected")
-
-                elif key_ego_goal_loc == "key_ego_goal_base_count":
-
-                    # will add counters here later
-
-                    # Set ego veh goal loc/endconditiontrigger here
-                    self.ego_veh.select_ego_endconditiontrigger_loc("base")
-
-                    list_of_ego_interaction_dicts = self.ego_right_start_goal_count_dict["key_ego_goal_base_interactions_dict"]
-
-
-                    #RANDOMLY chose the dictionary
-                    
-                    if len(list_of_ego_interaction_dicts) == 1:
-                        #key_index = 0  # only one value to choose from and it is at index 0 :3
-                        raise ValueError("Unexpected value of key_index")
-
-                    elif len(list_of_ego_interaction_dicts) > 1:
-                        #key_index = randint(0,len(list_of_ego_interaction_dicts)-1) # works, all three conditions appear
-                        ego_interaction_dict = self.selection_of_lower_counts_dict_from_list_of_two(list_of_ego_interaction_dicts)
-
-                    else:
-                        raise ValueError("Unexpected value of key_index")
-
-                    #key_index = randint(0,(len(list_of_ego_interaction_dicts)-1))
-
-                    #ego_interaction_dict = list_of_ego_interaction_dicts[key_index]  # 2 option for this case :3
-                    # use conflict point to identify which interaction is taking place
-
-                    key_ego_other_veh_interaction_list = []
-
-                    if ego_interaction_dict["key_conflict_point"] == "c2":
-
-                        # Set the conflictpoint/SyncArrivalLoc
-                        self.select_conflictpoint_syncarrival_loc("c2")
-
-                        for key in ego_interaction_dict.keys():
-                            if key == "key_SAVR_GBAVxSOVB_GLOV":  # only 1 here
-                                key_ego_other_veh_interaction_list.append(key)
-
-                        if len(key_ego_other_veh_interaction_list) == 1:
-                            key_index = 0  # only one value to choose from and it is at index 0 :3
-                        #elif len(key_ego_other_veh_interaction_list) > 1:
-                        #    key_index = randint(0,len(key_ego_other_veh_interaction_list)-1) # works, all three conditions appear
-                        else:
-                            raise ValueError("Unexpected value of key_index")
-
-
-                        #key_index = randint(0,(len(key_ego_other_veh_interaction_list)-1))
-                        key_ego_other_veh_interaction = key_ego_other_veh_interaction_list[key_index]
-
-                        if key_ego_other_veh_interaction == "key_SAVR_GBAVxSOVB_GLOV":
-                            ego_interaction_dict["key_SAVR_GBAVxSOVB_GLOV"] = ego_interaction_dict["key_SAVR_GBAVxSOVB_GLOV"] + 1
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
-
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("base_left_lane")
-
-                            # I will set the stopothertrigger to the goal location of the other vehicle but rightnow we have not setup controls to steer the othervehicle to it's goal locations.
-                            # I will set up the other vehicle controls to steer it to it's goal location in later stages. Maybe use a driving agent for that, but will have to see how to use that
-                            # with pytrees.
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("left")
-                        
-                        # no other situations possible in this case
-                        else:
-                            raise ValueError("Unexpected value of key_ego_other_veh_interaction selected")
-
-                    elif ego_interaction_dict["key_conflict_point"] == "c4": 
-
-                        # Set the conflictpoint/SyncArrivalLoc
-                        self.select_conflictpoint_syncarrival_loc("c4")
-
-                        for key in ego_interaction_dict.keys():
-                            if key == "key_SAVR_GBAVxSOVL_GROV" or key == "key_SAVR_GBAV_SOVL_GBOV":  # only 1 here
-                                key_ego_other_veh_interaction_list.append(key)
-
-                        ego_interaction_counts_only_dict = {keys:ego_interaction_dict[keys] for keys in  key_ego_other_veh_interaction_list}
-
-
-                        if len(key_ego_other_veh_interaction_list) == 1:
-                            #key_index = 0  # only one value to choose from and it is at index 0 :3
-                            raise ValueError("Unexpected value of key_index")
-                        
-
-                        elif len(key_ego_other_veh_interaction_list) > 1:
-                            #key_index = randint(0,len(key_ego_other_veh_interaction_list)-1) # works, all three conditions appear
-                            key_ego_other_veh_interaction = self.low_count_to_higher_prob_converter_for_situation_coverage(ego_interaction_counts_only_dict)
-
-                        else:
-                            raise ValueError("Unexpected value of key_index")
-
-                        #key_index = randint(0,(len(key_ego_other_veh_interaction_list)-1))
-                        #key_ego_other_veh_interaction = key_ego_other_veh_interaction_list[key_index]
-
-                        if key_ego_other_veh_interaction == "key_SAVR_GBAVxSOVL_GROV":
-                            ego_interaction_dict["key_SAVR_GBAVxSOVL_GROV"] = ego_interaction_dict["key_SAVR_GBAVxSOVL_GROV"] + 1
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
-
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("left")
-
-                            # I will set the stopothertrigger to the goal location of the other vehicle but rightnow we have not setup controls to steer the othervehicle to it's goal locations.
-                            # I will set up the other vehicle controls to steer it to it's goal location in later stages. Maybe use a driving agent for that, but will have to see how to use that
-                            # with pytrees.
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("right")
-                        
-                        elif key_ego_other_veh_interaction == "key_SAVR_GBAV_SOVL_GBOV":
-                            ego_interaction_dict["key_SAVR_GBAV_SOVL_GBOV"] = ego_interaction_dict["key_SAVR_GBAV_SOVL_GBOV"] + 1
-                            # This is the base concrete situation
-                            self.key_ego_other_veh_interaction_key = key_ego_other_veh_interaction
-
-                            # Set other vehicle start and goal locs. Set other veh triggers. Set the conflictpoint/syncloctrigger also.
-                            self.other_veh.select_other_vehicle_start_loc("left")
-
-                            # I will set the stopothertrigger to the goal location of the other vehicle but rightnow we have not setup controls to steer the othervehicle to it's goal locations.
-                            # I will set up the other vehicle controls to steer it to it's goal location in later stages. Maybe use a driving agent for that, but will have to see how to use that
-                            # with pytrees.
-                            self.other_veh.select_other_vehicle_stopothertrigger_loc("base")
-
-                        # no other situations possible in this case
-                        else:
-                            raise ValueError("Unexpected value of key_ego_other_veh_interaction selected")
-                    else:
-                        raise ValueError("Unexpected value of conflict point selected")
-
-                else:
-                    raise ValueError("Unexpected value of goal loc of ego veh selected")
-
-            else:
-
-                print("Please select appropriate starting location")
-                #return 0
-                raise ValueError("Unexpected value for appropriate starting location")
-
-        else:
-            print("Please select approprite situation generation technique")
-            #return 0
-            raise ValueError("Unexpected value approprite situation generation technique")
-
-    def initialize_situation_dictionaries(self):
-
-        # This is the main dictionay that will hold all the further nested dictionaries 
-        self.ego_start_count_plus_other_dict = dict()
-        
-        # We are starting with minimum granularity, i.e., 1 bin per category only.
-
-        
-        # *********************************************** LEFT ego AV Start loc *************************************
-        ##########################################################################################################
-        ##########################################################################################################
-        ##########################################################################################################
-        
-        # Conflict point dictionaries for this ego AV when it starts at self.ego_left_start_goal_count_dict
-        self.c1_AV_L_R_dict = {"key_SAVL_GRAVxSOVB_GROV": 0, "key_SAVL_GRAVxSOVB_GLOV": 0, 
-        "key_conflict_point": "c1"}  # maybe put the location of c1 at the end of this array so you can access it by -1 index. WRONG! Can't use -1 for dictionaries xP, dict is unordered data. 
-        self.c4_AV_L_R_dict = {"key_SAVL_GRAVxSOVR_GBOV": 0, "key_conflict_point": "c4"}
-        
-
-
-        self.c4_AV_L_B_dict = {"key_SAVL_GBAVxSOVR_GBOV": 0, "key_conflict_point": "c4"}
-
-
-
-        # Dictionary when ego starts at left intersection leg, how many times did it go to the following possible goal locations   
-        # Look at the all possible situations table mentioned in the word document to better understand this
-        #SAVL Goal loc of AV (look at word doc for this terminology) GBAVL, GRAVL
-        self.ego_left_start_goal_count_dict = {"key_ego_goal_base_count": 0, 
-        "key_ego_goal_base_interactions_dict": [self.c4_AV_L_B_dict],  # making this dictionary a list, so we can iterate through it, in the case there are multiple dictionaries as seen in the following key values of this dictionary
-        "key_ego_goal_right_count": 0, "key_ego_goal_right_interactions_dict": [self.c1_AV_L_R_dict, self.c4_AV_L_R_dict]}  # array of dictionaries
-        
-        # Will increment the counter for base goal location each time as the right goal location has 3 combinations to go to whereas the base goal location has only one combo. So to balance it out we have to increment its counter by 3 :3 
-
-        
-
-        
-        # *********************************************** RIGHT ego AV Start loc *************************************
-        ##########################################################################################################
-        ##########################################################################################################
-        ##########################################################################################################
-        
-        # Conflict point dictionaries for this ego AV when it starts at self.ego_right_start_goal_count_dict
-        self.c2_AV_R_L_dict = {"key_SAVR_GLAVxSOVB_GLOV": 0, "key_conflict_point": "c2"}
-        self.c2_AV_R_B_dict = {"key_SAVR_GBAVxSOVB_GLOV": 0,"key_conflict_point": "c2"}
-        self.c4_AV_R_B_dict = {"key_SAVR_GBAVxSOVL_GROV": 0,"key_SAVR_GBAV_SOVL_GBOV": 0,
-        "key_conflict_point": "c4"}
-
-
-        # Dictionary when ego starts at right intersection leg, how many times did it go to the following possible goal locations
-        # SAVR Goal loc of AV GLAVR, GBAVR
-        self.ego_right_start_goal_count_dict = {"key_ego_goal_left_count": 0, 
-        "key_ego_goal_left_interactions_dict": [self.c2_AV_R_L_dict],"key_ego_goal_base_count": 0, 
-        "key_ego_goal_base_interactions_dict": [self.c2_AV_R_B_dict, self.c4_AV_R_B_dict]}
-
-
-
-
-       
-        # *********************************************** BASE ego AV Start loc *************************************
-        ##########################################################################################################
-        ##########################################################################################################
-        ##########################################################################################################
-        
-        # Conflict point dictionaries for this ego AV when it starts at self.ego_base_start_goal_count_dict
-        self.c1_AV_B_R_dict = {"key_SAVB_GRAV_SOVL_GROV": 0, "key_conflict_point": "c1"} 
-        self.c1_AV_B_L_dict = {"key_SAVB_GLAV_SOVL_GROV": 0,"key_conflict_point": "c1"}
-        self.c2_AV_B_L_dict = {"key_SAVB_GLAV_SOVR_GLOV": 0, "key_SAVB_GLAVxSOVR_GBOV": 0, "key_conflict_point": "c2"}
-
-
-        # Dictionary when ego starts at base intersection leg, how many times did it go to the following possible goal locations
-        # SAVB Goal loc of AV GLAVB, GRAVB
-        self.ego_base_start_goal_count_dict = {"key_ego_goal_left_count": 0, 
-        "key_ego_goal_left_interactions_dict": [self.c1_AV_B_L_dict, self.c2_AV_B_L_dict],
-        "key_ego_goal_right_count": 0, "key_ego_goal_right_interactions_dict": [self.c1_AV_B_R_dict]}
-
-
-
-
-
-        # MAIN dictionary intialization. Put this at the end.
-
-        # Sow if we want to add more "bins" to start locations, we make the value side of the keys, an array. Like "key_ego_start_left": [0, 1, 2, 3, 4]. So value 0 corresponds
-        # to original left start ego loc, then other values can be like +-5 meters or something. We can even change initial velocities.
-        # I will be making bins of these vales in the later stages.
-        # Start loc of AV
-        self.ego_start_count_plus_other_dict = {"key_ego_start_left_count": 0, 
-        "key_ego_left_start_goal_count_dict": self.ego_left_start_goal_count_dict, 
-        "key_ego_start_base_count":0, "key_ego_base_start_goal_count_dict": self.ego_base_start_goal_count_dict, 
-        "key_ego_start_right_count":0, "key_ego_right_start_goal_count_dict": self.ego_right_start_goal_count_dict}
-
-        # Based on the conflict point selection, I wil have my other vehicle starting and goal locations (which I can make multiple bins of as well)
-
-
-    def select_conflictpoint_syncarrival_loc(self, conflict_point="c1"):
-
-        self.conflictpoint_syncarrival_loc_dict = dict()
-
-        if conflict_point=="c1":
-
-            self.conflictpoint_syncarrival_loc_x = -74.63
-            self.conflictpoint_syncarrival_loc_y = -136.34
-
-            self.conflictpoint_syncarrival_loc_dict = {"key_conflictpoint_syncarrival_loc_x": self.conflictpoint_syncarrival_loc_x,
-            "key_conflictpoint_syncarrival_loc_y": self.conflictpoint_syncarrival_loc_y}
-
-        elif conflict_point=="c2":
-
-            self.conflictpoint_syncarrival_loc_x = -74.63
-            self.conflictpoint_syncarrival_loc_y = -139.28
-
-            self.conflictpoint_syncarrival_loc_dict = {"key_conflictpoint_syncarrival_loc_x": self.conflictpoint_syncarrival_loc_x,
-            "key_conflictpoint_syncarrival_loc_y": self.conflictpoint_syncarrival_loc_y}
-
-        elif conflict_point=="c3":
-
-            self.conflictpoint_syncarrival_loc_x = -89.00
-            self.conflictpoint_syncarrival_loc_y = -140
-
-            self.conflictpoint_syncarrival_loc_dict = {"key_conflictpoint_syncarrival_loc_x": self.conflictpoint_syncarrival_loc_x,
-            "key_conflictpoint_syncarrival_loc_y": self.conflictpoint_syncarrival_loc_y}
-
-        elif conflict_point=="c4":
-
-            self.conflictpoint_syncarrival_loc_x = -89.00
-            self.conflictpoint_syncarrival_loc_y = -136.5
-
-            self.conflictpoint_syncarrival_loc_dict = {"key_conflictpoint_syncarrival_loc_x": self.conflictpoint_syncarrival_loc_x,
-            "key_conflictpoint_syncarrival_loc_y": self.conflictpoint_syncarrival_loc_y}
-
-        else:
-            raise ValueError("Unexpected value for conflict_point")
-
-    def low_count_to_higher_prob_converter_for_situation_coverage(self, dict_with_counts):
-        #pass
-        
-        keys_list = []
-        counts_list = []
-        
-        for key, value in dict_with_counts.items():
-            
-            keys_list.append(key)
-            counts_list.append(value)
-            
-        counts_np_array = np.array(counts_list)
-        
-        m = softmax(counts_np_array)
-        #invert the probabilites i.e., p2 = 1 - p
-        m_inv = 1 - m
-        sum_invP = m_inv.sum()  # sum of inverted probabilities
-        normalized_invP = m_inv/sum_invP  #output normalized inverted probabilities         
-        
-        # return choice_list
-        # Weighted random choice
-        Choice = np.random.choice(keys_list, size=1, p=normalized_invP)  # return one key from the dictionary based on higher probability of selection of low counts 
-
-        # Choice is coming out to be an ndarray so I will us Choice.item() which returns a single item in its original data type
-        #return Choice
-        return Choice.item()
-
-
-        # Add condition if len(keys_list) or len(values_list) is 1 then don't do the random selection stuff. Just do it. 
-
-    def selection_of_lower_counts_dict_from_list_of_two_beta(self, dicts_list_of_two): # not used anywhere
-
-        # Dicts list has two dictionaries. We know this information initially.
-
-        # Disecting each dict in the dicts_list to sum up their total counts
-
-        dict1 = dicts_list_of_two[0]
-        dict2 = dicts_list_of_two[1]
-
-        list_total_counts_for_two_dicts = []
-        counter_dict1 = 0
-        counter_dict2 = 0
-
-        for key, value in dict1.items():
-
-            if not isinstance(value, str): # filtering out the counter values
-                counter_dict1 = value + counter_dict1  # adding all the counter values in this dict
-
-        for key, value in dict2.items():
-
-            if not isinstance(value, str): # filtering out the counter values
-                counter_dict2 = value + counter_dict2 # adding all the counter values in this dict
-
-        list_total_counts_for_two_dicts = [counter_dict1, counter_dict2]
-
-        counts_np_array = np.array(list_total_counts_for_two_dicts)
-        
-        m = softmax(counts_np_array)
-        #invert the probabilites i.e., p2 = 1 - p
-        m_inv = 1 - m
-        sum_invP = m_inv.sum()  # sum of inverted probabilities
-        normalized_invP = m_inv/sum_invP  #output normalized inverted probabilities 
-
-        # Weighted random choice
-        Choice = np.random.choice(list_total_counts_for_two_dicts, size=1, p=normalized_invP)  # return one key from the dictionary based on higher probability of selection of low counts 
-
-        # returning dict with lower total counts (it would have higher probability to get returned :3)
-
-        if Choice == counter_dict1:
-
-            return dict1
-
-        elif Choice == counter_dict2:
-
-            return dict2
-
-        else:
-            raise ValueError("Something is wrong here")
-
-    def selection_of_lower_counts_dict_from_list_of_two(self, dicts_list_of_two):
-
-        # Dicts list has two dictionaries. We know this information initially.
-
-        # Disecting each dict in the dicts_list to sum up their total counts
-
-        dict1 = dicts_list_of_two[0]
-        dict2 = dicts_list_of_two[1]
-
-        counter_list_dict1 = []  # two possible counters in each dictionary
-
-        counter_list_dict2 = []
-
-        flag_counter_dict1 = False  # This flag will become true
-        flag_counter_dict2 = False
-
-
-        for key, value in dict1.items():
-
-            if not isinstance(value, str): # filtering out the counter values
-                counter_list_dict1.append(value)  # adding all the counter values in this dict
-
-            if len(counter_list_dict1) > 1:
-                flag_counter_dict1 = True  # i.e., dict1 has two counters in it i.e., two possible situations
-
-
-        for key, value in dict2.items():
-
-            if not isinstance(value, str): # filtering out the counter values
-                counter_list_dict2.append(value)  # adding all the counter values in this dict
-
-            if len(counter_list_dict2) > 1:
-                flag_counter_dict2 = True  # i.e., dict2 has two counters in it i.e., two possible situations
-
-        if flag_counter_dict1 == True and flag_counter_dict2 == True:
-            raise ValueError("Something is wrong here, these two dicts can't have two counters at the same time")
-
-        if flag_counter_dict1 == True:
-            counts_np_array = np.array([counter_list_dict1[0], counter_list_dict1[1], counter_list_dict2[0]])
-        elif flag_counter_dict2 == True:
-            counts_np_array = np.array([counter_list_dict1[0], counter_list_dict2[0], counter_list_dict2[1]])
-        else:
-            raise ValueError("Something is wrong here")
-
-        #list_total_counts_for_two_dicts = [counter_dict1, counter_dict2]
-
-        #counts_np_array = np.array(list_total_counts_for_two_dicts)
-        
-        m = softmax(counts_np_array)
-        #invert the probabilites i.e., p2 = 1 - p
-        m_inv = 1 - m
-        sum_invP = m_inv.sum()  # sum of inverted probabilities
-        normalized_invP = m_inv/sum_invP  #output normalized inverted probabilities 
-
-        # Weighted random choice
-
-        #Choice = np.random.choice(list_total_counts_for_two_dicts, size=1, p=normalized_invP)  # return one key from the dictionary based on higher probability of selection of low counts 
-        
-        Choice = np.random.choice(len(counts_np_array), size=1, p=normalized_invP)  # return one key from the dictionary based on higher probability of selection of low counts 
-
-        # returning dict with lower total counts (it would have higher probability to get returned :3)
-        if flag_counter_dict1 == True:
-            if Choice == 0 or Choice == 1:
-                return dict1
-            elif Choice == 2:
-                return dict2
-            else:
-                raise ValueError("something is wrong")
-
-        elif flag_counter_dict2 == True:
-            if Choice == 0:
-                return dict1
-            elif Choice == 1 or Choice == 2:
-                return dict2
-            else:
-                raise ValueError("something is wrong")
-        else:
-            raise ValueError("something is wrong")
-        
-
-
-
-class EnvironmentalConditions:
-
-    # default values of params
-    cloudiness = 0  # 0 to 100 values; 6 bins of 20 increments
-    # for these dictionaries, the key is an integer and it is the bin index. Each bin index corresponds to a list, with the first value of the list corresponding
-    # to the env condition parameter value and second item in the list in the counter of that parameter being selected :3
-    cloudiness_dict = {0:[0.0, 0.0], 1:[20.0, 0.0], 2:[40.0, 0.0], 3:[60.0, 0.0], 4:[80.0, 0.0], 5:[100.0, 0.0]}
-
-    precipitation = 0  # 0 to 100 values; 6 bins of 20 increments
-    precipitation_dict = {0:[0.0, 0.0], 1:[20.0, 0.0], 2:[40.0, 0.0], 3:[60.0, 0.0], 4:[80.0, 0.0], 5:[100.0, 0.0]}
-    
-    precipitation_deposits = 0  # 0 to 100 values; 6 bins of 20 increments
-    precipitation_deposits_dict = {0:[0.0, 0.0], 1:[20.0, 0.0], 2:[40.0, 0.0], 3:[60.0, 0.0], 4:[80.0, 0.0], 5:[100.0, 0.0]}
-
-    wind_intensity = 0.35  # 0 to 100 values; 6 bins of 20 increments
-    wind_intensity_dict = {0:[0.0, 0.0], 1:[20.0, 0.0], 2:[40.0, 0.0], 3:[60.0, 0.0], 4:[80.0, 0.0], 5:[100.0, 0.0]}
-
-    # Won't be using this in the start :3 #####********************************************************** imp
-    sun_azimuth_angle = 0.0  # range from 0 - 180. 7 bins of 30 increments
-    sun_azimuth_angle_dict = {0:[0.0, 0.0], 1:[30.0, 0.0], 2:[60.0, 0.0], 3:[90.0, 0.0], 4:[120.0, 0.0], 5:[150.0, 0.0], 6:[180.0, 0.0]}
-
-    # Won't be using this in the start :3 #####********************************************************** imp
-    sun_altitude_angle = 15.0  # range from 90 - -90. 7 bins of 30 increments
-    sun_altitude_angle_dict = {0:[-90.0, 0.0], 1:[-60.0, 0.0], 2:[-30.0, 0.0], 3:[0.0, 0.0], 4:[30.0, 0.0], 5:[60.0, 0.0], 6:[90.0, 0.0]}
-
-    fog_density = 0.0 # 0 to 100 values; 6 bins of 20 increments
-    fog_density_dict = {0:[0.0, 0.0], 1:[20.0, 0.0], 2:[40.0, 0.0], 3:[60.0, 0.0], 4:[80.0, 0.0], 5:[100.0, 0.0]}
-
-    fog_distance = 0.0  # 0 to infinity. Dividing it into 6 bins from 0 - 100
-    fog_distance_dict = {0:[0.0, 0.0], 1:[20.0, 0.0], 2:[40.0, 0.0], 3:[60.0, 0.0], 4:[80.0, 0.0], 5:[100.0, 0.0]}
-    
-    wetness = 0.0 # 0 to 100 values; 6 bins of 20 increments
-    wetness_dict = {0:[0.0, 0.0], 1:[20.0, 0.0], 2:[40.0, 0.0], 3:[60.0, 0.0], 4:[80.0, 0.0], 5:[100.0, 0.0]}
-    
-    fog_falloff = 0.0  # 0 to infinity. But fog goes to the ground after value of 5. So 6 bins from 0 - 5.
-    fog_falloff_dict = {0:[0.0, 0.0], 1:[1.0, 0.0], 2:[2.0, 0.0], 3:[3.0, 0.0], 4:[4.0, 0.0], 5:[5.0, 0.0]}
-    
-    friction = 1.0 # 0 to 1. 6 bins of 0.20 each # min fricion changed from 0 to 0.1
-    friction_dict = {0:[0.1, 0.0], 1:[0.20, 0.0], 2:[0.40, 0.0], 3:[0.60, 0.0], 4:[0.80, 0.0], 5:[1.0, 0.0]}
-
-
-    def __init__(self):
-        pass
-
-    def low_count_to_higher_prob_converter_for_situation_coverage(self, dict_with_counts):
-        #pass
-        
-        keys_list = []
-        counts_list = []
-        
-        for key, value in dict_with_counts.items():
-            
-            keys_list.append(key)
-            counts_list.append(value)
-            
-        counts_np_array = np.array(counts_list)
-        
-        m = softmax(counts_np_array)
-        #invert the probabilites i.e., p2 = 1 - p
-        m_inv = 1 - m
-        sum_invP = m_inv.sum()  # sum of inverted probabilities
-        normalized_invP = m_inv/sum_invP  #output normalized inverted probabilities         
-        
-        # return choice_list
-        # Weighted random choice
-        Choice = np.random.choice(keys_list, size=1, p=normalized_invP)  # return one key from the dictionary based on higher probability of selection of low counts 
-        # Choice is coming out to be an ndarray so I will us Choice.item() which returns a single item in its original data type
-        #return Choice
-        return Choice.item()
-
-
-        # Add condition if len(keys_list) or len(values_list) is 1 then don't do the random selection stuff. Just do it. 
-
-    def generate_environmental_conditions(self, approach, activate=False):
-
-        if activate:  # if not activated, pass the default values of env conditions paramters
-
-            # self.cloudiness_key
-            # self.precipitation_key
-            # self.precipitation_deposits_key
-            # self.wind_intensity_key
-            # self.fog_density_key
-            # self.fog_distance_key 
-            # self.wetness_key
-            # self.fog_falloff_key
-            # self.friction_key
-
-            if approach == "random":
-
-                key_cloudiness_dict = randint(0, 5)  # will always generate random numbers (having different random selection to each other) if randint is used in two seperate lines but for the same seed those two randint values will always be those specific values that were generated for that specific seed
-                self.cloudiness_key = key_cloudiness_dict
-                self.cloudiness = self.cloudiness_dict[key_cloudiness_dict][0]  # passing the first value of the list which is the parameter value
-                # updating the counter of the selected env condition parameter
-                self.cloudiness_dict[key_cloudiness_dict][1] = self.cloudiness_dict[key_cloudiness_dict][1] + 1  # Adding 1 to the counter value which is located at the second place after the parameter in the list at index 1 for this particular key that has been randomly selected
-
-                key_precipitation_dict = randint(0, 5)
-                self.precipitation_key = key_precipitation_dict
-                self.precipitation = self.precipitation_dict[key_precipitation_dict][0]  # passing the first value of the list which is the parameter value
-                self.precipitation_dict[key_precipitation_dict][1] = self.precipitation_dict[key_precipitation_dict][1] + 1  # Adding 1 to the counter value which is located at the second place after the parameter in the list at index 1 for this particular key that has been randomly selected
-
-                key_precipitation_deposits_dict = randint(0, 5)
-                self.precipitation_deposits_key = key_precipitation_deposits_dict
-                self.precipitation_deposits = self.precipitation_deposits_dict[key_precipitation_deposits_dict][0]  # passing the first value of the list which is the parameter value
-                self.precipitation_deposits_dict[key_precipitation_deposits_dict][1] = self.precipitation_deposits_dict[key_precipitation_deposits_dict][1] + 1  # Adding 1 to the counter value which is located at the second place after the parameter in the list at index 1 for this particular key that has been randomly selected
-
-                key_wind_intensity_dict = randint(0, 5)
-                self.wind_intensity_key = key_wind_intensity_dict
-                self.wind_intensity = self.wind_intensity_dict[key_wind_intensity_dict][0]  # passing the first value of the list which is the parameter value
-                self.wind_intensity_dict[key_wind_intensity_dict][1] = self.wind_intensity_dict[key_wind_intensity_dict][1] + 1  # Adding 1 to the counter value which is located at the second place after the parameter in the list at index 1 for this particular key that has been randomly selected
-
-                key_fog_density_dict = randint(0, 5)
-                self.fog_density_key = key_fog_density_dict
-                self.fog_density = self.fog_density_dict[key_fog_density_dict][0]  # passing the first value of the list which is the parameter value
-                self.fog_density_dict[key_fog_density_dict][1] = self.fog_density_dict[key_fog_density_dict][1] + 1  # Adding 1 to the counter value which is located at the second place after the parameter in the list at index 1 for this particular key that has been randomly selected
-
-                key_fog_distance_dict = randint(0, 5)
-                self.fog_distance_key = key_fog_distance_dict
-                self.fog_distance = self.fog_distance_dict[key_fog_distance_dict][0]  # passing the first value of the list which is the parameter value
-                self.fog_distance_dict[key_fog_distance_dict][1] = self.fog_distance_dict[key_fog_distance_dict][1] + 1  # Adding 1 to the counter value which is located at the second place after the parameter in the list at index 1 for this particular key that has been randomly selected
-
-                key_wetness_dict = randint(0, 5)
-                self.wetness_key = key_wetness_dict
-                self.wetness = self.wetness_dict[key_wetness_dict][0]  # passing the first value of the list which is the parameter value
-                self.wetness_dict[key_wetness_dict][1] = self.wetness_dict[key_wetness_dict][1] + 1  # Adding 1 to the counter value which is located at the second place after the parameter in the list at index 1 for this particular key that has been randomly selected
-
-                key_fog_falloff_dict = randint(0, 5)
-                self.fog_falloff_key = key_fog_falloff_dict
-                self.fog_falloff = self.fog_falloff_dict[key_fog_falloff_dict][0]  # passing the first value of the list which is the parameter value
-                self.fog_falloff_dict[key_fog_falloff_dict][1] = self.fog_falloff_dict[key_fog_falloff_dict][1] + 1  # Adding 1 to the counter value which is located at the second place after the parameter in the list at index 1 for this particular key that has been randomly selected
-
-                key_friction_dict = randint(0, 5)
-                self.friction_key = key_friction_dict
-                self.friction = self.friction_dict[key_friction_dict][0]  # passing the first value of the list which is the parameter value
-                self.friction_dict[key_friction_dict][1] = self.friction_dict[key_friction_dict][1] + 1  # Adding 1 to the counter value which is located at the second place after the parameter in the list at index 1 for this particular key that has been randomly selected
-
-
-
-            elif approach == "sitcov":
-
-                # self.cloudiness_key
-                # self.precipitation_key
-                # self.precipitation_deposits_key
-                # self.wind_intensity_key
-                # self.fog_density_key
-                # self.fog_distance_key 
-                # self.wetness_key
-                # self.fog_falloff_key
-                # self.friction_key
-                
-                # Setting up a dictionary with the keys and ONLY counter values. Parameters values aren't needed for the sitcov based selection.
-                cloudiness_counts_only_dict = {keys:self.cloudiness_dict[keys][1] for keys in self.cloudiness_dict.keys()}
-                #print(len(cloudiness_counts_only_dict))
-                #sys.exit("off")
-                # Selecting key based on the count values
-                key_cloudiness_dict = self.low_count_to_higher_prob_converter_for_situation_coverage(cloudiness_counts_only_dict)
-
-                self.cloudiness_key = key_cloudiness_dict
-
-                #print(key_cloudiness_dict)
-                #print(type(key_cloudiness_dict))
-                #sys.exit("off")
-                '''
-                [1]
-                <class 'numpy.ndarray'>
-                off
-                '''
-                self.cloudiness = self.cloudiness_dict[key_cloudiness_dict][0]  # passing the first value of the list which is the parameter value
-                # updating the counter of the selected env condition parameter
-                self.cloudiness_dict[key_cloudiness_dict][1] = self.cloudiness_dict[key_cloudiness_dict][1] + 1
-
-
-            
-                # Setting up a dictionary with the keys and ONLY counter values. Parameters values aren't needed for the sitcov based selection.
-                precipitation_counts_only_dict = {keys:self.precipitation_dict[keys][1] for keys in self.precipitation_dict.keys()}
-                # Selecting key based on the count values
-                key_precipitation_dict = self.low_count_to_higher_prob_converter_for_situation_coverage(precipitation_counts_only_dict)
-
-                self.precipitation_key = key_precipitation_dict
-
-                self.precipitation = self.precipitation_dict[key_precipitation_dict][0]  # passing the first value of the list which is the parameter value
-                # updating the counter of the selected env condition parameter
-                self.precipitation_dict[key_precipitation_dict][1] = self.precipitation_dict[key_precipitation_dict][1] + 1
-
-
-            
-                # Setting up a dictionary with the keys and ONLY counter values. Parameters values aren't needed for the sitcov based selection.
-                precipitation_deposits_counts_only_dict = {keys:self.precipitation_deposits_dict[keys][1] for keys in self.precipitation_deposits_dict.keys()}
-                # Selecting key based on the count values
-                key_precipitation_deposits_dict = self.low_count_to_higher_prob_converter_for_situation_coverage(precipitation_deposits_counts_only_dict)
-
-                self.precipitation_deposits_key = key_precipitation_deposits_dict
-
-                self.precipitation_deposits = self.precipitation_deposits_dict[key_precipitation_deposits_dict][0]  # passing the first value of the list which is the parameter value
-                # updating the counter of the selected env condition parameter
-                self.precipitation_deposits_dict[key_precipitation_deposits_dict][1] = self.precipitation_deposits_dict[key_precipitation_deposits_dict][1] + 1
-
-
-                # Setting up a dictionary with the keys and ONLY counter values. Parameters values aren't needed for the sitcov based selection.
-                wind_intensity_counts_only_dict = {keys:self.wind_intensity_dict[keys][1] for keys in self.wind_intensity_dict.keys()}
-                # Selecting key based on the count values
-                key_wind_intensity_dict = self.low_count_to_higher_prob_converter_for_situation_coverage(wind_intensity_counts_only_dict)
-
-                self.wind_intensity_key = key_wind_intensity_dict
-
-                self.wind_intensity = self.wind_intensity_dict[key_wind_intensity_dict][0]  # passing the first value of the list which is the parameter value
-                # updating the counter of the selected env condition parameter
-                self.wind_intensity_dict[key_wind_intensity_dict][1] = self.wind_intensity_dict[key_wind_intensity_dict][1] + 1
-
-
-                # Setting up a dictionary with the keys and ONLY counter values. Parameters values aren't needed for the sitcov based selection.
-                fog_density_counts_only_dict = {keys:self.fog_density_dict[keys][1] for keys in self.fog_density_dict.keys()}
-                # Selecting key based on the count values
-                key_fog_density_dict = self.low_count_to_higher_prob_converter_for_situation_coverage(fog_density_counts_only_dict)
-
-                self.fog_density_key = key_fog_density_dict
-
-                self.fog_density = self.fog_density_dict[key_fog_density_dict][0]  # passing the first value of the list which is the parameter value
-                # updating the counter of the selected env condition parameter
-                self.fog_density_dict[key_fog_density_dict][1] = self.fog_density_dict[key_fog_density_dict][1] + 1
-
-
-                # Setting up a dictionary with the keys and ONLY counter values. Parameters values aren't needed for the sitcov based selection.
-                fog_distance_counts_only_dict = {keys:self.fog_distance_dict[keys][1] for keys in self.fog_distance_dict.keys()}
-                # Selecting key based on the count values
-                key_fog_distance_dict = self.low_count_to_higher_prob_converter_for_situation_coverage(fog_distance_counts_only_dict)
-
-                self.fog_distance_key = key_fog_distance_dict
-
-                self.fog_distance = self.fog_distance_dict[key_fog_distance_dict][0]  # passing the first value of the list which is the parameter value
-                # updating the counter of the selected env condition parameter
-                self.fog_distance_dict[key_fog_distance_dict][1] = self.fog_distance_dict[key_fog_distance_dict][1] + 1
-
-
-                # Setting up a dictionary with the keys and ONLY counter values. Parameters values aren't needed for the sitcov based selection.
-                wetness_counts_only_dict = {keys:self.wetness_dict[keys][1] for keys in self.wetness_dict.keys()}
-                # Selecting key based on the count values
-                key_wetness_dict = self.low_count_to_higher_prob_converter_for_situation_coverage(wetness_counts_only_dict)
-
-                self.wetness_key = key_wetness_dict
-
-                self.wetness = self.wetness_dict[key_wetness_dict][0]  # passing the first value of the list which is the parameter value
-                # updating the counter of the selected env condition parameter
-                self.wetness_dict[key_wetness_dict][1] = self.wetness_dict[key_wetness_dict][1] + 1
-
-                
-                # Setting up a dictionary with the keys and ONLY counter values. Parameters values aren't needed for the sitcov based selection.
-                fog_falloff_counts_only_dict = {keys:self.fog_falloff_dict[keys][1] for keys in self.fog_falloff_dict.keys()}
-                # Selecting key based on the count values
-                key_fog_falloff_dict = self.low_count_to_higher_prob_converter_for_situation_coverage(fog_falloff_counts_only_dict)
-
-                self.fog_falloff_key = key_fog_falloff_dict
-
-                self.fog_falloff = self.fog_falloff_dict[key_fog_falloff_dict][0]  # passing the first value of the list which is the parameter value
-                # updating the counter of the selected env condition parameter
-                self.fog_falloff_dict[key_fog_falloff_dict][1] = self.fog_falloff_dict[key_fog_falloff_dict][1] + 1
-
-
-                # Setting up a dictionary with the keys and ONLY counter values. Parameters values aren't needed for the sitcov based selection.
-                friction_counts_only_dict = {keys:self.friction_dict[keys][1] for keys in self.friction_dict.keys()}
-                # Selecting key based on the count values
-                key_friction_dict = self.low_count_to_higher_prob_converter_for_situation_coverage(friction_counts_only_dict)
-
-                self.friction_key = key_friction_dict
-
-                self.friction = self.friction_dict[key_friction_dict][0]  # passing the first value of the list which is the parameter value
-                # updating the counter of the selected env condition parameter
-                self.friction_dict[key_friction_dict][1] = self.friction_dict[key_friction_dict][1] + 1
-
-
-            else:
-                raise ValueError("Invalid sit gen approach selected")
-        else:
-            pass  # default values selected
-
-
-
-class EgoVehicle:
-
-    # Dictionary to store the ego start location as a carla Transform and to store the start location string
-    ego_start_carla_transform_dict = dict()  # structure is as follows: {"key_transform": self.start_ego_base_carla_transform, "key_location_string": start_location_string}
-    ego_passthroughtrigger_dict = dict()
-    ego_startothertrigger_dict = dict()
-
-    ego_endconditiontrigger_dict = dict()  # goal location for ego vehicle
-    
-
-    #def __init__(self, start_location_string="base"):  # start_location will either be "Base", "Left", "Right" 
-
-    def __init__(self):
-        #self.ego_start_carla_transform_dict = self.select_ego_loc(start_location_string)  # self.ego_start_carla_transform_dict will be a dictionary with locaiton and the location string as it's two entries
-        pass
-
-    def select_ego_start_loc(self, start_location_string="base"):
-
-        # Base leg of intersection EGO Veh starting waypoint location/rotation details
-        self.start_ego_base_carla_loc = carla.Location(x=-74.32, y=-50, z=0.5)  
-        self.start_ego_base_carla_rotation = carla.Rotation(pitch=0.0, yaw=270, roll=0.0)
-        # Base leg of intersection EGO Veh starting waypoint Transform
-        self.start_ego_base_carla_transform = carla.Transform(self.start_ego_base_carla_loc, self.start_ego_base_carla_rotation)
-
-
-        # Left leg of intersection EGO Veh starting waypoint location/rotation details
-        self.start_ego_left_carla_loc = carla.Location(x=-145.36, y=-91.61, z=0.5)
-        self.start_ego_left_carla_rotation = carla.Rotation(pitch=0.0, yaw=270, roll=0.0)  # 270 yaw for left leg of intersection since the road turns left and becomes straight like Base leg
-        # Left leg of intersection EGO Veh starting waypoint Transform
-        self.start_ego_left_carla_transform = carla.Transform(self.start_ego_left_carla_loc, self.start_ego_left_carla_rotation)
-
-
-        # Right leg of intersection EGO Veh starting waypoint location/rotation details
-        #self.start_ego_right_carla_loc = carla.Location(x=10.09, y=-138.7, z=0.5)  # Right leg of intersection
-        
-        self.start_ego_right_carla_loc = carla.Location(x=15.09, y=-138.7, z=0.5)  # Right leg of intersection
-        
-
-        self.start_ego_right_carla_rotation = carla.Rotation(pitch=0.0, yaw=180, roll=0.0)
-        # Right leg of intersection EGO Veh starting waypoint Transform
-        self.start_ego_right_carla_transform = carla.Transform(self.start_ego_right_carla_loc, self.start_ego_right_carla_rotation)
-
-        if start_location_string == "base":
-
-            self.ego_start_carla_transform_dict = {"key_transform": self.start_ego_base_carla_transform, "key_location_string": start_location_string}  # return a dictionary
-            
-            # Don't need to return this dictionary. Just need to fill in the values as done in the line above.
-            #return self.ego_start_carla_transform_dict
-        
-        elif start_location_string == "left":
-
-            self.ego_start_carla_transform_dict = {"key_transform": self.start_ego_left_carla_transform, "key_location_string": start_location_string}  # return a dictionary
-
-            #return self.ego_start_carla_transform_dict
-
-        elif start_location_string == "right":
-
-            self.ego_start_carla_transform_dict = {"key_transform": self.start_ego_right_carla_transform, "key_location_string": start_location_string}  # return a dictionary
-
-            #return self.ego_start_carla_transform_dict
-
-        else:
-
-            print("Please select valid start location string for ego vehicle")
-            #return 0
-            raise ValueError("Unexpected value for start location string for ego vehicle")
-
-    
-    def select_ego_passthroughtrigger_loc(self, start_location_string="base"):  # INCOMPLETE
-
-
-        if start_location_string == "base":
-
-            # self.ego_passthroughtrigger_min_x = -90
-            # self.ego_passthroughtrigger_max_x = -70
-            # self.ego_passthroughtrigger_min_y = -124
-            # self.ego_passthroughtrigger_max_y = -119
-
-            # for base, y axis is changing. And it is getting less negative moving away from the intersection. So we will bring it closer by 3 in yaxis.
-
-            self.ego_passthroughtrigger_min_x = -90
-            self.ego_passthroughtrigger_max_x = -70
-            self.ego_passthroughtrigger_min_y = -127
-            self.ego_passthroughtrigger_max_y = -121
-
-
-            self.ego_passthroughtrigger_dict = {"key_ego_passthroughtrigger_min_x": self.ego_passthroughtrigger_min_x, 
-            "key_ego_passthroughtrigger_max_x": self.ego_passthroughtrigger_max_x, 
-            "key_ego_passthroughtrigger_min_y": self.ego_passthroughtrigger_min_y, 
-            "key_ego_passthroughtrigger_max_y": self.ego_passthroughtrigger_max_y}
-
-            #return self.ego_passthroughtrigger_dict  # Don't need to return anything. Only need to set the dictionary values as required by the locaiton selected.
-
-        elif start_location_string == "left":
-
-            # self.ego_passthroughtrigger_min_x = -106.64
-            # self.ego_passthroughtrigger_max_x = -101.64
-            # self.ego_passthroughtrigger_min_y = -148.5
-            # self.ego_passthroughtrigger_max_y = -128.5
-
-            # bringing this closer to intersection
-
-            self.ego_passthroughtrigger_min_x = -103.64
-            self.ego_passthroughtrigger_max_x = -98.64
-            self.ego_passthroughtrigger_min_y = -148.5
-            self.ego_passthroughtrigger_max_y = -128.5
-            
-            
-
-
-            self.ego_passthroughtrigger_dict = {"key_ego_passthroughtrigger_min_x": self.ego_passthroughtrigger_min_x, 
-            "key_ego_passthroughtrigger_max_x": self.ego_passthroughtrigger_max_x, 
-            "key_ego_passthroughtrigger_min_y": self.ego_passthroughtrigger_min_y, 
-            "key_ego_passthroughtrigger_max_y": self.ego_passthroughtrigger_max_y}
-
-        elif start_location_string == "right":
-
-            # self.ego_passthroughtrigger_min_x = -63.15
-            # self.ego_passthroughtrigger_max_x = -58.15
-            # self.ego_passthroughtrigger_min_y = -147.5
-            # self.ego_passthroughtrigger_max_y = -127.5
-
-            self.ego_passthroughtrigger_min_x = -66.15  # x axis gettind closer to intersection by 3. As it is becoming positive moving away from intersection in this case. 
-            self.ego_passthroughtrigger_max_x = -61.15
-            self.ego_passthroughtrigger_min_y = -147.5
-            self.ego_passthroughtrigger_max_y = -127.5
-            
-            
-
-            self.ego_passthroughtrigger_dict = {"key_ego_passthroughtrigger_min_x": self.ego_passthroughtrigger_min_x, 
-            "key_ego_passthroughtrigger_max_x": self.ego_passthroughtrigger_max_x, 
-            "key_ego_passthroughtrigger_min_y": self.ego_passthroughtrigger_min_y, 
-            "key_ego_passthroughtrigger_max_y": self.ego_passthroughtrigger_max_y}
-
-        else:
-            raise ValueError("Unexpected value for select_ego_passthroughtrigger_loc for ego vehicle")
-
-    def select_ego_startothertrigger_loc(self, start_location_string="base"):
-
-        if start_location_string == "base":
-
-            self.ego_startothertrigger_min_x = -80
-            self.ego_startothertrigger_max_x = -70
-            self.ego_startothertrigger_min_y = -75
-            self.ego_startothertrigger_max_y = -60
-
-            self.ego_startothertrigger_dict = {"key_ego_startothertrigger_min_x": self.ego_startothertrigger_min_x, 
-            "key_ego_startothertrigger_max_x": self.ego_startothertrigger_max_x, 
-            "key_ego_startothertrigger_min_y": self.ego_startothertrigger_min_y, 
-            "key_ego_startothertrigger_max_y": self.ego_startothertrigger_max_y}
-
-            #return self.ego_startothertrigger_dict
-
-        elif start_location_string == "left":
-
-            self.ego_startothertrigger_min_x = -148
-            self.ego_startothertrigger_max_x = -138
-            self.ego_startothertrigger_min_y = -113.5
-            self.ego_startothertrigger_max_y = -98.5
-
-            self.ego_startothertrigger_dict = {"key_ego_startothertrigger_min_x": self.ego_startothertrigger_min_x, 
-            "key_ego_startothertrigger_max_x": self.ego_startothertrigger_max_x, 
-            "key_ego_startothertrigger_min_y": self.ego_startothertrigger_min_y, 
-            "key_ego_startothertrigger_max_y": self.ego_startothertrigger_max_y}
-
-        elif start_location_string == "right":
-
-            self.ego_startothertrigger_min_x = -12.5
-            self.ego_startothertrigger_max_x = 2.5
-            self.ego_startothertrigger_min_y = -146
-            self.ego_startothertrigger_max_y = -131.1
-
-            self.ego_startothertrigger_dict = {"key_ego_startothertrigger_min_x": self.ego_startothertrigger_min_x, 
-            "key_ego_startothertrigger_max_x": self.ego_startothertrigger_max_x, 
-            "key_ego_startothertrigger_min_y": self.ego_startothertrigger_min_y, 
-            "key_ego_startothertrigger_max_y": self.ego_startothertrigger_max_y}
-
-        else:
-            raise ValueError("Unexpected value for select_ego_startothertrigger_loc for ego vehicle")
-    
-    def select_ego_endconditiontrigger_loc(self, ego_goal_location="base"):  # THE GOAL LOCATION OF EGO 
-
-        if ego_goal_location == "base":  # maybe set this location text in the dictionary also to pass to the veh controlling agent
-
-            # self.ego_endconditiontrigger_min_x = -90
-            # self.ego_endconditiontrigger_max_x = -70
-            # self.ego_endconditiontrigger_min_y = -119.92
-            # self.ego_endconditiontrigger_max_y = -105.923
-            
-            # Re-defining new ego_endcontiontriggers according to the new ego destinations
-            self.ego_endconditiontrigger_min_x = -95.20  # delta is 20 i.e. half is 10
-            self.ego_endconditiontrigger_max_x = -75.20 
-
-            #self.ego_endconditiontrigger_min_y = -37  # delta was 14
-            #self.ego_endconditiontrigger_max_y = -23 # swap the min and max to be real min and max as per sign
-            
-            # Re-adjusting the end condition trigger location considering that ego stops around 20 meters before, longitudinally
-
-            self.ego_endconditiontrigger_min_y = -57  # delta was 14
-            # new mid is y = -50
-            self.ego_endconditiontrigger_max_y = -43 # swap the min and max to be real min and max as per sign
-
-            # lets run this and see if the ego stops here!!!!!!!! :3 
-            #Works!!
-
-            self.ego_destination_x = -85.20
-            #self.ego_destination_x = -88.68
-            #self.ego_destination_x = -78.15
-            
-            #self.ego_destination_y = -112.92
-            self.ego_destination_y = -30.0  # Extended in logitudinal direction
-
-            self.ego_endconditiontrigger_dict = {"key_ego_endconditiontrigger_min_x": self.ego_endconditiontrigger_min_x, 
-            "key_ego_endconditiontrigger_max_x": self.ego_endconditiontrigger_max_x, 
-            "key_ego_endconditiontrigger_min_y": self.ego_endconditiontrigger_min_y, 
-            "key_ego_endconditiontrigger_max_y": self.ego_endconditiontrigger_max_y,
-            "key_ego_destination_x": self.ego_destination_x, 
-            "key_ego_destination_y": self.ego_destination_y}
-
-        elif ego_goal_location == "left":
-
-            # self.ego_endconditiontrigger_min_x = -148.5
-            # self.ego_endconditiontrigger_max_x = -128.5
-            # self.ego_endconditiontrigger_min_y = -118.64
-            # self.ego_endconditiontrigger_max_y = -104.64
-
-            # self.ego_endconditiontrigger_min_x = -118.64
-            # self.ego_endconditiontrigger_max_x = -104.64
-            # self.ego_endconditiontrigger_min_y = -148.5
-            # self.ego_endconditiontrigger_max_y = -128.5
-            
-            # Re-defining new ego_endcontiontriggers according to the new ego destinations
-
-            # self.ego_endconditiontrigger_min_x = -155.97  # DELTA IS 14 i.e. half is 7
-            # self.ego_endconditiontrigger_max_x = -141.97
-            # self.ego_endconditiontrigger_min_y = -86.77  # delat is 20 i.e. half is 10
-            # self.ego_endconditiontrigger_max_y = -66.77
-
-            # Re-adjusting the end condition trigger location considering that ego stops around 20 meters before, longitudinally
-
-            self.ego_endconditiontrigger_min_x = -155.77  # DELTA IS 14 i.e. half is 7
-            # mid x = -148.77
-            self.ego_endconditiontrigger_max_x = -141.77
-            
-
-            self.ego_endconditiontrigger_min_y = -106.91  # delat is 20 i.e. half is 10
-            # mid y = -96.91
-            self.ego_endconditiontrigger_max_y = -86.91
-
-            # self.ego_destination_x = -109.86
-            # self.ego_destination_y = -139.8
-            self.ego_destination_x = -148.97  # extended longitudinally
-            self.ego_destination_y = -76.77  # extended longitudinally
-
-            self.ego_endconditiontrigger_dict = {"key_ego_endconditiontrigger_min_x": self.ego_endconditiontrigger_min_x, 
-            "key_ego_endconditiontrigger_max_x": self.ego_endconditiontrigger_max_x, 
-            "key_ego_endconditiontrigger_min_y": self.ego_endconditiontrigger_min_y, 
-            "key_ego_endconditiontrigger_max_y": self.ego_endconditiontrigger_max_y,
-            "key_ego_destination_x": self.ego_destination_x, 
-            "key_ego_destination_y": self.ego_destination_y} 
-
-        elif ego_goal_location == "right":
-
-            # self.ego_endconditiontrigger_min_x = -148.17
-            # self.ego_endconditiontrigger_max_x = -128.17
-            # self.ego_endconditiontrigger_min_y = -60.08
-            # self.ego_endconditiontrigger_max_y = -46.08
-
-            # self.ego_endconditiontrigger_min_x = -60.08  
-            # self.ego_endconditiontrigger_max_x = -46.08
-            # self.ego_endconditiontrigger_min_y = -148.17
-            # self.ego_endconditiontrigger_max_y = -128.17
-
-            # Re-defining new ego_endcontiontriggers according to the new ego destinations
-
-            # self.ego_endconditiontrigger_min_x = 23.0  # delta is 14 i.e. half is 7
-            # self.ego_endconditiontrigger_max_x = 37.0
-            # self.ego_endconditiontrigger_min_y = -148.17
-            # self.ego_endconditiontrigger_max_y = -128.17
-
-
-            # Re-adjusting the end condition trigger location considering that ego stops around 20 meters before, longitudinally
-
-            self.ego_endconditiontrigger_min_x = 3.0  # delta is 14 i.e. half is 7
-            # mid x = 10 
-            self.ego_endconditiontrigger_max_x = 17.0
-            
-
-            self.ego_endconditiontrigger_min_y = -148.17
-            self.ego_endconditiontrigger_max_y = -128.17
-
-            #self.ego_destination_x = -55.16
-            self.ego_destination_x = 30.0  # Extended longitudinally
-            self.ego_destination_y = -135.95
-
-            self.ego_endconditiontrigger_dict = {"key_ego_endconditiontrigger_min_x": self.ego_endconditiontrigger_min_x, 
-            "key_ego_endconditiontrigger_max_x": self.ego_endconditiontrigger_max_x, 
-            "key_ego_endconditiontrigger_min_y": self.ego_endconditiontrigger_min_y, 
-            "key_ego_endconditiontrigger_max_y": self.ego_endconditiontrigger_max_y,
-            "key_ego_destination_x": self.ego_destination_x, 
-            "key_ego_destination_y": self.ego_destination_y}
-
-        else:
-            raise ValueError("Unexpected value for select_ego_endconditiontrigger_loc for ego vehicle")
-
-
-class OtherVehicle:
-
-    other_vehicle_start_carla_transform_dict = dict()  # start location for other vehicle
-    other_vehicle_stopothertrigger_dict = dict()  # the goal loc for other vehicle
-
-    def __init__(self):
-        
-        pass
-
-    def select_other_vehicle_start_loc(self, start_location_string="base"):
-
-        if start_location_string == "left": # OFFICIALLY Screwed this up xDDDDDDDDDDDDDD
-
-            #self.other_vehicle_start_loc_carla_location = carla.Location(x=-105, y=-136, z=0.5) 
-            
-            # 10 m away from intersection
-            self.other_vehicle_start_loc_carla_location = carla.Location(x=-109, y=-136, z=0.5) 
-            # WORRRRRRRRRRRRRRRRRRRRRRRRRRRRRRRRRNGGGGGGGGGGGGGGGGGGGGGGGGGGGGG
-            # self.other_vehicle_start_loc_carla_rotation = carla.Rotation(pitch=0.0, yaw=0.0, roll=0.0 )
-            self.other_vehicle_start_loc_carla_rotation = carla.Rotation(pitch=0.0, yaw=0.0, roll=0.0 )
-            self.other_vehicle_start_loc_carla_transform = carla.Transform(self.other_vehicle_start_loc_carla_location, self.other_vehicle_start_loc_carla_rotation)
-
-            self.other_vehicle_start_carla_transform_dict = {"key_transform": self.other_vehicle_start_loc_carla_transform, 
-            "key_location_string": start_location_string}
-
-        elif start_location_string == "base":
-
-            #self.other_vehicle_start_loc_carla_location = carla.Location(x=-74.70, y=-119.55, z=0.5) 
-            
-
-            # 10 m away from intersection
-            self.other_vehicle_start_loc_carla_location = carla.Location(x=-74.70, y=-114.95, z=0.5) 
-            #self.other_vehicle_start_loc_carla_location = carla.Location(x=-78.70, y=-114.95, z=0.5) # works!!
-             
-            # WORRRRRRRRRRRRRRRRRRRRRRRRRRRRRRRRRNGGGGGGGGGGGGGGGGGGGGGGGGGGGGG
-            #self.other_vehicle_start_loc_carla_rotation = carla.Rotation(pitch=0.0, yaw=90.0, roll=0.0 )
-            self.other_vehicle_start_loc_carla_rotation = carla.Rotation(pitch=0.0, yaw=270.0, roll=0.0 )
-            self.other_vehicle_start_loc_carla_transform = carla.Transform(self.other_vehicle_start_loc_carla_location, self.other_vehicle_start_loc_carla_rotation)
-
-            self.other_vehicle_start_carla_transform_dict = {"key_transform": self.other_vehicle_start_loc_carla_transform, 
-            "key_location_string": start_location_string}
-
-        elif start_location_string == "base_left_lane":
-
-            #self.other_vehicle_start_loc_carla_location = carla.Location(x=-74.70, y=-119.55, z=0.5) 
-            
-
-            # 10 m away from intersection
-            #self.other_vehicle_start_loc_carla_location = carla.Location(x=-74.70, y=-114.95, z=0.5) 
-            self.other_vehicle_start_loc_carla_location = carla.Location(x=-78.70, y=-114.95, z=0.5) # works!!
-             
-            # WORRRRRRRRRRRRRRRRRRRRRRRRRRRRRRRRRNGGGGGGGGGGGGGGGGGGGGGGGGGGGGG
-            #self.other_vehicle_start_loc_carla_rotation = carla.Rotation(pitch=0.0, yaw=90.0, roll=0.0 )
-            self.other_vehicle_start_loc_carla_rotation = carla.Rotation(pitch=0.0, yaw=270.0, roll=0.0 )
-            self.other_vehicle_start_loc_carla_transform = carla.Transform(self.other_vehicle_start_loc_carla_location, self.other_vehicle_start_loc_carla_rotation)
-
-            self.other_vehicle_start_carla_transform_dict = {"key_transform": self.other_vehicle_start_loc_carla_transform, 
-            "key_location_string": start_location_string}
-
-        elif start_location_string == "right":
-
-            #self.other_vehicle_start_loc_carla_location = carla.Location(x=-69.68, y=-139.5, z=0.5) 
-            #self.other_vehicle_start_loc_carla_location = carla.Location(x=-45.08, y=-139.5, z=0.5) 
-            self.other_vehicle_start_loc_carla_location = carla.Location(x=-55.08, y=-139.5, z=0.5) 
-            # WORRRRRRRRRRRRRRRRRRRRRRRRRRRRRRRRRNGGGGGGGGGGGGGGGGGGGGGGGGGGGGG
-            #self.other_vehicle_start_loc_carla_rotation = carla.Rotation(pitch=0.0, yaw=270, roll=0.0 )
-            self.other_vehicle_start_loc_carla_rotation = carla.Rotation(pitch=0.0, yaw=180.0, roll=0.0 )
-            self.other_vehicle_start_loc_carla_transform = carla.Transform(self.other_vehicle_start_loc_carla_location, self.other_vehicle_start_loc_carla_rotation)
-
-            self.other_vehicle_start_carla_transform_dict = {"key_transform": self.other_vehicle_start_loc_carla_transform, 
-            "key_location_string": start_location_string}
-
-        else:
-
-            raise ValueError("Unexpected value for select_other_vehicle_start_loc for other vehicle")
-
-
-    def select_other_vehicle_stopothertrigger_loc(self, other_vehicle_goal_location="base"):  # THE GOAL LOCATION OF Other vehicle 
-
-        # move all of them 7.5 way points ahead for the other veh automatic controller and also have to make it a valid lane and goal location for the controller so I guess I'll use the values from ego end locaiton trigger values :3 leme double check through screenshots first :3
-
-        if other_vehicle_goal_location == "base":
-
-            # self.other_vehicle_stopothertrigger_min_x = -91.6
-            # self.other_vehicle_stopothertrigger_max_x = -81.6
-            # self.other_vehicle_stopothertrigger_min_y = -104.92
-            # self.other_vehicle_stopothertrigger_max_y = -94.92
-
-            # move all of them 7.5 way points ahead for the other veh automatic controller and also have to make it a valid lane and goal location for the controller so I guess I'll use the values from ego end locaiton trigger values :3 leme double check through screenshots first :3
-
-            self.other_vehicle_stopothertrigger_min_x = -95.20  # delta is 20 i.e. half is 10
-            self.other_vehicle_stopothertrigger_max_x = -75.20
-
-            self.other_vehicle_stopothertrigger_min_y = -57    # delta was 14
-            self.other_vehicle_stopothertrigger_max_y = -43
-
-
-            self.other_vehicle_destination_x = -85.20
-            self.other_vehicle_destination_y = -30.0  # Extended in logitudinal direction
-
-            # WRONG BELOW!!!
-            #self.ego_endconditiontrigger_dict = {"key_other_vehicle_stopothertrigger_min_x": self.other_vehicle_stopothertrigger_min_x, 
-            
-            self.other_vehicle_stopothertrigger_dict = {"key_other_vehicle_stopothertrigger_min_x": self.other_vehicle_stopothertrigger_min_x, 
-            "key_other_vehicle_stopothertrigger_max_x": self.other_vehicle_stopothertrigger_max_x, 
-            "key_other_vehicle_stopothertrigger_min_y": self.other_vehicle_stopothertrigger_min_y, 
-            "key_other_vehicle_stopothertrigger_max_y": self.other_vehicle_stopothertrigger_max_y,
-            "key_other_vehicle_destination_x": self.other_vehicle_destination_x,
-            "key_other_vehicle_destination_y": self.other_vehicle_destination_y}
-            
-        elif other_vehicle_goal_location == "left":
-
-            # self.other_vehicle_stopothertrigger_min_x = -129.64
-            # self.other_vehicle_stopothertrigger_max_x = -119.64
-            # self.other_vehicle_stopothertrigger_min_y = -142
-            # self.other_vehicle_stopothertrigger_max_y = -132
-
-
-            self.other_vehicle_stopothertrigger_min_x = -155.77  # DELTA IS 14 i.e. half is 7
-            # mid x = -148.77
-            self.other_vehicle_stopothertrigger_max_x = -141.77
-
-
-            self.other_vehicle_stopothertrigger_min_y = -106.91  # delat is 20 i.e. half is 10
-            # mid y = -96.91
-            self.other_vehicle_stopothertrigger_max_y = -86.91
-
-
-            self.other_vehicle_destination_x = -148.97  # extended longitudinally
-            self.other_vehicle_destination_y = -76.77  # extended longitudinally
-
-
-            #self.ego_endconditiontrigger_dict = {"key_other_vehicle_stopothertrigger_min_x": self.other_vehicle_stopothertrigger_min_x, 
-            
-            self.other_vehicle_stopothertrigger_dict = {"key_other_vehicle_stopothertrigger_min_x": self.other_vehicle_stopothertrigger_min_x, 
-            "key_other_vehicle_stopothertrigger_max_x": self.other_vehicle_stopothertrigger_max_x, 
-            "key_other_vehicle_stopothertrigger_min_y": self.other_vehicle_stopothertrigger_min_y, 
-            "key_other_vehicle_stopothertrigger_max_y": self.other_vehicle_stopothertrigger_max_y,
-            "key_other_vehicle_destination_x": self.other_vehicle_destination_x,
-            "key_other_vehicle_destination_y": self.other_vehicle_destination_y}
-        
-        elif other_vehicle_goal_location == "right":
-
-            # self.other_vehicle_stopothertrigger_min_x = -45
-            # self.other_vehicle_stopothertrigger_max_x = -35
-            # self.other_vehicle_stopothertrigger_min_y = -140
-            # self.other_vehicle_stopothertrigger_max_y = -130
-
-            self.other_vehicle_stopothertrigger_min_x = 3.0  # delta is 14 i.e. half is 7
-            # mid x = 10
-            self.other_vehicle_stopothertrigger_max_x = 17.0
-
-
-            self.other_vehicle_stopothertrigger_min_y = -148.17
-            self.other_vehicle_stopothertrigger_max_y = -128.17
-
-
-
-            self.other_vehicle_destination_x = 30.0  # Extended longitudinally
-            self.other_vehicle_destination_y = -135.95
-
-            #self.ego_endconditiontrigger_dict = {"key_other_vehicle_stopothertrigger_min_x": self.other_vehicle_stopothertrigger_min_x, 
-            
-            self.other_vehicle_stopothertrigger_dict = {"key_other_vehicle_stopothertrigger_min_x": self.other_vehicle_stopothertrigger_min_x, 
-            "key_other_vehicle_stopothertrigger_max_x": self.other_vehicle_stopothertrigger_max_x, 
-            "key_other_vehicle_stopothertrigger_min_y": self.other_vehicle_stopothertrigger_min_y, 
-            "key_other_vehicle_stopothertrigger_max_y": self.other_vehicle_stopothertrigger_max_y,
-            "key_other_vehicle_destination_x": self.other_vehicle_destination_x,
-            "key_other_vehicle_destination_y": self.other_vehicle_destination_y}
-
-
-        else:
-            raise ValueError("Unexpected value for other_vehicle_stopothertrigger for other vehicle")
-
-
-
-
-def main():
-    """
-    main function
-    """
-    description = ("CARLA Scenario Runner: Setup, Run and Evaluate scenarios using CARLA\n"
-                   "Current version: " + VERSION)
-
-    # pylint: disable=line-too-long
-    parser = argparse.ArgumentParser(description=description,
-                                     formatter_class=RawTextHelpFormatter)
-    parser.add_argument('-v', '--version', action='version', version='%(prog)s ' + VERSION)
-    parser.add_argument('--host', default='127.0.0.1',
-                        help='IP of the host server (default: localhost)')
-    parser.add_argument('--port', default='2000',
-                        help='TCP port to listen to (default: 2000)')
-    parser.add_argument('--timeout', default="10.0",
-                        help='Set the CARLA client timeout value in seconds')
-    parser.add_argument('--trafficManagerPort', default='8000',
-                        help='Port to use for the TrafficManager (default: 8000)')
-    parser.add_argument('--trafficManagerSeed', default='0',
-                        help='Seed used by the TrafficManager (default: 0)')
-    parser.add_argument('--sync', action='store_true',
-                        help='Forces the simulation to run synchronously')
-    parser.add_argument('--list', action="store_true", help='List all supported scenarios and exit')
-
-    parser.add_argument(
-        '--scenario', help='Name of the scenario to be executed. Use the preposition \'group:\' to run all scenarios of one class, e.g. ControlLoss or FollowLeadingVehicle')
-    parser.add_argument('--openscenario', help='Provide an OpenSCENARIO definition')
-    parser.add_argument(
-        '--route', help='Run a route as a scenario (input: (route_file,scenario_file,[route id]))', nargs='+', type=str)  # route file (routes_debug.xml) and scenario file (all_towns_traffic_scenarios1_3_4.json) and route id (0) required
-
-    parser.add_argument(
-        '--agent', help="Agent used to execute the scenario. Currently only compatible with route-based scenarios.")  # can be npc_agent.py or even a humancontroller agent that uses manual_control.py or a custon defined agent :)
-    parser.add_argument('--agentConfig', type=str, help="Path to Agent's configuration file", default="")
-
-    parser.add_argument('--output', action="store_true", help='Provide results on stdout')
-    parser.add_argument('--file', action="store_true", help='Write results into a txt file')
-    parser.add_argument('--junit', action="store_true", help='Write results into a junit file')
-    parser.add_argument('--outputDir', default='', help='Directory for output files (default: this directory)')
-
-    parser.add_argument('--configFile', default='', help='Provide an additional scenario configuration file (*.xml)')
-    parser.add_argument('--additionalScenario', default='', help='Provide additional scenario implementations (*.py)')
-
-    parser.add_argument('--debug', action="store_true", help='Run with debug output')
-    parser.add_argument('--reloadWorld', action="store_true",
-                        help='Reload the CARLA world before starting a scenario (default=True)')
-    parser.add_argument('--record', type=str, default='',
-                        help='Path were the files will be saved, relative to SCENARIO_RUNNER_ROOT.\nActivates the CARLA recording feature and saves to file all the criteria information.')
-    parser.add_argument('--randomize', action="store_true", help='Scenario parameters are randomized')
-    parser.add_argument('--repetitions', default=1, type=int, help='Number of scenario executions')
-    parser.add_argument('--waitForEgo', action="store_true", help='Connect the scenario to an existing ego vehicle')
-    parser.add_argument('--show_int_wps', action="store_true", help='Show intersection waypoints')
-    parser.add_argument('--show_int_wp_locs', action="store_true", help='Show waypoint locations, just command works if show_int_wps is activated')
-    parser.add_argument('--not_visualize', action="store_false", help='Do not show pygame window for ego veh driving')
-    parser.add_argument('--Activate_IntersectionScenario_Seed', action="store_true", help='Use Intersection random num see or not')
-    parser.add_argument('--IntersectionScenario_Seed', default=0, type=int,
-                            help='Seed used by the IntersectionScenarios (default: 0)')
-    parser.add_argument('--use_sit_cov', action="store_true", help='Do situation coverage based generation')
-    parser.add_argument('--disable_env_cond_gen', action="store_false", help='Disable environemntal conditions generation')
-
-    #parser.add_argument('--IntersectionScenario_Seed', default='0',
-                            #help='Seed used by the IntersectionScenarios (default: 0)')
-
-
-
-    arguments = parser.parse_args()
-    # pylint: enable=line-too-long
-
-    if arguments.list:
-        print("Currently the following scenarios are supported:")
-        print(*ScenarioConfigurationParser.get_list_of_scenarios(arguments.configFile), sep='\n')
-        return 1
-
-    if not arguments.scenario and not arguments.openscenario and not arguments.route:
-        print("Please specify either a scenario or use the route mode\n\n")
-        parser.print_help(sys.stdout)
-        return 1
-
-    if arguments.route and (arguments.openscenario or arguments.scenario):
-        print("The route mode cannot be used together with a scenario (incl. OpenSCENARIO)'\n\n")
-        parser.print_help(sys.stdout)
-        return 1
-
-    if arguments.agent and (arguments.openscenario or arguments.scenario):
-        print("Agents are currently only compatible with route scenarios'\n\n")
-        parser.print_help(sys.stdout)
-        return 1
-
-    if arguments.route:
-        arguments.reloadWorld = True
-
-    if arguments.agent:
-        arguments.sync = True
+        try:
+            coordinator = CampaignCoordinator(arguments)
+        except ValueError as e:
+            print(e)
+            return 1
+        return not coordinator.run()
 
     scenario_runner = None
     result = True
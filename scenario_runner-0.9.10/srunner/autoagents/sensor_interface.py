@@ -14,6 +14,8 @@ import numpy as np
 
 import carla
 
+from srunner.tools.frame_ingestion import FrameRing
+
 
 class CallBack(object):
 
@@ -27,6 +29,7 @@ class CallBack(object):
         """
         self._tag = tag
         self._data_provider = data_provider
+        self.frame_ring = FrameRing()  # camera frames, BGRA, copied by SensorInterface.get_data
 
         self._data_provider.register_sensor(tag, sensor)
 
@@ -48,9 +51,7 @@ class CallBack(object):
         """
         parses cameras
         """
-        array = np.frombuffer(image.raw_data, dtype=np.dtype("uint8"))
-        array = copy.deepcopy(array)
-        array = np.reshape(array, (image.height, image.width, 4))
+        array = self.frame_ring.ingest(image)
         self._data_provider.update_sensor(tag, array, image.frame)
 
     def _parse_lidar_cb(self, lidar_data, tag):
@@ -117,9 +118,15 @@ class SensorInterface(object):
 
     def get_data(self):
         """
-        Returns the data of a sensor
+        Returns the data of all the sensors.
+
+        The arrays are copies owned by the caller: camera frames live in the frame ring
+        of their CallBack, whose buffers are overwritten by the following frames.
         """
         data_dict = {}
         for key in self._sensors_objects:
-            data_dict[key] = (self._timestamps[key], self._data_buffers[key])
+            data = self._data_buffers[key]
+            if isinstance(data, np.ndarray):
+                data = data.copy()
+            data_dict[key] = (self._timestamps[key], data)
         return data_dict
@@ -14,7 +14,7 @@ It is meant to serve as an example of how to use the information from
 the recorder
 """
 
-import math
+import numpy as np
 import matplotlib.pyplot as plt
 
 from srunner.metrics.examples.basic_metric import BasicMetric
@@ -35,31 +35,26 @@ class DistanceBetweenVehicles(BasicMetric):
         ego_id = log.get_ego_vehicle_id()
         adv_id = log.get_actor_ids_with_role_name("scenario")[0]  # Could have also used its type_id
 
-        dist_list = []
-        frames_list = []
-
         # Get the frames both actors were alive
         start_ego, end_ego = log.get_actor_alive_frames(ego_id)
         start_adv, end_adv = log.get_actor_alive_frames(adv_id)
         start = max(start_ego, start_adv)
         end = min(end_ego, end_adv)
 
-        # Get the distance between the two
-        for i in range(start, end):
-
-            # Get the transforms
-            ego_location = log.get_actor_transform(ego_id, i).location
-            adv_location = log.get_actor_transform(adv_id, i).location
+        # Get the transforms, as arrays, and keep the frames recorded for both
+        ego = log.get_actor_state_arrays(ego_id, "transform", start, end - 1)
+        adv = log.get_actor_state_arrays(adv_id, "transform", start, end - 1)
+        frames_list, ego_rows, adv_rows = np.intersect1d(ego["frame"], adv["frame"], return_indices=True)
 
-            # Filter some points for a better graph
-            if adv_location.z < -10:
-                continue
-
-            dist_v = ego_location - adv_location
-            dist = math.sqrt(dist_v.x * dist_v.x + dist_v.y * dist_v.y + dist_v.z * dist_v.z)
-
-            dist_list.append(dist)
-            frames_list.append(i)
+        # Get the distance between the two
+        dist_list = np.sqrt((ego["x"][ego_rows] - adv["x"][adv_rows]) ** 2 +
+                            (ego["y"][ego_rows] - adv["y"][adv_rows]) ** 2 +
+                            (ego["z"][ego_rows] - adv["z"][adv_rows]) ** 2)
+
+        # Filter some points for a better graph
+        valid = adv["z"][adv_rows] >= -10
+        frames_list = frames_list[valid]
+        dist_list = dist_list[valid]
 
         # Use matplotlib to show the results
         plt.plot(frames_list, dist_list)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Support functions of the MetricsManager to keep the parsed recorder next to the log,
+so that running other metrics on the same log needs neither the simulator nor parsing it again.
+
+The cache of "<name>.log" is the directory "<name>.log.cache", with:
+- index.json: cache version, size and modification time of the log, and the offset of each array
+- states.bin: the frames and values of the actor states (see ActorStateColumns), opened with np.memmap
+- events.txt: the recorder lines that aren't actor states, parsed again when the cache is opened
+- map.xodr: OpenDRIVE of the map, to create the carla.Map without a simulator
+
+The cache is written in a temporary directory that then replaces the previous one,
+and it is only used if the size and modification time of the log haven't changed.
+"""
+
+from __future__ import print_function
+
+import io
+import json
+import os
+import shutil
+
+import numpy as np
+
+from srunner.metrics.tools.metrics_parser import MetricsParser, ActorStateColumns, STATE_FIELDS
+
+CACHE_VERSION = 1
+
+
+def get_cache_dir(log_file):
+    """
+    Returns the cache directory of a log file
+    """
+    return log_file + ".cache"
+
+
+def _get_log_key(log_file):
+    """
+    Returns the size and modification time of the log, which identify the cached version
+    """
+    stat = os.stat(log_file)
+    return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def save_log_cache(log_file, recorder_info, event_lines, opendrive):
+    """
+    Writes the cache of a log.
+
+    Args:
+        log_file (str): path to the .log file
+        recorder_info (tuple): information returned by MetricsParser.parse_recorder_info
+        event_lines (list): lines kept by the MetricsParser (keep_event_lines=True)
+        opendrive (str): OpenDRIVE of the map of the simulation
+    """
+    cache_dir = get_cache_dir(log_file)
+    tmp_dir = "{}.tmp{}".format(cache_dir, os.getpid())
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    os.makedirs(tmp_dir)
+
+    states_info = recorder_info[3]
+    index = {"version": CACHE_VERSION, "key": _get_log_key(log_file), "states": []}
+
+    # All the arrays one after the other, aligned to 8 bytes
+    offset = 0
+    with open(os.path.join(tmp_dir, "states.bin"), "wb") as fd:
+        for actor_id, actor_states in states_info.items():
+            for state, columns in actor_states.items():
+                frames = np.ascontiguousarray(columns.frames, dtype=np.int32)
+                values = np.ascontiguousarray(columns.values, dtype=np.float64)
+
+                entry = {"actor_id": actor_id, "state": state, "rows": len(frames), "frames_offset": offset}
+                fd.write(frames.tobytes())
+                offset += frames.nbytes
+                padding = -offset % 8
+                fd.write(b"\0" * padding)
+                offset += padding
+
+                entry["values_offset"] = offset
+                fd.write(values.tobytes())
+                offset += values.nbytes
+                index["states"].append(entry)
+
+    with io.open(os.path.join(tmp_dir, "events.txt"), "w", encoding="utf-8") as fd:
+        for line in event_lines:
+            fd.write("{}\n".format(line))
+
+    with io.open(os.path.join(tmp_dir, "map.xodr"), "w", encoding="utf-8") as fd:
+        fd.write(opendrive)
+
+    # The index goes last, a cache without it is never used
+    with io.open(os.path.join(tmp_dir, "index.json"), "w", encoding="utf-8") as fd:
+        json.dump(index, fd)
+
+    if os.path.exists(cache_dir):
+        shutil.rmtree(cache_dir)
+    os.rename(tmp_dir, cache_dir)
+
+
+def load_log_cache(log_file):
+    """
+    Opens the cache of a log, returning the information as given by
+    MetricsParser.parse_recorder_info and the OpenDRIVE of the map.
+    Returns None if there is no cache or it belongs to another version of the log.
+
+    Args:
+        log_file (str): path to the .log file
+    """
+    cache_dir = get_cache_dir(log_file)
+    index_file = os.path.join(cache_dir, "index.json")
+    if not os.path.exists(index_file):
+        return None
+
+    try:
+        with io.open(index_file, encoding="utf-8") as fd:
+            index = json.load(fd)
+    except ValueError:
+        return None
+
+    if index.get("version") != CACHE_VERSION or index.get("key") != _get_log_key(log_file):
+        return None
+
+    # Everything except the actor states
+    with io.open(os.path.join(cache_dir, "events.txt"), encoding="utf-8") as fd:
+        simulation_info, actors_info, frames_info, _, events_info = MetricsParser(fd).parse_recorder_info()
+
+    # The actor states, as views of the mapped file
+    states_info = {}
+    states_file = os.path.join(cache_dir, "states.bin")
+    if os.path.getsize(states_file) > 0:
+        data = np.memmap(states_file, dtype=np.uint8, mode='r')
+        for entry in index["states"]:
+            fields = STATE_FIELDS[entry["state"]]
+            rows = entry["rows"]
+            frames_start = entry["frames_offset"]
+            values_start = entry["values_offset"]
+
+            columns = ActorStateColumns(fields)
+            columns.frames = data[frames_start:frames_start + 4 * rows].view(np.int32)
+            columns.values = data[values_start:values_start + 8 * rows * len(fields)].view(
+                np.float64).reshape(rows, len(fields))
+            states_info.setdefault(entry["actor_id"], {})[entry["state"]] = columns
+
+    with io.open(os.path.join(cache_dir, "map.xodr"), encoding="utf-8") as fd:
+        opendrive = fd.read()
+
+    return (simulation_info, actors_info, frames_info, states_info, events_info), opendrive
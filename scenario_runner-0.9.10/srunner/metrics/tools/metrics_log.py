@@ -11,24 +11,77 @@ Support class of the MetricsManager to query the information available
 to the metrics.
 
 It also provides a series of functions to help the user querry
-specific information
+specific information. The states of the actors are kept as NumPy arrays,
+which can be queried directly with get_actor_state_arrays
 """
 
 import fnmatch
-from srunner.metrics.tools.metrics_parser import MetricsParser
+import math
+
+import carla
+
+from srunner.metrics.tools.metrics_parser import (MetricsParser,
+                                                  NUMBER_TO_TRAFFIC_LIGHT_STATE,
+                                                  STR_TO_VEHICLE_LIGHT,
+                                                  find_last_event)
+
+
+# The getters return plain Python values, not NumPy scalars of the state arrays
+
+def _to_transform(row):
+    return carla.Transform(carla.Location(float(row[0]), float(row[1]), float(row[2])),
+                           carla.Rotation(float(row[4]), float(row[5]), float(row[3])))
+
+
+def _to_vector(row):
+    return carla.Vector3D(float(row[0]), float(row[1]), float(row[2]))
+
+
+def _to_control(row):
+    return carla.VehicleControl(float(row[0]), float(row[1]), float(row[2]), bool(row[3]),
+                                bool(row[4] < 0), False, int(row[4]))
+
+
+def _to_lights(row):
+    lights = int(row[0])
+    if lights == 0:
+        return [carla.VehicleLightState.NONE]
+    return [light for light in STR_TO_VEHICLE_LIGHT.values() if int(light) and lights & int(light)]
+
+
+# State name -> (columns holding it, function returning it from a row of the columns)
+STATE_GETTERS = {
+    "transform": ("transform", _to_transform),
+    "velocity": ("velocity", _to_vector),
+    "angular_velocity": ("angular_velocity", _to_vector),
+    "acceleration": ("acceleration", _to_vector),
+    "control": ("control", _to_control),
+    "speed": ("speed", lambda row: float(row[0])),
+    "state": ("traffic_light", lambda row: NUMBER_TO_TRAFFIC_LIGHT_STATE[int(row[0])]),
+    "frozen": ("traffic_light", lambda row: bool(row[1])),
+    "elapsed_time": ("traffic_light", lambda row: float(row[2])),
+    "lights": ("lights", _to_lights),
+}
 
 class MetricsLog(object):  # pylint: disable=too-many-public-methods
     """
     Utility class to query the log.
     """
 
-    def __init__(self, recorder):
+    def __init__(self, recorder=None, recorder_info=None):
         """
         Initializes the log class and parses it to extract the dictionaries.
+
+        Args:
+            recorder (str): string given by the recorder
+            recorder_info (tuple): already parsed information, as returned by
+                MetricsParser.parse_recorder_info (e.g. from the metrics cache)
         """
         # Parse the information
-        parser = MetricsParser(recorder)
-        self._simulation, self._actors, self._frames = parser.parse_recorder_info()
+        if recorder_info is None:
+            parser = MetricsParser(recorder)
+            recorder_info = parser.parse_recorder_info()
+        self._simulation, self._actors, self._frames, self._states, self._events = recorder_info
 
     ### Functions used to get general info of the simulation ###
     def get_actor_collisions(self, actor_id):
@@ -39,15 +92,7 @@ class MetricsLog(object):  # pylint: disable=too-many-public-methods
         Args:
             actor_id (int): ID of the actor.
         """
-        actor_collisions = {}
-
-        for i, frame in enumerate(self._frames):
-            collisions = frame["events"]["collisions"]
-
-            if actor_id in collisions:
-                actor_collisions.update({i: collisions[actor_id]})
-
-        return actor_collisions
+        return dict(self._events["collisions"].get(actor_id, {}))
 
     def get_total_frame_count(self):
         """
@@ -61,21 +106,22 @@ class MetricsLog(object):  # pylint: disable=too-many-public-methods
         Returns a float with the elapsed time of a specific frame.
         """
 
-        return self._frames[frame]["frame"]["elapsed_time"]
+        return float(self._frames["elapsed_time"][frame])
 
     def get_delta_time(self, frame):
         """
         Returns a float with the delta time of a specific frame.
         """
 
-        return self._frames[frame]["frame"]["delta_time"]
+        return float(self._frames["delta_time"][frame])
 
     def get_platform_time(self, frame):
         """
         Returns a float with the platform time time of a specific frame.
         """
 
-        return self._frames[frame]["frame"]["platform_time"]
+        platform_time = float(self._frames["platform_time"][frame])
+        return None if math.isnan(platform_time) else platform_time
 
     ### Functions used to get info about the actors ###
     def get_ego_vehicle_id(self):
@@ -191,19 +237,18 @@ class MetricsLog(object):  # pylint: disable=too-many-public-methods
             frame: (int): frame number of the simulation.
             attribute (str): name of the actor's attribute to be returned.
         """
-        frame_state = self._frames[frame - 1]["actors"]
-
-        # Check if the actor exists
-        if actor_id in frame_state:
+        columns_name, getter = STATE_GETTERS[state]
+        columns = self._states.get(actor_id, {}).get(columns_name)
 
-            # Check if the state exists
-            if state not in frame_state[actor_id]:
-                return None
+        # Check if the actor and the state exist
+        if columns is None:
+            return None
 
-            state_info = frame_state[actor_id][state]
-            return state_info
+        row = columns.row_at(frame)
+        if row < 0:
+            return None
 
-        return None
+        return getter(columns.values[row])
 
     def _get_all_actor_states(self, actor_id, state, first_frame=None, last_frame=None):
         """
@@ -223,11 +268,16 @@ class MetricsLog(object):  # pylint: disable=too-many-public-methods
         if last_frame is None:
             last_frame = self.get_total_frame_count()
 
-        state_list = []
+        state_list = [None] * max(last_frame - first_frame + 1, 0)
 
-        for frame_number in range(first_frame, last_frame + 1):
-            state_info = self._get_actor_state(actor_id, state, frame_number)
-            state_list.append(state_info)
+        columns_name, getter = STATE_GETTERS[state]
+        columns = self._states.get(actor_id, {}).get(columns_name)
+        if columns is None:
+            return state_list
+
+        rows = columns.rows_between(first_frame, last_frame)
+        for frame_number, values in zip(columns.frames[rows], columns.values[rows]):
+            state_list[frame_number - first_frame] = getter(values)
 
         return state_list
 
@@ -239,19 +289,54 @@ class MetricsLog(object):  # pylint: disable=too-many-public-methods
         By default, all actors will be considered.
         """
         states = {}
-        actor_info = self._frames[frame]["actors"]
 
-        for actor_id in actor_info:
+        for actor_id in self._states:
             if not actor_list:
                 _state = self._get_actor_state(actor_id, state, frame)
-                if _state:
+                if _state is not None:
                     states.update({actor_id: _state})
-            elif actor_id in actor_list:
+            elif actor_id in actor_list and self._is_actor_recorded(actor_id, frame):
                 _state = self._get_actor_state(actor_id, state, frame)
                 states.update({actor_id: _state})
 
         return states
 
+    def _is_actor_recorded(self, actor_id, frame):
+        """
+        Returns whether or not any state of the actor was recorded at the given frame.
+        """
+        for columns in self._states[actor_id].values():
+            if columns.row_at(frame) >= 0:
+                return True
+        return False
+
+    def get_actor_state_arrays(self, actor_id, state, first_frame=None, last_frame=None):
+        """
+        Returns a dictionary with the NumPy arrays of a state of the actor during a frame interval:
+        "frame", with the frames the state was recorded at, and one array per field of the state
+        (see metrics_parser.STATE_FIELDS, e.g. "x", "y", "z", "roll", "pitch" and "yaw" for "transform").
+        Returns None if the actor_id or the state are missing.
+
+        The arrays are views of the parsed log, they shouldn't be modified.
+
+        Args:
+            actor_id (int): ID of the actor.
+            state (str): "transform", "velocity", "angular_velocity", "acceleration",
+                "control", "speed", "traffic_light" or "lights"
+            first_frame (int): First frame checked. By default, 1.
+            last_frame (int): Last frame checked. By default, max number of frames.
+        """
+        columns = self._states.get(actor_id, {}).get(state)
+        if columns is None:
+            return None
+
+        if first_frame is None:
+            first_frame = 1
+        if last_frame is None:
+            last_frame = self.get_total_frame_count()
+
+        return columns.get_arrays(columns.rows_between(first_frame, last_frame))
+
     # Transforms
     def get_actor_transform(self, actor_id, frame):
         """
@@ -345,13 +430,8 @@ class MetricsLog(object):  # pylint: disable=too-many-public-methods
         Returns None if the id can't be found.
         """
 
-        for i in range(frame - 1, -1, -1):  # Go backwards from the frame until 0
-            physics_info = self._frames[i]["events"]["physics_control"]
-
-            if vehicle_id in physics_info:
-                return physics_info[vehicle_id]
-
-        return None
+        # Last one at or before the frame
+        return find_last_event(self._events["physics_control"], vehicle_id, frame - 1)
 
     def get_walker_speed(self, walker_id, frame):
         """
@@ -384,13 +464,10 @@ class MetricsLog(object):  # pylint: disable=too-many-public-methods
         Returns None if the id can't be found.
         """
 
-        for i in range(frame - 1, -1, -1):  # Go backwards from the frame until 0
-            state_times_info = self._frames[i]["events"]["traffic_light_state_time"]
-
-            if traffic_light_id in state_times_info:
-                states = state_times_info[traffic_light_id]
-                if state in states:
-                    return state_times_info[traffic_light_id][state]
+        # Last one at or before the frame
+        states = find_last_event(self._events["traffic_light_state_time"], traffic_light_id, frame - 1)
+        if states and state in states:
+            return states[state]
 
         return None
 
@@ -419,10 +496,5 @@ class MetricsLog(object):  # pylint: disable=too-many-public-methods
         Returns None if the id can't be found.
         """
 
-        for i in range(frame - 1, -1, -1):  # Go backwards from the frame until 0
-            scene_lights_info = self._frames[i]["events"]["scene_lights"]
-
-            if light_id in scene_lights_info:
-                return scene_lights_info[light_id]
-
-        return None
+        # Last one at or before the frame
+        return find_last_event(self._events["scene_lights"], light_id, frame - 1)
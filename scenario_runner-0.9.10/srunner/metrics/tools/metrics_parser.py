@@ -8,11 +8,76 @@
 
 """
 Support class of the MetricsManager to parse the information of
-the CARLA recorder into a readable dictionary
+the CARLA recorder into readable dictionaries and per actor arrays
 """
 
+from array import array
+import bisect
+
+import numpy as np
+from six import string_types
+
 import carla
 
+STR_TO_VEHICLE_LIGHT = {
+    "None": carla.VehicleLightState.NONE,
+    "Position": carla.VehicleLightState.Position,
+    "LowBeam": carla.VehicleLightState.LowBeam,
+    "HighBeam": carla.VehicleLightState.HighBeam,
+    "Brake": carla.VehicleLightState.Brake,
+    "RightBlinker": carla.VehicleLightState.RightBlinker,
+    "LeftBlinker": carla.VehicleLightState.LeftBlinker,
+    "Reverse": carla.VehicleLightState.Reverse,
+    "Fog": carla.VehicleLightState.Fog,
+    "Interior": carla.VehicleLightState.Interior,
+    "Special1": carla.VehicleLightState.Special1,
+    "Special2": carla.VehicleLightState.Special2,
+}
+
+NUMBER_TO_TRAFFIC_LIGHT_STATE = {
+    0: carla.TrafficLightState.Red,
+    1: carla.TrafficLightState.Yellow,
+    2: carla.TrafficLightState.Green,
+    3: carla.TrafficLightState.Off,
+    4: carla.TrafficLightState.Unknown,
+}
+
+# Sections of a frame whose rows are stored as columns
+COLUMN_SECTIONS = ("positions", "traffic_lights", "vehicle_animations",
+                   "walker_animations", "vehicle_lights", "dynamic_actors")
+
+# Fields of the per actor states, stored as columns
+STATE_FIELDS = {
+    "transform": ("x", "y", "z", "roll", "pitch", "yaw"),
+    "velocity": ("x", "y", "z"),
+    "angular_velocity": ("x", "y", "z"),
+    "acceleration": ("x", "y", "z"),
+    "control": ("throttle", "steer", "brake", "hand_brake", "gear"),
+    "speed": ("speed",),
+    "traffic_light": ("state", "frozen", "elapsed_time"),
+    "lights": ("lights",),
+}
+
+
+def iter_lines(recorder_info):
+    """
+    Yields the lines of the recorder information one by one
+
+    Args:
+        recorder_info (str or iterable): string given by the recorder, or an iterable of its lines (e.g. a file)
+    """
+    if isinstance(recorder_info, string_types):
+        start = 0
+        while start < len(recorder_info):
+            end = recorder_info.find("\n", start)
+            if end == -1:
+                end = len(recorder_info)
+            yield recorder_info[start:end]
+            start = end + 1
+    else:
+        for line in recorder_info:
+            yield line.rstrip("\r\n")
+
 
 def parse_actor(info):
     """
@@ -84,24 +149,9 @@ def parse_vehicle_lights(info):
     Args:
         info (list): list corresponding to a row of the recorder
     """
-    srt_to_vlight = {
-        "None": carla.VehicleLightState.NONE,
-        "Position": carla.VehicleLightState.Position,
-        "LowBeam": carla.VehicleLightState.LowBeam,
-        "HighBeam": carla.VehicleLightState.HighBeam,
-        "Brake": carla.VehicleLightState.Brake,
-        "RightBlinker": carla.VehicleLightState.RightBlinker,
-        "LeftBlinker": carla.VehicleLightState.LeftBlinker,
-        "Reverse": carla.VehicleLightState.Reverse,
-        "Fog": carla.VehicleLightState.Fog,
-        "Interior": carla.VehicleLightState.Interior,
-        "Special1": carla.VehicleLightState.Special1,
-        "Special2": carla.VehicleLightState.Special2,
-    }
-
     lights = []
     for i in range(2, len(info)):
-        lights.append(srt_to_vlight[info[i]])
+        lights.append(STR_TO_VEHICLE_LIGHT[info[i]])
 
     return lights
 
@@ -113,16 +163,8 @@ def parse_traffic_light(info):
     Args:
         info (list): list corresponding to a row of the recorder
     """
-    number_to_state = {
-        "0": carla.TrafficLightState.Red,
-        "1": carla.TrafficLightState.Yellow,
-        "2": carla.TrafficLightState.Green,
-        "3": carla.TrafficLightState.Off,
-        "4": carla.TrafficLightState.Unknown,
-    }
-
     traffic_light = {
-        "state": number_to_state[info[3]],
+        "state": NUMBER_TO_TRAFFIC_LIGHT_STATE[int(info[3])],
         "frozen": bool(int(info[5])),
         "elapsed_time": float(info[7]),
     }
@@ -279,340 +321,463 @@ def parse_wheels_control(info):
     return gears_control
 
 
-class MetricsParser(object):
+class ActorStateColumns(object):
     """
-    Class used to parse the CARLA recorder into readable information
+    Columns of one state of one actor (e.g. its transform): the frames it was recorded at
+    and one array per field. Rows are appended while parsing, in frame order, and turned
+    into NumPy arrays by finalize().
     """
 
-    def __init__(self, recorder_info):
+    def __init__(self, fields):
 
-        self.recorder_info = recorder_info
-        self.frame_list = None
-        self.frame_row = None
-        self.i = 0
+        self.fields = fields
+        self.frames = array('i')
+        self.values = array('d')
 
-    def get_row_elements(self, indent_num, split_string):
+    def append(self, frame, values):
         """
-        returns a list with the elements of the row
+        Adds the values of a frame
         """
-        return self.frame_row[indent_num:].split(split_string)
+        self.frames.append(frame)
+        self.values.extend(values)
 
-    def next_row(self):
+    def finalize(self):
         """
-        Gets the next row of the recorder
+        Turns the columns into NumPy arrays, viewing the parsed buffers without copying them
         """
-        self.i += 1
-        self.frame_row = self.frame_list[self.i]
+        self.frames = np.frombuffer(self.frames, dtype=np.intc)
+        self.values = np.frombuffer(self.values, dtype=np.float64).reshape(-1, len(self.fields))
 
-    def parse_recorder_info(self):
+    def row_at(self, frame):
         """
-        Parses the recorder into readable information.
-
-        Args:
-            recorder_info (str): string given by the recorder
+        Returns the row of a frame, -1 if the state wasn't recorded at that frame
         """
+        row = int(np.searchsorted(self.frames, frame))
+        if row < len(self.frames) and self.frames[row] == frame:
+            return row
+        return -1
 
-        # Divide it into frames
-        recorder_list = self.recorder_info.split("Frame")
-
-        # Get general information
-        header = recorder_list[0].split("\n")
-        sim_map = header[1][5:]
-        sim_date = header[2][6:]
-
-        annex = recorder_list[-1].split("\n")
-        sim_frames = int(annex[0][3:])
-        sim_duration = float(annex[1][10:-8])
-
-        recorder_list = recorder_list[1:-1]
-
-        simulation_info = {
-            "map": sim_map,
-            "date:": sim_date,
-            "total_frames": sim_frames,
-            "duration": sim_duration
-        }
-
-        actors_info = {}
-        frames_info = []
-
-        for frame in recorder_list:
-
-            # Divide the frame in lines
-            self.frame_list = frame.split("\n")
-
-            # Get the general frame information
-            frame_info = self.frame_list[0].split(" ")
-            frame_number = int(frame_info[1])
-            frame_time = float(frame_info[3])
-
-            try:
-                prev_frame = frames_info[frame_number - 2]
-                prev_time = prev_frame["frame"]["elapsed_time"]
-                delta_time = round(frame_time - prev_time, 6)
-            except IndexError:
-                delta_time = 0
-
-            # Variable to store all the information about the frame
-            frame_state = {
-                "frame": {
-                    "elapsed_time": frame_time,
-                    "delta_time": delta_time,
-                    "platform_time": None
-                },
-                "actors": {},
-                "events":{
-                    "scene_lights": {},
-                    "physics_control": {},
-                    "traffic_light_state_time": {},
-                    "collisions": {}
-                }
-            }
-
-            # Loop through all the other rows.
-            self.i = 0
-            self.next_row()
-
-            while self.frame_row.startswith(' Create') or self.frame_row.startswith('  '):
-
-                if self.frame_row.startswith(' Create'):
-                    elements = self.get_row_elements(1, " ")
-                    actor_id = int(elements[1][:-1])
-
-                    actor = parse_actor(elements)
-                    actors_info.update({actor_id: actor})
-                    actors_info[actor_id].update({"created": frame_number})
-                else:
-                    elements = self.get_row_elements(2, " = ")
-                    actors_info[actor_id].update({elements[0]: elements[1]})
-
-                self.next_row()
-
-            while self.frame_row.startswith(' Destroy'):
-
-                elements = self.get_row_elements(1, " ")
-
-                actor_id = int(elements[1])
-                actors_info[actor_id].update({"destroyed": frame_number})
-
-                self.next_row()
-
-            while self.frame_row.startswith(' Collision'):
-
-                elements = self.get_row_elements(1, " ")
-
-                actor_id = int(elements[4])
-                other_id = int(elements[-1])
-
-                if actor_id not in frame_state["events"]["collisions"]:
-                    frame_state["events"]["collisions"][actor_id] = [other_id]
-                else:
-                    collisions = frame_state["events"]["collisions"][actor_id]
-                    collisions.append(other_id)
-                    frame_state["events"]["collisions"].update({actor_id: collisions})
-
-                self.next_row()
-
-            while self.frame_row.startswith(' Parenting'):
-
-                elements = self.get_row_elements(1, " ")
-
-                actor_id = int(elements[1])
-                parent_id = int(elements[3])
-                actors_info[actor_id].update({"parent": parent_id})
-
-                self.next_row()
-
-            if self.frame_row.startswith(' Positions'):
-                self.next_row()
-
-                while self.frame_row.startswith('  '):
-
-                    elements = self.get_row_elements(2, " ")
-                    actor_id = int(elements[1])
-
-                    transform = parse_transform(elements)
-                    frame_state["actors"].update({actor_id: {"transform": transform}})
-
-                    self.next_row()
-
-            if self.frame_row.startswith(' State traffic lights'):
-                self.next_row()
-
-                while self.frame_row.startswith('  '):
-
-                    elements = self.get_row_elements(2, " ")
-                    actor_id = int(elements[1])
-
-                    traffic_light = parse_traffic_light(elements)
-                    frame_state["actors"].update({actor_id: traffic_light})
-                    self.next_row()
-
-            if self.frame_row.startswith(' Vehicle animations'):
-                self.next_row()
-
-                while self.frame_row.startswith('  '):
-
-                    elements = self.get_row_elements(2, " ")
-                    actor_id = int(elements[1])
-
-                    control = parse_control(elements)
-                    frame_state["actors"][actor_id].update({"control": control})
-                    self.next_row()
-
-            if self.frame_row.startswith(' Walker animations'):
-                self.next_row()
-
-                while self.frame_row.startswith('  '):
-                    elements = self.get_row_elements(2, " ")
-                    actor_id = int(elements[1])
-
-                    frame_state["actors"][actor_id].update({"speed": elements[3]})
-                    self.next_row()
-
-            if self.frame_row.startswith(' Vehicle light animations'):
-                self.next_row()
-
-                while self.frame_row.startswith('  '):
-                    elements = self.get_row_elements(2, " ")
-                    actor_id = int(elements[1])
-
-                    lights = parse_vehicle_lights(elements)
-                    frame_state["actors"][actor_id].update({"lights": lights})
-                    self.next_row()
-
-            if self.frame_row.startswith(' Scene light changes'):
-                self.next_row()
+    def rows_between(self, first_frame, last_frame):
+        """
+        Returns the slice of rows recorded between two frames, both included
+        """
+        return slice(int(np.searchsorted(self.frames, first_frame, side='left')),
+                     int(np.searchsorted(self.frames, last_frame, side='right')))
 
-                while self.frame_row.startswith('  '):
-                    elements = self.get_row_elements(2, " ")
-                    actor_id = int(elements[1])
+    def get_arrays(self, rows=slice(None)):
+        """
+        Returns a dictionary with the frames and the arrays of each field at the given rows
+        """
+        arrays = {"frame": self.frames[rows]}
+        for i, field in enumerate(self.fields):
+            arrays[field] = self.values[rows, i]
+        return arrays
 
-                    scene_light = parse_scene_lights(elements)
-                    frame_state["events"]["scene_lights"].update({actor_id: scene_light})
-                    self.next_row()
 
-            if self.frame_row.startswith(' Dynamic actors'):
-                self.next_row()
+class MetricsParser(object):
+    """
+    Class used to parse the CARLA recorder into readable information.
 
-                while self.frame_row.startswith('  '):
-                    elements = self.get_row_elements(2, " ")
-                    actor_id = int(elements[1])
+    The recorder is read line by line and the states of the actors are stored as
+    columns (see ActorStateColumns), so the memory used grows with the number of
+    values recorded and not with the size of the recorder string.
 
-                    velocity = parse_velocity(elements)
-                    frame_state["actors"][actor_id].update({"velocity": velocity})
+    With keep_event_lines, the lines that aren't stored as columns are kept at
+    event_lines. Parsing them again gives everything but the actor states, which
+    is what the metrics cache relies on.
+    """
 
-                    angular_v = parse_angular_velocity(elements)
-                    frame_state["actors"][actor_id].update({"angular_velocity": angular_v})
+    def __init__(self, recorder_info, keep_event_lines=False):
 
-                    if delta_time == 0:
-                        acceleration = carla.Vector3D(0, 0, 0)
-                    else:
-                        prev_velocity = frame_state["actors"][actor_id]["velocity"]
-                        acceleration = (velocity - prev_velocity) / delta_time
+        self.recorder_info = recorder_info
+        self.event_lines = [] if keep_event_lines else None
 
-                    frame_state["actors"][actor_id].update({"acceleration": acceleration})
-                    self.next_row()
+        self._simulation = None
+        self._actors = None
+        self._frames = None
+        self._states = None
+        self._events = None
 
-            if self.frame_row.startswith(' Actor bounding boxes'):
-                self.next_row()
+        self._frame_number = None
+        self._frame_index = -1
+        self._section = None
+        self._actor_id = None
+        self._physics_control = None
 
-                while self.frame_row.startswith('  '):
-                    elements = self.get_row_elements(2, " ")
-                    actor_id = int(elements[1])
+    def parse_recorder_info(self):
+        """
+        Parses the recorder into readable information.
 
-                    bbox = parse_bounding_box(elements)
-                    actors_info[actor_id].update({"bounding_box": bbox})
-                    self.next_row()
+        Returns:
+            simulation_info (dict): map, date, total frames and duration of the simulation
+            actors_info (dict): actor id -> attributes of the actor
+            frames_info (dict): arrays with the number, elapsed, delta and platform time of each frame
+            states_info (dict): actor id -> state name -> ActorStateColumns
+            events_info (dict): collisions, physics controls, scene lights and traffic light state
+                times, by actor id and frame index
+        """
+        self._simulation = {
+            "map": None,
+            "date:": None,
+            "total_frames": None,
+            "duration": None
+        }
+        self._actors = {}
+        self._frames = {
+            "frame": array('i'),
+            "elapsed_time": array('d'),
+            "delta_time": array('d'),
+            "platform_time": array('d'),
+        }
+        self._states = {}
+        self._events = {
+            "collisions": {},
+            "physics_control": {},
+            "scene_lights": {},
+            "traffic_light_state_time": {}
+        }
 
-            if self.frame_row.startswith(' Actor trigger volumes'):
-                self.next_row()
+        row_parsers = {
+            "create": self._parse_actor_attribute,
+            "positions": self._parse_position,
+            "traffic_lights": self._parse_traffic_light,
+            "vehicle_animations": self._parse_vehicle_animation,
+            "walker_animations": self._parse_walker_animation,
+            "vehicle_lights": self._parse_vehicle_lights,
+            "scene_lights": self._parse_scene_light,
+            "dynamic_actors": self._parse_dynamic_actor,
+            "bounding_boxes": self._parse_bounding_box,
+            "trigger_volumes": self._parse_trigger_volume,
+            "state_times": self._parse_state_times,
+        }
 
-                while self.frame_row.startswith('  '):
-                    elements = self.get_row_elements(2, " ")
-                    actor_id = int(elements[1])
+        for line in iter_lines(self.recorder_info):
+
+            if line.startswith("Frame "):
+                self._start_frame(line)
+            elif line.startswith("Frames: "):
+                self._end_physics_control()
+                self._simulation["total_frames"] = int(line[8:])
+            elif line.startswith("Duration: "):
+                self._simulation["duration"] = float(line[10:-8])
+            elif self._frame_number is None:
+                if line.startswith("Map: "):
+                    self._simulation["map"] = line[5:]
+                elif line.startswith("Date: "):
+                    self._simulation["date:"] = line[6:]
+            elif self._section == "physics_control" and line.startswith("  "):
+                self._parse_physics_control(line)
+            elif line.startswith("  "):
+                if self._section in row_parsers:
+                    row_parsers[self._section](line[2:].split(" "))
+                if self._section in COLUMN_SECTIONS:
+                    continue
+            elif line.startswith(" "):
+                self._end_physics_control()
+                self._parse_section(line[1:])
+
+            if self.event_lines is not None:
+                self.event_lines.append(line)
+
+        self._end_physics_control()
+
+        # Turn the parsed buffers into arrays
+        for name in self._frames:
+            dtype = np.intc if name == "frame" else np.float64
+            self._frames[name] = np.frombuffer(self._frames[name], dtype=dtype)
+
+        for actor_states in self._states.values():
+            for columns in actor_states.values():
+                columns.finalize()
+            if "velocity" in actor_states:
+                actor_states["acceleration"] = self._get_accelerations(actor_states["velocity"])
+
+        return self._simulation, self._actors, self._frames, self._states, self._events
+
+    def _start_frame(self, line):
+        """
+        Starts a new frame, given its first line ("Frame <number> at <time> seconds")
+        """
+        self._end_physics_control()
 
-                    trigvol = parse_bounding_box(elements)
-                    actors_info[actor_id].update({"trigger_volume": trigvol})
-                    self.next_row()
+        frame_info = line.split(" ")
+        self._frame_number = int(frame_info[1])
+        self._frame_index += 1
+        self._section = None
 
-            if self.frame_row.startswith(' Current platform time'):
+        frame_time = float(frame_info[3])
+        if self._frames["elapsed_time"]:
+            delta_time = round(frame_time - self._frames["elapsed_time"][-1], 6)
+        else:
+            delta_time = 0
 
-                elements = self.get_row_elements(1, " ")
+        self._frames["frame"].append(self._frame_number)
+        self._frames["elapsed_time"].append(frame_time)
+        self._frames["delta_time"].append(delta_time)
+        self._frames["platform_time"].append(float('nan'))
 
-                platform_time = float(elements[-1])
-                frame_state["frame"]["platform_time"] = platform_time
-                self.next_row()
+    def _parse_section(self, line):
+        """
+        Parses the header of a section of the frame. Some of them (creations, destructions,
+        collisions, parenting and the platform time) hold their information in the same line.
+        """
+        elements = line.split(" ")
+        self._section = None
+
+        if line.startswith("Create"):
+            self._actor_id = int(elements[1][:-1])
+            actor = parse_actor(elements)
+            actor.update({"created": self._frame_number})
+            self._actors[self._actor_id] = actor
+            self._section = "create"
+
+        elif line.startswith("Destroy"):
+            self._actors[int(elements[1])].update({"destroyed": self._frame_number})
+
+        elif line.startswith("Collision"):
+            actor_id = int(elements[4])
+            other_id = int(elements[-1])
+            actor_collisions = self._events["collisions"].setdefault(actor_id, {})
+            actor_collisions.setdefault(self._frame_index, []).append(other_id)
+
+        elif line.startswith("Parenting"):
+            self._actors[int(elements[1])].update({"parent": int(elements[3])})
+
+        elif line.startswith("Current platform time"):
+            self._frames["platform_time"][-1] = float(elements[-1])
+
+        elif line.startswith("Positions"):
+            self._section = "positions"
+        elif line.startswith("State traffic lights"):
+            self._section = "traffic_lights"
+        elif line.startswith("Vehicle animations"):
+            self._section = "vehicle_animations"
+        elif line.startswith("Walker animations"):
+            self._section = "walker_animations"
+        elif line.startswith("Vehicle light animations"):
+            self._section = "vehicle_lights"
+        elif line.startswith("Scene light changes"):
+            self._section = "scene_lights"
+        elif line.startswith("Dynamic actors"):
+            self._section = "dynamic_actors"
+        elif line.startswith("Actor bounding boxes"):
+            self._section = "bounding_boxes"
+        elif line.startswith("Actor trigger volumes"):
+            self._section = "trigger_volumes"
+        elif line.startswith("Physics Control"):
+            self._section = "physics_control"
+        elif line.startswith("Traffic Light time events"):
+            self._section = "state_times"
+
+    def _get_columns(self, actor_id, state):
+        """
+        Returns the columns of a state of an actor, creating them the first time
+        """
+        actor_states = self._states.setdefault(actor_id, {})
+        if state not in actor_states:
+            actor_states[state] = ActorStateColumns(STATE_FIELDS[state])
+        return actor_states[state]
 
-            if self.frame_row.startswith(' Physics Control'):
-                self.next_row()
+    def _add_event(self, event, actor_id, value):
+        """
+        Adds an event of an actor at the current frame
+        """
+        indices, values = self._events[event].setdefault(actor_id, ([], []))
+        indices.append(self._frame_index)
+        values.append(value)
 
-                actor_id = None
-                while self.frame_row.startswith('  '):
+    def _parse_actor_attribute(self, elements):
+        """
+        Parses an attribute ("<name> = <value>") of the last created actor
+        """
+        name, value = " ".join(elements).split(" = ", 1)
+        self._actors[self._actor_id].update({name: value})
 
-                    elements = self.get_row_elements(2, " ")
-                    actor_id = int(elements[1])
-                    physics_control = carla.VehiclePhysicsControl()
-                    self.next_row()
+    def _parse_position(self, elements):
+        """
+        Parses a row of the positions section
+        """
+        self._get_columns(int(elements[1]), "transform").append(self._frame_number, (
+            float(elements[3][1:-1]) / 100,
+            float(elements[4][:-1]) / 100,
+            float(elements[5][:-1]) / 100,
+            float(elements[7][1:-1]),   # roll
+            float(elements[8][:-1]),    # pitch
+            float(elements[9][:-1])     # yaw
+        ))
+
+    def _parse_traffic_light(self, elements):
+        """
+        Parses a row of the traffic light states section
+        """
+        self._get_columns(int(elements[1]), "traffic_light").append(self._frame_number, (
+            int(elements[3]),           # state
+            int(elements[5]),           # frozen
+            float(elements[7])          # elapsed_time
+        ))
 
-                    forward_gears = []
-                    wheels = []
-                    while self.frame_row.startswith('   '):
+    def _parse_vehicle_animation(self, elements):
+        """
+        Parses a row of the vehicle animations section
+        """
+        self._get_columns(int(elements[1]), "control").append(self._frame_number, (
+            float(elements[5]),         # throttle
+            float(elements[3]),         # steer
+            float(elements[7]),         # brake
+            int(elements[9]),           # hand_brake
+            int(elements[11])           # gear
+        ))
+
+    def _parse_walker_animation(self, elements):
+        """
+        Parses a row of the walker animations section
+        """
+        self._get_columns(int(elements[1]), "speed").append(self._frame_number, (float(elements[3]),))
 
-                        if self.frame_row.startswith('    '):
-                            elements = self.get_row_elements(4, " ")
-                            if elements[0] == "gear":
-                                forward_gears.append(parse_gears_control(elements))
-                            elif elements[0] == "wheel":
-                                wheels.append(parse_wheels_control(elements))
+    def _parse_vehicle_lights(self, elements):
+        """
+        Parses a row of the vehicle light animations section, the lights are stored as a bitmask
+        """
+        lights = 0
+        for light in parse_vehicle_lights(elements):
+            lights |= int(light)
+        self._get_columns(int(elements[1]), "lights").append(self._frame_number, (lights,))
 
-                        else:
-                            elements = self.get_row_elements(3, " = ")
-                            name = elements[0]
+    def _parse_scene_light(self, elements):
+        """
+        Parses a row of the scene light changes section
+        """
+        self._add_event("scene_lights", int(elements[1]), parse_scene_lights(elements))
 
-                            if name == "center_of_mass":
-                                values = elements[1].split(" ")
-                                value = carla.Vector3D(
-                                    float(values[0][1:-1]),
-                                    float(values[1][:-1]),
-                                    float(values[2][:-1]),
-                                )
-                                setattr(physics_control, name, value)
-                            elif name == "torque_curve" or name == "steering_curve":
-                                values = elements[1].split(" ")
-                                value = parse_vector_list(values)
-                                setattr(physics_control, name, value)
+    def _parse_dynamic_actor(self, elements):
+        """
+        Parses a row of the dynamic actors section
+        """
+        actor_id = int(elements[1])
+        self._get_columns(actor_id, "velocity").append(self._frame_number, (
+            float(elements[3][1:-1]),
+            float(elements[4][:-1]),
+            float(elements[5][:-1])
+        ))
+        self._get_columns(actor_id, "angular_velocity").append(self._frame_number, (
+            float(elements[7][1:-1]),
+            float(elements[8][:-1]),
+            float(elements[9][:-1])
+        ))
+
+    def _parse_bounding_box(self, elements):
+        """
+        Parses a row of the actor bounding boxes section
+        """
+        self._actors[int(elements[1])].update({"bounding_box": parse_bounding_box(elements)})
 
-                            elif name == "use_gear_auto_box":
-                                name = "use_gear_autobox"
-                                value = True if elements[1] == "true" else False
-                                setattr(physics_control, name, value)
+    def _parse_trigger_volume(self, elements):
+        """
+        Parses a row of the actor trigger volumes section
+        """
+        self._actors[int(elements[1])].update({"trigger_volume": parse_bounding_box(elements)})
 
-                            elif "forward_gears" in name or "wheels" in name:
-                                pass
+    def _parse_state_times(self, elements):
+        """
+        Parses a row of the traffic light time events section
+        """
+        self._add_event("traffic_light_state_time", int(elements[1]), parse_state_times(elements))
 
-                            else:
-                                name = name.lower()
-                                value = float(elements[1])
-                                setattr(physics_control, name, value)
+    def _parse_physics_control(self, line):
+        """
+        Parses a row of the physics control section. Each vehicle starts with an "Id" row,
+        followed by its attributes and, one level deeper, its gears and wheels.
+        """
+        if line.startswith("    "):
+            elements = line[4:].split(" ")
+            if elements[0] == "gear":
+                self._physics_control[2].append(parse_gears_control(elements))
+            elif elements[0] == "wheel":
+                self._physics_control[3].append(parse_wheels_control(elements))
+
+        elif line.startswith("   "):
+            elements = line[3:].split(" = ")
+            physics_control = self._physics_control[1]
+            name = elements[0]
+
+            if name == "center_of_mass":
+                values = elements[1].split(" ")
+                value = carla.Vector3D(
+                    float(values[0][1:-1]),
+                    float(values[1][:-1]),
+                    float(values[2][:-1]),
+                )
+                setattr(physics_control, name, value)
+            elif name == "torque_curve" or name == "steering_curve":
+                values = elements[1].split(" ")
+                value = parse_vector_list(values)
+                setattr(physics_control, name, value)
+
+            elif name == "use_gear_auto_box":
+                name = "use_gear_autobox"
+                value = True if elements[1] == "true" else False
+                setattr(physics_control, name, value)
+
+            elif "forward_gears" in name or "wheels" in name:
+                pass
+
+            else:
+                name = name.lower()
+                value = float(elements[1])
+                setattr(physics_control, name, value)
+
+        else:
+            self._end_physics_control()
+            elements = line[2:].split(" ")
+            self._physics_control = (int(elements[1]), carla.VehiclePhysicsControl(), [], [])
+
+    def _end_physics_control(self):
+        """
+        Stores the physics control being parsed, if any
+        """
+        if self._physics_control is None:
+            return
 
-                        self.next_row()
+        actor_id, physics_control, forward_gears, wheels = self._physics_control
+        setattr(physics_control, "forward_gears", forward_gears)
+        setattr(physics_control, "wheels", wheels)
+        self._add_event("physics_control", actor_id, physics_control)
+        self._physics_control = None
 
-                    setattr(physics_control, "forward_gears", forward_gears)
-                    setattr(physics_control, "wheels", wheels)
-                    frame_state["events"]["physics_control"].update({actor_id: physics_control})
+    def _get_accelerations(self, velocities):
+        """
+        Returns the accelerations of an actor, from the change of its velocity between
+        consecutive records. The first record and the ones without elapsed time are zero.
+        """
+        accelerations = ActorStateColumns(STATE_FIELDS["acceleration"])
+        accelerations.frames = velocities.frames
+        accelerations.values = np.zeros_like(velocities.values)
 
-            if self.frame_row.startswith(' Traffic Light time events'):
-                self.next_row()
+        if len(velocities.frames) > 1:
+            frame_rows = np.searchsorted(self._frames["frame"], velocities.frames)
+            frame_rows = np.minimum(frame_rows, len(self._frames["frame"]) - 1)
+            delta_times = np.diff(self._frames["elapsed_time"][frame_rows])
+            moving = delta_times > 0
+            accelerations.values[1:][moving] = \
+                np.diff(velocities.values, axis=0)[moving] / delta_times[moving, np.newaxis]
 
-                while self.frame_row.startswith('  '):
-                    elements = self.get_row_elements(2, " ")
-                    actor_id = int(elements[1])
+        return accelerations
 
-                    state_times = parse_state_times(elements)
-                    frame_state["events"]["traffic_light_state_time"].update({actor_id: state_times})
-                    self.next_row()
 
-            frames_info.append(frame_state)
+def find_last_event(events, actor_id, frame_index):
+    """
+    Returns the last event of an actor at or before a frame index, None if there is none
 
-        return simulation_info, actors_info, frames_info
+    Args:
+        events (dict): actor id -> (frame indices, values), as in the events parsed by MetricsParser
+        actor_id (int): ID of the actor
+        frame_index (int): index of the frame
+    """
+    if actor_id not in events:
+        return None
+
+    indices, values = events[actor_id]
+    position = bisect.bisect_right(indices, frame_index) - 1
+    if position < 0:
+        return None
+    return values[position]
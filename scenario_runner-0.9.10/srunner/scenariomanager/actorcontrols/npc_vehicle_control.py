@@ -92,7 +92,7 @@ class NpcVehicleControl(BasicControl):
         if self._local_planner.done():
             self._reached_goal = True
 
-        self._actor.apply_control(control)
+        CarlaDataProvider.apply_control(self._actor, control)
 
         if self._init_speed:
             current_speed = math.sqrt(self._actor.get_velocity().x**2 + self._actor.get_velocity().y**2)
@@ -13,6 +13,7 @@ import math
 
 import carla
 
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
 from srunner.scenariomanager.actorcontrols.basic_control import BasicControl
 
 
@@ -61,11 +62,11 @@ class PedestrianControl(BasicControl):
             direction = location - self._actor.get_location()
             direction_norm = math.sqrt(direction.x**2 + direction.y**2)
             control.direction = direction / direction_norm
-            self._actor.apply_control(control)
+            CarlaDataProvider.apply_control(self._actor, control)
             if direction_norm < 1.0:
                 self._waypoints = self._waypoints[1:]
                 if not self._waypoints:
                     self._reached_goal = True
         else:
             control.direction = self._actor.get_transform().rotation.get_forward_vector()
-            self._actor.apply_control(control)
+            CarlaDataProvider.apply_control(self._actor, control)
@@ -13,6 +13,7 @@ import math
 
 import carla
 
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
 from srunner.scenariomanager.actorcontrols.basic_control import BasicControl
 
 
@@ -59,7 +60,7 @@ class VehicleLongitudinalControl(BasicControl):
         else:
             control.throttle = 0.0
 
-        self._actor.apply_control(control)
+        CarlaDataProvider.apply_control(self._actor, control)
 
         if self._init_speed:
             if abs(self._target_speed - current_speed) > 3:
@@ -14,10 +14,12 @@ from __future__ import print_function
 
 import math
 import re
+import numpy as np
 import numpy.random as random
 from six import iteritems
 
 import carla
+from agents.tools.traffic_light_index import get_traffic_light_index
 
 
 def calculate_velocity(actor):
@@ -29,6 +31,20 @@ def calculate_velocity(actor):
     return math.sqrt(velocity_squared)
 
 
+# Row layout of the actor state cache, one row per registered actor
+ACTOR_STATE_DTYPE = np.dtype([
+    ('id', np.int64),
+    ('alive', np.bool_),
+    ('x', np.float64), ('y', np.float64), ('z', np.float64),
+    ('pitch', np.float64), ('yaw', np.float64), ('roll', np.float64),
+    ('vx', np.float64), ('vy', np.float64), ('vz', np.float64),
+    ('speed', np.float64),
+])
+
+# A spawn point closer than this to a vehicle or walker is taken, see _find_free_spawn_point
+SPAWN_POINT_CLEARANCE = 5.0
+
+
 class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
 
     """
@@ -51,15 +67,26 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
     _actor_velocity_map = dict()
     _actor_location_map = dict()
     _actor_transform_map = dict()
+    _actor_state_cache = np.zeros(16, dtype=ACTOR_STATE_DTYPE)
+    _actor_state_index = dict()
     _traffic_light_map = dict()
     _carla_actor_pool = dict()
     _client = None
+    _control_batch = None           # actor id -> (actor, control) while collecting, see start_control_batch
+    _batch_controls = True
     _world = None
+    _snapshot = None
     _map = None
     _sync_flag = False
     _spawn_points = None
     _spawn_index = 0
     _blueprint_library = None
+    _blueprint_ids = dict()         # blueprint filter -> ids of the matching blueprints, see _choose_blueprint
+    _reuse_actors = False
+    _parked_actors = dict()         # (type_id, role_name) -> parked actors, see release_actor
+    _parked_actor_ids = set()
+    _parked_world_id = None
+    _parking_slots = 0
     _ego_vehicle_route = None
     _traffic_manager_port = 8000
     _random_seed = 2000
@@ -89,6 +116,26 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
         else:
             CarlaDataProvider._actor_transform_map[actor] = None
 
+        CarlaDataProvider._register_actor_state(actor.id)
+
+    @staticmethod
+    def _register_actor_state(actor_id):
+        """
+        Reserve a row of the actor state cache for the given actor id
+        """
+        if actor_id in CarlaDataProvider._actor_state_index:
+            return
+
+        row = len(CarlaDataProvider._actor_state_index)
+        if row >= len(CarlaDataProvider._actor_state_cache):
+            grown = np.zeros(2 * len(CarlaDataProvider._actor_state_cache), dtype=ACTOR_STATE_DTYPE)
+            grown[:row] = CarlaDataProvider._actor_state_cache[:row]
+            CarlaDataProvider._actor_state_cache = grown
+
+        CarlaDataProvider._actor_state_cache[row] = np.zeros(1, dtype=ACTOR_STATE_DTYPE)[0]
+        CarlaDataProvider._actor_state_cache['id'][row] = actor_id
+        CarlaDataProvider._actor_state_index[actor_id] = row
+
     @staticmethod
     def register_actors(actors):
         """
@@ -98,26 +145,85 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
             CarlaDataProvider.register_actor(actor)
 
     @staticmethod
-    def on_carla_tick():
+    def on_carla_tick(snapshot=None):
         """
         Callback from CARLA
+
+        If a world snapshot is given, all actor maps are refreshed from it in a single
+        pass instead of querying the server for every actor
         """
-        for actor in CarlaDataProvider._actor_velocity_map:
-            if actor is not None and actor.is_alive:
-                CarlaDataProvider._actor_velocity_map[actor] = calculate_velocity(actor)
+        CarlaDataProvider._snapshot = snapshot
+        if snapshot is not None:
+            CarlaDataProvider._update_from_snapshot(snapshot)
+        else:
+            for actor in CarlaDataProvider._actor_velocity_map:
+                if actor is not None and actor.is_alive:
+                    CarlaDataProvider._actor_velocity_map[actor] = calculate_velocity(actor)
 
-        for actor in CarlaDataProvider._actor_location_map:
-            if actor is not None and actor.is_alive:
-                CarlaDataProvider._actor_location_map[actor] = actor.get_location()
+            for actor in CarlaDataProvider._actor_location_map:
+                if actor is not None and actor.is_alive:
+                    CarlaDataProvider._actor_location_map[actor] = actor.get_location()
 
-        for actor in CarlaDataProvider._actor_transform_map:
-            if actor is not None and actor.is_alive:
-                CarlaDataProvider._actor_transform_map[actor] = actor.get_transform()
+            for actor in CarlaDataProvider._actor_transform_map:
+                if actor is not None and actor.is_alive:
+                    CarlaDataProvider._actor_transform_map[actor] = actor.get_transform()
 
         world = CarlaDataProvider._world
         if world is None:
             print("WARNING: CarlaDataProvider couldn't find the world")
 
+    @staticmethod
+    def _update_from_snapshot(snapshot):
+        """
+        Fill the velocity, location and transform maps, as well as the actor state cache,
+        from a carla.WorldSnapshot. Actors missing from the snapshot are no longer alive
+        and keep their last known values.
+        """
+        cache = CarlaDataProvider._actor_state_cache
+        index = CarlaDataProvider._actor_state_index
+
+        for actor in CarlaDataProvider._actor_velocity_map:
+            if actor is None:
+                continue
+
+            row = index.get(actor.id)
+            actor_snapshot = snapshot.find(actor.id)
+            if actor_snapshot is None:
+                if row is not None:
+                    cache['alive'][row] = False
+                continue
+
+            transform = actor_snapshot.get_transform()
+            velocity = actor_snapshot.get_velocity()
+            speed = math.sqrt(velocity.x**2 + velocity.y**2)
+
+            CarlaDataProvider._actor_velocity_map[actor] = speed
+            CarlaDataProvider._actor_location_map[actor] = transform.location
+            CarlaDataProvider._actor_transform_map[actor] = transform
+
+            if row is not None:
+                cache[row] = (actor.id, True,
+                              transform.location.x, transform.location.y, transform.location.z,
+                              transform.rotation.pitch, transform.rotation.yaw, transform.rotation.roll,
+                              velocity.x, velocity.y, velocity.z, speed)
+
+    @staticmethod
+    def get_snapshot():
+        """
+        returns the world snapshot of the current tick, None if on_carla_tick() was not given one
+        """
+        return CarlaDataProvider._snapshot
+
+    @staticmethod
+    def get_actor_states():
+        """
+        returns the actor state cache (numpy structured array, one row per registered actor)
+        and the dictionary mapping actor ids to their row. Only valid after on_carla_tick()
+        has been called with a snapshot.
+        """
+        rows = len(CarlaDataProvider._actor_state_index)
+        return CarlaDataProvider._actor_state_cache[:rows], CarlaDataProvider._actor_state_index
+
     @staticmethod
     def get_velocity(actor):
         """
@@ -174,6 +280,71 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
         """
         return CarlaDataProvider._client
 
+    @staticmethod
+    def set_control_batching(enabled):
+        """
+        Enable or disable the batching of the controls. When disabled, apply_control
+        always applies the control directly to the actor
+        """
+        CarlaDataProvider._batch_controls = enabled
+
+    @staticmethod
+    def start_control_batch():
+        """
+        Start collecting the controls given to apply_control, to send them all
+        with a single call to the server in flush_control_batch
+        """
+        if CarlaDataProvider._batch_controls and CarlaDataProvider._client is not None:
+            CarlaDataProvider._control_batch = dict()
+
+    @staticmethod
+    def apply_control(actor, control):
+        """
+        Apply a carla.VehicleControl or carla.WalkerControl to the actor.
+
+        While a control batch is open, the control is collected instead (the last one
+        given to an actor replaces the previous ones). Otherwise it is applied directly.
+        """
+        if CarlaDataProvider._control_batch is not None and \
+                isinstance(control, (carla.VehicleControl, carla.WalkerControl)):
+            CarlaDataProvider._control_batch[actor.id] = (actor, control)
+        else:
+            actor.apply_control(control)
+
+    @staticmethod
+    def flush_control_batch():
+        """
+        Send the controls collected since start_control_batch in a single batch, and
+        stop collecting. If the batch can't be sent, the controls are applied one by one.
+
+        returns:
+            number of calls made to the server
+        """
+        control_batch = CarlaDataProvider._control_batch
+        CarlaDataProvider._control_batch = None
+        if not control_batch:
+            return 0
+
+        ApplyVehicleControl = carla.command.ApplyVehicleControl     # pylint: disable=invalid-name
+        ApplyWalkerControl = carla.command.ApplyWalkerControl       # pylint: disable=invalid-name
+
+        batch = []
+        for actor, control in control_batch.values():
+            if isinstance(control, carla.VehicleControl):
+                batch.append(ApplyVehicleControl(actor.id, control))
+            else:
+                batch.append(ApplyWalkerControl(actor.id, control))
+
+        try:
+            CarlaDataProvider._client.apply_batch(batch)
+            return 1
+        except RuntimeError as e:
+            print("WARNING: Could not apply the controls as a batch ({}), applying them one by one".format(e))
+
+        for actor, control in control_batch.values():
+            actor.apply_control(control)
+        return len(control_batch)
+
     @staticmethod
     def set_world(world):
         """
@@ -183,6 +354,10 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
         CarlaDataProvider._sync_flag = world.get_settings().synchronous_mode
         CarlaDataProvider._map = world.get_map()
         CarlaDataProvider._blueprint_library = world.get_blueprint_library()
+        CarlaDataProvider._blueprint_ids = dict()
+        if CarlaDataProvider._parked_world_id != world.id:
+            # The parked actors went away with the previous world
+            CarlaDataProvider._forget_parked_actors()
         CarlaDataProvider.generate_spawn_points()
         CarlaDataProvider.prepare_map()
 
@@ -251,9 +426,9 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
         """
         dict_annotations = {'ref': [], 'opposite': [], 'left': [], 'right': []}
 
-        # Get the waypoints
-        ref_location = CarlaDataProvider.get_trafficlight_trigger_location(traffic_light)
-        ref_waypoint = CarlaDataProvider.get_map().get_waypoint(ref_location)
+        # Get the waypoints, from the traffic light index of the map
+        tlight_index = get_traffic_light_index(CarlaDataProvider.get_world(), CarlaDataProvider.get_map())
+        ref_waypoint = tlight_index.trigger_waypoint(traffic_light)
         ref_yaw = ref_waypoint.transform.rotation.yaw
 
         group_tl = traffic_light.get_group_traffic_lights()
@@ -263,8 +438,7 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
                 dict_annotations['ref'].append(target_tl)
             else:
                 # Get the angle between yaws
-                target_location = CarlaDataProvider.get_trafficlight_trigger_location(target_tl)
-                target_waypoint = CarlaDataProvider.get_map().get_waypoint(target_location)
+                target_waypoint = tlight_index.trigger_waypoint(target_tl)
                 target_yaw = target_waypoint.transform.rotation.yaw
 
                 diff = (target_yaw - ref_yaw) % 360
@@ -433,7 +607,7 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
 
         # Set the model
         try:
-            blueprint = CarlaDataProvider._rng.choice(CarlaDataProvider._blueprint_library.filter(model))
+            blueprint = CarlaDataProvider._choose_blueprint(model)
         except ValueError:
             # The model is not part of the blueprint library. Let's take a default one for the given category
             bp_filter = "vehicle.*"
@@ -441,7 +615,7 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
             if new_model != '':
                 bp_filter = new_model
             print("WARNING: Actor model {} not available. Using instead {}".format(model, new_model))
-            blueprint = CarlaDataProvider._rng.choice(CarlaDataProvider._blueprint_library.filter(bp_filter))
+            blueprint = CarlaDataProvider._choose_blueprint(bp_filter)
 
         # Set the color
         if color:
@@ -474,6 +648,20 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
 
         return blueprint
 
+    @staticmethod
+    def _choose_blueprint(bp_filter):
+        """
+        Random blueprint matching the filter. The library is only filtered once per filter,
+        the same random draw as choosing from the filtered library is then made on the ids.
+        Raises ValueError if no blueprint matches.
+        """
+        if bp_filter not in CarlaDataProvider._blueprint_ids:
+            CarlaDataProvider._blueprint_ids[bp_filter] = [
+                blueprint.id for blueprint in CarlaDataProvider._blueprint_library.filter(bp_filter)]
+
+        blueprint_id = CarlaDataProvider._rng.choice(CarlaDataProvider._blueprint_ids[bp_filter])
+        return CarlaDataProvider._blueprint_library.find(blueprint_id)
+
     @staticmethod
     def handle_actor_batch(batch):
         """
@@ -513,15 +701,13 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
                           random_location=False, color=None, actor_category="car"):
         """
         This method tries to create a new actor, returning it if successful (None otherwise).
+        With actor reuse enabled, a parked actor of the same blueprint and role name is
+        teleported to the spawn point instead of spawning a new one.
         """
         blueprint = CarlaDataProvider.create_blueprint(model, rolename, color, actor_category)  # ZZZ Setting rolename of ego to hero on server side here!
 
         if random_location:
-            actor = None
-            while not actor:
-                spawn_point = CarlaDataProvider._rng.choice(CarlaDataProvider._spawn_points)
-                actor = CarlaDataProvider._world.try_spawn_actor(blueprint, spawn_point)  # Return: carla.Actor
-
+            spawn_point = CarlaDataProvider._rng.choice(CarlaDataProvider._spawn_points)
         else:
             # slightly lift the actor to avoid collisions with ground when spawning the actor
             # DO NOT USE spawn_point directly, as this will modify spawn_point permanently
@@ -541,6 +727,27 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
             the earth!
             '''
 
+        actor = CarlaDataProvider._take_parked_actor(blueprint, rolename, color)
+        if actor is not None and random_location:
+            # try_spawn_actor refuses a taken spawn point, a teleport doesn't: check it here
+            spawn_point = CarlaDataProvider._find_free_spawn_point(spawn_point, actor)
+            if spawn_point is None:
+                CarlaDataProvider._destroy_or_park(actor)
+                actor = None
+                spawn_point = CarlaDataProvider._rng.choice(CarlaDataProvider._spawn_points)
+        if actor is not None:
+            # A parked actor is moved with the next tick, no need to wait for it to spawn
+            CarlaDataProvider._unpark_actor(actor, spawn_point if random_location else _spawn_point, autopilot)
+            CarlaDataProvider._carla_actor_pool[actor.id] = actor
+            CarlaDataProvider.register_actor(actor)
+            return actor
+
+        if random_location:
+            actor = CarlaDataProvider._world.try_spawn_actor(blueprint, spawn_point)  # Return: carla.Actor
+            while not actor:
+                spawn_point = CarlaDataProvider._rng.choice(CarlaDataProvider._spawn_points)
+                actor = CarlaDataProvider._world.try_spawn_actor(blueprint, spawn_point)
+        else:
             actor = CarlaDataProvider._world.try_spawn_actor(blueprint, _spawn_point)
 
         if actor is None:
@@ -739,7 +946,7 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
         Remove an actor from the pool using its ID
         """
         if actor_id in CarlaDataProvider._carla_actor_pool:
-            CarlaDataProvider._carla_actor_pool[actor_id].destroy()
+            CarlaDataProvider._destroy_or_park(CarlaDataProvider._carla_actor_pool[actor_id])
             CarlaDataProvider._carla_actor_pool[actor_id] = None
             CarlaDataProvider._carla_actor_pool.pop(actor_id)
         else:
@@ -753,12 +960,186 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
         """
         for actor_id in CarlaDataProvider._carla_actor_pool.copy():
             if CarlaDataProvider._carla_actor_pool[actor_id].get_location().distance(location) < distance:
-                CarlaDataProvider._carla_actor_pool[actor_id].destroy()
+                CarlaDataProvider._destroy_or_park(CarlaDataProvider._carla_actor_pool[actor_id])
                 CarlaDataProvider._carla_actor_pool.pop(actor_id)
 
         # Remove all keys with None values
         CarlaDataProvider._carla_actor_pool = dict({k: v for k, v in CarlaDataProvider._carla_actor_pool.items() if v})
 
+    @staticmethod
+    def set_actor_reuse(enabled):
+        """
+        Enable or disable the reuse of the actors. When enabled, removed vehicles are parked
+        instead of destroyed, and request_new_actor teleports them back into the scenario.
+        Disabling it destroys the parked actors.
+        """
+        CarlaDataProvider._reuse_actors = enabled
+        if not enabled:
+            CarlaDataProvider.destroy_parked_actors()
+
+    @staticmethod
+    def release_actor(actor):
+        """
+        Give back an actor that is no longer used: it is removed from the pool and parked
+        (or destroyed, if it can't be reused). Actors that are already parked are left as they are.
+        """
+        if actor is None or actor.id in CarlaDataProvider._parked_actor_ids:
+            return
+        if actor.id in CarlaDataProvider._carla_actor_pool:
+            CarlaDataProvider.remove_actor_by_id(actor.id)
+        else:
+            CarlaDataProvider._destroy_or_park(actor)
+
+    @staticmethod
+    def get_parked_actors():
+        """
+        returns the parked actors, per (blueprint id, role name)
+        """
+        return CarlaDataProvider._parked_actors
+
+    @staticmethod
+    def _destroy_or_park(actor):
+        """
+        Park the actor if it can be reused, destroy it otherwise
+        """
+        if not CarlaDataProvider._park_actor(actor):
+            actor.destroy()
+
+    @staticmethod
+    def _park_actor(actor):
+        """
+        Move the actor out of the way so that request_new_actor can reuse it. Returns False
+        if the actor can't be parked, in which case it has to be destroyed.
+
+        Reset checklist, in this order, so that nothing of the previous repetition is carried over:
+        1. autopilot off, a neutral control (no throttle, steer or brake, no hand brake, no reverse)
+           and all the lights off
+        2. linear and angular velocities zeroed
+        3. physics disabled, so the actor doesn't fall or get hit while parked
+        4. teleported to its own parking slot, far below the map (see the z = -500 convention below)
+        5. forgotten by the velocity, location and transform maps, and marked as not alive
+           in the actor state cache, so that no criterion or agent sees it while parked
+        """
+        world = CarlaDataProvider._world
+        if not CarlaDataProvider._reuse_actors or world is None or not actor.is_alive \
+                or not actor.type_id.startswith('vehicle.'):
+            return False
+        if CarlaDataProvider._parked_world_id not in (None, world.id):
+            return False
+
+        try:
+            actor.set_autopilot(False)
+            actor.apply_control(carla.VehicleControl())
+            actor.set_light_state(carla.VehicleLightState.NONE)
+            actor.set_target_velocity(carla.Vector3D())
+            actor.set_target_angular_velocity(carla.Vector3D())
+            actor.set_simulate_physics(False)
+            slot = CarlaDataProvider._parking_slots
+            actor.set_transform(carla.Transform(carla.Location(x=20.0 * slot, y=-10000.0, z=-500.0)))
+        except RuntimeError as e:
+            print("WARNING: Could not park actor {} ({}), destroying it instead".format(actor.id, e))
+            return False
+
+        CarlaDataProvider._parking_slots += 1
+        CarlaDataProvider._actor_velocity_map.pop(actor, None)
+        CarlaDataProvider._actor_location_map.pop(actor, None)
+        CarlaDataProvider._actor_transform_map.pop(actor, None)
+        row = CarlaDataProvider._actor_state_index.get(actor.id)
+        if row is not None:
+            CarlaDataProvider._actor_state_cache['alive'][row] = False
+
+        key = (actor.type_id, actor.attributes.get('role_name', ''))
+        CarlaDataProvider._parked_actors.setdefault(key, []).append(actor)
+        CarlaDataProvider._parked_actor_ids.add(actor.id)
+        CarlaDataProvider._parked_world_id = world.id
+        return True
+
+    @staticmethod
+    def _take_parked_actor(blueprint, rolename, color=None):
+        """
+        Take out of the parking a live actor of the given blueprint and role name,
+        None if there is none. If a color is given, the actor must have it too.
+        """
+        parked_actors = CarlaDataProvider._parked_actors.get((blueprint.id, rolename), [])
+        wanted_color = None
+        if color and blueprint.has_attribute('color'):
+            wanted_color = blueprint.get_attribute('color').as_str()
+
+        for actor in reversed(parked_actors):
+            if actor.is_alive and wanted_color not in (None, actor.attributes.get('color')):
+                continue
+            parked_actors.remove(actor)
+            CarlaDataProvider._parked_actor_ids.discard(actor.id)
+            if actor.is_alive:
+                return actor
+        return None
+
+    @staticmethod
+    def _find_free_spawn_point(spawn_point, ignored_actor):
+        """
+        The spawn point if no vehicle or walker is closer than SPAWN_POINT_CLEARANCE to it,
+        otherwise the first free one of the other spawn points, in a random order. None if
+        all of them are taken. Parked actors and the ignored actor don't take any.
+        """
+        taken = [actor.get_location() for actor in CarlaDataProvider._world.get_actors()
+                 if actor.id != ignored_actor.id and actor.id not in CarlaDataProvider._parked_actor_ids
+                 and actor.type_id.startswith(('vehicle.', 'walker.'))]
+
+        def is_free(transform):
+            return all(transform.location.distance(location) > SPAWN_POINT_CLEARANCE for location in taken)
+
+        if is_free(spawn_point):
+            return spawn_point
+        spawn_points = list(CarlaDataProvider._spawn_points)
+        for index in CarlaDataProvider._rng.permutation(len(spawn_points)):
+            if is_free(spawn_points[index]):
+                return spawn_points[index]
+        return None
+
+    @staticmethod
+    def _unpark_actor(actor, transform, autopilot):
+        """
+        Bring a parked actor to the transform, undoing the reset checklist of _park_actor:
+        teleported first, then velocities zeroed again and physics enabled, then the autopilot
+        """
+        actor.set_transform(transform)
+        actor.set_target_velocity(carla.Vector3D())
+        actor.set_target_angular_velocity(carla.Vector3D())
+        actor.set_simulate_physics(True)
+        actor.set_autopilot(autopilot)
+
+    @staticmethod
+    def _forget_parked_actors():
+        """
+        Empty the parking without touching the actors (their world is gone)
+        """
+        CarlaDataProvider._parked_actors = dict()
+        CarlaDataProvider._parked_actor_ids = set()
+        CarlaDataProvider._parked_world_id = None
+        CarlaDataProvider._parking_slots = 0
+
+    @staticmethod
+    def destroy_parked_actors():
+        """
+        Destroy all the parked actors, e.g. once no more repetitions are run
+        """
+        parked_actors = [actor for actors in CarlaDataProvider._parked_actors.values() for actor in actors]
+        batch = [carla.command.DestroyActor(actor.id) for actor in parked_actors if actor.is_alive]
+        CarlaDataProvider._forget_parked_actors()
+        if not batch:
+            return
+
+        if CarlaDataProvider._client:
+            try:
+                CarlaDataProvider._client.apply_batch_sync(batch)
+            except RuntimeError as e:
+                if "time-out" not in str(e):
+                    raise e
+        else:
+            for actor in parked_actors:
+                if actor.is_alive:
+                    actor.destroy()
+
     @staticmethod
     def get_traffic_manager_port():
         """
@@ -776,15 +1157,19 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
     @staticmethod
     def cleanup():
         """
-        Cleanup and remove all entries from all dictionaries
+        Cleanup and remove all entries from all dictionaries.
+        The parked actors are kept for the next scenario of the same world.
         """
+        # Send the controls of an interrupted tick first, parking then neutralizes them
+        CarlaDataProvider.flush_control_batch()
+
         DestroyActor = carla.command.DestroyActor       # pylint: disable=invalid-name
         batch = []
 
         for actor_id in CarlaDataProvider._carla_actor_pool.copy():
             actor = CarlaDataProvider._carla_actor_pool[actor_id]
-            if actor.is_alive:
-                batch.append(DestroyActor(actor))
+            if actor.is_alive and not CarlaDataProvider._park_actor(actor):
+                batch.append(DestroyActor(actor.id))
 
         if CarlaDataProvider._client:
             try:
@@ -798,13 +1183,17 @@ class CarlaDataProvider(object):  # pylint: disable=too-many-public-methods
         CarlaDataProvider._actor_velocity_map.clear()
         CarlaDataProvider._actor_location_map.clear()
         CarlaDataProvider._actor_transform_map.clear()
+        CarlaDataProvider._actor_state_cache = np.zeros(16, dtype=ACTOR_STATE_DTYPE)
+        CarlaDataProvider._actor_state_index.clear()
         CarlaDataProvider._traffic_light_map.clear()
         CarlaDataProvider._map = None
         CarlaDataProvider._world = None
+        CarlaDataProvider._snapshot = None
         CarlaDataProvider._sync_flag = False
         CarlaDataProvider._ego_vehicle_route = None
         CarlaDataProvider._carla_actor_pool = dict()
         CarlaDataProvider._client = None
         CarlaDataProvider._spawn_points = None
         CarlaDataProvider._spawn_index = 0
+        CarlaDataProvider._blueprint_ids = dict()
         CarlaDataProvider._rng = random.RandomState(CarlaDataProvider._random_seed)
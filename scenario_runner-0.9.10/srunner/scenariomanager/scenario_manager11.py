@@ -19,6 +19,7 @@ import py_trees
 from srunner.autoagents.agent_wrapper import AgentWrapper
 from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
 from srunner.scenariomanager.result_writer2 import ResultOutputProvider
+from srunner.scenariomanager.tick_driver import TickDriver
 from srunner.scenariomanager.timer import GameTime
 from srunner.scenariomanager.watchdog import Watchdog
 from automatic_control_agent_z8_ego import *  # EgoControlAgent() imported from here
@@ -70,6 +71,8 @@ class ScenarioManager(object):
         self.collision_counts = None
         self.collision_test_result = None
 
+        self.ego_agentZ = None  # created once, reset to the new ego vehicle every repetition
+
     def _reset(self):
         """
         Reset all parameters
@@ -102,11 +105,13 @@ class ScenarioManager(object):
         """
         self._reset()
 
-        # Initializing our custom ego
-        self.ego_agentZ = EgoControlAgent()
+        # Initializing our custom ego, the client, model and route planner stay warm across repetitions
+        if self.ego_agentZ is None:
+            self.ego_agentZ = EgoControlAgent()
 
-        # load the scenario settings in the ego driving agent 
-        self.ego_agentZ.game_loop_init(ego_goal_location, ego_visualize)
+        # load the scenario settings in the ego driving agent, bound to the ego vehicle spawned by CarlaDataProvider
+        ego_vehicle = scenario.ego_vehicles[0] if scenario.ego_vehicles else None
+        self.ego_agentZ.game_loop_init(ego_goal_location, ego_visualize, ego_vehicle)
         #sys.exit("reached here load_scenario")
 
         # default code of agent not used
@@ -119,7 +124,9 @@ class ScenarioManager(object):
 
 
         self.scenario_class = scenario  # NoSignalJunctionCrossing Class
-        self.scenario = scenario.scenario  # Scenario(behavior_seq, criteria, self.name, self.timeout, self.terminate_on_failure) class in Basic Scenario Class
+        # Scenario(behavior_seq, criteria, self.name, self.timeout, self.terminate_on_failure)
+        # class in Basic Scenario Class
+        self.scenario = scenario.scenario
 
         '''
         Scenario Class
@@ -129,7 +136,10 @@ class ScenarioManager(object):
             self.timeout = timeout
             self.name = name  # name = "NoSignalJunctionCrossing"
         '''
-        self.scenario_tree = self.scenario.scenario_tree  # from scenario class in basic_scenario py file --> Tha main scenario tree that has everything :3 self.scenario_tree = py_trees.composites.Parallel(name, policy=py_trees.common.ParallelPolicy.SUCCESS_ON_ONE)   # name = "NoSignalJunctionCrossing"
+        # from scenario class in basic_scenario py file --> Tha main scenario tree that has everything :3
+        # self.scenario_tree = py_trees.composites.Parallel(name, policy=py_trees.common.ParallelPolicy.SUCCESS_ON_ONE)
+        # name = "NoSignalJunctionCrossing"
+        self.scenario_tree = self.scenario.scenario_tree
         
         # Create overall py_tree --> from scenario class in basic_scenario py file
         #self.scenario_tree = py_trees.composites.Parallel(name, policy=py_trees.common.ParallelPolicy.SUCCESS_ON_ONE)
@@ -158,30 +168,27 @@ class ScenarioManager(object):
         self._watchdog.start()
         self._running = True
 
-        while self._running:  # is equal to false when the scenario tree is finished running as seen below in self._tick_scenario(timestamp)
-            timestamp = None
-            world = CarlaDataProvider.get_world()
-            if world:
-                snapshot = world.get_snapshot()  # snapshot of what's happening in the world?
-                '''
-                This snapshot comprises all the information for every actor on scene at a certain moment of time. It creates and gives acces to a data structure containing a series of carla.ActorSnapshot. The client recieves a new snapshot on every tick that cannot be stored.
-
-                '''
+        # The tick driver hands out every frame once, the agents and the scenario are all stepped with it
+        tick_driver = TickDriver(CarlaDataProvider.get_world(), self._sync_mode, 10.0)
 
+        # self._running is equal to false when the scenario tree is finished running as seen below in
+        # self._tick_scenario(timestamp)
+        while self._running:
+            snapshot = tick_driver.wait_for_frame()
+            if snapshot is None:
+                continue
 
-                if snapshot:
-                    timestamp = snapshot.timestamp
-                    #print(timestamp)
-            if timestamp:  # meaning carla worl is running i.e., the scenario in that world
+            # The controls of the agents and of the behaviors are sent together at the end of the tick
+            CarlaDataProvider.start_control_batch()
+            try:
+                # The ego agent drives with the same frame,
+                # the other vehicle agent is stepped by its behavior in the tree
+                self.ego_agentZ.game_loop_step(snapshot)
 
-                # So the scenario is ticked in a while loop which is pretty fast :3 
-                # So do I need to declare the veh driving agent here or independently? Let's see.
-                # Maybe I should call the ego and other veh agents here :3 
-                # Run the run_step method here of the automatic_control_agent_z here :3
-
-                self.ego_agentZ.game_loop_step()  # making new plan again for each step, just an experiment.
-                
-                self._tick_scenario(timestamp)  # Run next tick of scenario and the agent.
+                self._tick_scenario(snapshot.timestamp, snapshot)  # Run next tick of scenario and the agent.
+            finally:
+                # Never leave the batch open, or every later control would be collected and lost
+                CarlaDataProvider.flush_control_batch()
 
         self.ego_agentZ.game_loop_end()
         self.other_veh_agentZ_og.game_loop_end()  # ENDING IT HERE AL!
@@ -200,40 +207,50 @@ class ScenarioManager(object):
         if self.scenario_tree.status == py_trees.common.Status.FAILURE:
             print("ScenarioManager: Terminated due to failure")
 
-    def _tick_scenario(self, timestamp):
+    def _tick_scenario(self, timestamp, snapshot=None):
         """
         Run next tick of scenario and the agent.
         If running synchornously, it also handles the ticking of the world.
+        The world snapshot, if given, is used to refresh all actor states in one pass.
         """
 
-        if self._timestamp_last_run < timestamp.elapsed_seconds and self._running:
-            self._timestamp_last_run = timestamp.elapsed_seconds
-
-            self._watchdog.update()
-
-            if self._debug_mode:
-                print("\n--------- Tick ---------\n")  # cool
+        try:
+            if self._timestamp_last_run < timestamp.elapsed_seconds and self._running:
+                self._timestamp_last_run = timestamp.elapsed_seconds
+
+                self._watchdog.update()
+
+                if self._debug_mode:
+                    print("\n--------- Tick ---------\n")  # cool
+                    #sys.exit("fhawk")
+                # Update game time and actor information
+                GameTime.on_carla_tick(timestamp)
+                CarlaDataProvider.on_carla_tick(snapshot)  # update all actors velocity, location, transform
+
+                if self._agent is not None:
+                    # doesn't enter this condition for NoSignalJunctionCrossing so let's ignore it for now
+                    ego_action = self._agent()
+                if self._agent is not None:
+                    # will see what is this ego_action
+                    CarlaDataProvider.apply_control(self.ego_vehicles[0], ego_action)
+
+                # Tick scenario
+                # look at this, moving through the sequences in a tree I suppose!!!!!~~~!! vip!
+                self.scenario_tree.tick_once()
                 #sys.exit("fhawk")
-            # Update game time and actor information
-            GameTime.on_carla_tick(timestamp)
-            CarlaDataProvider.on_carla_tick()  # update all actors velocity, location, transform
-
-            if self._agent is not None:
-                ego_action = self._agent()  # doesn't enter this condition for NoSignalJunctionCrossing so let's ignore it for now
-            if self._agent is not None:
-                self.ego_vehicles[0].apply_control(ego_action)  # will see what is this ego_action
-
-            # Tick scenario
-            self.scenario_tree.tick_once()  # look at this, moving through the sequences in a tree I suppose!!!!!~~~!! vip!
-            #sys.exit("fhawk")
 
-            if self._debug_mode:
-                print("\n")
-                py_trees.display.print_ascii_tree(self.scenario_tree, show_status=True)
-                sys.stdout.flush()
+                if self._debug_mode:
+                    print("\n")
+                    py_trees.display.print_ascii_tree(self.scenario_tree, show_status=True)
+                    sys.stdout.flush()
 
-            if self.scenario_tree.status != py_trees.common.Status.RUNNING:
-                self._running = False  # meaning scenario finished  # When last child/node of the pytree i.e., the root = pytree sequence() is executed and in a non running state
+                if self.scenario_tree.status != py_trees.common.Status.RUNNING:
+                    # meaning scenario finished: the last child/node of the pytree i.e., the root = pytree sequence()
+                    # is executed and in a non running state
+                    self._running = False
+        finally:
+            # One call to the server for all the controls of this tick
+            CarlaDataProvider.flush_control_batch()
 
         if self._sync_mode and self._running and self._watchdog.get_status():
             CarlaDataProvider.get_world().tick()
@@ -250,6 +267,7 @@ class ScenarioManager(object):
         This function is used by the overall signal handler to terminate the scenario execution
         """
         self._running = False
+        CarlaDataProvider.flush_control_batch()
 
     def analyze_scenario(self, stdout, filename, junit):
         """
@@ -279,7 +297,8 @@ class ScenarioManager(object):
             timeout = True
             result = "TIMEOUT"
 
-        output = ResultOutputProvider(self, result, stdout, filename, junit)  # self is the scenario manager class object
+        # self is the scenario manager class object
+        output = ResultOutputProvider(self, result, stdout, filename, junit)
         output.write()
 
         self.collision_counts = output.collision_counts
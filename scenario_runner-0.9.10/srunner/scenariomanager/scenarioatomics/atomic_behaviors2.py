@@ -922,7 +922,7 @@ class AccelerateToVelocity(AtomicBehavior):
                 new_status = py_trees.common.Status.SUCCESS
                 self._control.throttle = 0
 
-        self._actor.apply_control(self._control)
+        CarlaDataProvider.apply_control(self._actor, self._control)
         self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
 
         return new_status
@@ -993,7 +993,7 @@ class AccelerateToCatchUp(AtomicBehavior):
             # keep velocity until the actors are in trigger distance
             self._control.throttle = 0
 
-        self._actor.apply_control(self._control)
+        CarlaDataProvider.apply_control(self._actor, self._control)
 
         # new status:
         if distance <= self._trigger_distance:
@@ -1117,7 +1117,7 @@ class KeepVelocity(AtomicBehavior):
         elif self._type == 'walker':
             self._control.speed = 0.0
         if self._actor is not None and self._actor.is_alive:
-            self._actor.apply_control(self._control)
+            CarlaDataProvider.apply_control(self._actor, self._control)
         super(KeepVelocity, self).terminate(new_status)
 
 
@@ -1225,7 +1225,7 @@ class StopVehicle(AtomicBehavior):
         else:
             new_status = py_trees.common.Status.SUCCESS
 
-        self._actor.apply_control(self._control)
+        CarlaDataProvider.apply_control(self._actor, self._control)
 
         self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
 
@@ -1297,7 +1297,7 @@ class SyncArrival(AtomicBehavior):  # class AtomicBehavior(py_trees.behaviour.Be
             self._control.throttle = 0
             self._control.brake = min([abs(control_value), 1])
 
-        self._actor.apply_control(self._control)
+        CarlaDataProvider.apply_control(self._actor, self._control)
         self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
         return new_status
 
@@ -1309,7 +1309,7 @@ class SyncArrival(AtomicBehavior):  # class AtomicBehavior(py_trees.behaviour.Be
         if self._actor is not None and self._actor.is_alive:
             self._control.throttle = 0.0
             self._control.brake = 0.0
-            self._actor.apply_control(self._control)
+            CarlaDataProvider.apply_control(self._actor, self._control)
         super(SyncArrival, self).terminate(new_status)
 
 
@@ -1347,7 +1347,7 @@ class AddNoiseToVehicle(AtomicBehavior):
         new_status = py_trees.common.Status.SUCCESS
 
         self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
-        self._actor.apply_control(self._control)
+        CarlaDataProvider.apply_control(self._actor, self._control)
 
         return new_status
 
@@ -1430,14 +1430,14 @@ class BasicAgentBehavior(AtomicBehavior):
             new_status = py_trees.common.Status.SUCCESS
 
         self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
-        self._actor.apply_control(self._control)
+        CarlaDataProvider.apply_control(self._actor, self._control)
 
         return new_status
 
     def terminate(self, new_status):
         self._control.throttle = 0.0
         self._control.brake = 0.0
-        self._actor.apply_control(self._control)
+        CarlaDataProvider.apply_control(self._actor, self._control)
         super(BasicAgentBehavior, self).terminate(new_status)
 
 
@@ -1649,7 +1649,7 @@ class WaypointFollower(AtomicBehavior):
                     if self._avoid_collision and detect_lane_obstacle(actor):
                         control.throttle = 0.0
                         control.brake = 1.0
-                    actor.apply_control(control)
+                    CarlaDataProvider.apply_control(actor, control)
                     # Check if the actor reached the end of the plan
                     # @TODO replace access to private _waypoints_queue with public getter
                     if local_planner._waypoints_queue:  # pylint: disable=protected-access
@@ -1666,7 +1666,7 @@ class WaypointFollower(AtomicBehavior):
                         control = actor.get_control()
                         control.speed = self._target_speed
                         control.direction = direction / direction_norm
-                        actor.apply_control(control)
+                        CarlaDataProvider.apply_control(actor, control)
                         if direction_norm < 1.0:
                             self._actor_dict[actor] = self._actor_dict[actor][1:]
                             if self._actor_dict[actor] is None:
@@ -1675,7 +1675,7 @@ class WaypointFollower(AtomicBehavior):
                         control = actor.get_control()
                         control.speed = self._target_speed
                         control.direction = CarlaDataProvider.get_transform(actor).rotation.get_forward_vector()
-                        actor.apply_control(control)
+                        CarlaDataProvider.apply_control(actor, control)
 
         if success:
             new_status = py_trees.common.Status.SUCCESS
@@ -1690,7 +1690,7 @@ class WaypointFollower(AtomicBehavior):
         for actor in self._local_planner_dict:
             if actor is not None and actor.is_alive:
                 control, _ = get_actor_control(actor)
-                actor.apply_control(control)
+                CarlaDataProvider.apply_control(actor, control)
                 local_planner = self._local_planner_dict[actor]
                 if local_planner is not None and local_planner != "Walker":
                     local_planner.reset_vehicle()
@@ -1837,12 +1837,12 @@ class HandBrakeVehicle(AtomicBehavior):
         new_status = py_trees.common.Status.SUCCESS
         if self._type == 'vehicle':
             self._control.hand_brake = self._hand_brake_value
-            self._vehicle.apply_control(self._control)
+            CarlaDataProvider.apply_control(self._vehicle, self._control)
         else:
             self._hand_brake_value = None
             self.logger.debug("%s.update()[%s->%s]" %
                               (self.__class__.__name__, self.status, new_status))
-            self._vehicle.apply_control(self._control)
+            CarlaDataProvider.apply_control(self._vehicle, self._control)
 
         return new_status
 
@@ -22,10 +22,12 @@ import py_trees
 import shapely
 
 import carla
+from agents.tools.traffic_light_index import get_traffic_light_index, rotate_point, segments_intersect
 
 from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
 from srunner.scenariomanager.timer import GameTime
 from srunner.scenariomanager.traffic_events import TrafficEvent, TrafficEventType
+from srunner.tools.route_geometry import RouteGeometry
 
 
 class Criterion(py_trees.behaviour.Behaviour):
@@ -1063,8 +1065,7 @@ class OutsideRouteLanesTest(Criterion):
         self._actor = actor
         self._route = route
         self._current_index = 0
-        self._route_length = len(self._route)
-        self._waypoints, _ = zip(*self._route)
+        self._geometry = RouteGeometry.get(self._route)
 
         self._map = CarlaDataProvider.get_map()
         self._pre_ego_waypoint = self._map.get_waypoint(self._actor.get_location())
@@ -1102,30 +1103,19 @@ class OutsideRouteLanesTest(Criterion):
         if self._outside_lane_active or self._wrong_lane_active:
             self.test_status = "FAILURE"
 
-        # 2) Get the traveled distance
-        for index in range(self._current_index + 1,
-                           min(self._current_index + self.WINDOWS_SIZE + 1, self._route_length)):
-            # Get the dot product to know if it has passed this location
-            index_location = self._waypoints[index]
-            index_waypoint = self._map.get_waypoint(index_location)
+        # 2) Get the traveled distance, through all the points of the window the actor has passed
+        passed = self._geometry.passed_points(location, self._current_index + 1,
+                                              self._current_index + self.WINDOWS_SIZE + 1)
+        if len(passed) > 0:
+            new_dist = self._geometry.chain_distance(self._current_index, passed)
 
-            wp_dir = index_waypoint.transform.get_forward_vector()  # Waypoint's forward vector
-            wp_veh = location - index_location  # vector waypoint - vehicle
-            dot_ve_wp = wp_veh.x * wp_dir.x + wp_veh.y * wp_dir.y + wp_veh.z * wp_dir.z
+            # Add it to the total distance
+            self._current_index = int(passed[-1])
+            self._total_distance += new_dist
 
-            if dot_ve_wp > 0:
-                # Get the distance traveled
-                index_location = self._waypoints[index]
-                current_index_location = self._waypoints[self._current_index]
-                new_dist = current_index_location.distance(index_location)
-
-                # Add it to the total distance
-                self._current_index = index
-                self._total_distance += new_dist
-
-                # And to the wrong one if outside route lanes
-                if self._outside_lane_active or self._wrong_lane_active:
-                    self._wrong_distance += new_dist
+            # And to the wrong one if outside route lanes
+            if self._outside_lane_active or self._wrong_lane_active:
+                self._wrong_distance += new_dist
 
         self.logger.debug("%s.update()[%s->%s]" % (self.__class__.__name__, self.status, new_status))
 
@@ -1484,24 +1474,11 @@ class InRouteTest(Criterion):
             self._offroad_min = self._offroad_min
 
         self._world = CarlaDataProvider.get_world()
-        self._waypoints, _ = zip(*self._route)
-        self._route_length = len(self._route)
+        self._geometry = RouteGeometry.get(self._route)
         self._current_index = 0
         self._out_route_distance = 0
         self._in_safe_route = True
 
-        self._accum_meters = []
-        prev_wp = self._waypoints[0]
-        for i, wp in enumerate(self._waypoints):
-            d = wp.distance(prev_wp)
-            if i > 0:
-                accum = self._accum_meters[i - 1]
-            else:
-                accum = 0
-
-            self._accum_meters.append(d + accum)
-            prev_wp = wp
-
         # Blackboard variable
         blackv = py_trees.blackboard.Blackboard()
         _ = blackv.set("InRoute", True)
@@ -1523,17 +1500,9 @@ class InRouteTest(Criterion):
 
             off_route = True
 
-            shortest_distance = float('inf')
-            closest_index = -1
-
             # Get the closest distance
-            for index in range(self._current_index,
-                               min(self._current_index + self.WINDOWS_SIZE + 1, self._route_length)):
-                ref_waypoint = self._waypoints[index]
-                distance = math.sqrt(((location.x - ref_waypoint.x) ** 2) + ((location.y - ref_waypoint.y) ** 2))
-                if distance <= shortest_distance:
-                    closest_index = index
-                    shortest_distance = distance
+            closest_index, shortest_distance = self._geometry.closest_point(
+                location, self._current_index, self._current_index + self.WINDOWS_SIZE + 1)
 
             if closest_index == -1 or shortest_distance == float('inf'):
                 return new_status
@@ -1546,12 +1515,12 @@ class InRouteTest(Criterion):
             # If actor advanced a step, record the distance
             if self._current_index != closest_index:
 
-                new_dist = self._accum_meters[closest_index] - self._accum_meters[self._current_index]
+                new_dist = self._geometry.distance_between(self._current_index, closest_index)
 
                 # If too far from the route, add it and check if its value
                 if not self._in_safe_route:
                     self._out_route_distance += new_dist
-                    out_route_percentage = 100 * self._out_route_distance / self._accum_meters[-1]
+                    out_route_percentage = 100 * self._out_route_distance / self._geometry.length
                     if out_route_percentage > self.MAX_ROUTE_PERCENTAGE:
                         off_route = True
 
@@ -1608,21 +1577,8 @@ class RouteCompletionTest(Criterion):
 
         self._wsize = self.WINDOWS_SIZE
         self._current_index = 0
-        self._route_length = len(self._route)
-        self._waypoints, _ = zip(*self._route)
-        self.target = self._waypoints[-1]
-
-        self._accum_meters = []
-        prev_wp = self._waypoints[0]
-        for i, wp in enumerate(self._waypoints):
-            d = wp.distance(prev_wp)
-            if i > 0:
-                accum = self._accum_meters[i - 1]
-            else:
-                accum = 0
-
-            self._accum_meters.append(d + accum)
-            prev_wp = wp
+        self._geometry = RouteGeometry.get(self._route)
+        self.target = self._geometry.locations[-1]
 
         self._traffic_event = TrafficEvent(event_type=TrafficEventType.ROUTE_COMPLETION)
         self.list_traffic_events.append(self._traffic_event)
@@ -1643,24 +1599,18 @@ class RouteCompletionTest(Criterion):
 
         elif self.test_status == "RUNNING" or self.test_status == "INIT":
 
-            for index in range(self._current_index, min(self._current_index + self._wsize + 1, self._route_length)):
-                # Get the dot product to know if it has passed this location
-                ref_waypoint = self._waypoints[index]
-                wp = self._map.get_waypoint(ref_waypoint)
-                wp_dir = wp.transform.get_forward_vector()          # Waypoint's forward vector
-                wp_veh = location - ref_waypoint                    # vector waypoint - vehicle
-                dot_ve_wp = wp_veh.x * wp_dir.x + wp_veh.y * wp_dir.y + wp_veh.z * wp_dir.z
-
-                if dot_ve_wp > 0:
-                    # good! segment completed!
-                    self._current_index = index
-                    self._percentage_route_completed = 100.0 * float(self._accum_meters[self._current_index]) \
-                        / float(self._accum_meters[-1])
-                    self._traffic_event.set_dict({
-                        'route_completed': self._percentage_route_completed})
-                    self._traffic_event.set_message(
-                        "Agent has completed > {:.2f}% of the route".format(
-                            self._percentage_route_completed))
+            # Get the dot product to know if it has passed the locations of the window
+            passed = self._geometry.passed_points(location, self._current_index,
+                                                  self._current_index + self._wsize + 1)
+            if len(passed) > 0:
+                # good! segment completed!
+                self._current_index = int(passed[-1])
+                self._percentage_route_completed = self._geometry.completion(self._current_index)
+                self._traffic_event.set_dict({
+                    'route_completed': self._percentage_route_completed})
+                self._traffic_event.set_message(
+                    "Agent has completed > {:.2f}% of the route".format(
+                        self._percentage_route_completed))
 
             if self._percentage_route_completed > 99.0 and location.distance(self.target) < self.DISTANCE_THRESHOLD:
                 route_completion_event = TrafficEvent(event_type=TrafficEventType.ROUTE_COMPLETED)
@@ -1707,16 +1657,12 @@ class RunningRedLightTest(Criterion):
         self._actor = actor
         self._world = actor.get_world()
         self._map = CarlaDataProvider.get_map()
-        self._list_traffic_lights = []
         self._last_red_light_id = None
         self.actual_value = 0
         self.debug = False
 
-        all_actors = self._world.get_actors()
-        for _actor in all_actors:
-            if 'traffic_light' in _actor.type_id:
-                center, waypoints = self.get_traffic_light_waypoints(_actor)
-                self._list_traffic_lights.append((_actor, center, waypoints))
+        # Traffic lights of the map with their stop lines, shared with the agents
+        self._index = get_traffic_light_index(self._world, self._map)
 
     # pylint: disable=no-self-use
     def is_vehicle_crossing_line(self, seg1, seg2):
@@ -1748,76 +1694,58 @@ class RunningRedLightTest(Criterion):
         tail_far_pt = self.rotate_point(carla.Vector3D(-veh_extent - 1, 0.0, location.z), transform.rotation.yaw)
         tail_far_pt = location + carla.Location(tail_far_pt)
 
-        for traffic_light, center, waypoints in self._list_traffic_lights:
+        if self.debug:
+            self._draw_traffic_lights()
 
-            if self.debug:
-                z = 2.1
-                if traffic_light.state == carla.TrafficLightState.Red:
-                    color = carla.Color(155, 0, 0)
-                elif traffic_light.state == carla.TrafficLightState.Green:
-                    color = carla.Color(0, 155, 0)
-                else:
-                    color = carla.Color(155, 155, 0)
-                self._world.debug.draw_point(center + carla.Location(z=z), size=0.2, color=color, life_time=0.01)
-                for wp in waypoints:
-                    text = "{}.{}".format(wp.road_id, wp.lane_id)
-                    self._world.debug.draw_string(
-                        wp.transform.location + carla.Location(x=1, z=z), text, color=color, life_time=0.01)
-                    self._world.debug.draw_point(
-                        wp.transform.location + carla.Location(z=z), size=0.1, color=color, life_time=0.01)
+        tail_wp = None
+        ve_dir = None
 
-            center_loc = carla.Location(center)
+        for traffic_light in self._index.lights_near(location, self.DISTANCE_LIGHT):
 
             if self._last_red_light_id and self._last_red_light_id == traffic_light.id:
                 continue
-            if center_loc.distance(location) > self.DISTANCE_LIGHT:
+            if self._index.center(traffic_light).distance(location) > self.DISTANCE_LIGHT:
                 continue
             if traffic_light.state != carla.TrafficLightState.Red:
                 continue
 
-            for wp in waypoints:
-
+            if tail_wp is None:
                 tail_wp = self._map.get_waypoint(tail_far_pt)
+                forward = transform.get_forward_vector()
+                ve_dir = np.array([forward.x, forward.y, forward.z])
+
+            # Stop lines of the lanes of the light that the "tail" is on, until it has passed
+            # (the dot product might be unscaled, as only its sign is important)
+            lines = self._index.stop_lines(traffic_light)
+            mask = (lines['road_id'] == tail_wp.road_id) & (lines['lane_id'] == tail_wp.lane_id) & \
+                (lines['forward'].dot(ve_dir) > 0)
+            if not mask.any():
+                continue
+
+            # Is the vehicle traversing the stop line?
+            crossing = segments_intersect(np.array([tail_close_pt.x, tail_close_pt.y]),
+                                          np.array([tail_far_pt.x, tail_far_pt.y]),
+                                          lines['start'][mask], lines['end'][mask])
+            if crossing.any():
+
+                self.test_status = "FAILURE"
+                self.actual_value += 1
+                location = traffic_light.get_transform().location
+                red_light_event = TrafficEvent(event_type=TrafficEventType.TRAFFIC_LIGHT_INFRACTION)
+                red_light_event.set_message(
+                    "Agent ran a red light {} at (x={}, y={}, z={})".format(
+                        traffic_light.id,
+                        round(location.x, 3),
+                        round(location.y, 3),
+                        round(location.z, 3)))
+                red_light_event.set_dict({
+                    'id': traffic_light.id,
+                    'x': location.x,
+                    'y': location.y,
+                    'z': location.z})
 
-                # Calculate the dot product (Might be unscaled, as only its sign is important)
-                ve_dir = CarlaDataProvider.get_transform(self._actor).get_forward_vector()
-                wp_dir = wp.transform.get_forward_vector()
-                dot_ve_wp = ve_dir.x * wp_dir.x + ve_dir.y * wp_dir.y + ve_dir.z * wp_dir.z
-
-                # Check the lane until all the "tail" has passed
-                if tail_wp.road_id == wp.road_id and tail_wp.lane_id == wp.lane_id and dot_ve_wp > 0:
-                    # This light is red and is affecting our lane
-                    yaw_wp = wp.transform.rotation.yaw
-                    lane_width = wp.lane_width
-                    location_wp = wp.transform.location
-
-                    lft_lane_wp = self.rotate_point(carla.Vector3D(0.4 * lane_width, 0.0, location_wp.z), yaw_wp + 90)
-                    lft_lane_wp = location_wp + carla.Location(lft_lane_wp)
-                    rgt_lane_wp = self.rotate_point(carla.Vector3D(0.4 * lane_width, 0.0, location_wp.z), yaw_wp - 90)
-                    rgt_lane_wp = location_wp + carla.Location(rgt_lane_wp)
-
-                    # Is the vehicle traversing the stop line?
-                    if self.is_vehicle_crossing_line((tail_close_pt, tail_far_pt), (lft_lane_wp, rgt_lane_wp)):
-
-                        self.test_status = "FAILURE"
-                        self.actual_value += 1
-                        location = traffic_light.get_transform().location
-                        red_light_event = TrafficEvent(event_type=TrafficEventType.TRAFFIC_LIGHT_INFRACTION)
-                        red_light_event.set_message(
-                            "Agent ran a red light {} at (x={}, y={}, z={})".format(
-                                traffic_light.id,
-                                round(location.x, 3),
-                                round(location.y, 3),
-                                round(location.z, 3)))
-                        red_light_event.set_dict({
-                            'id': traffic_light.id,
-                            'x': location.x,
-                            'y': location.y,
-                            'z': location.z})
-
-                        self.list_traffic_events.append(red_light_event)
-                        self._last_red_light_id = traffic_light.id
-                        break
+                self.list_traffic_events.append(red_light_event)
+                self._last_red_light_id = traffic_light.id
 
         if self._terminate_on_failure and (self.test_status == "FAILURE"):
             new_status = py_trees.common.Status.FAILURE
@@ -1826,52 +1754,38 @@ class RunningRedLightTest(Criterion):
 
         return new_status
 
+    def _draw_traffic_lights(self):
+        """
+        Draw the trigger volume centers and the stop waypoints of all the traffic lights
+        """
+        z = 2.1
+        for traffic_light in self._index.lights:
+            if traffic_light.state == carla.TrafficLightState.Red:
+                color = carla.Color(155, 0, 0)
+            elif traffic_light.state == carla.TrafficLightState.Green:
+                color = carla.Color(0, 155, 0)
+            else:
+                color = carla.Color(155, 155, 0)
+            self._world.debug.draw_point(
+                self._index.center(traffic_light) + carla.Location(z=z), size=0.2, color=color, life_time=0.01)
+            for wp in self._index.stop_waypoints(traffic_light):
+                text = "{}.{}".format(wp.road_id, wp.lane_id)
+                self._world.debug.draw_string(
+                    wp.transform.location + carla.Location(x=1, z=z), text, color=color, life_time=0.01)
+                self._world.debug.draw_point(
+                    wp.transform.location + carla.Location(z=z), size=0.1, color=color, life_time=0.01)
+
     def rotate_point(self, point, angle):
         """
         rotate a given point by a given angle
         """
-        x_ = math.cos(math.radians(angle)) * point.x - math.sin(math.radians(angle)) * point.y
-        y_ = math.sin(math.radians(angle)) * point.x + math.cos(math.radians(angle)) * point.y
-        return carla.Vector3D(x_, y_, point.z)
+        return rotate_point(point, angle)
 
     def get_traffic_light_waypoints(self, traffic_light):
         """
         get area of a given traffic light
         """
-        base_transform = traffic_light.get_transform()
-        base_rot = base_transform.rotation.yaw
-        area_loc = base_transform.transform(traffic_light.trigger_volume.location)
-
-        # Discretize the trigger box into points
-        area_ext = traffic_light.trigger_volume.extent
-        x_values = np.arange(-0.9 * area_ext.x, 0.9 * area_ext.x, 1.0)  # 0.9 to avoid crossing to adjacent lanes
-
-        area = []
-        for x in x_values:
-            point = self.rotate_point(carla.Vector3D(x, 0, area_ext.z), base_rot)
-            point_location = area_loc + carla.Location(x=point.x, y=point.y)
-            area.append(point_location)
-
-        # Get the waypoints of these points, removing duplicates
-        ini_wps = []
-        for pt in area:
-            wpx = self._map.get_waypoint(pt)
-            # As x_values are arranged in order, only the last one has to be checked
-            if not ini_wps or ini_wps[-1].road_id != wpx.road_id or ini_wps[-1].lane_id != wpx.lane_id:
-                ini_wps.append(wpx)
-
-        # Advance them until the intersection
-        wps = []
-        for wpx in ini_wps:
-            while not wpx.is_intersection:
-                next_wp = wpx.next(0.5)[0]
-                if next_wp and not next_wp.is_intersection:
-                    wpx = next_wp
-                else:
-                    break
-            wps.append(wpx)
-
-        return area_loc, wps
+        return self._index.center(traffic_light), self._index.stop_waypoints(traffic_light)
 
 
 class RunningStopTest(Criterion):
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides the TickDriver, which owns the frame boundary of a
+scenario run: everything that has to happen once per simulation frame (the
+driving agents, CarlaDataProvider.on_carla_tick, the scenario tree) is called
+with the snapshot it returns, instead of every component waiting for the next
+frame on its own.
+
+In synchronous mode the frame is produced by world.tick() (done by the
+ScenarioManager at the end of each frame), in asynchronous mode the driver
+blocks in world.wait_for_tick() until the server sends the next frame.
+Neither polls, so no CPU is burnt while waiting for the simulator.
+"""
+
+from __future__ import print_function
+
+import time
+
+
+class TickDriver(object):
+
+    """
+    Hands out every simulation frame exactly once.
+
+    Usage:
+    driver = TickDriver(world, sync_mode, timeout)
+    while running:
+        snapshot = driver.wait_for_frame()   # None if no frame arrived within the timeout
+    """
+
+    def __init__(self, world, sync_mode=False, timeout=10.0):
+        self._world = world
+        self._sync_mode = sync_mode
+        self._timeout = timeout
+        self._last_frame = None
+
+        self.frames = 0
+        self.timeouts = 0
+        self.wait_time = 0.0  # wall time spent waiting for the simulator
+
+    def wait_for_frame(self):
+        """
+        Return the snapshot of the next, not yet handed out, frame
+        """
+        start_time = time.time()
+        try:
+            if self._sync_mode:
+                # the previous frame has been ticked already, the current snapshot is the new frame
+                snapshot = self._world.get_snapshot()
+                if snapshot is not None and snapshot.frame == self._last_frame:
+                    snapshot = self._world.wait_for_tick(self._timeout)
+            else:
+                snapshot = self._world.wait_for_tick(self._timeout)
+        except RuntimeError:
+            snapshot = None
+        self.wait_time += time.time() - start_time
+
+        if not snapshot:
+            self.timeouts += 1
+            return None
+
+        self._last_frame = snapshot.frame
+        self.frames += 1
+        return snapshot
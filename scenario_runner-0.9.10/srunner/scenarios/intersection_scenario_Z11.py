@@ -268,7 +268,8 @@ class IntersectionScenarioZ_11(BasicScenario):
         # load the scenario settings in the ego driving agent 
         #goal = carla.Location(x=-148.97, y=-76.77, z=0.0)  #ego lef leg loc
         
-        self.other_veh_agentZ.game_loop_init(self.other_vehicle_goal_carla_Location, self.other_visualize)
+        # the agent is reused across repetitions, it is only bound to the new vehicle
+        self.other_veh_agentZ.game_loop_init(self.other_vehicle_goal_carla_Location, self.other_visualize, first_vehicle)
         #self.other_veh_agentZ.game_loop_init(goal, self.other_visualize)
 
         #while True:
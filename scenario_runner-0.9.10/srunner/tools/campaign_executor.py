@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides a parallel executor for test campaigns, which runs the
+repetitions of a campaign on a pool of CARLA servers.
+
+Every server endpoint (host, port, traffic manager port) gets one worker
+process. Jobs are generated on demand in the coordinating process, i.e. only
+when a worker is free. This keeps situation coverage based selection globally
+consistent: every new situation sees the counters of all situations handed
+out before it, whichever server they run on.
+
+The workers are created by a picklable factory, e.g.
+functools.partial(SomeWorker, args), called with the endpoint of the worker.
+A worker has to provide run_job(job) -> result and close().
+StubCampaignWorker can be used to try the executor without any simulator.
+"""
+
+from __future__ import print_function
+
+import collections
+import multiprocessing
+import time
+import traceback
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+
+Endpoint = collections.namedtuple('Endpoint', ['host', 'port', 'tm_port'])
+
+
+def parse_endpoints(endpoint_strings):
+    """
+    Parse "host:port[:tm_port]" strings into Endpoints.
+    Without a traffic manager port, port + 6000 is used (i.e. 8000 for the default port 2000).
+    """
+    endpoints = []
+    for endpoint_string in endpoint_strings:
+        parts = endpoint_string.split(':')
+        if len(parts) not in (2, 3):
+            raise ValueError("Invalid server endpoint {}, expected host:port[:tm_port]".format(endpoint_string))
+        port = int(parts[1])
+        tm_port = int(parts[2]) if len(parts) == 3 else port + 6000
+        endpoints.append(Endpoint(parts[0], port, tm_port))
+
+    if len(set(endpoints)) != len(endpoints):
+        raise ValueError("Every server endpoint can only be used once")
+
+    return endpoints
+
+
+def _worker_main(worker_factory, index, endpoint, job_queue, result_queue):
+    """
+    Main loop of a worker process: run the jobs of job_queue until a None job arrives
+    """
+    try:
+        worker = worker_factory(endpoint)
+    except Exception:                           # pylint: disable=broad-except
+        result_queue.put((index, None, None, traceback.format_exc()))
+        return
+
+    try:
+        while True:
+            job = job_queue.get()
+            if job is None:
+                break
+
+            try:
+                result = worker.run_job(job)
+                error = None
+            except Exception:                   # pylint: disable=broad-except
+                result = None
+                error = traceback.format_exc()
+            result_queue.put((index, job, result, error))
+    finally:
+        worker.close()
+
+
+class CampaignExecutor(object):
+
+    """
+    Runs the jobs of a campaign on a pool of endpoints, one worker process per endpoint.
+
+    Usage:
+    executor = CampaignExecutor(endpoints, worker_factory, next_job, job_done)
+    executor.run()
+
+    next_job() returns the next job (any picklable object) or None when the campaign is done.
+    job_done(job, result, error) is called in this process for every finished job,
+    with error being the formatted traceback if the job failed (None otherwise).
+    """
+
+    poll_interval = 1.0  # in seconds
+
+    def __init__(self, endpoints, worker_factory, next_job, job_done):
+        """
+        Setup the executor, nothing is started before run()
+        """
+        if not endpoints:
+            raise ValueError("At least one server endpoint is needed")
+
+        self.endpoints = list(endpoints)
+        self.worker_factory = worker_factory
+        self._next_job = next_job
+        self._job_done = job_done
+
+        self._pending = collections.deque()  # jobs of workers that failed to start, to be run elsewhere
+        self._campaign_done = False
+
+    def _get_job(self):
+        """
+        Next job to hand out, None if there is nothing left
+        """
+        if self._pending:
+            return self._pending.popleft()
+        if self._campaign_done:
+            return None
+
+        job = self._next_job()
+        if job is None:
+            self._campaign_done = True
+        return job
+
+    def run(self):
+        """
+        Run the whole campaign. Returns the number of jobs finished per endpoint.
+        """
+        result_queue = multiprocessing.Queue()
+        job_queues = []
+        processes = []
+        for index, endpoint in enumerate(self.endpoints):
+            job_queue = multiprocessing.Queue()
+            process = multiprocessing.Process(target=_worker_main,
+                                              args=(self.worker_factory, index, endpoint, job_queue, result_queue),
+                                              name="campaign-worker-{}:{}".format(endpoint.host, endpoint.port))
+            process.start()
+            job_queues.append(job_queue)
+            processes.append(process)
+
+        outstanding = dict()  # worker index -> job
+        alive = set(range(len(self.endpoints)))
+        finished_jobs = [0] * len(self.endpoints)
+
+        def dispatch(index):
+            job = self._get_job()
+            if job is not None:
+                outstanding[index] = job
+                job_queues[index].put(job)
+
+        try:
+            for index in range(len(self.endpoints)):
+                dispatch(index)
+
+            while outstanding:
+                try:
+                    index, job, result, error = result_queue.get(timeout=self.poll_interval)
+                except queue.Empty:
+                    # a worker process that died while running a job can not report it
+                    for index in list(outstanding):
+                        if not processes[index].is_alive():
+                            alive.discard(index)
+                            self._job_done(outstanding.pop(index), None,
+                                           "Worker for {} exited unexpectedly".format(self.endpoints[index]))
+                    continue
+
+                if job is None:
+                    # the worker could not be created, its job has to run somewhere else
+                    print("Could not start the worker for {}:\n{}".format(self.endpoints[index], error))
+                    alive.discard(index)
+                    if index in outstanding:
+                        self._pending.append(outstanding.pop(index))
+                    for other_index in alive:
+                        if other_index not in outstanding:
+                            dispatch(other_index)
+                    continue
+
+                del outstanding[index]
+                finished_jobs[index] += 1
+                self._job_done(job, result, error)
+                dispatch(index)
+
+            if self._pending:
+                print("No worker left to run {} remaining jobs".format(len(self._pending)))
+
+        finally:
+            for index in range(len(self.endpoints)):
+                if processes[index].is_alive():
+                    job_queues[index].put(None)
+            for process in processes:
+                process.join()
+
+        return finished_jobs
+
+
+class StubCampaignWorker(object):
+
+    """
+    Worker that does not connect to any simulator, for trying and testing the executor locally.
+    Every job takes job_duration seconds and its result echoes the job and the endpoint.
+    A job that is a dict can set its own "duration", and fails if it has "fail" set.
+    """
+
+    def __init__(self, endpoint, job_duration=0.0):
+        self.endpoint = endpoint
+        self.job_duration = job_duration
+
+    def run_job(self, job):
+        """
+        Pretend to run the job
+        """
+        options = job if isinstance(job, dict) else dict()
+        time.sleep(options.get("duration", self.job_duration))
+        if options.get("fail"):
+            raise RuntimeError("Stub job {} failed".format(job))
+        return {"job": job, "endpoint": "{}:{}".format(self.endpoint.host, self.endpoint.port)}
+
+    def close(self):
+        """
+        Nothing to clean up
+        """
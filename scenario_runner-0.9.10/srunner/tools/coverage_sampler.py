@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides the coverage weighted sampler used for situation coverage
+based generation: the less often a bin has been selected so far, the more
+likely it is to be selected next.
+
+The counts of all dimensions (e.g. the environmental condition parameters) are
+the rows of one 2D array, which is updated in place. All dimensions are drawn
+together with a single vectorized call. Dimensions with fewer bins are padded
+and masked out.
+
+Supported weightings:
+- "softmax":          w = exp(-(count - min count) / temperature)
+- "inverse_count":    w = 1 / (1 + count - min count)
+- "ucb":              the bin(s) with the largest exploration bonus
+                      sqrt(2 ln(total + 1) / (count + 1)), ties broken uniformly
+- "inverted_softmax": w = 1 - softmax(count), the original weighting
+- "uniform":          w = 1, i.e. plain random selection
+
+All weightings work on counts relative to the lowest count of their dimension
+(or on shifted exponentials), so they stay well conditioned however large the
+counts grow.
+"""
+
+from __future__ import print_function
+
+import numpy as np
+
+
+class CoverageSampler(object):
+
+    """
+    Coverage weighted selection of bins.
+
+    Usage:
+    sampler = CoverageSampler([6, 6, 7])        # three dimensions with 6, 6 and 7 bins
+    bins = sampler.select()                     # one bin per dimension, counts are incremented
+    index = sampler.choose(some_counts_array)   # one index of a 1D count array, nothing is incremented
+    """
+
+    WEIGHTINGS = ("softmax", "inverse_count", "ucb", "inverted_softmax", "uniform")
+
+    def __init__(self, dimension_sizes=(), weighting="softmax", temperature=1.0):
+        """
+        Setup the count arrays of all dimensions
+        """
+        if weighting not in self.WEIGHTINGS:
+            raise ValueError("Unknown coverage weighting {}, expected one of {}".format(weighting, self.WEIGHTINGS))
+        if temperature <= 0:
+            raise ValueError("The coverage weighting temperature has to be positive")
+
+        self.weighting = weighting
+        self.temperature = float(temperature)
+
+        self.dimension_sizes = np.array(dimension_sizes, dtype=np.int64)
+        max_bins = int(self.dimension_sizes.max()) if len(self.dimension_sizes) else 0
+        self.counts = np.zeros((len(self.dimension_sizes), max_bins), dtype=np.int64)
+        self.mask = np.arange(max_bins)[np.newaxis, :] < self.dimension_sizes[:, np.newaxis]
+
+    def probabilities(self, counts, mask=None, weighting=None):
+        """
+        Selection probabilities of the bins in the last axis of counts.
+        Bins outside of the (optional) boolean mask get a probability of 0.
+        """
+        counts = np.asarray(counts, dtype=np.float64)
+        if mask is None:
+            mask = np.ones(counts.shape, dtype=bool)
+        weighting = weighting or self.weighting
+
+        lowest = np.where(mask, counts, np.inf).min(axis=-1, keepdims=True)
+        relative = np.where(mask, counts - lowest, 0.0)
+
+        if weighting == "softmax":
+            weights = np.exp(-relative / self.temperature)
+
+        elif weighting == "inverse_count":
+            weights = 1.0 / (1.0 + relative)
+
+        elif weighting == "ucb":
+            total = np.where(mask, counts, 0.0).sum(axis=-1, keepdims=True)
+            bonus = np.sqrt(2.0 * np.log(total + 1.0) / (counts + 1.0))
+            bonus = np.where(mask, bonus, -np.inf)
+            weights = (bonus >= bonus.max(axis=-1, keepdims=True)).astype(np.float64)
+
+        elif weighting == "inverted_softmax":
+            highest = np.where(mask, counts, -np.inf).max(axis=-1, keepdims=True)
+            exps = np.where(mask, np.exp(counts - highest), 0.0)
+            weights = 1.0 - exps / exps.sum(axis=-1, keepdims=True)
+
+        elif weighting == "uniform":
+            weights = np.ones(counts.shape)
+
+        else:
+            raise ValueError("Unknown coverage weighting {}".format(weighting))
+
+        weights = np.where(mask, weights, 0.0)
+
+        # e.g. inverted_softmax of a single bin is 0, so fall back to the bins themselves
+        weights = np.where(weights.sum(axis=-1, keepdims=True) > 0, weights, mask)
+
+        return weights / weights.sum(axis=-1, keepdims=True)
+
+    def choose(self, counts, mask=None, weighting=None):
+        """
+        Draw one bin index per row of counts (a single int for a 1D counts array).
+        The counts are not modified.
+        """
+        counts = np.asarray(counts)
+        cumulative = np.cumsum(self.probabilities(counts, mask, weighting), axis=-1)
+
+        threshold = np.random.random_sample(counts.shape[:-1] + (1,)) * cumulative[..., -1:]
+        indices = (cumulative < threshold).sum(axis=-1)
+
+        if counts.ndim == 1:
+            return int(indices)
+        return indices
+
+    def select(self, dimensions=None, weighting=None):
+        """
+        Draw one bin for each of the given dimensions (default: all of them) and increment their counts.
+        Returns the array of selected bins.
+        """
+        if dimensions is None:
+            dimensions = np.arange(len(self.counts))
+        dimensions = np.asarray(dimensions, dtype=np.int64)
+
+        bins = self.choose(self.counts[dimensions], self.mask[dimensions], weighting)
+        self.counts[dimensions, bins] += 1
+
+        return bins
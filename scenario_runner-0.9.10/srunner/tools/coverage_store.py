@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides an append-only, crash-safe on-disk store for the
+situation coverage counters of a test campaign.
+
+Every counter is identified by a path string (e.g. "env/cloudiness_dict/3").
+The file is a sequence of self-checking binary records:
+- DEFINE:     assigns a small integer id to a counter path (written once per path)
+- REPETITION: the index of one repetition and all its counter increments, committed together
+- CHECKPOINT: the full counter state and the indices of the committed repetitions,
+              written every few repetitions and by compact()
+
+Repetitions can be committed in any order, e.g. as they finish on several
+servers, so a resumed campaign runs exactly the repetitions that are missing.
+A torn or corrupted tail (e.g. after a crash mid-write) is detected by its
+checksum and dropped on open, so the store always resumes from the last
+fully committed repetition. Loading is a single sequential read of the file.
+"""
+
+from __future__ import print_function
+
+import os
+import struct
+import zlib
+
+_MAGIC = b'SITCOV2\n'
+
+_RECORD_DEFINE = 1
+_RECORD_REPETITION = 2
+_RECORD_CHECKPOINT = 3
+
+_RECORD_HEADER = struct.Struct('<BII')    # record type, payload length, crc32 of the payload
+_DEFINE_HEAD = struct.Struct('<I')        # counter id, followed by the utf-8 path
+_REPETITION_HEAD = struct.Struct('<II')   # repetition index, number of entries
+_CHECKPOINT_HEAD = struct.Struct('<III')  # repetitions so far, number of entries, number of committed indices
+_ENTRY = struct.Struct('<Id')             # counter id, increment (or value for checkpoints)
+_INDEX = struct.Struct('<I')              # index of a committed repetition, after the checkpoint entries
+
+
+class CoverageStore(object):
+
+    """
+    Append-only store of situation coverage counters.
+
+    Usage:
+    store = CoverageStore(path)          # creates or reopens (resumes) the store
+    store.counters                       # {path: value} as of the last committed repetition
+    store.missing_repetitions(total)     # indices of the repetitions still to run
+    store.record_repetition(increments, repetition)  # {path: delta} of a finished repetition
+    store.close()
+    """
+
+    def __init__(self, filename, checkpoint_interval=100):
+        """
+        Open the store, replaying its content if the file already exists
+        """
+        self.filename = filename
+        self.checkpoint_interval = checkpoint_interval
+        self.counters = dict()
+        self.repetitions = 0
+        self.completed = set()     # indices of the committed repetitions
+
+        self._ids = dict()
+        self._paths = dict()
+        self._file = None
+
+        valid_size = self._load()
+        self._file = open(self.filename, 'r+b' if valid_size else 'w+b')
+        if valid_size:
+            self._file.truncate(valid_size)
+            self._file.seek(valid_size)
+        else:
+            self._file.write(_MAGIC)
+            self._sync()
+
+    def _load(self):
+        """
+        Replay the records of an existing store into memory.
+        Returns the size of the valid prefix of the file, 0 if there is nothing to resume.
+        """
+        if not os.path.isfile(self.filename):
+            return 0
+
+        with open(self.filename, 'rb') as fd:
+            data = fd.read()
+
+        if not data.startswith(_MAGIC):
+            if data:
+                raise ValueError("{} is not a situation coverage store".format(self.filename))
+            return 0
+
+        offset = len(_MAGIC)
+        while offset + _RECORD_HEADER.size <= len(data):
+            record_type, length, crc = _RECORD_HEADER.unpack_from(data, offset)
+            start = offset + _RECORD_HEADER.size
+            payload = data[start:start + length]
+            if len(payload) != length or zlib.crc32(payload) & 0xffffffff != crc:
+                print("WARNING: Dropping incomplete record at the end of {}".format(self.filename))
+                break
+
+            self._apply_record(record_type, payload)
+            offset = start + length
+
+        return offset
+
+    def _apply_record(self, record_type, payload):
+        """
+        Apply one decoded record to the in-memory state
+        """
+        if record_type == _RECORD_DEFINE:
+            counter_id, = _DEFINE_HEAD.unpack_from(payload, 0)
+            path = payload[_DEFINE_HEAD.size:].decode('utf-8')
+            self._ids[path] = counter_id
+            self._paths[counter_id] = path
+
+        elif record_type == _RECORD_REPETITION:
+            repetition, entries = _REPETITION_HEAD.unpack_from(payload, 0)
+            for counter_id, delta in self._iter_entries(payload, _REPETITION_HEAD.size, entries):
+                path = self._paths[counter_id]
+                self.counters[path] = self.counters.get(path, 0) + delta
+            self.completed.add(repetition)
+            self.repetitions += 1
+
+        elif record_type == _RECORD_CHECKPOINT:
+            repetitions, entries, indices = _CHECKPOINT_HEAD.unpack_from(payload, 0)
+            self.counters = dict()
+            for counter_id, value in self._iter_entries(payload, _CHECKPOINT_HEAD.size, entries):
+                self.counters[self._paths[counter_id]] = value
+            offset = _CHECKPOINT_HEAD.size + entries * _ENTRY.size
+            self.completed = set(_INDEX.unpack_from(payload, offset + i * _INDEX.size)[0] for i in range(indices))
+            self.repetitions = repetitions
+
+        else:
+            raise ValueError("Unknown record type {} in {}".format(record_type, self.filename))
+
+    @staticmethod
+    def _iter_entries(payload, offset, entries):
+        """
+        Yield the (counter id, value) pairs of a record payload
+        """
+        for i in range(entries):
+            yield _ENTRY.unpack_from(payload, offset + i * _ENTRY.size)
+
+    def _write_record(self, record_type, payload):
+        """
+        Append one record to the file (without syncing it)
+        """
+        self._file.write(_RECORD_HEADER.pack(record_type, len(payload), zlib.crc32(payload) & 0xffffffff))
+        self._file.write(payload)
+
+    def _sync(self):
+        """
+        Make sure everything written so far survives a crash
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _counter_id(self, path):
+        """
+        Return the id of a counter path, defining it in the file if needed
+        """
+        if path not in self._ids:
+            counter_id = len(self._ids)
+            self._write_record(_RECORD_DEFINE, _DEFINE_HEAD.pack(counter_id) + path.encode('utf-8'))
+            self._ids[path] = counter_id
+            self._paths[counter_id] = path
+        return self._ids[path]
+
+    def missing_repetitions(self, total_repetitions):
+        """
+        Indices of the repetitions in [0, total_repetitions) that are not committed yet, in order
+        """
+        return [repetition for repetition in range(total_repetitions) if repetition not in self.completed]
+
+    def record_repetition(self, increments, repetition=None):
+        """
+        Commit the counter increments ({path: delta}) of one finished repetition.
+        Without an index, the repetition is the next one of a campaign run in order.
+        """
+        if repetition is None:
+            repetition = self.repetitions
+        if repetition in self.completed:
+            raise ValueError("Repetition {} is already committed to {}".format(repetition, self.filename))
+
+        entries = [(self._counter_id(path), delta) for path, delta in increments.items() if delta]
+        self.repetitions += 1
+        self.completed.add(repetition)
+
+        payload = bytearray(_REPETITION_HEAD.pack(repetition, len(entries)))
+        for counter_id, delta in entries:
+            payload += _ENTRY.pack(counter_id, delta)
+        self._write_record(_RECORD_REPETITION, bytes(payload))
+
+        for path, delta in increments.items():
+            self.counters[path] = self.counters.get(path, 0) + delta
+
+        if self.checkpoint_interval and self.repetitions % self.checkpoint_interval == 0:
+            self._write_checkpoint()
+
+        self._sync()
+
+    def _write_checkpoint(self):
+        """
+        Append the full counter state to the file
+        """
+        entries = [(self._counter_id(path), value) for path, value in self.counters.items()]
+        payload = bytearray(_CHECKPOINT_HEAD.pack(self.repetitions, len(entries), len(self.completed)))
+        for counter_id, value in entries:
+            payload += _ENTRY.pack(counter_id, value)
+        for repetition in sorted(self.completed):
+            payload += _INDEX.pack(repetition)
+        self._write_record(_RECORD_CHECKPOINT, bytes(payload))
+
+    def compact(self):
+        """
+        Rewrite the store as its definitions plus a single checkpoint.
+        The new file replaces the old one atomically.
+        """
+        temp_filename = self.filename + '.tmp'
+        self._file.close()
+        self._file = open(temp_filename, 'w+b')
+        self._file.write(_MAGIC)
+
+        paths = self._paths
+        self._ids = dict()
+        self._paths = dict()
+        for counter_id in sorted(paths):
+            self._counter_id(paths[counter_id])
+        self._write_checkpoint()
+        self._sync()
+
+        os.replace(temp_filename, self.filename)
+
+    def close(self):
+        """
+        Flush and close the underlying file
+        """
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._file = None
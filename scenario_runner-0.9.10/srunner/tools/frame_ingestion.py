@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides the ingestion of CARLA camera frames into NumPy arrays.
+
+The raw BGRA buffer of a carla.Image is read through a np.frombuffer view and
+copied exactly once, into the next buffer of a preallocated ring. Dropping the
+alpha channel (BGRA -> BGR) happens as part of that single copy, so there is no
+further colour conversion or resize. In steady state no memory is allocated.
+
+A returned frame stays valid until ring_size further frames have been ingested,
+i.e. consumers may hold on to at most ring_size - 1 frames.
+"""
+
+from __future__ import print_function
+
+import numpy as np
+
+
+class FrameRing(object):
+
+    """
+    Ring of preallocated frame buffers.
+
+    Usage:
+    ring = FrameRing(ring_size=4, channels=3)   # keep BGR, drop alpha
+    frame = ring.ingest(image)                  # (height, width, 3) uint8 array, one memcpy
+    ring.stats()                                # allocation and copy volume so far
+    """
+
+    def __init__(self, ring_size=4, channels=None):
+        """
+        channels: number of leading channels to keep (3 for BGR), None keeps all four (BGRA)
+        """
+        if ring_size < 1:
+            raise ValueError("The frame ring needs at least one buffer")
+
+        self.ring_size = ring_size
+        self.channels = channels
+
+        self._buffers = []
+        self._next = 0
+
+        self.frames = 0
+        self.allocations = 0
+        self.allocated_bytes = 0
+        self.copied_bytes = 0
+
+    def _allocate(self, shape):
+        """
+        (Re)allocate the ring for frames of the given shape
+        """
+        self._buffers = [np.empty(shape, dtype=np.uint8) for _ in range(self.ring_size)]
+        self._next = 0
+        self.allocations += self.ring_size
+        self.allocated_bytes += self.ring_size * self._buffers[0].nbytes
+
+    def ingest(self, image):
+        """
+        Copy the raw data of a carla.Image into the next ring buffer and return it
+        """
+        raw = np.frombuffer(image.raw_data, dtype=np.uint8).reshape((image.height, image.width, 4))
+        if self.channels is not None:
+            raw = raw[:, :, :self.channels]
+
+        if not self._buffers or self._buffers[0].shape != raw.shape:
+            self._allocate(raw.shape)
+
+        frame = self._buffers[self._next]
+        self._next = (self._next + 1) % self.ring_size
+        np.copyto(frame, raw)
+
+        self.frames += 1
+        self.copied_bytes += frame.nbytes
+        return frame
+
+    def stats(self):
+        """
+        Allocation and copy volume as a dictionary, totals and per frame
+        """
+        frames = max(self.frames, 1)
+        return {
+            "frames": self.frames,
+            "allocations": self.allocations,
+            "allocated_bytes": self.allocated_bytes,
+            "copied_bytes": self.copied_bytes,
+            "allocated_bytes_per_frame": float(self.allocated_bytes) / frames,
+            "copied_bytes_per_frame": float(self.copied_bytes) / frames,
+        }
@@ -0,0 +1,619 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides the situation generation engine of the intersection
+scenarios: IntersectionSituations selects the base concrete situation (ego
+start and goal legs, conflict point, other vehicle start and goal locations)
+and the environmental conditions of every repetition, randomly or based on
+situation coverage. EgoVehicle and OtherVehicle hold the carla transforms and
+trigger locations of the selected situation.
+"""
+
+from __future__ import print_function
+
+from random import seed
+from random import randint
+
+import numpy as np
+
+import carla
+
+from srunner.tools.coverage_sampler import CoverageSampler
+
+
+# Sync arrival location (x, y) of every conflict point
+CONFLICT_POINTS = {
+    "c1": (-74.63, -136.34),
+    "c2": (-74.63, -139.28),
+    "c3": (-89.00, -140),
+    "c4": (-89.00, -136.5),
+}
+
+# Start location (x, y, z) and yaw of the ego vehicle on every intersection leg. The left leg has a yaw of 270
+# since the road turns left and becomes straight like the base leg.
+EGO_STARTS = {
+    "base": ((-74.32, -50, 0.5), 270),
+    "left": ((-145.36, -91.61, 0.5), 270),
+    "right": ((15.09, -138.7, 0.5), 180),
+}
+
+# Trigger boxes (min x, max x, min y, max y) of the ego start legs. The pass through triggers are 3 m closer
+# to the intersection than the lane ends.
+EGO_PASS_THROUGH_TRIGGERS = {
+    "base": (-90, -70, -127, -121),
+    "left": (-103.64, -98.64, -148.5, -128.5),
+    "right": (-66.15, -61.15, -147.5, -127.5),
+}
+EGO_START_OTHER_TRIGGERS = {
+    "base": (-80, -70, -75, -60),
+    "left": (-148, -138, -113.5, -98.5),
+    "right": (-12.5, 2.5, -146, -131.1),
+}
+
+# End condition trigger box (min x, max x, min y, max y) and destination (x, y) of every goal leg, shared by
+# the ego and the other vehicle. The boxes are about 20 m before the destinations, where the vehicles stop.
+GOAL_TRIGGERS = {
+    "base": ((-95.20, -75.20, -57, -43), (-85.20, -30.0)),
+    "left": ((-155.77, -141.77, -106.91, -86.91), (-148.97, -76.77)),
+    "right": ((3.0, 17.0, -148.17, -128.17), (30.0, -135.95)),
+}
+
+# Start location (x, y, z) and yaw of the other vehicle, 10 m away from the intersection
+OTHER_VEHICLE_STARTS = {
+    "left": ((-109, -136, 0.5), 0.0),
+    "base": ((-74.70, -114.95, 0.5), 270.0),
+    "base_left_lane": ((-78.70, -114.95, 0.5), 270.0),
+    "right": ((-55.08, -139.5, 0.5), 180.0),
+}
+
+
+def _start_transform_dict(starts, start_location_string):
+    """
+    Returns the {"key_transform", "key_location_string"} dictionary of a start leg
+    """
+    (x, y, z), yaw = starts[start_location_string]
+    transform = carla.Transform(carla.Location(x=x, y=y, z=z), carla.Rotation(pitch=0.0, yaw=yaw, roll=0.0))
+    return {"key_transform": transform, "key_location_string": start_location_string}
+
+
+def _trigger_dict(name, box, destination=None):
+    """
+    Returns the dictionary of a trigger box, e.g. key_<name>_min_x, and of the destination of the vehicle
+    """
+    trigger = dict(zip(("key_" + name + "_min_x", "key_" + name + "_max_x",
+                        "key_" + name + "_min_y", "key_" + name + "_max_y"), box))
+    if destination is not None:
+        prefix = "key_" + name.split("_")[0] + ("_vehicle" if name.startswith("other") else "")
+        trigger[prefix + "_destination_x"], trigger[prefix + "_destination_y"] = destination
+    return trigger
+
+
+class IntersectionSituations:
+
+    """
+    Situation generation engine of the intersection scenarios.
+
+    key_ego_other_veh_interaction_key is the key of the selected base concrete situation
+    """
+
+    # The whole intersection situation space, one row per base concrete situation (leaf), listed depth first.
+    # Columns: ego start leg, ego goal leg, conflict point, situation key, other veh start loc, other veh goal loc.
+    # Adding legs, goals, conflict points or interactions only means adding rows here.
+    # base_left_lane is the other vehicle start of the situations whose goal location needs the left lane.
+    situation_table = (
+        ("left", "base", "c4", "key_SAVL_GBAVxSOVR_GBOV", "right", "base"),
+        ("left", "right", "c1", "key_SAVL_GRAVxSOVB_GROV", "base", "right"),
+        ("left", "right", "c1", "key_SAVL_GRAVxSOVB_GLOV", "base_left_lane", "left"),
+        ("left", "right", "c4", "key_SAVL_GRAVxSOVR_GBOV", "right", "base"),
+        ("base", "left", "c1", "key_SAVB_GLAV_SOVL_GROV", "left", "right"),
+        ("base", "left", "c2", "key_SAVB_GLAV_SOVR_GLOV", "right", "left"),
+        ("base", "left", "c2", "key_SAVB_GLAVxSOVR_GBOV", "right", "base"),
+        ("base", "right", "c1", "key_SAVB_GRAV_SOVL_GROV", "left", "right"),
+        ("right", "left", "c2", "key_SAVR_GLAVxSOVB_GLOV", "base_left_lane", "left"),
+        ("right", "base", "c2", "key_SAVR_GBAVxSOVB_GLOV", "base_left_lane", "left"),
+        ("right", "base", "c4", "key_SAVR_GBAVxSOVL_GROV", "left", "right"),
+        ("right", "base", "c4", "key_SAVR_GBAV_SOVL_GBOV", "left", "base"),
+    )
+
+    def __init__(self, seed_boolean, seedz, weighting="softmax", temperature=1.0):
+        """
+        Setup the ego and other vehicles, the env conditions and the compiled situation tree
+        """
+        # The ego_veh object gives the carla transforms of the ego vehicle start and goal locations, based on
+        # which intersection leg is selected as the START location of ego and, based upon the start, which
+        # GOAL location is chosen
+        self.ego_veh = EgoVehicle()
+        self.other_veh = OtherVehicle()
+        self.env_conditions = EnvironmentalConditions(weighting, temperature)
+
+        # one coverage weighted sampler for the env conditions and all levels of the situation tree
+        self.sampler = self.env_conditions.sampler
+
+        # bins of the env conditions of the current situation, see EnvironmentalConditions
+        self.cloudiness_key = None
+        self.precipitation_key = None
+        self.precipitation_deposits_key = None
+        self.wind_intensity_key = None
+        self.fog_density_key = None
+        self.fog_distance_key = None
+        self.wetness_key = None
+        self.fog_falloff_key = None
+        self.friction_key = None
+
+        # the current base concrete situation and its conflict point
+        self.key_ego_other_veh_interaction_key = None
+        self.conflictpoint_syncarrival_loc_x = None
+        self.conflictpoint_syncarrival_loc_y = None
+        self.conflictpoint_syncarrival_loc_dict = {}
+
+        # Compile situation_table into flat arrays, one set per level of the situation tree. The children of every
+        # node are contiguous, so children of node i on a level are [offsets[i], offsets[i + 1]) on the next level.
+        # The counts of every level are NumPy arrays.
+        ego_start_locs = []
+        ego_goals = []  # (start index, goal loc)
+        conflict_points = []  # (goal index, conflict point)
+        situation_group = []
+
+        for ego_start, ego_goal, conflict_point, _, _, _ in self.situation_table:
+            if not ego_start_locs or ego_start_locs[-1] != ego_start:
+                ego_start_locs.append(ego_start)
+            if not ego_goals or ego_goals[-1] != (len(ego_start_locs) - 1, ego_goal):
+                ego_goals.append((len(ego_start_locs) - 1, ego_goal))
+            if not conflict_points or conflict_points[-1] != (len(ego_goals) - 1, conflict_point):
+                conflict_points.append((len(ego_goals) - 1, conflict_point))
+            situation_group.append(len(conflict_points) - 1)
+
+        if len(set(ego_start_locs)) != len(ego_start_locs):
+            raise ValueError("situation_table has to be listed depth first")
+
+        # ego start level
+        self.ego_start_locs = np.array(ego_start_locs)
+        self.ego_start_counts = np.zeros(len(ego_start_locs), dtype=np.int64)
+
+        # ego goal level
+        self.ego_goal_start = np.array([start for start, _ in ego_goals], dtype=np.int64)
+        self.ego_goal_locs = np.array([goal for _, goal in ego_goals])
+        self.ego_goal_counts = np.zeros(len(ego_goals), dtype=np.int64)
+        self.ego_goal_offsets = self._children_offsets(self.ego_goal_start, len(ego_start_locs))
+
+        # conflict point level
+        conflict_point_goal = np.array([goal for goal, _ in conflict_points], dtype=np.int64)
+        self.conflict_points = np.array([conflict_point for _, conflict_point in conflict_points])
+        self.conflict_point_offsets = self._children_offsets(conflict_point_goal, len(ego_goals))
+
+        # situation level (base concrete situations)
+        self.situation_group = np.array(situation_group, dtype=np.int64)
+        self.situation_goal = conflict_point_goal[self.situation_group]
+        self.situation_ego_start = self.ego_goal_start[self.situation_goal]
+        self.situation_keys = np.array([row[3] for row in self.situation_table])
+        self.other_veh_start_locs = np.array([row[4] for row in self.situation_table])
+        self.other_veh_goal_locs = np.array([row[5] for row in self.situation_table])
+        self.situation_counts = np.zeros(len(self.situation_table), dtype=np.int64)
+        self.situation_offsets = self._children_offsets(self.situation_group, len(conflict_points))
+
+        # Goal counters are incremented by 1 in "random". In "sitcov" a goal with fewer situations than its sibling
+        # goals is incremented by more, e.g., left start -> base goal has 1 situation whereas left start -> right
+        # goal has 3, so the base goal counter is incremented by 3 to balance it out. The situation counters always
+        # go up by 1, so the final statistics stay correct.
+        situations_per_goal = np.bincount(self.situation_goal, minlength=len(ego_goals))
+        max_situations_of_siblings = np.maximum.reduceat(situations_per_goal,
+                                                         self.ego_goal_offsets[:-1])[self.ego_goal_start]
+        self.ego_goal_increments = {"random": np.ones(len(ego_goals), dtype=np.int64),
+                                    "sitcov": np.maximum(max_situations_of_siblings // situations_per_goal, 1)}
+
+        # Probability of every situation under "random", where every level is chosen uniformly
+        goals_per_start = np.diff(self.ego_goal_offsets)
+        conflict_points_per_goal = np.diff(self.conflict_point_offsets)
+        situations_per_conflict_point = np.diff(self.situation_offsets)
+        self.random_situation_probabilities = 1.0 / (len(ego_start_locs) * goals_per_start[self.situation_ego_start] *
+                                                     conflict_points_per_goal[self.situation_goal] *
+                                                     situations_per_conflict_point[self.situation_group])
+
+        if seed_boolean:
+            seed(seedz)
+            np.random.seed(seedz)
+
+    def start_sit_config_gen(self, approach, activate_env_cond_generation=False):
+        """
+        Selects the situation and the env conditions of the next repetition of the scenario and sets them up.
+        approach can either be "random" or "sitcov". Returns the index of the situation (row of situation_table)
+        """
+        self.env_conditions.generate_environmental_conditions(approach, activate_env_cond_generation)
+
+        self._copy_env_condition_keys()
+
+        if approach not in ("random", "sitcov"):
+            print("Please select approprite situation generation technique")
+            raise ValueError("Unexpected value approprite situation generation technique")
+
+        # select the situation and increment its counters on every level (multi-level situation coverage)
+        situation = self.select_situation(approach, self.ego_start_counts, self.ego_goal_counts, self.situation_counts)
+
+        start = self.situation_ego_start[situation]
+        start_key = "key_ego_start_" + str(self.ego_start_locs[start]) + "_count"
+
+        print("following key was selected :3", start_key)
+        print(start_key, self.ego_start_counts[start])
+
+        self.apply_situation(situation)
+
+        return situation
+
+    def apply_situation(self, situation, env_bins=None):
+        """
+        Sets up the ego veh, other veh and conflict point for a situation (row of situation_table) without
+        touching any counts, e.g., for a situation selected by the campaign coordinator. env_bins
+        (see EnvironmentalConditions.current_bins) sets the env conditions too.
+        """
+        if env_bins is not None:
+            self.env_conditions.apply_bins(env_bins)
+            self._copy_env_condition_keys()
+
+        start = self.situation_ego_start[situation]
+
+        # Set ego veh start loc and the triggers that depend upon it
+        self.ego_veh.select_ego_start_loc(self.ego_start_locs[start])
+        self.ego_veh.select_ego_passthroughtrigger_loc(self.ego_start_locs[start])
+        self.ego_veh.select_ego_startothertrigger_loc(self.ego_start_locs[start])
+
+        # Set ego veh goal loc/endconditiontrigger here
+        self.ego_veh.select_ego_endconditiontrigger_loc(self.ego_goal_locs[self.situation_goal[situation]])
+
+        # Set the conflictpoint/SyncArrivalLoc
+        self.select_conflictpoint_syncarrival_loc(self.conflict_points[self.situation_group[situation]])
+
+        # This is the base concrete situation
+        self.key_ego_other_veh_interaction_key = self.situation_keys[situation]
+
+        # Set other vehicle start and goal locs (the stopothertrigger is set to the goal location of the other vehicle)
+        self.other_veh.select_other_vehicle_start_loc(self.other_veh_start_locs[situation])
+        self.other_veh.select_other_vehicle_stopothertrigger_loc(self.other_veh_goal_locs[situation])
+
+    def _copy_env_condition_keys(self):
+        """
+        Copies the bins of the current env conditions
+        """
+        self.cloudiness_key = self.env_conditions.cloudiness_key
+        self.precipitation_key = self.env_conditions.precipitation_key
+        self.precipitation_deposits_key = self.env_conditions.precipitation_deposits_key
+        self.wind_intensity_key = self.env_conditions.wind_intensity_key
+        self.fog_density_key = self.env_conditions.fog_density_key
+        self.fog_distance_key = self.env_conditions.fog_distance_key
+        self.wetness_key = self.env_conditions.wetness_key
+        self.fog_falloff_key = self.env_conditions.fog_falloff_key
+        self.friction_key = self.env_conditions.friction_key
+
+    def select_situation(self, approach, ego_start_counts, ego_goal_counts, situation_counts):
+        """
+        Walks down the compiled situation tree (start -> goal -> conflict point -> situation), selecting one node
+        per level, and increments the given count arrays. Returns the index of the selected situation
+        (row of situation_table).
+        """
+        # ego start leg
+        start = self.select_lower_count_index(approach, ego_start_counts, 0, len(ego_start_counts))
+        ego_start_counts[start] += 1
+
+        # ego goal leg of this start
+        goal = self.select_lower_count_index(approach, ego_goal_counts,
+                                             self.ego_goal_offsets[start], self.ego_goal_offsets[start + 1])
+        ego_goal_counts[goal] += self.ego_goal_increments[approach][goal]
+
+        # conflict point of this goal
+        first_group = self.conflict_point_offsets[goal]
+        last_group = self.conflict_point_offsets[goal + 1]
+        if approach == "sitcov" and last_group - first_group > 1:
+            # choose among all the situations of this goal and keep the conflict point the chosen one belongs to,
+            # so that a conflict point with more situations is not under sampled
+            situation = self.select_lower_count_index(approach, situation_counts, self.situation_offsets[first_group],
+                                                      self.situation_offsets[last_group])
+            group = self.situation_group[situation]
+        else:
+            group = self.select_lower_count_index(approach, None, first_group, last_group)
+
+        # situation (ego veh and other veh interaction) at this conflict point
+        situation = self.select_lower_count_index(approach, situation_counts,
+                                                  self.situation_offsets[group], self.situation_offsets[group + 1])
+        situation_counts[situation] += 1
+
+        return situation
+
+    def select_lower_count_index(self, approach, counts, first, last):
+        """
+        Selects an index in [first, last). "random" selects uniformly, "sitcov" gives lower counts a higher
+        probability.
+        """
+        if last - first == 1:
+            return first  # only one value to choose from
+        if last - first < 1:
+            raise ValueError("Unexpected value of key_index")
+
+        if approach == "random" or counts is None:
+            return randint(first, last - 1)
+
+        return first + self.sampler.choose(counts[first:last])
+
+    def pre_generate_situations(self, approach, number_of_situations):
+        """
+        Generates a batch of situation indices (rows of situation_table) without touching the coverage counts
+        or the ego/other vehicle objects, e.g., for offline planning. Use self.situation_keys[indices] to get
+        the keys.
+        """
+        if approach == "random":
+            # random selection is independent of the counts, so the whole batch is one weighted draw
+            return np.random.choice(len(self.situation_keys), size=number_of_situations,
+                                    p=self.random_situation_probabilities)
+
+        if approach == "sitcov":
+            # sitcov depends on the counts so far, which are simulated on copies of the count arrays
+            ego_start_counts = self.ego_start_counts.copy()
+            ego_goal_counts = self.ego_goal_counts.copy()
+            situation_counts = self.situation_counts.copy()
+
+            situations = np.empty(number_of_situations, dtype=np.int64)
+            for i in range(number_of_situations):
+                situations[i] = self.select_situation(approach, ego_start_counts, ego_goal_counts, situation_counts)
+            return situations
+
+        raise ValueError("Unexpected value approprite situation generation technique")
+
+    @staticmethod
+    def _children_offsets(parent_index, number_of_parents):
+        """
+        Children of parent i are [offsets[i], offsets[i + 1]) given a sorted parent_index array
+        """
+        return np.concatenate(([0], np.cumsum(np.bincount(parent_index, minlength=number_of_parents))))
+
+    def _coverage_counter_slots(self):
+        """
+        Yields (path, container, key) for every situation and environmental conditions counter,
+        so that container[key] is the counter. Used to save and restore the coverage state.
+        """
+        for start, start_loc in enumerate(self.ego_start_locs):
+            yield "sit/ego_start/" + str(start_loc), self.ego_start_counts, start
+
+        for goal, goal_loc in enumerate(self.ego_goal_locs):
+            start_loc = self.ego_start_locs[self.ego_goal_start[goal]]
+            yield "sit/ego_goal/" + str(start_loc) + "/" + str(goal_loc), self.ego_goal_counts, goal
+
+        for situation, situation_key in enumerate(self.situation_keys):
+            yield "sit/situation/" + str(situation_key), self.situation_counts, situation
+
+        env_counts = self.env_conditions.sampler.counts
+        for dimension, dict_name in enumerate(self.env_conditions.counter_dict_names):
+            for bin_key in getattr(self.env_conditions, dict_name).keys():
+                # row of the env counts array
+                yield "env/" + dict_name + "/" + str(bin_key), env_counts[dimension], bin_key
+
+    def get_coverage_counters(self):
+        """
+        Flat {path: count} snapshot of all coverage counters
+        """
+        return {path: int(container[key]) for path, container, key in self._coverage_counter_slots()}
+
+    def set_coverage_counters(self, counters):
+        """
+        Overwrite the coverage counters with saved values e.g., from a CoverageStore
+        """
+        for path, container, key in self._coverage_counter_slots():
+            if path in counters:
+                container[key] = type(container[key])(counters[path])  # keep ints as ints
+
+    def select_conflictpoint_syncarrival_loc(self, conflict_point="c1"):
+        """
+        Sets the sync arrival location of a conflict point
+        """
+        if conflict_point not in CONFLICT_POINTS:
+            raise ValueError("Unexpected value for conflict_point")
+
+        self.conflictpoint_syncarrival_loc_x, self.conflictpoint_syncarrival_loc_y = CONFLICT_POINTS[conflict_point]
+        self.conflictpoint_syncarrival_loc_dict = {
+            "key_conflictpoint_syncarrival_loc_x": self.conflictpoint_syncarrival_loc_x,
+            "key_conflictpoint_syncarrival_loc_y": self.conflictpoint_syncarrival_loc_y}
+
+
+class EnvironmentalConditions:
+
+    """
+    Bins of the environmental condition parameters and their selection
+    """
+
+    # default values of params
+    cloudiness = 0  # 0 to 100 values; 6 bins of 20 increments
+    # for these dictionaries, the key is an integer and it is the bin index. Each bin index corresponds to the
+    # env condition parameter value. The counters of the bins are kept in self.sampler.counts, one row per
+    # dictionary (in the order of counter_dict_names) :3
+    cloudiness_dict = {0: 0.0, 1: 20.0, 2: 40.0, 3: 60.0, 4: 80.0, 5: 100.0}
+
+    precipitation = 0  # 0 to 100 values; 6 bins of 20 increments
+    precipitation_dict = {0: 0.0, 1: 20.0, 2: 40.0, 3: 60.0, 4: 80.0, 5: 100.0}
+
+    precipitation_deposits = 0  # 0 to 100 values; 6 bins of 20 increments
+    precipitation_deposits_dict = {0: 0.0, 1: 20.0, 2: 40.0, 3: 60.0, 4: 80.0, 5: 100.0}
+
+    wind_intensity = 0.35  # 0 to 100 values; 6 bins of 20 increments
+    wind_intensity_dict = {0: 0.0, 1: 20.0, 2: 40.0, 3: 60.0, 4: 80.0, 5: 100.0}
+
+    # Not generated
+    sun_azimuth_angle = 0.0  # range from 0 - 180. 7 bins of 30 increments
+    sun_azimuth_angle_dict = {0: 0.0, 1: 30.0, 2: 60.0, 3: 90.0, 4: 120.0, 5: 150.0, 6: 180.0}
+
+    # Not generated
+    sun_altitude_angle = 15.0  # range from 90 - -90. 7 bins of 30 increments
+    sun_altitude_angle_dict = {0: -90.0, 1: -60.0, 2: -30.0, 3: 0.0, 4: 30.0, 5: 60.0, 6: 90.0}
+
+    fog_density = 0.0  # 0 to 100 values; 6 bins of 20 increments
+    fog_density_dict = {0: 0.0, 1: 20.0, 2: 40.0, 3: 60.0, 4: 80.0, 5: 100.0}
+
+    fog_distance = 0.0  # 0 to infinity. Dividing it into 6 bins from 0 - 100
+    fog_distance_dict = {0: 0.0, 1: 20.0, 2: 40.0, 3: 60.0, 4: 80.0, 5: 100.0}
+
+    wetness = 0.0  # 0 to 100 values; 6 bins of 20 increments
+    wetness_dict = {0: 0.0, 1: 20.0, 2: 40.0, 3: 60.0, 4: 80.0, 5: 100.0}
+
+    fog_falloff = 0.0  # 0 to infinity. But fog goes to the ground after value of 5. So 6 bins from 0 - 5.
+    fog_falloff_dict = {0: 0.0, 1: 1.0, 2: 2.0, 3: 3.0, 4: 4.0, 5: 5.0}
+
+    friction = 1.0  # 0 to 1. 6 bins of 0.20 each # min fricion changed from 0 to 0.1
+    friction_dict = {0: 0.1, 1: 0.20, 2: 0.40, 3: 0.60, 4: 0.80, 5: 1.0}
+
+    # names of all the bin dictionaries above, i.e., all the env condition counters
+    counter_dict_names = ("cloudiness_dict", "precipitation_dict", "precipitation_deposits_dict", "wind_intensity_dict",
+                          "sun_azimuth_angle_dict", "sun_altitude_angle_dict", "fog_density_dict", "fog_distance_dict",
+                          "wetness_dict", "fog_falloff_dict", "friction_dict")
+
+    # the env condition parameters that are generated, i.e., parameter name + "_dict" is one of counter_dict_names
+    generated_parameters = ("cloudiness", "precipitation", "precipitation_deposits", "wind_intensity", "fog_density",
+                            "fog_distance", "wetness", "fog_falloff", "friction")
+
+    def __init__(self, weighting="softmax", temperature=1.0):
+        """
+        Setup the coverage sampler of all the bin dictionaries
+        """
+        self.sampler = CoverageSampler([len(getattr(self, dict_name)) for dict_name in self.counter_dict_names],
+                                       weighting, temperature)
+        self.generated_dimensions = [self.counter_dict_names.index(parameter + "_dict")
+                                     for parameter in self.generated_parameters]
+
+        # bins of the generated parameters, None until the env conditions are generated
+        self.cloudiness_key = None
+        self.precipitation_key = None
+        self.precipitation_deposits_key = None
+        self.wind_intensity_key = None
+        self.fog_density_key = None
+        self.fog_distance_key = None
+        self.wetness_key = None
+        self.fog_falloff_key = None
+        self.friction_key = None
+
+    def generate_environmental_conditions(self, approach, activate=False):
+        """
+        Selects the bins of the generated parameters. If not activated, the default values are kept
+        """
+        if not activate:
+            return
+
+        if approach == "random":
+            weighting = "uniform"
+        elif approach == "sitcov":
+            weighting = None  # weighting of the sampler
+        else:
+            raise ValueError("Invalid sit gen approach selected")
+
+        # Selecting the bins of all the env condition parameters in one go, this also updates their counters
+        self.apply_bins(self.sampler.select(self.generated_dimensions, weighting))
+
+    def apply_bins(self, bins):
+        """
+        Sets the parameter values (and keys) of the generated env conditions to the given bins, in the order
+        of generated_parameters
+        """
+        for parameter, bin_key in zip(self.generated_parameters, bins):
+            bin_key = int(bin_key)
+            setattr(self, parameter + "_key", bin_key)  # e.g., self.cloudiness_key
+            # e.g., self.cloudiness, the parameter value of the bin
+            setattr(self, parameter, getattr(self, parameter + "_dict")[bin_key])
+
+    def current_bins(self):
+        """
+        The bins of the generated env conditions selected last, in the order of generated_parameters
+        (None if nothing was generated yet)
+        """
+        if self.cloudiness_key is None:
+            return None
+        return [getattr(self, parameter + "_key") for parameter in self.generated_parameters]
+
+
+class EgoVehicle:
+
+    """
+    Start transform and trigger boxes of the ego vehicle
+    """
+
+    def __init__(self):
+        """
+        The dictionaries are filled in by the select_* methods
+        """
+        # {"key_transform": carla.Transform, "key_location_string": start location string}
+        self.ego_start_carla_transform_dict = {}
+        self.ego_passthroughtrigger_dict = {}
+        self.ego_startothertrigger_dict = {}
+        self.ego_endconditiontrigger_dict = {}  # goal location for ego vehicle
+
+    def select_ego_start_loc(self, start_location_string="base"):
+        """
+        Sets the start transform of the ego vehicle on a leg ("base", "left" or "right")
+        """
+        if start_location_string not in EGO_STARTS:
+            print("Please select valid start location string for ego vehicle")
+            raise ValueError("Unexpected value for start location string for ego vehicle")
+
+        self.ego_start_carla_transform_dict = _start_transform_dict(EGO_STARTS, start_location_string)
+
+    def select_ego_passthroughtrigger_loc(self, start_location_string="base"):
+        """
+        Sets the pass through trigger box of the ego start leg
+        """
+        if start_location_string not in EGO_PASS_THROUGH_TRIGGERS:
+            raise ValueError("Unexpected value for select_ego_passthroughtrigger_loc for ego vehicle")
+
+        self.ego_passthroughtrigger_dict = _trigger_dict(
+            "ego_passthroughtrigger", EGO_PASS_THROUGH_TRIGGERS[start_location_string])
+
+    def select_ego_startothertrigger_loc(self, start_location_string="base"):
+        """
+        Sets the trigger box of the ego start leg that starts the other vehicle
+        """
+        if start_location_string not in EGO_START_OTHER_TRIGGERS:
+            raise ValueError("Unexpected value for select_ego_startothertrigger_loc for ego vehicle")
+
+        self.ego_startothertrigger_dict = _trigger_dict(
+            "ego_startothertrigger", EGO_START_OTHER_TRIGGERS[start_location_string])
+
+    def select_ego_endconditiontrigger_loc(self, ego_goal_location="base"):
+        """
+        Sets the goal location of the ego vehicle and the trigger box of its end condition
+        """
+        if ego_goal_location not in GOAL_TRIGGERS:
+            raise ValueError("Unexpected value for select_ego_endconditiontrigger_loc for ego vehicle")
+
+        box, destination = GOAL_TRIGGERS[ego_goal_location]
+        self.ego_endconditiontrigger_dict = _trigger_dict("ego_endconditiontrigger", box, destination)
+
+
+class OtherVehicle:
+
+    """
+    Start transform and goal trigger box of the other vehicle
+    """
+
+    def __init__(self):
+        """
+        The dictionaries are filled in by the select_* methods
+        """
+        self.other_vehicle_start_carla_transform_dict = {}  # start location for other vehicle
+        self.other_vehicle_stopothertrigger_dict = {}  # the goal loc for other vehicle
+
+    def select_other_vehicle_start_loc(self, start_location_string="base"):
+        """
+        Sets the start transform of the other vehicle ("left", "base", "base_left_lane" or "right")
+        """
+        if start_location_string not in OTHER_VEHICLE_STARTS:
+            raise ValueError("Unexpected value for select_other_vehicle_start_loc for other vehicle")
+
+        self.other_vehicle_start_carla_transform_dict = _start_transform_dict(OTHER_VEHICLE_STARTS,
+                                                                              start_location_string)
+
+    def select_other_vehicle_stopothertrigger_loc(self, other_vehicle_goal_location="base"):
+        """
+        Sets the goal location of the other vehicle and the trigger box that stops it. The goal locations are
+        valid lanes for the automatic controller of the other vehicle, the same as the ego goal locations.
+        """
+        if other_vehicle_goal_location not in GOAL_TRIGGERS:
+            raise ValueError("Unexpected value for other_vehicle_stopothertrigger for other vehicle")
+
+        box, destination = GOAL_TRIGGERS[other_vehicle_goal_location]
+        self.other_vehicle_stopothertrigger_dict = _trigger_dict("other_vehicle_stopothertrigger", box, destination)
@@ -14,6 +14,7 @@ import copy
 import datetime
 import math
 import operator
+import re
 
 import py_trees
 import carla
@@ -177,14 +178,48 @@ class OpenScenarioParser(object):
             value = parameter.attrib.get('value')
             parameter_dict[name] = value
 
-        for node in xml_tree.iter():
-            for key in node.attrib:
-                for param in sorted(parameter_dict, key=len, reverse=True):
-                    if "$" + param in node.attrib[key]:
-                        node.attrib[key] = node.attrib[key].replace("$" + param, parameter_dict[param])
+        OpenScenarioParser.replace_parameter_references(xml_tree, parameter_dict)
 
         return xml_tree, parameter_dict
 
+    @staticmethod
+    def replace_parameter_references(xml_tree, parameter_dict):
+        """
+        Replace all parameter references ("$" + name) in the attributes of xml_tree
+        by the values of parameter_dict, longer names first.
+
+        The names are sorted once into a regular expression that replaces the
+        reference of an attribute in a single pass, and only the attributes that
+        contain "$" are checked. If replacing a parameter can create a new reference
+        (a value containing "$", or several "$" in the attribute), the parameters are
+        replaced one after the other instead, as the result depends on the order.
+
+        Args:
+            xml_tree: Containing all nodes that should be updated
+            parameter_dict (dictionary): Parameters as dict (name, value)
+        """
+        if not parameter_dict:
+            return
+
+        names = sorted(parameter_dict, key=len, reverse=True)
+        pattern = re.compile(r"\$(" + "|".join(re.escape(name) for name in names) + ")")
+        chained = any("$" in str(value) for value in parameter_dict.values())
+
+        def replace(match):
+            return parameter_dict[match.group(1)]
+
+        for node in xml_tree.iter():
+            for key, value in node.attrib.items():
+                if "$" not in value:
+                    continue
+                if chained or value.count("$") > 1:
+                    for param in names:
+                        if "$" + param in value:
+                            value = value.replace("$" + param, parameter_dict[param])
+                    node.attrib[key] = value
+                else:
+                    node.attrib[key] = pattern.sub(replace, value)
+
     @staticmethod
     def set_global_parameters(parameter_dict):
         """
@@ -246,11 +281,7 @@ class OpenScenarioParser(object):
                 value = parameter_assignment.attrib.get("value")
                 parameter_dict[parameter] = value
 
-        for node in entry_instance.iter():
-            for key in node.attrib:
-                for param in sorted(parameter_dict, key=len, reverse=True):
-                    if "$" + param in node.attrib[key]:
-                        node.attrib[key] = node.attrib[key].replace("$" + param, parameter_dict[param])
+        OpenScenarioParser.replace_parameter_references(entry_instance, parameter_dict)
 
         OpenScenarioParser.set_parameters(entry_instance, OpenScenarioParser.global_osc_parameters)
 
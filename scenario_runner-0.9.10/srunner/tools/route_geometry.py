@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides the geometry of a route shared by the route criteria
+(InRouteTest, RouteCompletionTest and OutsideRouteLanesTest).
+
+The route locations are converted once into a NumPy array, together with the
+cumulative distance along the route. Every criterion keeps its own cursor
+(the index it has progressed to, which only moves forward) and asks for the
+points in a window after it, so the cost of a tick does not depend on the
+length of the route. The lane directions at the route points, needed to know
+if a point has been passed, are looked up in the map the first time a window
+reaches them and kept afterwards.
+"""
+
+from __future__ import print_function
+
+import weakref
+
+import numpy as np
+
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+
+
+class RouteGeometry(object):
+
+    """
+    Points, cumulative distances and lane directions of a route.
+
+    Usage:
+    geometry = RouteGeometry.get(route)     # route: list of (carla.Location, RoadOption)
+    index, distance = geometry.closest_point(location, cursor, cursor + window + 1)
+    passed = geometry.passed_points(location, cursor, cursor + window + 1)
+    """
+
+    _shared = weakref.WeakValueDictionary()  # id(route) -> RouteGeometry, alive as long as a criterion uses it
+
+    @staticmethod
+    def get(route):
+        """
+        Return the geometry of route, shared by all criteria created with the same route list
+        """
+        geometry = RouteGeometry._shared.get(id(route))
+        if geometry is None or geometry.route is not route:
+            geometry = RouteGeometry(route)
+            RouteGeometry._shared[id(route)] = geometry
+        return geometry
+
+    def __init__(self, route):
+        self.route = route
+        self.locations = [location for location, _ in route]
+
+        self.points = np.array([[location.x, location.y, location.z] for location in self.locations],
+                               dtype=np.float64).reshape(-1, 3)
+        segment_lengths = np.linalg.norm(np.diff(self.points, axis=0), axis=1)
+        self.accum_meters = np.concatenate(([0.0], np.cumsum(segment_lengths)))
+
+        # forward vectors of the lane at each point, NaN until they are looked up
+        self._forward = np.full((len(self.points), 3), np.nan)
+        self._map = None
+
+    def __len__(self):
+        return len(self.points)
+
+    @property
+    def length(self):
+        """
+        Total length of the route in meters
+        """
+        return float(self.accum_meters[-1]) if len(self.accum_meters) else 0.0
+
+    def completion(self, index):
+        """
+        Percentage of the route length covered up to point index
+        """
+        if self.length == 0:
+            return 0.0
+        return 100.0 * float(self.accum_meters[index]) / self.length
+
+    def distance_between(self, start, end):
+        """
+        Distance along the route from point start to point end
+        """
+        return float(self.accum_meters[end] - self.accum_meters[start])
+
+    def closest_point(self, location, start, stop):
+        """
+        Point of the window [start, stop) closest to location in the xy plane, the last one on ties.
+        Returns (index, distance), (-1, inf) if the window is empty.
+        """
+        stop = min(stop, len(self.points))
+        if start >= stop:
+            return -1, float('inf')
+
+        offset = self.points[start:stop, :2] - np.array([location.x, location.y])
+        distances = np.hypot(offset[:, 0], offset[:, 1])
+        last_minimum = len(distances) - 1 - int(np.argmin(distances[::-1]))
+        return start + last_minimum, float(distances[last_minimum])
+
+    def passed_points(self, location, start, stop):
+        """
+        Indices of the points of the window [start, stop) that location has passed,
+        i.e. that are behind it along the lane direction at the point
+        """
+        stop = min(stop, len(self.points))
+        if start >= stop:
+            return np.zeros(0, dtype=np.int64)
+
+        forward = self._forward_vectors(start, stop)
+        offset = np.array([location.x, location.y, location.z]) - self.points[start:stop]
+        return start + np.flatnonzero(np.einsum('ij,ij->i', offset, forward) > 0)
+
+    def chain_distance(self, start, indices):
+        """
+        Length of the polygonal chain start -> indices[0] -> indices[1] ... through the route points
+        """
+        if len(indices) == 0:
+            return 0.0
+        chain = self.points[np.concatenate(([start], indices))]
+        return float(np.linalg.norm(np.diff(chain, axis=0), axis=1).sum())
+
+    def _forward_vectors(self, start, stop):
+        """
+        Lane forward vectors of the points [start, stop), looked up in the map once per point
+        """
+        forward = self._forward[start:stop]
+        missing = np.flatnonzero(np.isnan(forward[:, 0]))
+        if len(missing):
+            if self._map is None:
+                self._map = CarlaDataProvider.get_map()
+            for i in missing:
+                vector = self._map.get_waypoint(self.locations[start + i]).transform.get_forward_vector()
+                forward[i] = (vector.x, vector.y, vector.z)
+        return forward
@@ -12,6 +12,8 @@ import math
 import xml.etree.ElementTree as ET
 import sys
 
+import numpy as np
+
 import carla
 from agents.navigation.local_planner import RoadOption
 from srunner.scenarioconfigs.route_scenario_configuration import RouteScenarioConfiguration
@@ -21,6 +23,101 @@ TRIGGER_THRESHOLD = 2.0  # Threshold to say if a trigger position is new or repe
 TRIGGER_ANGLE_THRESHOLD = 10  # Threshold to say if two angles can be considering matching when matching transforms.
 
 
+class PositionIndex(object):
+
+    """
+    Grid index of positions with a yaw, used to match transforms (within TRIGGER_THRESHOLD and
+    TRIGGER_ANGLE_THRESHOLD) without scanning all of them. The grid cells are TRIGGER_THRESHOLD wide,
+    so only the 3x3 cells around a query can hold a match.
+
+    Positions get consecutive ids in the order they are added, and a query returns the lowest matching id,
+    i.e. the same result as a linear scan in that order.
+    """
+
+    def __init__(self, use_z=True):
+        """
+        use_z: compare 3D positions (as for route waypoints), otherwise only x and y (as for triggers)
+        """
+        self._use_z = use_z
+        self._cells = {}
+        self._positions = []
+        self._arrays = None
+
+    @classmethod
+    def from_trajectory(cls, trajectory):
+        """
+        Index of a route, given as a list of (carla.Transform, RoadOption)
+        """
+        index = cls(use_z=True)
+        for transform, _ in trajectory:
+            index.add(transform.location.x, transform.location.y, transform.location.z, transform.rotation.yaw)
+        return index
+
+    def _cell(self, x, y):
+        return (int(math.floor(x / TRIGGER_THRESHOLD)), int(math.floor(y / TRIGGER_THRESHOLD)))
+
+    def add(self, x, y, z, yaw):
+        """
+        Add a position, returns its id
+        """
+        position_id = len(self._positions)
+        self._positions.append((x, y, z, yaw))
+        self._cells.setdefault(self._cell(x, y), []).append(position_id)
+        self._arrays = None
+        return position_id
+
+    def match(self, x, y, z, yaw):
+        """
+        Return the id of the first position matching the given one, None if there is none
+        """
+        position_id = self.match_batch([(x, y, z)], [yaw])[0]
+        return None if position_id < 0 else int(position_id)
+
+    def match_batch(self, locations, yaws):
+        """
+        Match many positions at once: locations is a (N, 3) array-like of x, y, z and yaws has N angles.
+        Returns an array with the id of the first matching position for each query, -1 where there is none.
+        """
+        locations = np.asarray(locations, dtype=np.float64).reshape(-1, 3)
+        yaws = np.asarray(yaws, dtype=np.float64).reshape(-1)
+        matches = np.full(len(locations), -1, dtype=np.int64)
+        if not self._positions or locations.size == 0:
+            return matches
+
+        if self._arrays is None:
+            self._arrays = np.array(self._positions, dtype=np.float64)
+
+        # candidates of all queries, gathered from the neighbouring cells
+        candidates = []
+        owners = []
+        for query, (x, y, _) in enumerate(locations):
+            i, j = self._cell(x, y)
+            for di in (-1, 0, 1):
+                for dj in (-1, 0, 1):
+                    cell = self._cells.get((i + di, j + dj))
+                    if cell:
+                        candidates.extend(cell)
+                        owners.extend([query] * len(cell))
+        if not candidates:
+            return matches
+        candidates = np.array(candidates, dtype=np.int64)
+        owners = np.array(owners, dtype=np.int64)
+
+        # one vectorized check of all (query, candidate) pairs
+        dimensions = 3 if self._use_z else 2
+        delta = self._arrays[candidates, :dimensions] - locations[owners, :dimensions]
+        distance = np.sqrt((delta * delta).sum(axis=1))
+        dyaw = np.mod(yaws[owners] - self._arrays[candidates, 3], 360)
+        valid = (distance < TRIGGER_THRESHOLD) & \
+            ((dyaw < TRIGGER_ANGLE_THRESHOLD) | (dyaw > (360 - TRIGGER_ANGLE_THRESHOLD)))
+
+        first = np.full(len(locations), len(self._positions), dtype=np.int64)
+        np.minimum.at(first, owners[valid], candidates[valid])
+        found = first < len(self._positions)
+        matches[found] = first[found]
+        return matches
+
+
 class RouteParser(object):
 
     """
@@ -162,15 +259,22 @@ class RouteParser(object):
 
         return weather
 
+    # trigger_id = RouteParser.check_trigger_position(waypoint, existent_triggers)
+    # waypoint is the trigger transform that has matched with a waypoint inside our route traj
+    # existent_triggers is empty for our first iteration
     @staticmethod
-    def check_trigger_position(new_trigger, existing_triggers):  # trigger_id = RouteParser.check_trigger_position(waypoint, existent_triggers)  # waypoint is the trigger transform  that has matched with a waypoint inside our route traj  # existent_triggers is empty for our first iteration
+    def check_trigger_position(new_trigger, existing_triggers, trigger_index=None):
         """
         Check if this trigger position already exists or if it is a new one.
         :param new_trigger:
         :param existing_triggers:
+        :param trigger_index: optional PositionIndex (use_z=False) of existing_triggers, with the trigger ids as ids
         :return:
         """
 
+        if trigger_index is not None:
+            return trigger_index.match(new_trigger['x'], new_trigger['y'], 0.0, new_trigger['yaw'])
+
         for trigger_id in existing_triggers.keys():
             trigger = existing_triggers[trigger_id]
             dx = trigger['x'] - new_trigger['x']
@@ -198,13 +302,19 @@ class RouteParser(object):
         waypoint['z'] = float(waypoint['z'])
         waypoint['yaw'] = float(waypoint['yaw'])
 
+    # (waypoint, trajectory)  # waypoint is the trigger transform and traj is our route
     @staticmethod
-    def match_world_location_to_route(world_location, route_description):  # (waypoint, trajectory)  # waypoint is the trigger transform and traj is our route
+    def match_world_location_to_route(world_location, route_description, route_index=None):
         """
         We match this location to a given route.
             world_location:
             route_description:
+            route_index: optional PositionIndex of route_description, for matching many locations to the same route
         """
+        if route_index is not None:
+            return route_index.match(float(world_location['x']), float(world_location['y']),
+                                     float(world_location['z']), float(world_location['yaw']))
+
         def match_waypoints(waypoint1, wtransform):
             """
             Check if waypoint1 and wtransform are similar
@@ -229,7 +339,6 @@ class RouteParser(object):
         # *********** outer function starts here merroooo ***************
 
         match_position = 0
-        # TODO this function can be optimized to run on Log(N) time
         for route_waypoint in route_description:  # in route
             if match_waypoints(world_location, route_waypoint[0]):  # trigger point and route waypoint
                 
@@ -241,6 +350,18 @@ class RouteParser(object):
 
         return None
 
+    @staticmethod
+    def match_events_to_route(events, route_index):
+        """
+        Match the trigger transforms of many events to a route in one go.
+        :param events: list of annotation events, with float 'transform' entries
+        :param route_index: PositionIndex of the route
+        :return: list with the match position of each event, None where it does not match
+        """
+        locations = [(event['transform']['x'], event['transform']['y'], event['transform']['z']) for event in events]
+        yaws = [event['transform']['yaw'] for event in events]
+        return [None if position < 0 else int(position) for position in route_index.match_batch(locations, yaws)]
+
     @staticmethod
     def get_scenario_type(scenario, match_position, trajectory):  #scenario_subtype = RouteParser.get_scenario_type(scenario_name, match_position, trajectory)  # # "scenario_type": "Scenario1", i.e., all scenarios  # this match position is the index of the waypoint inside our route array  # traj is our densly populated route
                                                                          
@@ -358,6 +479,10 @@ class RouteParser(object):
         # Keep track of the trigger ids being added
         latest_trigger_id = 0
 
+        # Spatial indices of the route and of the triggers, instead of scanning them for every event
+        route_index = PositionIndex.from_trajectory(trajectory)
+        trigger_index = PositionIndex(use_z=False)
+
         for town_name in world_annotations.keys():
             if town_name != route_name:
                 continue
@@ -368,6 +493,16 @@ class RouteParser(object):
             #print(scenarios)  # all scenarios with all their transforms and everything was printed. The Dynamic Language. 
             #sys.exit("heff")
 
+            # Match the trigger points of all the events of this town to the route at once
+            town_events = []
+            for scenario in scenarios:
+                if "scenario_type" not in scenario:
+                    break
+                for event in scenario["available_event_configurations"]:
+                    RouteParser.convert_waypoint_float(event['transform'])
+                    town_events.append(event)
+            match_positions = RouteParser.match_events_to_route(town_events, route_index)
+            event_number = 0
 
 
             for scenario in scenarios:  # For each existent scenario
@@ -382,10 +517,10 @@ class RouteParser(object):
 
                 for event in scenario["available_event_configurations"]:  # for each scenario there is "available_event_configurations": [ in which there are numerous transforms and other vehicles and front and side and back transforms etc
                     waypoint = event['transform']  # trigger point of this scenario  # just noticed in some JSON available_event_configurations we have other vehicles with left or right sub fields which have front left &/or right locs and a transform underneath them as a trigger point I presume 
-                    RouteParser.convert_waypoint_float(waypoint)
                     # We match trigger point to the  route, now we need to check if the route affects
-                    match_position = RouteParser.match_world_location_to_route(
-                        waypoint, trajectory)  # waypoint is the trigger transform and traj is our route
+                    # waypoint is the trigger transform and traj is our route
+                    match_position = match_positions[event_number]
+                    event_number += 1
                     
                     # return match_position  # this match position is the index of the waypoint inside our route array for which our particular transform has matched with.  
 
@@ -414,7 +549,9 @@ class RouteParser(object):
                             'scenario_type': scenario_subtype,  # scenario_name = scenario["scenario_type"]  # "scenario_type": "Scenario1"  # some scenarios have route dependent configs, S4left, etc
                         }
 
-                        trigger_id = RouteParser.check_trigger_position(waypoint, existent_triggers)  # waypoint is the trigger transform  that has matched with a waypoint inside our route traj  # existent_triggers is empty for our first iteration
+                        # waypoint is the trigger transform that has matched with a waypoint inside our route traj
+                        # existent_triggers is empty for our first iteration
+                        trigger_id = RouteParser.check_trigger_position(waypoint, existent_triggers, trigger_index)
                         
                         #return trigger_id  # if the triger is already in the existing_triggers, it will return the trigger_id else it will return none i.e., implying that there are none matches xP
 
@@ -422,6 +559,8 @@ class RouteParser(object):
                         if trigger_id is None:
                             # This trigger does not exist create a new reference on existent triggers
                             existent_triggers.update({latest_trigger_id: waypoint})  # latest_trigger_id = 0 initially
+                            # gets latest_trigger_id as its id
+                            trigger_index.add(waypoint['x'], waypoint['y'], 0.0, waypoint['yaw'])
                             # Update a reference for this trigger on the possible scenarios
 
                             possible_scenarios.update({latest_trigger_id: []})  # latest_trigger_id = 0 initially
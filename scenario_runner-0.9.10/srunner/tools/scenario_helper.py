@@ -18,6 +18,7 @@ import numpy as np
 import carla
 from agents.tools.misc import vector
 from agents.navigation.local_planner import RoadOption
+from agents.tools.actor_state_table import get_actor_state_table, VEHICLE
 
 from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
 
@@ -453,39 +454,89 @@ def get_intersection(ego_actor, other_actor):
 def detect_lane_obstacle(actor, extension_factor=3, margin=1.02):
     """
     This function identifies if an obstacle is present in front of the reference actor
+
+    The poses of the vehicles come from the actor state table of the current frame, and
+    the box of the actor, extended forward, is tested against all the vehicle boxes within
+    50 m at once (see boxes_overlap)
     """
     world = CarlaDataProvider.get_world()
-    world_actors = world.get_actors().filter('vehicle.*')
+    table = get_actor_state_table(world, CarlaDataProvider.get_snapshot())
+
+    row = table.rows_of([actor.id])[0]
+    if row < 0:
+        actor_transform = actor.get_transform()
+        location = actor_transform.location
+        actor_yaw = actor_transform.rotation.yaw
+    else:
+        location = carla.Location(*table.locations[row])
+        actor_yaw = float(table.yaws[row])
+
+    rows = table.within_radius(location, 50, VEHICLE, exclude_id=actor.id)
+    if len(rows) == 0:
+        return False
+
     actor_bbox = actor.bounding_box
-    actor_transform = actor.get_transform()
-    actor_location = actor_transform.location
-    actor_vector = actor_transform.rotation.get_forward_vector()
-    actor_vector = np.array([actor_vector.x, actor_vector.y])
-    actor_vector = actor_vector / np.linalg.norm(actor_vector)
-    actor_vector = actor_vector * (extension_factor - 1) * actor_bbox.extent.x
-    actor_location = actor_location + carla.Location(actor_vector[0], actor_vector[1])
-    actor_yaw = actor_transform.rotation.yaw
-
-    is_hazard = False
-    for adversary in world_actors:
-        if adversary.id != actor.id and \
-                actor_transform.location.distance(adversary.get_location()) < 50:
-            adversary_bbox = adversary.bounding_box
-            adversary_transform = adversary.get_transform()
-            adversary_loc = adversary_transform.location
-            adversary_yaw = adversary_transform.rotation.yaw
-            overlap_adversary = RotatedRectangle(
-                adversary_loc.x, adversary_loc.y,
-                2 * margin * adversary_bbox.extent.x, 2 * margin * adversary_bbox.extent.y, adversary_yaw)
-            overlap_actor = RotatedRectangle(
-                actor_location.x, actor_location.y,
-                2 * margin * actor_bbox.extent.x * extension_factor, 2 * margin * actor_bbox.extent.y, actor_yaw)
-            overlap_area = overlap_adversary.intersection(overlap_actor).area
-            if overlap_area > 0:
-                is_hazard = True
-                break
+    actor_vector = np.array([math.cos(math.radians(actor_yaw)), math.sin(math.radians(actor_yaw))])
+    actor_center = np.array([location.x, location.y]) + actor_vector * (extension_factor - 1) * actor_bbox.extent.x
+    actor_box = get_box_corners(
+        actor_center[np.newaxis],
+        np.array([[margin * actor_bbox.extent.x * extension_factor, margin * actor_bbox.extent.y]]),
+        np.array([actor_yaw]))[0]
+
+    adversary_extents = np.array([[adversary.bounding_box.extent.x, adversary.bounding_box.extent.y]
+                                  for adversary in table.actors(rows)]).reshape(-1, 2)
+    adversary_boxes = get_box_corners(table.locations[rows, :2], margin * adversary_extents, table.yaws[rows])
+
+    return bool(boxes_overlap(actor_box, adversary_boxes).any())
+
+
+def get_box_corners(centers, extents, yaws):
+    """
+    Corners of oriented boxes in the xy plane, counterclockwise
+
+    Args:
+        centers: (n, 2) array with the centers of the boxes
+        extents: (n, 2) array with half the length and width of the boxes
+        yaws: (n,) array with the orientation of the boxes, in degrees
+
+    returns:
+        (n, 4, 2) array with the corners
+    """
+    yaws = np.radians(yaws)
+    cos_yaw = np.cos(yaws)[:, np.newaxis]
+    sin_yaw = np.sin(yaws)[:, np.newaxis]
+
+    local = np.array([[1, 1], [-1, 1], [-1, -1], [1, -1]]) * extents[:, np.newaxis, :]
+    corners_x = local[..., 0] * cos_yaw - local[..., 1] * sin_yaw + centers[:, 0, np.newaxis]
+    corners_y = local[..., 0] * sin_yaw + local[..., 1] * cos_yaw + centers[:, 1, np.newaxis]
+    return np.stack([corners_x, corners_y], axis=-1)
 
-    return is_hazard
+
+def boxes_overlap(box, boxes):
+    """
+    Separating axis test of an oriented box against n oriented boxes: they overlap
+    if their projections overlap on the two edge directions of both boxes. Touching
+    boxes (with no overlapping area) don't overlap.
+
+    Args:
+        box: (4, 2) array with the corners of the box
+        boxes: (n, 4, 2) array with the corners of the other boxes
+
+    returns:
+        boolean array, one value per box of boxes
+    """
+    box = np.broadcast_to(box, boxes.shape)
+    overlap = np.ones(len(boxes), dtype=bool)
+
+    for corners in (box, boxes):
+        for edge in range(2):
+            axis = corners[:, edge + 1] - corners[:, edge]
+            box_projection = np.einsum('nkj,nj->nk', box, axis)
+            boxes_projection = np.einsum('nkj,nj->nk', boxes, axis)
+            overlap &= (box_projection.max(axis=1) > boxes_projection.min(axis=1)) & \
+                (boxes_projection.max(axis=1) > box_projection.min(axis=1))
+
+    return overlap
 
 
 class RotatedRectangle(object):
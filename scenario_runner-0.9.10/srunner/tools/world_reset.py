@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+This module provides the WorldResetter, which prepares the CARLA world for
+the next scenario run, i.e. every repetition of every configuration.
+
+A cold reset loads the town again with client.load_world, which takes
+seconds and drops everything cached for the map. When the town doesn't
+change, a warm reset brings the loaded world back to the state it had right
+after its cold load instead:
+- the actors of the previous scenario (vehicles, walkers, sensors, walker
+  controllers) are destroyed, except those parked by the CarlaDataProvider
+- the weather is set back to the weather of the loaded town
+- the traffic lights get back the state, timings and freeze flag they had
+- the settings of the world are applied again
+A cold reset is still made when the town changes, and after cold_every
+runs if that is set.
+"""
+
+from __future__ import print_function
+
+import time
+
+import carla
+
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+
+
+# Actors that a scenario can leave behind, and which a warm reset removes
+SCENARIO_ACTOR_FILTERS = ['vehicle.*', 'walker.*', 'sensor.*', 'controller.*']
+
+
+class WorldResetter(object):
+
+    """
+    Loads the town of every scenario run, warm if possible.
+
+    Usage:
+    resetter = WorldResetter(client, warm=True, cold_every=0)
+    world = resetter.reset(town)    # before every run, i.e. every repetition of every configuration
+    print(resetter.summary())
+    """
+
+    def __init__(self, client, warm=False, cold_every=0):
+        """
+        Setup the resetter. With warm False, every reset is cold. A cold_every of 0
+        makes a cold reset only when the town changes.
+        """
+        self._client = client
+        self._warm = warm
+        self._cold_every = cold_every
+
+        self._world = None
+        self._town = None
+        self._runs = 0                # scenario runs on the world since its cold load
+        self._weather = None
+        self._light_states = []
+        self._settings = None
+
+        self.cold_times = []
+        self.warm_times = []
+
+    def reset(self, town):
+        """
+        Prepare the world for a new run of a scenario in the given town and return it
+        """
+        start_time = time.time()
+        if self._can_reset_warm(town):
+            self._reset_warm()
+            self._runs += 1
+            self.warm_times.append(time.time() - start_time)
+        else:
+            self._reset_cold(town)
+            self._runs = 1
+            self.cold_times.append(time.time() - start_time)
+        return self._world
+
+    def _can_reset_warm(self, town):
+        """
+        True if the world of the previous run can be reused for the town
+        """
+        if not self._warm or self._world is None or self._town != town:
+            return False
+        if self._cold_every and self._runs >= self._cold_every:
+            return False
+        return self._client.get_world().id == self._world.id
+
+    def _reset_cold(self, town):
+        """
+        Load the town and remember the state to go back to in the warm resets
+        """
+        self._world = self._client.load_world(town)
+        self._town = town
+        self._weather = self._world.get_weather()
+        self._settings = self._world.get_settings()
+        self._light_states = []
+        for light in self._world.get_actors().filter('*traffic_light*'):
+            self._light_states.append((light, light.get_state(), light.get_green_time(),
+                                       light.get_yellow_time(), light.get_red_time(), light.is_frozen()))
+
+    def _reset_warm(self):
+        """
+        Bring the loaded world back to the state of its cold load
+        """
+        parked_ids = set(actor.id for actors in CarlaDataProvider.get_parked_actors().values() for actor in actors)
+        batch = []
+        actors = self._world.get_actors()
+        for actor_filter in SCENARIO_ACTOR_FILTERS:
+            for actor in actors.filter(actor_filter):
+                if actor.id not in parked_ids:
+                    batch.append(carla.command.DestroyActor(actor.id))
+        if batch:
+            self._client.apply_batch_sync(batch)
+
+        self._world.set_weather(self._weather)
+
+        for light, state, green_time, yellow_time, red_time, frozen in self._light_states:
+            light.freeze(False)
+            light.set_green_time(green_time)
+            light.set_yellow_time(yellow_time)
+            light.set_red_time(red_time)
+            light.set_state(state)
+            light.freeze(frozen)
+
+        self._world.apply_settings(self._settings)
+
+    def saved_time(self):
+        """
+        Estimated wall time saved by the warm resets, in seconds, from the mean time of the cold ones
+        """
+        if not self.cold_times or not self.warm_times:
+            return 0.0
+        mean_cold_time = sum(self.cold_times) / len(self.cold_times)
+        return len(self.warm_times) * mean_cold_time - sum(self.warm_times)
+
+    def summary(self):
+        """
+        Number and time of the cold and warm resets, and the time saved
+        """
+        def mean_ms(times):
+            return 1000 * sum(times) / len(times) if times else 0.0
+
+        return "World resets: {} cold ({:.0f} ms each), {} warm ({:.0f} ms each), {:.1f} s saved".format(
+            len(self.cold_times), mean_ms(self.cold_times), len(self.warm_times), mean_ms(self.warm_times),
+            self.saved_time())
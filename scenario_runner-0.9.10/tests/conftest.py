@@ -0,0 +1,22 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Shared setup of the tests: the scenario_runner root and the agents of
+PythonAPI/carla are importable, as when running scenario_runner.py.
+
+Tests of modules that need the CARLA Python API are skipped without it.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PYTHONAPI_CARLA = os.path.join(ROOT, '..', 'PythonAPI', 'carla')
+
+sys.path.insert(0, ROOT)
+if os.path.isdir(PYTHONAPI_CARLA):
+    sys.path.insert(1, PYTHONAPI_CARLA)
@@ -0,0 +1,524 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+In-process stand-in for a CARLA server, used by the tests of this directory.
+
+FakeClient, FakeWorld and FakeActor implement the part of carla.Client,
+carla.World and carla.Actor that CarlaDataProvider uses to spawn, move and
+destroy actors. Every call that would reach the server is counted per method
+in FakeWorld.calls, and the state set on an actor (transform, velocities,
+physics, autopilot, last control, lights) is kept so that it can be checked.
+A FakeWorld also has a weather and traffic lights that cycle with its ticks,
+and FakeClient.load_world replaces it with a new one after a simulated delay.
+"""
+
+from __future__ import print_function
+
+import collections
+import copy
+import fnmatch
+import time
+
+import carla
+
+
+class FakeAttribute(object):
+
+    """
+    carla.ActorAttribute
+    """
+
+    def __init__(self, value, recommended_values=None):
+        self.value = value
+        self.recommended_values = recommended_values or []
+
+    def as_str(self):
+        """
+        Value as a string
+        """
+        return self.value
+
+
+class FakeBlueprint(object):
+
+    """
+    carla.ActorBlueprint
+    """
+
+    def __init__(self, blueprint_id, colors=None):
+        self.id = blueprint_id
+        self._attributes = {'role_name': FakeAttribute('')}
+        if colors:
+            self._attributes['color'] = FakeAttribute(colors[0], colors)
+
+    def has_attribute(self, name):
+        """
+        True if the blueprint has the attribute
+        """
+        return name in self._attributes
+
+    def get_attribute(self, name):
+        """
+        The attribute with the given name
+        """
+        return self._attributes[name]
+
+    def set_attribute(self, name, value):
+        """
+        Set the value of an attribute
+        """
+        self._attributes[name].value = value
+
+
+class FakeBlueprintLibrary(list):
+
+    """
+    carla.BlueprintLibrary, a list of blueprints
+    """
+
+    def filter(self, wildcard_pattern):
+        """
+        Blueprints whose id matches the pattern
+        """
+        return FakeBlueprintLibrary(bp for bp in self if fnmatch.fnmatch(bp.id, wildcard_pattern))
+
+    def find(self, blueprint_id):
+        """
+        Copy of the blueprint with the given id
+        """
+        for blueprint in self:
+            if blueprint.id == blueprint_id:
+                return copy.deepcopy(blueprint)
+        raise IndexError("blueprint '{}' not found".format(blueprint_id))
+
+
+class FakeActorList(list):
+
+    """
+    carla.ActorList, a list of actors
+    """
+
+    def filter(self, wildcard_pattern):
+        """
+        Actors whose type id matches the pattern
+        """
+        return FakeActorList(actor for actor in self if fnmatch.fnmatch(actor.type_id, wildcard_pattern))
+
+
+class FakeActor(object):
+
+    """
+    carla.Actor spawned by a FakeWorld
+    """
+
+    def __init__(self, world, actor_id, blueprint, transform):
+        self._world = world
+        self.id = actor_id
+        self.type_id = blueprint.id
+        self.attributes = {name: attribute.value for name, attribute in blueprint._attributes.items()}  # pylint: disable=protected-access
+        self.is_alive = True
+        self.transform = transform
+        self.velocity = carla.Vector3D()
+        self.angular_velocity = carla.Vector3D()
+        self.physics = True
+        self.autopilot = False
+        self.control = None
+        self.light_state = carla.VehicleLightState.NONE
+
+    def get_transform(self):
+        """
+        Current transform
+        """
+        self._world.call('get_transform')
+        return self.transform
+
+    def get_location(self):
+        """
+        Current location
+        """
+        self._world.call('get_location')
+        return self.transform.location
+
+    def get_velocity(self):
+        """
+        Current velocity
+        """
+        self._world.call('get_velocity')
+        return self.velocity
+
+    def set_transform(self, transform):
+        """
+        Teleport the actor
+        """
+        self._world.call('set_transform')
+        self.transform = transform
+
+    def set_target_velocity(self, velocity):
+        """
+        Set the velocity
+        """
+        self._world.call('set_target_velocity')
+        self.velocity = velocity
+
+    def set_target_angular_velocity(self, angular_velocity):
+        """
+        Set the angular velocity
+        """
+        self._world.call('set_target_angular_velocity')
+        self.angular_velocity = angular_velocity
+
+    def set_simulate_physics(self, enabled=True):
+        """
+        Enable or disable the physics
+        """
+        self._world.call('set_simulate_physics')
+        self.physics = enabled
+
+    def set_autopilot(self, enabled=True, tm_port=None):  # pylint: disable=unused-argument
+        """
+        Enable or disable the autopilot
+        """
+        self._world.call('set_autopilot')
+        self.autopilot = enabled
+
+    def apply_control(self, control):
+        """
+        Apply a control
+        """
+        self._world.call('apply_control')
+        self.control = control
+
+    def set_light_state(self, light_state):
+        """
+        Turn the lights on or off
+        """
+        self._world.call('set_light_state')
+        self.light_state = light_state
+
+    def get_light_state(self):
+        """
+        Current lights
+        """
+        return self.light_state
+
+    def destroy(self):
+        """
+        Destroy the actor, False if it was already destroyed
+        """
+        self._world.call('destroy')
+        return self._world.destroy_actor(self.id)
+
+
+class FakeTrafficLight(FakeActor):
+
+    """
+    carla.TrafficLight, cycling green, yellow and red as the world ticks
+    """
+
+    CYCLE = [carla.TrafficLightState.Green, carla.TrafficLightState.Yellow, carla.TrafficLightState.Red]
+
+    def __init__(self, world, actor_id, transform):
+        super(FakeTrafficLight, self).__init__(world, actor_id, FakeBlueprint('traffic.traffic_light'), transform)
+        self.state = carla.TrafficLightState.Red
+        self.times = {carla.TrafficLightState.Green: 10.0,
+                      carla.TrafficLightState.Yellow: 3.0,
+                      carla.TrafficLightState.Red: 2.0}
+        self.elapsed_time = 0.0
+        self.frozen = False
+
+    def get_state(self):
+        """
+        Current state
+        """
+        self._world.call('get_state')
+        return self.state
+
+    def set_state(self, state):
+        """
+        Set the state, which starts again from the beginning
+        """
+        self._world.call('set_state')
+        self.state = state
+        self.elapsed_time = 0.0
+
+    def get_green_time(self):
+        """
+        Duration of the green state
+        """
+        return self.times[carla.TrafficLightState.Green]
+
+    def get_yellow_time(self):
+        """
+        Duration of the yellow state
+        """
+        return self.times[carla.TrafficLightState.Yellow]
+
+    def get_red_time(self):
+        """
+        Duration of the red state
+        """
+        return self.times[carla.TrafficLightState.Red]
+
+    def set_green_time(self, green_time):
+        """
+        Set the duration of the green state
+        """
+        self._world.call('set_green_time')
+        self.times[carla.TrafficLightState.Green] = green_time
+
+    def set_yellow_time(self, yellow_time):
+        """
+        Set the duration of the yellow state
+        """
+        self._world.call('set_yellow_time')
+        self.times[carla.TrafficLightState.Yellow] = yellow_time
+
+    def set_red_time(self, red_time):
+        """
+        Set the duration of the red state
+        """
+        self._world.call('set_red_time')
+        self.times[carla.TrafficLightState.Red] = red_time
+
+    def freeze(self, freeze):
+        """
+        Stop or resume the cycle
+        """
+        self._world.call('freeze')
+        self.frozen = freeze
+
+    def is_frozen(self):
+        """
+        True if the cycle is stopped
+        """
+        return self.frozen
+
+    def advance(self, delta_seconds):
+        """
+        Advance the cycle by delta_seconds
+        """
+        if self.frozen:
+            return
+        self.elapsed_time += delta_seconds
+        while self.elapsed_time >= self.times[self.state]:
+            self.elapsed_time -= self.times[self.state]
+            self.state = self.CYCLE[(self.CYCLE.index(self.state) + 1) % len(self.CYCLE)]
+
+
+class FakeMap(object):
+
+    """
+    carla.Map with only a name and spawn points
+    """
+
+    def __init__(self, name, spawn_points):
+        self.name = name
+        self._spawn_points = spawn_points
+
+    def get_spawn_points(self):
+        """
+        Recommended spawn points
+        """
+        return list(self._spawn_points)
+
+
+class FakeWorld(object):
+
+    """
+    carla.World holding the spawned actors
+    """
+
+    def __init__(self, world_id, town, blueprints, spawn_points, light_transforms=()):
+        self.id = world_id
+        self.calls = collections.Counter()
+        self.actors = collections.OrderedDict()
+        self.frame = 0
+        self._map = FakeMap(town, spawn_points)
+        self._blueprints = FakeBlueprintLibrary(blueprints)
+        self._settings = carla.WorldSettings()
+        self._weather = carla.WeatherParameters()
+        self._next_actor_id = 1000 * world_id
+
+        for transform in light_transforms:
+            self._next_actor_id += 1
+            self.actors[self._next_actor_id] = FakeTrafficLight(self, self._next_actor_id, transform)
+
+    def call(self, name):
+        """
+        Count a call to the server
+        """
+        self.calls[name] += 1
+
+    def get_map(self):
+        """
+        The map of the world
+        """
+        self.call('get_map')
+        return self._map
+
+    def get_blueprint_library(self):
+        """
+        All the blueprints
+        """
+        self.call('get_blueprint_library')
+        return self._blueprints
+
+    def get_settings(self):
+        """
+        Copy of the current settings, as the server sends them
+        """
+        self.call('get_settings')
+        return copy_settings(self._settings)
+
+    def apply_settings(self, settings):
+        """
+        Set the settings, returns the frame they apply from
+        """
+        self.call('apply_settings')
+        self._settings = copy_settings(settings)
+        return self.frame
+
+    def get_weather(self):
+        """
+        Current weather
+        """
+        self.call('get_weather')
+        return self._weather
+
+    def set_weather(self, weather):
+        """
+        Set the weather
+        """
+        self.call('set_weather')
+        self._weather = weather
+
+    def try_spawn_actor(self, blueprint, transform):
+        """
+        Spawn an actor of the blueprint at the transform
+        """
+        self.call('try_spawn_actor')
+        self._next_actor_id += 1
+        actor = FakeActor(self, self._next_actor_id, blueprint, transform)
+        self.actors[actor.id] = actor
+        return actor
+
+    def destroy_actor(self, actor_id):
+        """
+        Remove the actor from the world, False if it doesn't exist
+        """
+        actor = self.actors.pop(actor_id, None)
+        if actor is None:
+            return False
+        actor.is_alive = False
+        return True
+
+    def get_actors(self, actor_ids=None):
+        """
+        The actors of the world, or only those with the given ids
+        """
+        self.call('get_actors')
+        if actor_ids is None:
+            return FakeActorList(self.actors.values())
+        return FakeActorList(self.actors[actor_id] for actor_id in actor_ids if actor_id in self.actors)
+
+    def tick(self):
+        """
+        Advance the simulation by one frame
+        """
+        self.call('tick')
+        self._advance()
+        return self.frame
+
+    def wait_for_tick(self):
+        """
+        Same as tick, the fake server has no clock of its own
+        """
+        self.call('wait_for_tick')
+        self._advance()
+
+    def _advance(self):
+        """
+        Next frame, the traffic lights advance by the fixed delta (0.05 s if not set)
+        """
+        self.frame += 1
+        delta_seconds = self._settings.fixed_delta_seconds or 0.05
+        for actor in self.actors.values():
+            if isinstance(actor, FakeTrafficLight):
+                actor.advance(delta_seconds)
+
+
+class FakeClient(object):
+
+    """
+    carla.Client of a FakeWorld
+    """
+
+    def __init__(self, world, load_time=0.0):
+        self.world = world
+        self.load_time = load_time
+        self.loads = 0
+
+    def get_world(self):
+        """
+        The current world
+        """
+        return self.world
+
+    def load_world(self, town):
+        """
+        Replace the world with a new one of the town, taking load_time seconds
+        """
+        time.sleep(self.load_time)
+        self.loads += 1
+        world_id = self.world.id + 1 if self.world is not None else 1
+        self.world = FakeWorld(world_id, town, vehicle_blueprints(), spawn_points(), light_transforms())
+        return self.world
+
+    def apply_batch_sync(self, commands, due_tick_cue=False):  # pylint: disable=unused-argument
+        """
+        Run a batch of DestroyActor commands with one call
+        """
+        self.world.call('apply_batch_sync')
+        for command in commands:
+            self.world.destroy_actor(command.actor_id)
+        return []
+
+
+def copy_settings(settings):
+    """
+    Copy of a carla.WorldSettings
+    """
+    settings_copy = carla.WorldSettings()
+    settings_copy.synchronous_mode = settings.synchronous_mode
+    settings_copy.no_rendering_mode = settings.no_rendering_mode
+    settings_copy.fixed_delta_seconds = settings.fixed_delta_seconds
+    return settings_copy
+
+
+def vehicle_blueprints():
+    """
+    A few vehicle blueprints, two of them with colors
+    """
+    colors = ['255,0,0', '0,255,0', '0,0,255']
+    return [FakeBlueprint('vehicle.tesla.model3', colors),
+            FakeBlueprint('vehicle.audi.a2', colors),
+            FakeBlueprint('vehicle.volkswagen.t2')]
+
+
+def spawn_points(count=8):
+    """
+    Spawn points along the x axis
+    """
+    return [carla.Transform(carla.Location(x=10.0 * i, y=5.0, z=0.5), carla.Rotation(yaw=90.0))
+            for i in range(count)]
+
+
+def light_transforms():
+    """
+    A traffic light next to the spawn points, at the crossing of test scenarios
+    """
+    return [carla.Transform(carla.Location(x=2.0, y=115.0, z=0.0))]
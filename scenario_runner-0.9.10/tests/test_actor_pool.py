@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Tests of the actor reuse of the CarlaDataProvider against a fake world.
+
+The actor life cycle of the repetitions of ScenarioRunner (ego vehicle and other
+vehicle requested, the other vehicle removed by ActorDestroy, the ego vehicle
+released by its agent, then CarlaDataProvider.cleanup) is run once with fresh
+actors and once with actor reuse.
+"""
+
+import pytest
+
+carla = pytest.importorskip('carla')
+
+# pylint: disable=wrong-import-position
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+
+from fake_world import FakeClient, FakeWorld, spawn_points, vehicle_blueprints
+
+REPETITIONS = 6
+
+
+@pytest.fixture(autouse=True)
+def fixture_reset_data_provider():
+    yield
+    CarlaDataProvider.cleanup()
+    CarlaDataProvider.destroy_parked_actors()
+    CarlaDataProvider.set_actor_reuse(False)
+
+
+def make_world(world_id=1):
+    return FakeWorld(world_id, 'Town03', vehicle_blueprints(), spawn_points())
+
+
+def use_world(world):
+    CarlaDataProvider.set_client(FakeClient(world))
+    CarlaDataProvider.set_world(world)
+
+
+def is_zero(vector):
+    return vector.x == 0 and vector.y == 0 and vector.z == 0
+
+
+def assert_parked(actor):
+    """
+    The reset checklist of CarlaDataProvider._park_actor
+    """
+    assert actor.is_alive
+    assert not actor.autopilot
+    control = actor.control
+    assert control is not None
+    assert (control.throttle, control.steer, control.brake) == (0, 0, 0)
+    assert not control.hand_brake and not control.reverse
+    assert actor.light_state == carla.VehicleLightState.NONE
+    assert is_zero(actor.velocity) and is_zero(actor.angular_velocity)
+    assert not actor.physics
+    assert actor.transform.location.z == -500
+    # pylint: disable=protected-access
+    assert actor not in CarlaDataProvider._actor_velocity_map
+    assert actor not in CarlaDataProvider._actor_location_map
+    assert actor not in CarlaDataProvider._actor_transform_map
+    assert not CarlaDataProvider.actor_id_exists(actor.id)
+
+
+def assert_spawned(actor, transform):
+    """
+    An actor returned by request_new_actor, reused or not
+    """
+    location = actor.transform.location
+    assert (location.x, location.y) == (transform.location.x, transform.location.y)
+    assert location.z == pytest.approx(transform.location.z + 0.2)
+    assert actor.transform.rotation.yaw == transform.rotation.yaw
+    assert actor.physics
+    assert not actor.autopilot
+    assert is_zero(actor.velocity) and is_zero(actor.angular_velocity)
+    assert CarlaDataProvider.actor_id_exists(actor.id)
+    assert actor in CarlaDataProvider._actor_velocity_map  # pylint: disable=protected-access
+
+
+def run_repetitions(world, reuse, repetitions=REPETITIONS):
+    """
+    Run the repetitions, returns the actors and the (blueprint, role name) requested per repetition
+    """
+    points = spawn_points()
+    CarlaDataProvider.set_actor_reuse(reuse)
+
+    actors = []
+    requested = []
+    for repetition in range(repetitions):
+        use_world(world)
+
+        ego_transform = points[repetition % len(points)]
+        other_transform = points[(repetition + 1) % len(points)]
+        ego = CarlaDataProvider.request_new_actor('vehicle.tesla.model3', ego_transform, 'hero')
+        other = CarlaDataProvider.request_new_actor('vehicle.*', other_transform)
+        assert_spawned(ego, ego_transform)
+        assert_spawned(other, other_transform)
+        actors.append((ego, other))
+        requested.append(((ego.type_id, ego.attributes['role_name']), (other.type_id, other.attributes['role_name'])))
+
+        # Some driving, then the end of the repetition as in ScenarioRunner._load_and_run_scenario
+        ego.set_target_velocity(ego_transform.get_forward_vector())
+        ego.apply_control(carla.VehicleControl(throttle=0.7, steer=0.1, hand_brake=True))
+        ego.set_light_state(carla.VehicleLightState.LowBeam)
+        other.set_autopilot(True)
+        CarlaDataProvider.on_carla_tick()
+        CarlaDataProvider.remove_actor_by_id(other.id)   # ActorDestroy
+        CarlaDataProvider.release_actor(ego)             # game_loop_end of the ego agent
+        CarlaDataProvider.release_actor(other)           # game_loop_end of the other vehicle agent
+        CarlaDataProvider.cleanup()
+
+    return actors, requested
+
+
+def test_actors_are_destroyed_without_reuse():
+    world = make_world()
+    actors, _ = run_repetitions(world, reuse=False)
+
+    assert all(not ego.is_alive and not other.is_alive for ego, other in actors)
+    assert not world.actors
+    assert world.calls['try_spawn_actor'] == 2 * REPETITIONS
+
+
+def test_parked_actors_go_through_the_reset_checklist():
+    world = make_world()
+    actors, _ = run_repetitions(world, reuse=True)
+
+    for ego, other in actors:
+        assert_parked(ego)
+        assert_parked(other)
+    assert len(world.actors) == len(CarlaDataProvider.get_parked_actors()) == 2
+    assert world.calls['try_spawn_actor'] == 2
+
+
+def test_reuse_requests_the_same_blueprints():
+    _, fresh_requested = run_repetitions(make_world(), reuse=False)
+    _, reused_requested = run_repetitions(make_world(), reuse=True)
+    assert fresh_requested == reused_requested
+
+
+def test_dead_parked_actor_is_not_reused():
+    world = make_world()
+    run_repetitions(world, reuse=True, repetitions=1)
+
+    parked = [actor for actors in CarlaDataProvider.get_parked_actors().values() for actor in actors]
+    hero = [actor for actor in parked if actor.attributes['role_name'] == 'hero'][0]
+    world.destroy_actor(hero.id)
+
+    use_world(world)
+    ego = CarlaDataProvider.request_new_actor('vehicle.tesla.model3', spawn_points()[0], 'hero')
+    assert ego.id != hero.id
+    assert_spawned(ego, spawn_points()[0])
+
+
+def test_destroy_parked_actors_leaves_no_actor():
+    world = make_world()
+    run_repetitions(world, reuse=True, repetitions=2)
+
+    CarlaDataProvider.set_client(FakeClient(world))
+    CarlaDataProvider.destroy_parked_actors()
+    assert not world.actors
+    assert not CarlaDataProvider.get_parked_actors()
+
+
+def test_parked_actors_are_forgotten_with_their_world():
+    run_repetitions(make_world(1), reuse=True, repetitions=1)
+    assert CarlaDataProvider.get_parked_actors()
+
+    new_world = make_world(2)
+    use_world(new_world)
+    assert not CarlaDataProvider.get_parked_actors()
+
+    ego = CarlaDataProvider.request_new_actor('vehicle.tesla.model3', spawn_points()[0], 'hero')
+    assert ego.id in new_world.actors
+
+
+def park_hero(world):
+    """
+    Run a repetition with actor reuse, returns the parked ego vehicle
+    """
+    run_repetitions(world, reuse=True, repetitions=1)
+    parked = [actor for actors in CarlaDataProvider.get_parked_actors().values() for actor in actors]
+    use_world(world)
+    return [actor for actor in parked if actor.attributes['role_name'] == 'hero'][0]
+
+
+def test_reused_actor_goes_to_a_free_random_spawn_point():
+    world = make_world()
+    hero = park_hero(world)
+
+    points = spawn_points()
+    free_point = points[5]
+    for transform in points:
+        if transform is not free_point:
+            CarlaDataProvider.request_new_actor('vehicle.tesla.model3', transform, 'blocker')
+
+    ego = CarlaDataProvider.request_new_actor('vehicle.tesla.model3', None, 'hero', random_location=True)
+    assert ego.id == hero.id
+    location = ego.transform.location
+    assert (location.x, location.y, location.z) == (free_point.location.x, free_point.location.y, free_point.location.z)
+    assert ego.physics
+    assert CarlaDataProvider.actor_id_exists(ego.id)
+
+
+def test_reused_actor_stays_parked_without_a_free_spawn_point():
+    world = make_world()
+    hero = park_hero(world)
+
+    for transform in spawn_points():
+        CarlaDataProvider.request_new_actor('vehicle.tesla.model3', transform, 'blocker')
+
+    ego = CarlaDataProvider.request_new_actor('vehicle.tesla.model3', None, 'hero', random_location=True)
+    assert ego.id != hero.id
+    assert_parked(hero)
+    assert hero in CarlaDataProvider.get_parked_actors()[('vehicle.tesla.model3', 'hero')]
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Tests of the actor states that CarlaDataProvider.on_carla_tick reads from a
+world snapshot, against a fake carla.WorldSnapshot.
+"""
+
+import math
+
+import pytest
+
+carla = pytest.importorskip('carla')
+
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider  # pylint: disable=wrong-import-position
+
+
+class FakeActor(object):
+
+    """
+    carla.Actor that fails if the data provider queries it instead of the snapshot
+    """
+
+    def __init__(self, actor_id):
+        self.id = actor_id
+        self.is_alive = True
+
+    def get_velocity(self):
+        raise AssertionError("actor {} queried for its velocity".format(self.id))
+
+    def get_location(self):
+        raise AssertionError("actor {} queried for its location".format(self.id))
+
+    def get_transform(self):
+        raise AssertionError("actor {} queried for its transform".format(self.id))
+
+
+class FakeActorSnapshot(object):
+
+    """
+    carla.ActorSnapshot
+    """
+
+    def __init__(self, transform, velocity):
+        self._transform = transform
+        self._velocity = velocity
+
+    def get_transform(self):
+        return self._transform
+
+    def get_velocity(self):
+        return self._velocity
+
+
+class FakeWorldSnapshot(object):
+
+    """
+    carla.WorldSnapshot with the given actor snapshots, by actor id
+    """
+
+    def __init__(self, actor_snapshots):
+        self._actor_snapshots = actor_snapshots
+
+    def find(self, actor_id):
+        return self._actor_snapshots.get(actor_id)
+
+
+def make_state(x, y, yaw, vx, vy):
+    transform = carla.Transform(carla.Location(x=x, y=y, z=0.5), carla.Rotation(pitch=1.0, yaw=yaw, roll=2.0))
+    return FakeActorSnapshot(transform, carla.Vector3D(vx, vy, 0.25))
+
+
+@pytest.fixture(name='actors')
+def fixture_actors():
+    actors = [FakeActor(actor_id) for actor_id in (11, 12, 13)]
+    CarlaDataProvider.register_actors(actors)
+    yield actors
+    CarlaDataProvider.cleanup()
+
+
+def test_snapshot_fills_the_actor_maps(actors):
+    states = {11: make_state(1.0, 2.0, 90.0, 3.0, 4.0),
+              12: make_state(-5.0, 6.0, 180.0, 0.0, 0.0),
+              13: make_state(7.0, -8.0, -90.0, -1.0, 1.0)}
+    snapshot = FakeWorldSnapshot(states)
+    CarlaDataProvider.on_carla_tick(snapshot)
+
+    assert CarlaDataProvider.get_snapshot() is snapshot
+    for actor in actors:
+        state = states[actor.id]
+        assert CarlaDataProvider.get_transform(actor) is state.get_transform()
+        assert CarlaDataProvider.get_location(actor) is state.get_transform().location
+        velocity = state.get_velocity()
+        assert CarlaDataProvider.get_velocity(actor) == pytest.approx(math.sqrt(velocity.x**2 + velocity.y**2))
+
+    cache, index = CarlaDataProvider.get_actor_states()
+    assert len(cache) == 3
+    row = cache[index[11]]
+    assert row['id'] == 11 and row['alive']
+    assert (row['x'], row['y'], row['z']) == (1.0, 2.0, 0.5)
+    assert (row['pitch'], row['yaw'], row['roll']) == (1.0, 90.0, 2.0)
+    assert (row['vx'], row['vy'], row['vz']) == (3.0, 4.0, 0.25)
+    assert row['speed'] == pytest.approx(5.0)
+
+
+def test_actor_missing_from_the_snapshot_keeps_its_last_state(actors):
+    CarlaDataProvider.on_carla_tick(FakeWorldSnapshot({actor.id: make_state(actor.id, 0.0, 0.0, 1.0, 0.0)
+                                                       for actor in actors}))
+    last_transform = CarlaDataProvider.get_transform(actors[1])
+
+    # actor 12 is gone from the next snapshot, e.g. destroyed by the server
+    CarlaDataProvider.on_carla_tick(FakeWorldSnapshot({11: make_state(21.0, 0.0, 0.0, 2.0, 0.0),
+                                                       13: make_state(23.0, 0.0, 0.0, 2.0, 0.0)}))
+
+    cache, index = CarlaDataProvider.get_actor_states()
+    assert not cache['alive'][index[12]]
+    assert cache['x'][index[12]] == 12.0
+    assert CarlaDataProvider.get_transform(actors[1]) is last_transform
+    assert cache['alive'][index[11]] and cache['x'][index[11]] == 21.0
+    assert cache['alive'][index[13]] and cache['x'][index[13]] == 23.0
+
+
+def test_removed_actor_goes_stale_on_the_next_tick(actors):
+    CarlaDataProvider._carla_actor_pool[12] = actors[1]  # pylint: disable=protected-access
+    actors[1].destroy = lambda: True
+    CarlaDataProvider.on_carla_tick(FakeWorldSnapshot({actor.id: make_state(actor.id, 0.0, 0.0, 1.0, 0.0)
+                                                       for actor in actors}))
+
+    CarlaDataProvider.remove_actor_by_id(12)
+    CarlaDataProvider.on_carla_tick(FakeWorldSnapshot({actor.id: make_state(actor.id, 1.0, 0.0, 1.0, 0.0)
+                                                       for actor in actors if actor.id != 12}))
+
+    cache, index = CarlaDataProvider.get_actor_states()
+    assert not CarlaDataProvider.actor_id_exists(12)
+    assert not cache['alive'][index[12]]
+    assert cache['alive'][index[11]] and cache['alive'][index[13]]
+    assert cache['y'][index[11]] == 1.0
+
+
+def test_cleanup_clears_the_actor_states(actors):
+    CarlaDataProvider.on_carla_tick(FakeWorldSnapshot({actor.id: make_state(actor.id, 0.0, 0.0, 1.0, 0.0)
+                                                       for actor in actors}))
+    CarlaDataProvider.cleanup()
+
+    cache, index = CarlaDataProvider.get_actor_states()
+    assert len(cache) == 0 and not index
+    assert CarlaDataProvider.get_snapshot() is None
+
+
+def test_actor_state_cache_grows():
+    actors = [FakeActor(actor_id) for actor_id in range(100, 140)]
+    CarlaDataProvider.register_actors(actors)
+    try:
+        CarlaDataProvider.on_carla_tick(FakeWorldSnapshot({actor.id: make_state(actor.id, 0.0, 0.0, 0.0, 0.0)
+                                                           for actor in actors}))
+        cache, index = CarlaDataProvider.get_actor_states()
+        assert len(cache) == 40
+        assert all(cache['x'][index[actor.id]] == actor.id for actor in actors)
+    finally:
+        CarlaDataProvider.cleanup()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Tests of the actor state table shared by the agents, on a fake world whose actors
+come and go as in the scenarios run one after the other on the same world.
+"""
+
+import numpy as np
+import pytest
+
+carla = pytest.importorskip('carla')
+
+# pylint: disable=wrong-import-position
+from agents.tools.actor_state_table import OTHER, VEHICLE, WALKER, ActorRegistry
+
+
+class FakeActor(object):
+
+    def __init__(self, actor_id, type_id, x):
+        self.id = actor_id
+        self.type_id = type_id
+        self.transform = carla.Transform(carla.Location(x=x, y=0.0, z=0.0), carla.Rotation(yaw=x))
+        self.velocity = carla.Vector3D(x, 0.0, 0.0)
+
+    def get_transform(self):
+        return self.transform
+
+    def get_velocity(self):
+        return self.velocity
+
+
+class FakeSnapshot(object):
+
+    """
+    carla.WorldSnapshot: the actor snapshots of a frame
+    """
+
+    def __init__(self, frame, actors):
+        self.frame = frame
+        self._actors = list(actors)
+
+    def __len__(self):
+        return len(self._actors)
+
+    def __iter__(self):
+        return iter(self._actors)
+
+
+class FakeWorld(object):
+
+    """
+    carla.World whose actors are spawned and destroyed by the test, counting the actor lookups
+    """
+
+    def __init__(self, world_id=1):
+        self.id = world_id
+        self.frame = 0
+        self.actors = {}
+        self.looked_up = []
+
+    def spawn(self, actor_id, type_id, x=0.0):
+        self.actors[actor_id] = FakeActor(actor_id, type_id, x)
+
+    def destroy(self, actor_id):
+        del self.actors[actor_id]
+
+    def tick(self):
+        self.frame += 1
+
+    def get_snapshot(self):
+        return FakeSnapshot(self.frame, self.actors.values())
+
+    def get_actors(self, actor_ids):
+        self.looked_up.extend(actor_ids)
+        return [self.actors[actor_id] for actor_id in actor_ids]
+
+
+def test_table_of_a_frame():
+    world = FakeWorld()
+    world.spawn(30, 'walker.pedestrian.0001', 3.0)
+    world.spawn(10, 'vehicle.tesla.model3', 1.0)
+    world.spawn(20, 'traffic.traffic_light', 2.0)
+    registry = ActorRegistry()
+
+    table = registry.get_table(world)
+    assert table.ids.tolist() == [10, 20, 30]
+    assert table.kinds.tolist() == [VEHICLE, OTHER, WALKER]
+    assert table.locations[:, 0].tolist() == [1.0, 2.0, 3.0]
+    assert table.yaws.tolist() == [1.0, 2.0, 3.0]
+    assert table.velocities[:, 0].tolist() == [1.0, 2.0, 3.0]
+    assert table.rows_of([30, 99]).tolist() == [2, -1]
+    assert [actor.id for actor in table.actors(table.within_radius(carla.Location(), 2.5, VEHICLE))] == [10]
+
+    # the same table for the whole frame, and the actors are only looked up once
+    assert registry.get_table(world) is table
+    world.tick()
+    assert registry.get_table(world) is not table
+    assert sorted(world.looked_up) == [10, 20, 30]
+
+
+def test_destroyed_actors_are_dropped():
+    world = FakeWorld()
+    registry = ActorRegistry()
+    world.spawn(1, 'traffic.traffic_light')
+
+    # scenarios on the same world, each with its own vehicles
+    for run in range(5):
+        vehicle_ids = [100 * (run + 1) + index for index in range(3)]
+        for vehicle_id in vehicle_ids:
+            world.spawn(vehicle_id, 'vehicle.audi.a2')
+        for _ in range(3):
+            world.tick()
+            table = registry.get_table(world)
+        assert sorted(registry.kinds) == [1] + vehicle_ids
+        assert sorted(registry.actors) == [1] + vehicle_ids
+        assert np.count_nonzero(table.kinds == VEHICLE) == 3
+        for vehicle_id in vehicle_ids:
+            world.destroy(vehicle_id)
+
+    world.tick()
+    registry.get_table(world)
+    assert list(registry.kinds) == [1] and list(registry.actors) == [1]
+    assert world.looked_up.count(1) == 1
+
+
+def test_new_world_clears_the_registry():
+    world = FakeWorld(world_id=1)
+    world.spawn(5, 'vehicle.audi.a2')
+    registry = ActorRegistry()
+    registry.get_table(world)
+
+    # an id of the previous episode given to another actor
+    other_world = FakeWorld(world_id=2)
+    other_world.spawn(5, 'walker.pedestrian.0001')
+    table = registry.get_table(other_world)
+    assert table.kinds.tolist() == [WALKER]
+    assert registry.actors[5] is other_world.actors[5]
+
+    registry.clear()
+    assert not registry.kinds and not registry.actors and registry.latest is None
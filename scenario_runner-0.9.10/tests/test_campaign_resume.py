@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Tests of resuming a parallel campaign: the CampaignExecutor runs stub jobs that
+finish out of order and commit their repetition to a CoverageStore, as the
+CampaignCoordinator does, and a resumed campaign has to run exactly the
+repetitions that are missing.
+"""
+
+import collections
+import os
+
+import pytest
+
+from srunner.tools.campaign_executor import CampaignExecutor, Endpoint, StubCampaignWorker, parse_endpoints
+from srunner.tools.coverage_store import CoverageStore
+
+ENDPOINTS = parse_endpoints(["localhost:2000", "localhost:2002", "localhost:2004"])
+TOTAL_REPETITIONS = 12
+
+
+class StubCampaign(object):
+
+    """
+    next_job / job_done of the CampaignCoordinator on a CoverageStore, with stub jobs.
+    Every repetition increments the counter of its situation (repetition % 3).
+    """
+
+    def __init__(self, store, durations=None, failing=(), stop_after=None):
+        self.store = store
+        self.repetitions = collections.deque(store.missing_repetitions(TOTAL_REPETITIONS))
+        self.durations = durations or dict()
+        self.failing = set(failing)
+        self.stop_after = stop_after  # jobs handed out before the campaign is interrupted
+        self.handed_out = []
+        self.finished = []
+
+    def next_job(self):
+        if not self.repetitions or len(self.handed_out) == self.stop_after:
+            return None
+        repetition = self.repetitions.popleft()
+        self.handed_out.append(repetition)
+        return {"repetition": repetition,
+                "duration": self.durations.get(repetition, 0.0),
+                "fail": repetition in self.failing}
+
+    def job_done(self, job, result, error):
+        self.finished.append(job["repetition"])
+        if error is None:
+            assert result["job"] == job
+            self.store.record_repetition({"sit/situation/{}".format(job["repetition"] % 3): 1}, job["repetition"])
+
+    def run(self):
+        executor = CampaignExecutor(ENDPOINTS, StubCampaignWorker, self.next_job, self.job_done)
+        executor.poll_interval = 0.05
+        return executor.run()
+
+
+@pytest.fixture(name='store_file')
+def fixture_store_file(tmpdir):
+    return os.path.join(str(tmpdir), 'campaign.sitcov')
+
+
+def expected_counters(repetitions):
+    counters = collections.Counter("sit/situation/{}".format(repetition % 3) for repetition in repetitions)
+    return dict(counters)
+
+
+def test_stub_worker_runs_and_fails_jobs():
+    worker = StubCampaignWorker(Endpoint("localhost", 2000, 8000))
+    assert worker.run_job({"repetition": 0}) == {"job": {"repetition": 0}, "endpoint": "localhost:2000"}
+    with pytest.raises(RuntimeError):
+        worker.run_job({"repetition": 1, "fail": True})
+
+
+def test_executor_runs_every_job_once(store_file):
+    store = CoverageStore(store_file)
+    campaign = StubCampaign(store)
+    finished_per_server = campaign.run()
+    store.close()
+
+    assert sorted(campaign.finished) == list(range(TOTAL_REPETITIONS))
+    assert sum(finished_per_server) == TOTAL_REPETITIONS
+    assert CoverageStore(store_file).missing_repetitions(TOTAL_REPETITIONS) == []
+
+
+def test_resume_after_out_of_order_completion(store_file):
+    # The first jobs are the slowest, so later repetitions finish first. The campaign is
+    # interrupted after 6 jobs, and repetition 4 fails, so 0 to 3 and 5 are committed.
+    store = CoverageStore(store_file, checkpoint_interval=2)
+    first = StubCampaign(store, durations={0: 0.6, 1: 0.4, 2: 0.2}, failing=[4], stop_after=6)
+    first.run()
+    store.close()
+
+    assert first.finished != sorted(first.finished)
+    committed = [0, 1, 2, 3, 5]
+
+    store = CoverageStore(store_file, checkpoint_interval=2)
+    assert store.completed == set(committed)
+    assert store.repetitions == len(committed)
+    assert store.counters == expected_counters(committed)
+    assert store.missing_repetitions(TOTAL_REPETITIONS) == [4] + list(range(6, TOTAL_REPETITIONS))
+
+    second = StubCampaign(store)
+    second.run()
+    store.compact()
+    store.close()
+
+    assert sorted(second.handed_out) == [4] + list(range(6, TOTAL_REPETITIONS))
+    assert not set(second.handed_out) & set(committed)
+
+    store = CoverageStore(store_file)
+    assert store.completed == set(range(TOTAL_REPETITIONS))
+    assert store.repetitions == TOTAL_REPETITIONS
+    assert store.counters == expected_counters(range(TOTAL_REPETITIONS))
+    store.close()
+
+
+def test_repetition_can_only_be_committed_once(store_file):
+    store = CoverageStore(store_file)
+    store.record_repetition({"sit/situation/0": 1}, 3)
+    with pytest.raises(ValueError):
+        store.record_repetition({"sit/situation/0": 1}, 3)
+    store.close()
+
+
+def test_in_order_repetitions_need_no_index(store_file):
+    store = CoverageStore(store_file)
+    for _ in range(3):
+        store.record_repetition({"sit/situation/0": 1})
+    store.close()
+
+    store = CoverageStore(store_file)
+    assert store.completed == {0, 1, 2}
+    assert store.missing_repetitions(5) == [3, 4]
+    store.close()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Tests of the control batch of CarlaDataProvider: the controls collected during
+a tick are sent in one call, and a batch is never left open when a tick fails,
+the scenario is stopped or the data provider is cleaned up.
+"""
+
+import pytest
+
+carla = pytest.importorskip('carla')
+
+# pylint: disable=wrong-import-position
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.timer import GameTime
+
+
+class FakeClient(object):
+
+    """
+    carla.Client recording the batches it is sent, in order
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def apply_batch(self, batch):
+        self.calls.append(('apply_batch', [command.actor_id for command in batch]))
+
+    def apply_batch_sync(self, batch):
+        self.calls.append(('apply_batch_sync', [command.actor_id for command in batch]))
+        return []
+
+
+class FakeActor(object):
+
+    def __init__(self, actor_id):
+        self.id = actor_id
+        self.type_id = 'vehicle.fake'
+        self.is_alive = True
+        self.controls = []
+
+    def apply_control(self, control):
+        self.controls.append(control)
+
+
+@pytest.fixture(name='client')
+def fixture_client():
+    client = FakeClient()
+    CarlaDataProvider.set_client(client)
+    CarlaDataProvider.set_control_batching(True)
+    yield client
+    CarlaDataProvider.cleanup()
+    CarlaDataProvider.set_control_batching(True)
+
+
+def test_controls_of_a_tick_are_sent_in_one_batch(client):
+    first, second = FakeActor(1), FakeActor(2)
+
+    CarlaDataProvider.start_control_batch()
+    CarlaDataProvider.apply_control(first, carla.VehicleControl(throttle=0.2))
+    CarlaDataProvider.apply_control(second, carla.VehicleControl(throttle=0.4))
+    CarlaDataProvider.apply_control(first, carla.VehicleControl(throttle=0.6))
+    assert client.calls == []
+
+    assert CarlaDataProvider.flush_control_batch() == 1
+    assert client.calls == [('apply_batch', [1, 2])]
+    assert not first.controls and not second.controls
+
+    # once flushed, the controls are applied directly again
+    CarlaDataProvider.apply_control(first, carla.VehicleControl())
+    assert len(first.controls) == 1
+    assert CarlaDataProvider.flush_control_batch() == 0
+
+
+def test_cleanup_sends_the_open_batch_before_removing_the_actors(client):
+    actor = FakeActor(7)
+    CarlaDataProvider._carla_actor_pool[actor.id] = actor  # pylint: disable=protected-access
+
+    CarlaDataProvider.start_control_batch()
+    CarlaDataProvider.apply_control(actor, carla.VehicleControl(brake=1.0))
+    CarlaDataProvider.cleanup()
+
+    assert client.calls == [('apply_batch', [7]), ('apply_batch_sync', [7])]
+    assert CarlaDataProvider._control_batch is None  # pylint: disable=protected-access
+
+    CarlaDataProvider.apply_control(actor, carla.VehicleControl())
+    assert len(actor.controls) == 1
+
+
+class FakeTimestamp(object):
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.elapsed_seconds = frame * 0.05
+        self.delta_seconds = 0.05
+
+
+class FakeWatchdog(object):
+
+    def update(self):
+        pass
+
+    def get_status(self):
+        return True
+
+
+class FailingTree(object):
+
+    """
+    Scenario tree whose behavior sets a control and then fails
+    """
+
+    def __init__(self, actor):
+        self.actor = actor
+
+    def tick_once(self):
+        CarlaDataProvider.apply_control(self.actor, carla.VehicleControl(throttle=1.0))
+        raise RuntimeError("behavior failed")
+
+
+@pytest.fixture(name='manager_class')
+def fixture_manager_class():
+    module = pytest.importorskip('srunner.scenariomanager.scenario_manager11')
+    yield module.ScenarioManager
+    GameTime.restart()
+
+
+def make_manager(manager_class, tree):
+    # the constructor sets up the ego agent, a tick only needs the state below
+    manager = object.__new__(manager_class)
+    manager._timestamp_last_run = 0.0   # pylint: disable=protected-access
+    manager._running = True             # pylint: disable=protected-access
+    manager._watchdog = FakeWatchdog()  # pylint: disable=protected-access
+    manager._debug_mode = False         # pylint: disable=protected-access
+    manager._agent = None               # pylint: disable=protected-access
+    manager._sync_mode = False          # pylint: disable=protected-access
+    manager.scenario_tree = tree
+    return manager
+
+
+def test_failing_tick_flushes_the_batch(client, manager_class):
+    actor = FakeActor(3)
+    manager = make_manager(manager_class, FailingTree(actor))
+
+    CarlaDataProvider.start_control_batch()
+    with pytest.raises(RuntimeError):
+        manager._tick_scenario(FakeTimestamp(1))  # pylint: disable=protected-access
+
+    assert client.calls == [('apply_batch', [3])]
+    assert CarlaDataProvider._control_batch is None  # pylint: disable=protected-access
+
+
+def test_stop_scenario_flushes_the_batch(client, manager_class):
+    actor = FakeActor(4)
+    manager = make_manager(manager_class, FailingTree(actor))
+
+    CarlaDataProvider.start_control_batch()
+    CarlaDataProvider.apply_control(actor, carla.VehicleControl(throttle=0.5))
+    manager.stop_scenario()
+
+    assert not manager._running  # pylint: disable=protected-access
+    assert client.calls == [('apply_batch', [4])]
+    assert CarlaDataProvider._control_batch is None  # pylint: disable=protected-access
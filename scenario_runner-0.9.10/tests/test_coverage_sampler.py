@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Tests of the weightings and the seeded draws of the CoverageSampler
+"""
+
+import numpy as np
+import pytest
+
+from srunner.tools.coverage_sampler import CoverageSampler
+
+# First bins drawn by the default weighting with np.random.seed(2000), any change of the draws changes them
+SEEDED_SOFTMAX_BINS = [[3, 3, 3], [1, 2, 4], [0, 4, 1], [1, 0, 0]]
+
+
+def original_weighting(counts):
+    """
+    Probabilities of the low_count_to_higher_prob_converter_for_situation_coverage
+    that the sampler replaced: 1 - softmax(counts), normalized
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    exps = np.exp(counts - counts.max())
+    inverted = 1.0 - exps / exps.sum()
+    return inverted / inverted.sum()
+
+
+def test_softmax_weights():
+    sampler = CoverageSampler([4])
+    probabilities = sampler.probabilities([3, 5, 3, 4])
+    expected = np.exp(-np.array([0.0, 2.0, 0.0, 1.0]))
+    assert probabilities == pytest.approx(expected / expected.sum())
+
+
+def test_softmax_at_a_low_temperature_picks_the_least_covered_bins():
+    sampler = CoverageSampler([4], temperature=1e-6)
+    assert sampler.probabilities([3, 5, 3, 4]) == pytest.approx([0.5, 0.0, 0.5, 0.0])
+
+
+def test_softmax_at_a_high_temperature_is_uniform():
+    sampler = CoverageSampler([4], temperature=1e6)
+    assert sampler.probabilities([3, 5, 3, 4]) == pytest.approx([0.25] * 4, abs=1e-5)
+
+
+def test_softmax_stays_finite_with_large_counts():
+    sampler = CoverageSampler([3], temperature=0.01)
+    probabilities = sampler.probabilities([10**9, 10**9 + 1, 10**12])
+    assert np.all(np.isfinite(probabilities))
+    assert probabilities == pytest.approx([1.0, 0.0, 0.0])
+
+
+def test_temperature_has_to_be_positive():
+    with pytest.raises(ValueError):
+        CoverageSampler([3], temperature=0.0)
+    with pytest.raises(ValueError):
+        CoverageSampler([3], weighting="unknown")
+
+
+def test_inverse_count_weights():
+    sampler = CoverageSampler([3], weighting="inverse_count")
+    assert sampler.probabilities([2, 3, 5]) == pytest.approx(np.array([1.0, 0.5, 0.25]) / 1.75)
+
+
+def test_inverted_softmax_matches_the_original_weighting():
+    sampler = CoverageSampler([5], weighting="inverted_softmax")
+    for counts in ([0, 0, 0, 0, 0], [1, 0, 2, 0, 3], [10, 12, 11, 10, 13]):
+        assert sampler.probabilities(counts) == pytest.approx(original_weighting(counts))
+
+
+def test_inverted_softmax_of_a_single_bin():
+    sampler = CoverageSampler([1], weighting="inverted_softmax")
+    assert sampler.probabilities([7]) == pytest.approx([1.0])
+
+
+def test_ucb_picks_the_largest_bonus():
+    sampler = CoverageSampler([3], weighting="ucb")
+    assert sampler.probabilities([4, 1, 1]) == pytest.approx([0.0, 0.5, 0.5])
+
+
+def test_masked_bins_are_never_chosen():
+    sampler = CoverageSampler([2, 4])
+    assert sampler.mask.tolist() == [[True, True, False, False], [True, True, True, True]]
+    probabilities = sampler.probabilities(sampler.counts, sampler.mask)
+    assert probabilities[0] == pytest.approx([0.5, 0.5, 0.0, 0.0])
+
+    np.random.seed(1)
+    for _ in range(200):
+        bins = sampler.select()
+        assert bins[0] < 2
+
+
+def test_select_increments_the_chosen_bins():
+    sampler = CoverageSampler([6, 6, 7])
+    np.random.seed(3)
+    for _ in range(30):
+        sampler.select()
+    assert sampler.counts.sum(axis=1).tolist() == [30, 30, 30]
+    assert sampler.counts[:2, 6].tolist() == [0, 0]
+
+    sampler.select([1])
+    assert sampler.counts.sum(axis=1).tolist() == [30, 31, 30]
+
+
+def test_select_spreads_the_counts():
+    sampler = CoverageSampler([6], temperature=0.1)
+    np.random.seed(0)
+    for _ in range(60):
+        sampler.select()
+    assert sampler.counts[0].tolist() == [10] * 6
+
+
+@pytest.mark.parametrize("weighting", CoverageSampler.WEIGHTINGS)
+def test_draws_are_deterministic_under_a_fixed_seed(weighting):
+    def draws():
+        np.random.seed(2000)
+        sampler = CoverageSampler([6, 6, 7], weighting)
+        return [sampler.select().tolist() for _ in range(25)] + \
+            [sampler.choose(np.array([3, 1, 4, 1, 5])) for _ in range(25)]
+
+    assert draws() == draws()
+
+
+def test_seeded_softmax_draws_are_stable():
+    np.random.seed(2000)
+    sampler = CoverageSampler([6, 6, 7])
+    assert [sampler.select().tolist() for _ in range(4)] == SEEDED_SOFTMAX_BINS
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Tests of where the detection model registry downloads and untars a model
+"""
+
+import os
+import tarfile
+
+import pytest
+
+pytest.importorskip('tensorflow')
+pytest.importorskip('object_detection')
+
+# pylint: disable=wrong-import-position
+import detection_model_registry
+
+MODEL_NAME = 'fake_ssd_model'
+
+
+@pytest.fixture(name='model_server')
+def fixture_model_server(tmpdir, monkeypatch):
+    """
+    A file:// origin holding MODEL_NAME.tar.gz with an empty saved_model directory
+    """
+    model_dir = tmpdir.mkdir('build').mkdir(MODEL_NAME)
+    model_dir.mkdir('saved_model').join('saved_model.pb').write('')
+    server_dir = tmpdir.mkdir('server')
+    with tarfile.open(str(server_dir.join(MODEL_NAME + '.tar.gz')), 'w:gz') as archive:
+        archive.add(str(model_dir), arcname=MODEL_NAME)
+    monkeypatch.setattr(detection_model_registry, 'MODEL_BASE_URL', 'file://' + str(server_dir) + '/')
+    return server_dir
+
+
+def test_model_is_untarred_in_the_model_dir(model_server, tmpdir, monkeypatch):  # pylint: disable=unused-argument
+    monkeypatch.chdir(str(tmpdir))
+    relative_dir = os.path.join('models', 'research', 'object_detection', 'models')
+
+    model_path = detection_model_registry.download_model(MODEL_NAME, relative_dir)
+
+    expected = os.path.join(str(tmpdir), relative_dir, MODEL_NAME)
+    assert os.path.abspath(model_path) == expected
+    assert os.path.isfile(os.path.join(expected, 'saved_model', 'saved_model.pb'))
+    assert not os.path.exists(os.path.join(str(tmpdir), relative_dir, 'datasets'))
+
+    # a second call finds the model where the first one put it
+    assert detection_model_registry.download_model(MODEL_NAME, relative_dir) == model_path
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Tests of the road graph cache of the GlobalRoutePlanner, on a fake map: a graph read
+back from the disk has to be the stored one, and a cached graph must not be used for
+another map, OpenDRIVE or sampling resolution.
+"""
+
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+pytest.importorskip('carla')
+nx = pytest.importorskip('networkx')
+
+# pylint: disable=wrong-import-position
+from agents.navigation import global_route_planner_cache
+from agents.navigation.local_planner import RoadOption
+
+
+class FakeWaypoint(object):
+
+    def __init__(self, road_id, lane_id, s):
+        self.id = hash((road_id, lane_id, s))
+        self.road_id = road_id
+        self.lane_id = lane_id
+        self.s = s
+
+
+class FakeMap(object):
+
+    """
+    carla.Map with an OpenDRIVE content, whose waypoints are those of a few roads
+    """
+
+    def __init__(self, opendrive='<OpenDRIVE version="1"/>', name='Carla/Maps/Town99'):
+        self.name = name
+        self._opendrive = opendrive
+        self.missing_roads = set()
+
+    def to_opendrive(self):
+        return self._opendrive
+
+    def get_waypoint_xodr(self, road_id, lane_id, s):
+        if road_id in self.missing_roads:
+            return None
+        return FakeWaypoint(road_id, lane_id, s)
+
+
+def build_graph():
+    """
+    Graph as built by the GlobalRoutePlanner: a road of two segments and a lane change
+    """
+    graph = nx.DiGraph()
+    for node, vertex in enumerate([(0.0, 0.0, 0.0), (10.0, 0.0, 0.0), (20.0, 0.0, 0.0), (10.0, 3.5, 0.0)]):
+        graph.add_node(node, vertex=vertex)
+
+    for n1, n2, road_id in [(0, 1, 1), (1, 2, 2)]:
+        path = [FakeWaypoint(road_id, -1, s) for s in (2.0, 4.0, 6.0)]
+        graph.add_edge(n1, n2, length=len(path) + 1, path=path,
+                       entry_waypoint=FakeWaypoint(road_id, -1, 0.0), exit_waypoint=FakeWaypoint(road_id, -1, 8.0),
+                       entry_vector=np.array([1.0, 0.0, 0.0]), exit_vector=np.array([1.0, 0.0, 0.0]),
+                       net_vector=[1.0, 0.0, 0.0], intersection=road_id == 2, type=RoadOption.LANEFOLLOW)
+    graph.add_edge(1, 3, entry_waypoint=FakeWaypoint(1, -1, 8.0), exit_waypoint=FakeWaypoint(1, 1, 8.0),
+                   intersection=False, exit_vector=None, path=[], length=0, type=RoadOption.CHANGELANELEFT,
+                   change_waypoint=FakeWaypoint(1, 1, 8.0))
+    id_map = {(0.0, 0.0, 0.0): 0, (10.0, 0.0, 0.0): 1, (20.0, 0.0, 0.0): 2, (10.0, 3.5, 0.0): 3}
+    road_id_to_edge = {1: {0: {-1: (0, 1)}}, 2: {0: {-1: (1, 2)}}}
+    return graph, id_map, road_id_to_edge
+
+
+def as_plain(value):
+    """
+    Comparable form of an edge attribute
+    """
+    if isinstance(value, FakeWaypoint):
+        return ('waypoint', value.road_id, value.lane_id, value.s)
+    if isinstance(value, (list, np.ndarray)):
+        return [as_plain(item) for item in value]
+    return value
+
+
+def edges_of(graph):
+    return sorted((n1, n2, sorted((name, as_plain(value)) for name, value in attributes.items()))
+                  for n1, n2, attributes in graph.edges(data=True))
+
+
+@pytest.fixture(name='cache_dir')
+def fixture_cache_dir(tmpdir, monkeypatch):
+    monkeypatch.setenv('CARLA_ROUTE_PLANNER_CACHE', str(tmpdir))
+    monkeypatch.setattr(global_route_planner_cache, '_graphs', {})
+    return tmpdir
+
+
+def forget_in_memory_graphs(monkeypatch):
+    """
+    As if the next load happened in a new process
+    """
+    monkeypatch.setattr(global_route_planner_cache, '_graphs', {})
+
+
+def test_graph_read_from_the_disk_is_the_stored_one(cache_dir, monkeypatch):
+    wmap = FakeMap()
+    assert global_route_planner_cache.load(wmap, 2.0) is None
+
+    graph, id_map, road_id_to_edge = build_graph()
+    global_route_planner_cache.store(wmap, 2.0, graph, id_map, road_id_to_edge)
+    assert len(cache_dir.listdir()) == 1
+
+    # the same objects for the rest of the process
+    assert global_route_planner_cache.load(wmap, 2.0) == (graph, id_map, road_id_to_edge)
+
+    forget_in_memory_graphs(monkeypatch)
+    loaded_graph, loaded_id_map, loaded_road_id_to_edge = global_route_planner_cache.load(FakeMap(), 2.0)
+    assert dict(loaded_graph.nodes(data='vertex')) == dict(graph.nodes(data='vertex'))
+    assert edges_of(loaded_graph) == edges_of(graph)
+    assert loaded_graph.edges[1, 3]['type'] is RoadOption.CHANGELANELEFT
+    assert loaded_id_map == id_map
+    assert loaded_road_id_to_edge == road_id_to_edge
+
+
+def test_stale_graphs_are_not_used(cache_dir, monkeypatch):
+    global_route_planner_cache.store(FakeMap(), 2.0, *build_graph())
+    forget_in_memory_graphs(monkeypatch)
+
+    assert global_route_planner_cache.load(FakeMap('<OpenDRIVE version="2"/>'), 2.0) is None
+    assert global_route_planner_cache.load(FakeMap(name='Carla/Maps/Town98'), 2.0) is None
+    assert global_route_planner_cache.load(FakeMap(), 1.0) is None
+
+    # a file of another format version
+    filename = cache_dir.listdir()[0]
+    with open(str(filename), 'rb') as fd:
+        data = pickle.load(fd)
+    data['version'] += 1
+    with open(str(filename), 'wb') as fd:
+        pickle.dump(data, fd)
+    assert global_route_planner_cache.load(FakeMap(), 2.0) is None
+
+
+def test_graph_of_a_changed_map_is_ignored(cache_dir, monkeypatch, capsys):
+    global_route_planner_cache.store(FakeMap(), 2.0, *build_graph())
+    forget_in_memory_graphs(monkeypatch)
+
+    wmap = FakeMap()
+    wmap.missing_roads.add(2)
+    assert global_route_planner_cache.load(wmap, 2.0) is None
+    assert 'Ignoring the route planner cache' in capsys.readouterr().out
+
+    # and a partial or corrupted file
+    filename = str(cache_dir.listdir()[0])
+    with open(filename, 'wb') as fd:
+        fd.write(b'\x80\x04')
+    assert global_route_planner_cache.load(FakeMap(), 2.0) is None
+
+
+def test_disabled_disk_cache(tmpdir, monkeypatch):
+    monkeypatch.setenv('CARLA_ROUTE_PLANNER_CACHE', '')
+    forget_in_memory_graphs(monkeypatch)
+    monkeypatch.chdir(str(tmpdir))
+
+    global_route_planner_cache.store(FakeMap(), 2.0, *build_graph())
+    assert global_route_planner_cache.load(FakeMap(), 2.0) is not None
+    forget_in_memory_graphs(monkeypatch)
+    assert global_route_planner_cache.load(FakeMap(), 2.0) is None
+    assert not os.listdir(str(tmpdir))
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Tests of the table-driven situation generator of IntersectionSituations
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('carla')
+
+from srunner.tools.intersection_situations import IntersectionSituations  # pylint: disable=wrong-import-position
+
+# Situations generated with a seed of 7 and the env conditions activated. Any change of the draw order changes them.
+SEEDED_SITUATIONS = {
+    "random": [5, 0, 4, 0, 7, 0, 1, 0, 9, 0, 8, 7, 0, 9, 0, 4, 8, 8, 7, 7, 11, 0, 8, 3],
+    "sitcov": [7, 9, 0, 5, 2, 9, 6, 3, 8, 1, 7, 0, 10, 10, 1, 4, 8, 3, 6, 4, 1, 11, 8, 0],
+}
+SEEDED_ENV_BINS = {
+    "random": [4, 3, 0, 5, 5, 2, 3, 0, 5],
+    "sitcov": [2, 0, 5, 3, 0, 4, 2, 3, 2],
+}
+
+
+def generate(approach, number_of_situations, seed=7):
+    situations = IntersectionSituations(True, seed)
+    selected = [int(situations.start_sit_config_gen(approach, True)) for _ in range(number_of_situations)]
+    return situations, selected
+
+
+@pytest.fixture(autouse=True)
+def fixture_quiet(capsys):
+    # start_sit_config_gen prints the selected keys
+    yield
+    capsys.readouterr()
+
+
+def test_table_compiles_into_the_situation_tree():
+    situations = IntersectionSituations(False, 0)
+    table = situations.situation_table
+
+    assert len(situations.situation_keys) == len(table)
+    assert len(set(situations.situation_keys)) == len(table)
+    for index, (ego_start, ego_goal, conflict_point, key, other_start, other_goal) in enumerate(table):
+        assert situations.ego_start_locs[situations.situation_ego_start[index]] == ego_start
+        assert situations.ego_goal_locs[situations.situation_goal[index]] == ego_goal
+        assert situations.conflict_points[situations.situation_group[index]] == conflict_point
+        assert situations.situation_keys[index] == key
+        assert situations.other_veh_start_locs[index] == other_start
+        assert situations.other_veh_goal_locs[index] == other_goal
+
+    assert situations.random_situation_probabilities.sum() == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("approach", ["random", "sitcov"])
+def test_generated_situations_are_valid(approach):
+    situations = IntersectionSituations(True, 3)
+    table = situations.situation_table
+
+    for _ in range(3 * len(table)):
+        situation = situations.start_sit_config_gen(approach, True)
+        ego_start, ego_goal, _, key, other_start, _ = table[situation]
+
+        assert 0 <= situation < len(table)
+        assert situations.key_ego_other_veh_interaction_key == key
+        assert situations.ego_veh.ego_start_carla_transform_dict["key_location_string"] == ego_start
+        assert situations.ego_veh.ego_endconditiontrigger_dict
+        assert situations.other_veh.other_vehicle_start_carla_transform_dict["key_location_string"] == other_start
+        assert situations.other_veh.other_vehicle_stopothertrigger_dict
+        assert situations.conflictpoint_syncarrival_loc_dict
+        assert ego_goal in situations.ego_goal_locs
+
+    # every repetition is counted once on the start and situation levels
+    assert situations.ego_start_counts.sum() == 3 * len(table)
+    assert situations.situation_counts.sum() == 3 * len(table)
+
+
+def test_sitcov_covers_every_situation():
+    situations, selected = generate("sitcov", 4 * len(IntersectionSituations.situation_table))
+    assert set(selected) == set(range(len(situations.situation_table)))
+
+
+@pytest.mark.parametrize("approach", ["random", "sitcov"])
+def test_seeded_sequence_is_stable(approach):
+    situations, selected = generate(approach, len(SEEDED_SITUATIONS[approach]))
+    assert selected == SEEDED_SITUATIONS[approach]
+    assert situations.env_conditions.current_bins() == SEEDED_ENV_BINS[approach]
+
+    _, selected_again = generate(approach, len(SEEDED_SITUATIONS[approach]))
+    assert selected_again == selected
+
+
+@pytest.mark.parametrize("approach", ["random", "sitcov"])
+def test_pre_generated_situations_leave_the_counts_alone(approach):
+    situations = IntersectionSituations(True, 7)
+    batch = situations.pre_generate_situations(approach, 50)
+
+    assert batch.shape == (50,)
+    assert np.all((batch >= 0) & (batch < len(situations.situation_table)))
+    assert not situations.situation_counts.any()
+    assert not situations.ego_start_counts.any()
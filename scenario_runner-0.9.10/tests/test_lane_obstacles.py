@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Tests of the oriented box test used by detect_lane_obstacle: boxes_overlap has to
+agree with the shapely intersection of RotatedRectangle, which the lane obstacle
+detection used before, on random pairs of boxes (including almost aligned, nested
+and barely touching ones).
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('shapely')
+pytest.importorskip('carla')
+
+# pylint: disable=wrong-import-position
+from srunner.tools.scenario_helper import RotatedRectangle, boxes_overlap, get_box_corners
+
+
+def random_boxes(rng, count):
+    """
+    Random centers, extents and yaws, with some yaws snapped to multiples of 90 degrees
+    """
+    centers = rng.uniform(-8, 8, size=(count, 2))
+    extents = rng.uniform(0.2, 5, size=(count, 2))
+    yaws = rng.uniform(-180, 180, size=count)
+    snapped = rng.random_sample(count) < 0.2
+    yaws[snapped] = 90 * np.round(yaws[snapped] / 90)
+    return centers, extents, yaws
+
+
+def shapely_overlap(center_a, extent_a, yaw_a, center_b, extent_b, yaw_b):
+    """
+    Overlap as computed with shapely
+    """
+    rectangle_a = RotatedRectangle(center_a[0], center_a[1], 2 * extent_a[0], 2 * extent_a[1], yaw_a)
+    rectangle_b = RotatedRectangle(center_b[0], center_b[1], 2 * extent_b[0], 2 * extent_b[1], yaw_b)
+    return rectangle_a.intersection(rectangle_b).area > 0
+
+
+def sat_overlap(center_a, extent_a, yaw_a, center_b, extent_b, yaw_b):
+    box = get_box_corners(np.array([center_a], dtype=float), np.array([extent_a], dtype=float),
+                          np.array([yaw_a], dtype=float))[0]
+    boxes = get_box_corners(np.array([center_b], dtype=float), np.array([extent_b], dtype=float),
+                            np.array([yaw_b], dtype=float))
+    return bool(boxes_overlap(box, boxes)[0])
+
+
+def test_box_corners():
+    corners = get_box_corners(np.array([[1.0, 2.0]]), np.array([[2.0, 1.0]]), np.array([90.0]))
+    assert corners[0] == pytest.approx(np.array([[0.0, 4.0], [0.0, 0.0], [2.0, 0.0], [2.0, 4.0]]))
+
+
+@pytest.mark.parametrize("box_a, box_b, expected", [
+    (((0, 0), (2, 1), 0), ((3, 0), (2, 1), 0), True),        # aligned, overlapping
+    (((0, 0), (2, 1), 0), ((4, 0), (2, 1), 0), False),       # aligned, touching
+    (((0, 0), (2, 1), 0), ((5, 0), (2, 1), 0), False),       # aligned, apart
+    (((0, 0), (4, 4), 30), ((0.5, 0), (1, 1), 75), True),    # nested
+    (((0, 0), (2, 1), 45), ((2.5, -2.5), (2, 1), 45), False),  # diagonal neighbours
+    (((0, 0), (3, 0.5), 0), ((0, 0), (3, 0.5), 90), True),   # crossing
+])
+def test_overlap_of_known_boxes(box_a, box_b, expected):
+    assert sat_overlap(*(box_a + box_b)) is expected
+    assert shapely_overlap(*(box_a + box_b)) is expected
+
+
+def test_overlap_matches_shapely_on_random_boxes():
+    cases = 5000
+    rng = np.random.RandomState(0)
+    centers_a, extents_a, yaws_a = random_boxes(rng, cases)
+    centers_b, extents_b, yaws_b = random_boxes(rng, cases)
+
+    boxes_a = get_box_corners(centers_a, extents_a, yaws_a)
+    boxes_b = get_box_corners(centers_b, extents_b, yaws_b)
+
+    mismatches = []
+    overlaps = 0
+    for i in range(cases):
+        expected = shapely_overlap(centers_a[i], extents_a[i], yaws_a[i], centers_b[i], extents_b[i], yaws_b[i])
+        overlaps += expected
+        if bool(boxes_overlap(boxes_a[i], boxes_b[i:i + 1])[0]) != expected:
+            mismatches.append(i)
+
+    assert mismatches == []
+    # both outcomes are well represented
+    assert 0.2 * cases < overlaps < 0.8 * cases
+
+
+def test_one_box_against_many():
+    rng = np.random.RandomState(1)
+    centers, extents, yaws = random_boxes(rng, 100)
+    boxes = get_box_corners(centers, extents, yaws)
+
+    result = boxes_overlap(boxes[0], boxes[1:])
+    expected = [shapely_overlap(centers[0], extents[0], yaws[0], centers[i], extents[i], yaws[i])
+                for i in range(1, 100)]
+    assert result.tolist() == expected
@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Tests of the map raster cache of the no_rendering_mode visualizers, on a fake
+map: a raster read from the cache has to match the rendered one pixel for pixel,
+and a cache that can't be written must not stop the visualizer.
+"""
+
+import importlib.util
+import json
+import logging
+import os
+
+import numpy as np
+import pytest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+pygame = pytest.importorskip('pygame')
+
+# pylint: disable=wrong-import-position
+from agents.tools.map_raster_cache import CACHE_FORMAT_VERSION, MapRasterCache, compute_map_bounds
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RENDERERS = {
+    'scenario_runner': os.path.join(ROOT, 'no_rendering_mode.py'),
+    'examples': os.path.join(ROOT, '..', 'PythonAPI', 'examples', 'no_rendering_mode.py'),
+}
+PIXELS_PER_METER = 2
+
+
+class Location(object):
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class Waypoint(object):
+
+    def __init__(self, x, y):
+        self.transform = type('Transform', (object,), {})()
+        self.transform.location = Location(x, y)
+
+
+class FakeMap(object):
+
+    """
+    carla.Map with an OpenDRIVE content and a winding road, counting the waypoint generations
+    """
+
+    def __init__(self, opendrive='<OpenDRIVE road="1"/>'):
+        self.name = 'Carla/Maps/Town99'
+        self._opendrive = opendrive
+        self.generated_waypoints = 0
+
+    def to_opendrive(self):
+        return self._opendrive
+
+    def generate_waypoints(self, distance):  # pylint: disable=unused-argument
+        self.generated_waypoints += 1
+        return [Waypoint(10.0 * i, 30.0 * np.sin(i / 2.0)) for i in range(12)]
+
+
+def load_renderer(name):
+    """
+    The no_rendering_mode module of the copy, with a MapImage that draws the waypoints of the map
+    """
+    path = RENDERERS[name]
+    if not os.path.isfile(path):
+        pytest.skip("no {} copy of no_rendering_mode.py".format(name))
+    spec = importlib.util.spec_from_file_location('{}_no_rendering_mode'.format(name), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    class SketchMapImage(module.MapImage):
+
+        """
+        MapImage whose road map is a polyline through the waypoints, the rest is unchanged
+        """
+
+        def draw_road_map(self, map_surface, carla_world, carla_map, world_to_pixel, world_to_pixel_width):
+            map_surface.fill(module.COLOR_ALUMINIUM_4)
+            points = [world_to_pixel(w.transform.location) for w in carla_map.generate_waypoints(2)]
+            pygame.draw.lines(map_surface, module.COLOR_BUTTER_0, False, points, world_to_pixel_width(3))
+            for point in points:
+                pygame.draw.circle(map_surface, module.COLOR_SKY_BLUE_0, point, world_to_pixel_width(2))
+
+    module.SketchMapImage = SketchMapImage
+    return module
+
+
+@pytest.fixture(name='display', scope='module')
+def fixture_display():
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.display.quit()
+
+
+@pytest.fixture(name='renderer', params=sorted(RENDERERS))
+def fixture_renderer(request, display):  # pylint: disable=unused-argument
+    pytest.importorskip('carla')
+    return load_renderer(request.param)
+
+
+def build(renderer, carla_map, map_cache):
+    return renderer.SketchMapImage(None, carla_map, PIXELS_PER_METER, False, False, False, map_cache)
+
+
+def test_cached_map_matches_the_rendered_one(renderer, tmpdir):
+    map_cache = MapRasterCache(renderer.MAP_RENDERER, str(tmpdir))
+
+    rendered_map = FakeMap()
+    rendered = build(renderer, rendered_map, map_cache)
+    assert rendered_map.generated_waypoints > 0
+    assert len(tmpdir.listdir()) == 2
+
+    cached_map = FakeMap()
+    cached = build(renderer, cached_map, map_cache)
+    assert cached_map.generated_waypoints == 0
+
+    # pylint: disable=protected-access
+    assert cached.width == rendered.width
+    assert cached._world_offset == rendered._world_offset
+    assert cached._pixels_per_meter == rendered._pixels_per_meter
+    assert cached.big_map_surface.get_size() == rendered.big_map_surface.get_size()
+    assert np.array_equal(pygame.surfarray.array3d(cached.big_map_surface),
+                          pygame.surfarray.array3d(rendered.big_map_surface))
+
+
+def test_unwritable_cache_keeps_the_rendered_map(renderer, tmpdir, caplog):
+    # a file where the cache directory should be, so that it can't be created
+    blocked_dir = tmpdir.join('blocked')
+    blocked_dir.write('')
+    blocked_cache = MapRasterCache(renderer.MAP_RENDERER, str(blocked_dir))
+
+    with caplog.at_level(logging.WARNING):
+        image = build(renderer, FakeMap(), blocked_cache)
+    assert any('could not cache the rendered map' in record.getMessage() for record in caplog.records)
+
+    expected = build(renderer, FakeMap(), MapRasterCache(renderer.MAP_RENDERER, str(tmpdir.mkdir('cache'))))
+    assert image.surface is image.big_map_surface
+    assert np.array_equal(pygame.surfarray.array3d(image.surface), pygame.surfarray.array3d(expected.surface))
+
+
+def test_key_depends_on_the_map_and_the_drawing():
+    map_cache = MapRasterCache('renderer-1', 'unused')
+    key = map_cache.key(FakeMap(), 2, (False, False, False))
+
+    assert key.startswith('Town99_')
+    assert map_cache.key(FakeMap(), 2, (False, False, False)) == key
+    assert map_cache.key(FakeMap('<OpenDRIVE road="2"/>'), 2, (False, False, False)) != key
+    assert map_cache.key(FakeMap(), 3, (False, False, False)) != key
+    assert map_cache.key(FakeMap(), 2, (True, False, False)) != key
+    assert MapRasterCache('renderer-2', 'unused').key(FakeMap(), 2, (False, False, False)) != key
+
+
+def test_incomplete_entries_are_misses(tmpdir):
+    map_cache = MapRasterCache('renderer-1', str(tmpdir))
+    surface = pygame.Surface((4, 4))
+    surface.fill((10, 20, 30))
+
+    assert map_cache.load('missing') is None
+
+    map_cache.save('entry', surface, {'width': 2.0})
+    loaded_surface, metadata = map_cache.load('entry')
+    assert metadata == {'width': 2.0, 'format': CACHE_FORMAT_VERSION, 'renderer': 'renderer-1'}
+    assert np.array_equal(pygame.surfarray.array3d(loaded_surface), pygame.surfarray.array3d(surface))
+
+    # an entry of another format version
+    tmpdir.join('entry.json').write(json.dumps(dict(metadata, format=CACHE_FORMAT_VERSION + 1)))
+    assert map_cache.load('entry') is None
+
+    # an image without its sidecar
+    tmpdir.join('entry.json').remove()
+    assert map_cache.load('entry') is None
+
+
+def test_map_bounds():
+    (min_x, min_y), width = compute_map_bounds(FakeMap(), margin=10)
+    waypoints = FakeMap().generate_waypoints(2)
+    assert min_x == pytest.approx(-10.0)
+    assert min_y == pytest.approx(min(w.transform.location.y for w in waypoints) - 10)
+    assert width == pytest.approx(130.0)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Tests of the metrics cache: a MetricsLog opened from the cache of a log has to answer
+as the one parsing the log, and the cache must not be used once the log has changed.
+"""
+
+import json
+import os
+
+import pytest
+
+carla = pytest.importorskip('carla')
+
+# pylint: disable=wrong-import-position
+from srunner.metrics.tools.metrics_cache import CACHE_VERSION, get_cache_dir, load_log_cache, save_log_cache
+from srunner.metrics.tools.metrics_log import MetricsLog
+from srunner.metrics.tools.metrics_parser import MetricsParser
+
+from test_metrics_parser import (RECORDER_LOG, control_as_tuple, transform_as_tuple, as_tuple,
+                                 PREVIOUS_TRANSFORMS_AND_VELOCITIES, PREVIOUS_CONTROLS_AND_LIGHTS,
+                                 PREVIOUS_TRAFFIC_LIGHTS_AND_WALKERS)
+
+OPENDRIVE = '<?xml version="1.0"?>\n<OpenDRIVE name="Town03 é"/>'
+
+
+def cache_log(log_file):
+    """
+    Parse the log file as the MetricsManager does and write its cache
+    """
+    with open(log_file, encoding='utf-8') as fd:
+        parser = MetricsParser(fd.read(), keep_event_lines=True)
+    recorder_info = parser.parse_recorder_info()
+    save_log_cache(log_file, recorder_info, parser.event_lines, OPENDRIVE)
+
+
+@pytest.fixture(name='log_file')
+def fixture_log_file(tmpdir):
+    log_file = tmpdir.join('run.log')
+    log_file.write(RECORDER_LOG)
+    return str(log_file)
+
+
+def test_cached_log_answers_as_the_parsed_one(log_file):
+    assert load_log_cache(log_file) is None
+    cache_log(log_file)
+
+    recorder_info, opendrive = load_log_cache(log_file)
+    assert opendrive == OPENDRIVE
+    parsed = MetricsLog(RECORDER_LOG)
+    cached = MetricsLog(recorder_info=recorder_info)
+
+    assert cached.get_total_frame_count() == parsed.get_total_frame_count()
+    assert cached.get_ego_vehicle_id() == parsed.get_ego_vehicle_id()
+    assert cached.get_actor_ids_with_type_id('*') == parsed.get_actor_ids_with_type_id('*')
+    assert cached.get_actor_collisions(24) == parsed.get_actor_collisions(24)
+    for frame in range(4):
+        assert cached.get_elapsed_time(frame) == parsed.get_elapsed_time(frame)
+        assert cached.get_platform_time(frame) == parsed.get_platform_time(frame)
+    for frame, actor_id in PREVIOUS_TRANSFORMS_AND_VELOCITIES:
+        assert transform_as_tuple(cached.get_actor_transform(actor_id, frame)) == \
+            transform_as_tuple(parsed.get_actor_transform(actor_id, frame))
+        assert as_tuple(cached.get_actor_velocity(actor_id, frame)) == \
+            as_tuple(parsed.get_actor_velocity(actor_id, frame))
+    for frame, vehicle_id in PREVIOUS_CONTROLS_AND_LIGHTS:
+        assert control_as_tuple(cached.get_vehicle_control(vehicle_id, frame)) == \
+            control_as_tuple(parsed.get_vehicle_control(vehicle_id, frame))
+        assert cached.get_vehicle_lights(vehicle_id, frame) == parsed.get_vehicle_lights(vehicle_id, frame)
+    for frame in PREVIOUS_TRAFFIC_LIGHTS_AND_WALKERS:
+        assert cached.get_traffic_light_state(30, frame) == parsed.get_traffic_light_state(30, frame)
+        assert cached.get_walker_speed(40, frame) == parsed.get_walker_speed(40, frame)
+    assert sorted(cached.get_actor_transforms_at_frame(4)) == sorted(parsed.get_actor_transforms_at_frame(4))
+
+
+def test_cache_of_a_changed_log_is_not_used(log_file):
+    cache_log(log_file)
+    assert load_log_cache(log_file) is not None
+
+    # same size, another modification time
+    stat = os.stat(log_file)
+    os.utime(log_file, (stat.st_atime, stat.st_mtime + 10))
+    assert load_log_cache(log_file) is None
+
+    # written again, then changed
+    cache_log(log_file)
+    assert load_log_cache(log_file) is not None
+    with open(log_file, 'a', encoding='utf-8') as fd:
+        fd.write('Frame 5 at 0.2 seconds\n')
+    assert load_log_cache(log_file) is None
+
+
+def test_cache_of_another_version_is_not_used(log_file):
+    cache_log(log_file)
+    index_file = os.path.join(get_cache_dir(log_file), 'index.json')
+    with open(index_file, encoding='utf-8') as fd:
+        index = json.load(fd)
+
+    with open(index_file, 'w', encoding='utf-8') as fd:
+        json.dump(dict(index, version=CACHE_VERSION + 1), fd)
+    assert load_log_cache(log_file) is None
+
+    with open(index_file, 'w', encoding='utf-8') as fd:
+        fd.write('{"version": ')
+    assert load_log_cache(log_file) is None
+
+
+def test_cache_is_replaced(log_file):
+    cache_log(log_file)
+    stale_file = os.path.join(get_cache_dir(log_file), 'stale')
+    with open(stale_file, 'w', encoding='utf-8') as fd:
+        fd.write('')
+
+    cache_log(log_file)
+    assert not os.path.exists(stale_file)
+    assert sorted(os.listdir(os.path.dirname(log_file))) == ['run.log', 'run.log.cache']
@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Tests of the MetricsParser and MetricsLog on a small recorder log.
+
+The expected values are the ones the previous parser (a dictionary of states
+per frame) gave for the same log. They only differ where that parser was wrong:
+the states of all the actors at a frame are those of the actors recorded at
+that frame (it took the actors of the next frame, and failed at the last one),
+and the walker speeds are floats (it returned the strings of the log).
+"""
+
+import pytest
+
+carla = pytest.importorskip('carla')
+
+# pylint: disable=wrong-import-position
+from srunner.metrics.tools.metrics_log import MetricsLog
+
+RECORDER_LOG = """Version: 1
+Map: Town03
+Date: 02/18/21 15:00:00
+
+Frame 1 at 0 seconds
+ Create 24: vehicle.tesla.model3 (1) at (1000, 2000, 50)
+  number_of_wheels = 4
+  role_name = hero
+ Create 25: vehicle.audi.a2 (1) at (3000, 2000, 50)
+  role_name = scenario
+ Create 30: traffic.traffic_light (5) at (5000, 500, 0)
+ Create 40: walker.pedestrian.0001 (2) at (1200, 2500, 100)
+  role_name = walker
+ Positions: 3
+  Id: 24 Location: (1000, 2000, 50) Rotation (0, 90, 0)
+  Id: 25 Location: (3000, 2000, 50) Rotation (0, -90, 0)
+  Id: 40 Location: (1200, 2500, 100) Rotation (0, 180, 0)
+ State traffic lights: 1
+  Id: 30 state: 0 frozen: 0 elapsedTime: 0.5
+ Vehicle animations: 2
+  Id: 24 Steering: 0 Throttle: 0.5 Brake: 0 Handbrake: 0 Gear: 1
+  Id: 25 Steering: 0.25 Throttle: 0.3 Brake: 0 Handbrake: 0 Gear: -1
+ Walker animations: 1
+  Id: 40 speed: 1.2
+ Vehicle light animations: 2
+  Id: 24 LowBeam Brake
+  Id: 25 None
+ Dynamic actors: 3
+  Id: 24 linear_velocity: (0, 1, 0) angular_velocity: (0, 0, 0.5)
+  Id: 25 linear_velocity: (0, -2, 0) angular_velocity: (0, 0, 0)
+  Id: 40 linear_velocity: (-1.2, 0, 0) angular_velocity: (0, 0, 0)
+ Current platform time: 10.5
+Frame 2 at 0.05 seconds
+ Collision id 1 between 24 with 25
+ Positions: 3
+  Id: 24 Location: (1000, 2005, 50) Rotation (0.5, 90.5, -1)
+  Id: 25 Location: (3000, 1990, 50) Rotation (0, -90, 0)
+  Id: 40 Location: (1194, 2500, 100) Rotation (0, 180, 0)
+ State traffic lights: 1
+  Id: 30 state: 2 frozen: 1 elapsedTime: 0.55
+ Vehicle animations: 2
+  Id: 24 Steering: -0.1 Throttle: 0.6 Brake: 0.2 Handbrake: 1 Gear: 2
+  Id: 25 Steering: 0.25 Throttle: 0 Brake: 1 Handbrake: 0 Gear: -1
+ Walker animations: 1
+  Id: 40 speed: 1.5
+ Vehicle light animations: 2
+  Id: 24 HighBeam
+  Id: 25 Reverse Fog
+ Dynamic actors: 3
+  Id: 24 linear_velocity: (0, 2, 0) angular_velocity: (0, 0, 0.25)
+  Id: 25 linear_velocity: (0, -1, 0) angular_velocity: (0.5, 0, 0)
+  Id: 40 linear_velocity: (-1.5, 0, 0) angular_velocity: (0, 0, 0)
+ Current platform time: 10.6
+Frame 3 at 0.1 seconds
+ Destroy 25
+ Positions: 2
+  Id: 24 Location: (1000, 2015, 50) Rotation (1, 91, -2)
+  Id: 40 Location: (1186.5, 2500, 100) Rotation (0, 180, 0)
+ State traffic lights: 1
+  Id: 30 state: 2 frozen: 1 elapsedTime: 0.6
+ Vehicle animations: 1
+  Id: 24 Steering: 0 Throttle: 0 Brake: 1 Handbrake: 0 Gear: 0
+ Walker animations: 1
+  Id: 40 speed: 0
+ Vehicle light animations: 1
+  Id: 24 Brake RightBlinker
+ Dynamic actors: 2
+  Id: 24 linear_velocity: (0, 0.5, 0) angular_velocity: (0, 0, 0)
+  Id: 40 linear_velocity: (0, 0, 0) angular_velocity: (0, 0, 0)
+ Current platform time: 10.7
+Frame 4 at 0.15 seconds
+ Collision id 2 between 24 with 40
+ Positions: 2
+  Id: 24 Location: (1000, 2017.5, 50) Rotation (1, 91, -2)
+  Id: 40 Location: (1186.5, 2500, 100) Rotation (0, 90, 0)
+ State traffic lights: 1
+  Id: 30 state: 1 frozen: 0 elapsedTime: 0.65
+ Vehicle animations: 1
+  Id: 24 Steering: 0 Throttle: 0 Brake: 1 Handbrake: 1 Gear: -1
+ Walker animations: 1
+  Id: 40 speed: 0
+ Vehicle light animations: 1
+  Id: 24 Reverse
+ Dynamic actors: 2
+  Id: 24 linear_velocity: (0, -0.5, 0) angular_velocity: (0, 0, 0)
+  Id: 40 linear_velocity: (0, 0, 0) angular_velocity: (0, 0, 0)
+ Current platform time: 10.8
+
+Frames: 4
+Duration: 0.15 seconds
+"""
+
+# (frame, actor id) -> (x, y, z, pitch, yaw, roll), velocity, angular velocity
+PREVIOUS_TRANSFORMS_AND_VELOCITIES = {
+    (1, 24): ((10.0, 20.0, 0.5, 90.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 0.5)),
+    (1, 25): ((30.0, 20.0, 0.5, -90.0, 0.0, 0.0), (0.0, -2.0, 0.0), (0.0, 0.0, 0.0)),
+    (1, 40): ((12.0, 25.0, 1.0, 180.0, 0.0, 0.0), (-1.2, 0.0, 0.0), (0.0, 0.0, 0.0)),
+    (2, 24): ((10.0, 20.05, 0.5, 90.5, -1.0, 0.5), (0.0, 2.0, 0.0), (0.0, 0.0, 0.25)),
+    (2, 25): ((30.0, 19.9, 0.5, -90.0, 0.0, 0.0), (0.0, -1.0, 0.0), (0.5, 0.0, 0.0)),
+    (2, 40): ((11.94, 25.0, 1.0, 180.0, 0.0, 0.0), (-1.5, 0.0, 0.0), (0.0, 0.0, 0.0)),
+    (3, 24): ((10.0, 20.15, 0.5, 91.0, -2.0, 1.0), (0.0, 0.5, 0.0), (0.0, 0.0, 0.0)),
+    (3, 25): (None, None, None),
+    (3, 40): ((11.865, 25.0, 1.0, 180.0, 0.0, 0.0), (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)),
+    (4, 24): ((10.0, 20.175, 0.5, 91.0, -2.0, 1.0), (0.0, -0.5, 0.0), (0.0, 0.0, 0.0)),
+    (4, 25): (None, None, None),
+    (4, 40): ((11.865, 25.0, 1.0, 90.0, 0.0, 0.0), (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)),
+}
+
+# (frame, vehicle id) -> (throttle, steer, brake, hand_brake, reverse, gear), lights
+PREVIOUS_CONTROLS_AND_LIGHTS = {
+    (1, 24): ((0.5, 0.0, 0.0, False, False, 1),
+              [carla.VehicleLightState.LowBeam, carla.VehicleLightState.Brake]),
+    (1, 25): ((0.3, 0.25, 0.0, False, True, -1), [carla.VehicleLightState.NONE]),
+    (2, 24): ((0.6, -0.1, 0.2, True, False, 2), [carla.VehicleLightState.HighBeam]),
+    (2, 25): ((0.0, 0.25, 1.0, False, True, -1),
+              [carla.VehicleLightState.Reverse, carla.VehicleLightState.Fog]),
+    (3, 24): ((0.0, 0.0, 1.0, False, False, 0),
+              [carla.VehicleLightState.Brake, carla.VehicleLightState.RightBlinker]),
+    (3, 25): (None, None),
+    (4, 24): ((0.0, 0.0, 1.0, True, True, -1), [carla.VehicleLightState.Reverse]),
+    (4, 25): (None, None),
+}
+
+# frame -> traffic light state, frozen, elapsed time, walker speed
+PREVIOUS_TRAFFIC_LIGHTS_AND_WALKERS = {
+    1: (carla.TrafficLightState.Red, False, 0.5, 1.2),
+    2: (carla.TrafficLightState.Green, True, 0.55, 1.5),
+    3: (carla.TrafficLightState.Green, True, 0.6, 0.0),
+    4: (carla.TrafficLightState.Yellow, False, 0.65, 0.0),
+}
+
+
+@pytest.fixture(name='log', scope='module')
+def fixture_log():
+    return MetricsLog(RECORDER_LOG)
+
+
+def as_tuple(vector):
+    return None if vector is None else (vector.x, vector.y, vector.z)
+
+
+def transform_as_tuple(transform):
+    if transform is None:
+        return None
+    rotation = transform.rotation
+    return as_tuple(transform.location) + (rotation.pitch, rotation.yaw, rotation.roll)
+
+
+def control_as_tuple(control):
+    if control is None:
+        return None
+    return (control.throttle, control.steer, control.brake, control.hand_brake, control.reverse, control.gear)
+
+
+def test_simulation_and_actors(log):
+    assert log.get_total_frame_count() == 4
+    # the frame times are indexed from 0, as before
+    assert log.get_elapsed_time(2) == pytest.approx(0.1)
+    assert log.get_delta_time(1) == pytest.approx(0.05)
+    assert log.get_platform_time(3) == pytest.approx(10.8)
+    assert log.get_ego_vehicle_id() == 24
+    assert log.get_actor_ids_with_type_id('vehicle.*') == [24, 25]
+    assert log.get_actor_attributes(24)['number_of_wheels'] == '4'
+    assert [log.get_actor_alive_frames(actor_id) for actor_id in (24, 25, 40)] == [(1, 4), (1, 2), (1, 4)]
+
+
+@pytest.mark.parametrize("frame, actor_id", sorted(PREVIOUS_TRANSFORMS_AND_VELOCITIES))
+def test_transforms_and_velocities(log, frame, actor_id):
+    transform, velocity, angular_velocity = PREVIOUS_TRANSFORMS_AND_VELOCITIES[(frame, actor_id)]
+    assert transform_as_tuple(log.get_actor_transform(actor_id, frame)) == pytest.approx(transform)
+    assert as_tuple(log.get_actor_velocity(actor_id, frame)) == pytest.approx(velocity)
+    assert as_tuple(log.get_actor_angular_velocity(actor_id, frame)) == pytest.approx(angular_velocity)
+
+
+@pytest.mark.parametrize("frame, vehicle_id", sorted(PREVIOUS_CONTROLS_AND_LIGHTS))
+def test_controls_and_lights(log, frame, vehicle_id):
+    control, lights = PREVIOUS_CONTROLS_AND_LIGHTS[(frame, vehicle_id)]
+    assert control_as_tuple(log.get_vehicle_control(vehicle_id, frame)) == pytest.approx(control)
+    assert log.get_vehicle_lights(vehicle_id, frame) == lights
+
+
+@pytest.mark.parametrize("frame", sorted(PREVIOUS_TRAFFIC_LIGHTS_AND_WALKERS))
+def test_traffic_lights_and_walkers(log, frame):
+    state, frozen, elapsed_time, speed = PREVIOUS_TRAFFIC_LIGHTS_AND_WALKERS[frame]
+    assert log.get_traffic_light_state(30, frame) == state
+    assert log.is_traffic_light_frozen(30, frame) is frozen
+    assert log.get_traffic_light_elapsed_time(30, frame) == pytest.approx(elapsed_time)
+    assert log.get_walker_speed(40, frame) == pytest.approx(speed)
+
+
+def test_collisions(log):
+    # keyed by the index of the frame, as before
+    assert log.get_actor_collisions(24) == {1: [25], 3: [40]}
+    assert log.get_actor_collisions(25) == {}
+
+
+def test_states_at_frame(log):
+    # the actors recorded at the frame, including one destroyed at the next frame
+    transforms = log.get_actor_transforms_at_frame(2)
+    assert sorted(transforms) == [24, 25, 40]
+    assert transform_as_tuple(transforms[25]) == pytest.approx(PREVIOUS_TRANSFORMS_AND_VELOCITIES[(2, 25)][0])
+
+    # the last frame has states too
+    transforms = log.get_actor_transforms_at_frame(4)
+    assert sorted(transforms) == [24, 40]
+    assert transform_as_tuple(transforms[40]) == pytest.approx(PREVIOUS_TRANSFORMS_AND_VELOCITIES[(4, 40)][0])
+    assert sorted(log.get_actor_velocities_at_frame(4, [24, 25])) == [24]
+
+
+def test_values_are_plain_python_types(log):
+    control = log.get_vehicle_control(25, 1)
+    assert type(control.reverse) is bool  # pylint: disable=unidiomatic-typecheck
+    assert type(control.hand_brake) is bool  # pylint: disable=unidiomatic-typecheck
+    assert type(control.gear) is int  # pylint: disable=unidiomatic-typecheck
+    assert type(control.throttle) is float  # pylint: disable=unidiomatic-typecheck
+
+    transform = log.get_actor_transform(24, 2)
+    values = as_tuple(transform.location) + (transform.rotation.pitch, transform.rotation.yaw, transform.rotation.roll)
+    values += as_tuple(log.get_actor_velocity(24, 2)) + as_tuple(log.get_actor_angular_velocity(24, 2))
+    assert all(type(value) is float for value in values)  # pylint: disable=unidiomatic-typecheck
+    assert type(log.is_traffic_light_frozen(30, 2)) is bool  # pylint: disable=unidiomatic-typecheck
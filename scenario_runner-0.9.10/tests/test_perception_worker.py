@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Tests of the frames handed to the PerceptionWorker: a Detection has to keep the
+frame that was detected, even when the camera reuses its buffer meanwhile.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from perception_worker import PerceptionWorker
+
+
+class SlowModel(object):
+
+    """
+    Detection model whose inference blocks until it is released, and records the frame it saw
+    """
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.seen = []
+
+    def run_inference(self, image):
+        self.seen.append(int(image[0, 0, 0]))
+        self.started.set()
+        self.release.wait(5.0)
+        return {'frame_value': int(image[0, 0, 0])}
+
+
+def wait_for_detection(worker, frame_id):
+    deadline = time.time() + 5.0
+    while time.time() < deadline:
+        detection = worker.latest()
+        if detection is not None and detection.frame_id == frame_id:
+            return detection
+        time.sleep(0.005)
+    raise AssertionError("frame {} was not detected".format(frame_id))
+
+
+def test_detection_keeps_the_detected_frame():
+    model = SlowModel()
+    worker = PerceptionWorker(model, visualize=False)
+    camera_buffer = np.full((4, 6, 3), 1, dtype=np.uint8)
+    try:
+        worker.submit(1, camera_buffer)
+        assert model.started.wait(5.0)
+
+        # the camera overwrites its buffer while frame 1 is detected
+        camera_buffer[...] = 2
+        model.release.set()
+
+        detection = wait_for_detection(worker, 1)
+        assert detection.output_dict == {'frame_value': 1}
+        assert np.all(detection.image == 1)
+        assert detection.image is not camera_buffer
+
+        # and again once frame 1 is published
+        camera_buffer[...] = 3
+        assert np.all(worker.latest().image == 1)
+    finally:
+        model.release.set()
+        worker.stop()
+
+
+def test_dropped_frames_are_replaced_by_the_latest():
+    model = SlowModel()
+    worker = PerceptionWorker(model, visualize=False)
+    camera_buffer = np.zeros((4, 6, 3), dtype=np.uint8)
+    try:
+        camera_buffer[...] = 1
+        worker.submit(1, camera_buffer)
+        assert model.started.wait(5.0)
+
+        for frame_id in (2, 3, 4):
+            camera_buffer[...] = frame_id
+            worker.submit(frame_id, camera_buffer)
+        camera_buffer[...] = 9
+        model.release.set()
+
+        detection = wait_for_detection(worker, 4)
+        assert np.all(detection.image == 4)
+        assert model.seen == [1, 4]
+        assert worker.frames_submitted == 4
+        assert worker.frames_dropped == 2
+    finally:
+        model.release.set()
+        worker.stop()
+
+
+def test_reset_drops_the_waiting_frame():
+    model = SlowModel()
+    worker = PerceptionWorker(model, visualize=False)
+    try:
+        worker.submit(1, np.zeros((2, 2, 3), dtype=np.uint8))
+        assert model.started.wait(5.0)
+        worker.submit(2, np.zeros((2, 2, 3), dtype=np.uint8))
+        worker.reset()
+        model.release.set()
+
+        time.sleep(0.1)
+        assert worker.latest() is None
+        assert model.seen == [0]
+    finally:
+        model.release.set()
+        worker.stop()
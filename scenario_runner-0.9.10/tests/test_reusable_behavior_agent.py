@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Tests of binding a reused behavior agent to the vehicle of the next repetition
+"""
+
+import pytest
+
+pytest.importorskip('carla')
+
+# pylint: disable=wrong-import-position
+from agents.navigation.behavior_agent_z2 import BehaviorAgentZ2
+from agents.navigation.behavior_agent_z4 import BehaviorAgentZ4
+from agents.navigation.reusable_behavior_agent import ReusableBehaviorAgent
+from agents.navigation.types_behavior2 import Cautious
+
+
+class FakeMap(object):
+
+    def __init__(self, name):
+        self.name = name
+
+
+class FakeWorld(object):
+
+    def __init__(self, world_id, town):
+        self.id = world_id
+        self.map = FakeMap(town)
+
+    def get_map(self):
+        return self.map
+
+
+class FakeVehicle(object):
+
+    def __init__(self, world):
+        self.world = world
+
+    def get_world(self):
+        return self.world
+
+
+class FakeLocalPlanner(object):
+
+    def __init__(self):
+        self.bound = []
+
+    def set_vehicle(self, vehicle, wmap=None):
+        self.bound.append((vehicle, wmap))
+
+
+def make_agent(agent_class, world):
+    # the constructors need a whole map, reset() only needs the state they set up
+    agent = object.__new__(agent_class)
+    agent._world = world                       # pylint: disable=protected-access
+    agent._map = world.get_map()               # pylint: disable=protected-access
+    agent._grp = "route planner"               # pylint: disable=protected-access
+    agent._local_planner = FakeLocalPlanner()  # pylint: disable=protected-access
+    agent._last_traffic_light = "light"        # pylint: disable=protected-access
+    agent.behavior = Cautious()
+    agent.behavior.tailgate_counter = 7
+    agent.speed = 30
+    agent.light_id_to_ignore = 12
+    return agent
+
+
+def test_both_agents_share_reset():
+    assert BehaviorAgentZ2.reset is ReusableBehaviorAgent.reset
+    assert BehaviorAgentZ4.reset is ReusableBehaviorAgent.reset
+
+
+@pytest.mark.parametrize("agent_class", [BehaviorAgentZ2, BehaviorAgentZ4])
+def test_reset_on_the_same_world_keeps_the_route_planner(agent_class):
+    world = FakeWorld(1, 'Town03')
+    agent = make_agent(agent_class, world)
+    vehicle = FakeVehicle(world)
+
+    agent.reset(vehicle)
+
+    assert agent.vehicle is vehicle and agent._vehicle is vehicle  # pylint: disable=protected-access
+    assert agent._grp == "route planner"                            # pylint: disable=protected-access
+    assert agent._local_planner.bound == [(vehicle, world.map)]     # pylint: disable=protected-access
+    assert agent._last_traffic_light is None                        # pylint: disable=protected-access
+    assert agent.speed == 0 and agent.light_id_to_ignore == -1
+    assert isinstance(agent.behavior, Cautious) and agent.behavior.tailgate_counter == 0
+
+
+@pytest.mark.parametrize("agent_class", [BehaviorAgentZ2, BehaviorAgentZ4])
+def test_reset_on_a_new_world(agent_class):
+    agent = make_agent(agent_class, FakeWorld(1, 'Town03'))
+
+    reloaded = FakeWorld(2, 'Town03')
+    agent.reset(FakeVehicle(reloaded))
+    assert agent._map is reloaded.map and agent._grp == "route planner"  # pylint: disable=protected-access
+
+    other_town = FakeWorld(3, 'Town01')
+    agent.reset(FakeVehicle(other_town))
+    assert agent._map is other_town.map and agent._grp is None  # pylint: disable=protected-access
@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Tests of the route geometry shared by the route criteria: InRouteTest and
+RouteCompletionTest are driven along a curved route and must follow the
+route as their previous implementation did, which scanned the route
+locations one by one (kept here as the reference).
+"""
+
+import math
+
+import pytest
+
+carla = pytest.importorskip('carla')
+pytest.importorskip('py_trees')
+
+# pylint: disable=wrong-import-position
+from agents.navigation.local_planner import RoadOption
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.scenariomanager.scenarioatomics.atomic_criteria import InRouteTest, RouteCompletionTest
+from srunner.tools.route_geometry import RouteGeometry
+
+RADIUS = 60.0
+
+
+class FakeActor(object):
+
+    def __init__(self, actor_id):
+        self.id = actor_id
+        self.is_alive = True
+
+
+class FakeWaypoint(object):
+
+    def __init__(self, transform):
+        self.transform = transform
+
+
+class FakeMap(object):
+
+    """
+    carla.Map of a counterclockwise circular road around the origin
+    """
+
+    def __init__(self):
+        self.lookups = 0
+
+    def get_waypoint(self, location):
+        self.lookups += 1
+        yaw = math.degrees(math.atan2(location.y, location.x)) + 90.0
+        return FakeWaypoint(carla.Transform(location, carla.Rotation(yaw=yaw)))
+
+
+def arc_route(count=120, step=2.0):
+    """
+    Route along the circle, unevenly spaced and with a slope
+    """
+    route = []
+    arc = 0.0
+    for index in range(count):
+        angle = arc / RADIUS
+        route.append((carla.Location(x=RADIUS * math.cos(angle), y=RADIUS * math.sin(angle), z=0.05 * index),
+                      RoadOption.LANEFOLLOW))
+        arc += step * (1.0 + 0.5 * (index % 3))
+    return route
+
+
+def on_the_arc(arc, offset=0.0):
+    """
+    Location at the arc length arc of the circle, offset meters outside of it
+    """
+    angle = arc / RADIUS
+    return carla.Location(x=(RADIUS + offset) * math.cos(angle), y=(RADIUS + offset) * math.sin(angle), z=0.0)
+
+
+def accumulated_meters(waypoints):
+    accum_meters = []
+    prev_wp = waypoints[0]
+    for i, wp in enumerate(waypoints):
+        d = wp.distance(prev_wp)
+        accum = accum_meters[i - 1] if i > 0 else 0
+        accum_meters.append(d + accum)
+        prev_wp = wp
+    return accum_meters
+
+
+class PreviousInRoute(object):
+
+    """
+    The route following of the previous InRouteTest.update
+    """
+
+    def __init__(self, route, offroad_max=30):
+        self._waypoints = [location for location, _ in route]
+        self._accum_meters = accumulated_meters(self._waypoints)
+        self._offroad_max = offroad_max
+        self._offroad_min = offroad_max / 2
+        self.current_index = 0
+        self.out_route_distance = 0
+        self.in_safe_route = True
+        self.failed = False
+
+    def update(self, location):
+        if self.failed:
+            return
+        shortest_distance = float('inf')
+        closest_index = -1
+        for index in range(self.current_index,
+                           min(self.current_index + InRouteTest.WINDOWS_SIZE + 1, len(self._waypoints))):
+            ref_waypoint = self._waypoints[index]
+            distance = math.sqrt(((location.x - ref_waypoint.x) ** 2) + ((location.y - ref_waypoint.y) ** 2))
+            if distance <= shortest_distance:
+                closest_index = index
+                shortest_distance = distance
+
+        off_route = True
+        if shortest_distance < self._offroad_max:
+            off_route = False
+            self.in_safe_route = bool(shortest_distance < self._offroad_min)
+
+        if self.current_index != closest_index:
+            new_dist = self._accum_meters[closest_index] - self._accum_meters[self.current_index]
+            if not self.in_safe_route:
+                self.out_route_distance += new_dist
+                if 100 * self.out_route_distance / self._accum_meters[-1] > InRouteTest.MAX_ROUTE_PERCENTAGE:
+                    off_route = True
+            self.current_index = closest_index
+
+        self.failed = self.failed or off_route
+
+
+class PreviousRouteCompletion(object):
+
+    """
+    The route following of the previous RouteCompletionTest.update
+    """
+
+    def __init__(self, route, carla_map):
+        self._waypoints = [location for location, _ in route]
+        self._accum_meters = accumulated_meters(self._waypoints)
+        self._map = carla_map
+        self.current_index = 0
+        self.percentage = 0.0
+
+    def update(self, location):
+        for index in range(self.current_index,
+                           min(self.current_index + RouteCompletionTest.WINDOWS_SIZE + 1, len(self._waypoints))):
+            ref_waypoint = self._waypoints[index]
+            wp_dir = self._map.get_waypoint(ref_waypoint).transform.get_forward_vector()
+            wp_veh = location - ref_waypoint
+            if wp_veh.x * wp_dir.x + wp_veh.y * wp_dir.y + wp_veh.z * wp_dir.z > 0:
+                self.current_index = index
+                self.percentage = 100.0 * float(self._accum_meters[self.current_index]) \
+                    / float(self._accum_meters[-1])
+
+
+@pytest.fixture(name='actor')
+def fixture_actor():
+    actor = FakeActor(7)
+    CarlaDataProvider.register_actors([actor])
+    CarlaDataProvider._map = FakeMap()  # pylint: disable=protected-access
+    yield actor
+    CarlaDataProvider.cleanup()
+
+
+def drive(actor, route, locations):
+    """
+    Tick both criteria and their previous implementation at each location, and compare them
+    """
+    carla_map = CarlaDataProvider.get_map()
+    in_route = InRouteTest(actor, route)
+    completion = RouteCompletionTest(actor, route)
+    previous_in_route = PreviousInRoute(route)
+    previous_completion = PreviousRouteCompletion(route, carla_map)
+
+    # pylint: disable=protected-access
+    for location in locations:
+        CarlaDataProvider._actor_location_map[actor] = location
+        in_route.update()
+        completion.update()
+        previous_in_route.update(location)
+        previous_completion.update(location)
+
+        assert in_route._current_index == previous_in_route.current_index
+        assert in_route._out_route_distance == pytest.approx(previous_in_route.out_route_distance)
+        assert in_route._in_safe_route == previous_in_route.in_safe_route
+        assert (in_route.test_status == "FAILURE") == previous_in_route.failed
+        # both stop following the route once it is completed
+        if completion.test_status != "SUCCESS":
+            assert completion._current_index == previous_completion.current_index
+            assert completion._percentage_route_completed == pytest.approx(previous_completion.percentage)
+    return in_route, completion
+
+
+def test_criteria_follow_the_route_as_before(actor):
+    route = arc_route()
+    length = RouteGeometry.get(route).length
+
+    # forwards with some weaving, a stop, and a few steps backwards (never level with
+    # a route point or halfway between two, where both implementations are a rounding apart)
+    arcs = [0.5 * tick + 0.13 for tick in range(int(length / 0.5) + 20)]
+    arcs[100:100] = [50.13] * 5 + [49.13, 48.13, 47.13]
+    locations = [on_the_arc(arc, offset=2.5 * math.sin(arc / 7.0)) for arc in arcs]
+
+    in_route, completion = drive(actor, route, locations)
+    assert in_route.test_status != "FAILURE"
+    assert completion.test_status == "SUCCESS"
+
+
+def test_criteria_follow_a_deviation_as_before(actor):
+    route = arc_route()
+
+    # far enough to count as out of the safe route, then off the route
+    arcs = [0.5 * tick + 0.13 for tick in range(500)]
+    locations = [on_the_arc(arc, offset=min(40.0, max(0.0, arc - 60.0))) for arc in arcs]
+
+    in_route, completion = drive(actor, route, locations)
+    assert in_route.test_status == "FAILURE"
+    assert 0.0 < completion._percentage_route_completed < 99.0  # pylint: disable=protected-access
+
+
+def test_lane_directions_are_looked_up_once(actor):
+    route = arc_route(count=30)
+    carla_map = CarlaDataProvider.get_map()
+    geometry = RouteGeometry.get(route)
+    assert RouteGeometry.get(route) is geometry
+    assert RouteGeometry.get(arc_route(count=30)) is not geometry
+
+    CarlaDataProvider._actor_location_map[actor] = on_the_arc(20.0)  # pylint: disable=protected-access
+    for _ in range(3):
+        geometry.passed_points(on_the_arc(20.0), 0, 10)
+    assert carla_map.lookups == 10
+    assert geometry.completion(len(route) - 1) == pytest.approx(100.0)
+    assert geometry.distance_between(0, len(route) - 1) == pytest.approx(geometry.length)
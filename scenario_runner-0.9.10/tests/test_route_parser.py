@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Tests of the trigger matching of the RouteParser: the PositionIndex has to give the
+results of the linear scans over the route and over the existing triggers.
+"""
+
+import copy
+import math
+import random
+
+import pytest
+
+carla = pytest.importorskip('carla')
+
+# pylint: disable=wrong-import-position
+from agents.navigation.local_planner import RoadOption
+from srunner.tools.route_parser import TRIGGER_THRESHOLD, PositionIndex, RouteParser
+
+LAP_WAYPOINTS = 600
+
+
+def loop_route():
+    """
+    Route of waypoints about 0.5 m apart, going twice around the same circle so that every
+    position matches waypoints of both laps, with a few turns
+    """
+    trajectory = []
+    for step in range(2 * LAP_WAYPOINTS):
+        angle = 2 * math.pi * step / LAP_WAYPOINTS
+        location = carla.Location(x=50.0 * math.cos(angle), y=50.0 * math.sin(angle), z=0.1 * (step % 3))
+        yaw = math.degrees(angle) + 90.0
+        option = RoadOption.LEFT if step % 97 == 0 else RoadOption.LANEFOLLOW
+        trajectory.append((carla.Transform(location, carla.Rotation(yaw=yaw)), option))
+    return trajectory
+
+
+def random_events(trajectory, count, seed=1):
+    """
+    Events around the route, about half of them close enough to match, with yaws around 0/360
+    """
+    rng = random.Random(seed)
+    events = []
+    for _ in range(count):
+        transform = rng.choice(trajectory)[0]
+        distance = rng.choice([0.0, 0.5, 1.5, 1.99, 2.01, 3.0])
+        direction = rng.uniform(0, 2 * math.pi)
+        yaw = transform.rotation.yaw + rng.choice([0.0, 9.9, -9.9, 10.1, 180.0]) + rng.choice([0, 360, -360])
+        events.append({'transform': {'x': transform.location.x + distance * math.cos(direction),
+                                     'y': transform.location.y + distance * math.sin(direction),
+                                     'z': transform.location.z,
+                                     'yaw': yaw}})
+    return events
+
+
+def test_route_matches_are_the_ones_of_the_linear_scan():
+    trajectory = loop_route()
+    events = random_events(trajectory, 300)
+    route_index = PositionIndex.from_trajectory(trajectory)
+
+    expected = [RouteParser.match_world_location_to_route(event['transform'], trajectory) for event in events]
+    assert RouteParser.match_events_to_route(events, route_index) == expected
+    assert [RouteParser.match_world_location_to_route(event['transform'], trajectory, route_index)
+            for event in events] == expected
+
+    # the sample covers matches, misses, and the first of several matching waypoints
+    assert None in expected
+    assert len(set(position for position in expected if position is not None)) > 100
+    assert all(position is None or position < LAP_WAYPOINTS for position in expected)
+
+
+def test_trigger_matches_are_the_ones_of_the_linear_scan():
+    rng = random.Random(2)
+    existing_triggers = {}
+    trigger_index = PositionIndex(use_z=False)
+    matched = 0
+    for _ in range(500):
+        trigger = {'x': rng.uniform(0, 20), 'y': rng.uniform(0, 20), 'z': rng.uniform(0, 5),
+                   'yaw': rng.choice([0.0, 5.0, 355.0, 90.0])}
+        expected = RouteParser.check_trigger_position(trigger, existing_triggers)
+        assert RouteParser.check_trigger_position(trigger, existing_triggers, trigger_index) == expected
+        if expected is None:
+            trigger_id = len(existing_triggers)
+            existing_triggers[trigger_id] = trigger
+            assert trigger_index.add(trigger['x'], trigger['y'], 0.0, trigger['yaw']) == trigger_id
+        else:
+            matched += 1
+    assert matched and len(existing_triggers) > 1
+
+
+def test_positions_on_the_cell_borders():
+    index = PositionIndex()
+    index.add(TRIGGER_THRESHOLD - 0.01, 0.0, 0.0, 0.0)
+    index.add(TRIGGER_THRESHOLD, 0.0, 0.0, 0.0)
+
+    assert index.match(0.0, 0.0, 0.0, 359.0) == 0
+    assert index.match(2 * TRIGGER_THRESHOLD - 0.02, 0.0, 0.0, 0.0) == 0
+    assert index.match(2 * TRIGGER_THRESHOLD - 0.005, 0.0, 0.0, 0.0) == 1
+    assert index.match(TRIGGER_THRESHOLD, 0.0, TRIGGER_THRESHOLD, 0.0) is None
+    assert index.match(TRIGGER_THRESHOLD, 0.0, 0.0, 20.0) is None
+    assert index.match_batch([], []).size == 0
+    assert PositionIndex().match(0.0, 0.0, 0.0, 0.0) is None
+
+
+def test_scan_route_gives_the_scenarios_of_the_linear_scan(monkeypatch):
+    trajectory = loop_route()
+    events = random_events(trajectory, 200, seed=3)
+    world_annotations = {
+        'Town01': [{'scenario_type': 'Scenario{}'.format(number),
+                    'available_event_configurations': events[number::4]} for number in (1, 3, 4, 7)],
+        'Town02': [{'scenario_type': 'Scenario1', 'available_event_configurations': events[:10]}],
+    }
+
+    scenarios, triggers = RouteParser.scan_route_for_scenarios('Town01', trajectory,
+                                                               copy.deepcopy(world_annotations))
+
+    # the same scan without the indices
+    check_trigger_position = RouteParser.check_trigger_position
+    monkeypatch.setattr(RouteParser, 'match_events_to_route', staticmethod(
+        lambda events, route_index: [RouteParser.match_world_location_to_route(event['transform'], trajectory)
+                                     for event in events]))
+    monkeypatch.setattr(RouteParser, 'check_trigger_position', staticmethod(
+        lambda new_trigger, existing_triggers, trigger_index=None: check_trigger_position(new_trigger,
+                                                                                          existing_triggers)))
+    linear_scenarios, linear_triggers = RouteParser.scan_route_for_scenarios('Town01', trajectory,
+                                                                             copy.deepcopy(world_annotations))
+
+    assert triggers == linear_triggers
+    assert scenarios == linear_scenarios
+    assert len(triggers) > 10
+    assert any(len(descriptions) > 1 for descriptions in scenarios.values())
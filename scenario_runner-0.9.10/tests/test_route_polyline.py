@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Tests of the RoutePolyline followed by the local planners, on a synthetic plan
+"""
+
+from agents.navigation.route_polyline import RoutePolyline
+
+
+class Location(object):
+
+    def __init__(self, x, y, z=0.0):
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+class Transform(object):
+
+    def __init__(self, location):
+        self.location = location
+
+
+class Waypoint(object):
+
+    def __init__(self, x, y, z=0.0):
+        self.transform = Transform(Location(x, y, z))
+
+
+def straight_plan(count, spacing=2.0):
+    """
+    Plan along the x axis, one point every spacing meters
+    """
+    return [(Waypoint(i * spacing, 0.0), 'LANEFOLLOW') for i in range(count)]
+
+
+def test_points_of_the_plan():
+    plan = [(Waypoint(0, 0), None), (Waypoint(3, 4), None), (Waypoint(3, 10, 1), None)]
+    route = RoutePolyline(plan)
+    assert route.points.tolist() == [[0.0, 0.0, 0.0], [3.0, 4.0, 0.0], [3.0, 10.0, 1.0]]
+    assert len(route) == 3
+    assert route.head() is plan[0]
+
+
+def test_advance_moves_past_the_last_reached_point():
+    plan = straight_plan(10)
+    route = RoutePolyline(plan)
+
+    assert route.advance(Location(-10.0, 0.0), 1.5, 5) == 0
+    assert route.cursor == 0
+
+    # points 0, 1 and 2 are within 3 m, 3 is not
+    assert route.advance(Location(3.0, 0.0), 3.0, 5) == 3
+    assert route.cursor == 3
+    assert route.head() is plan[3]
+    assert len(route) == 7
+
+    # only the next count points are tested
+    assert route.advance(Location(12.0, 0.0), 1.0, 2) == 0
+    assert route.advance(Location(12.0, 0.0), 1.0, 4) == 4
+    assert route.head() is plan[7]
+
+
+def test_advance_in_the_plane():
+    plan = [(Waypoint(i * 2.0, 0.0, 5.0), None) for i in range(4)]
+    route = RoutePolyline(plan)
+
+    # the points are 5 m above the vehicle
+    assert route.advance(Location(0.0, 0.0, 0.0), 1.0, 3) == 0
+    assert route.advance(Location(0.0, 0.0, 0.0), 1.0, 3, planar=True) == 1
+
+
+def test_completed_route():
+    route = RoutePolyline(straight_plan(3))
+    assert route.advance(Location(4.0, 0.0), 10.0, 5) == 3
+    assert route.head() is None
+    assert len(route) == 0
+    assert route.advance(Location(4.0, 0.0), 10.0, 5) == 0
+
+
+def test_empty_plan():
+    route = RoutePolyline([])
+    assert len(route) == 0
+    assert route.head() is None
+    assert route.advance(Location(0.0, 0.0), 1.0, 5) == 0
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Tests of the hand-off of the sensor data to the agents: the camera frames of the
+frame ring must not change under an agent that keeps them.
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('carla')
+
+# pylint: disable=wrong-import-position
+from srunner.autoagents.sensor_interface import SensorInterface
+from srunner.tools.frame_ingestion import FrameRing
+
+
+class FakeImage(object):
+
+    """
+    carla.Image with a constant BGRA value
+    """
+
+    def __init__(self, value, width=8, height=6):
+        self.width = width
+        self.height = height
+        self.raw_data = bytes(bytearray([value]) * (width * height * 4))
+
+
+def test_kept_frames_are_not_overwritten_by_the_ring():
+    ring = FrameRing(ring_size=2)
+    interface = SensorInterface()
+    interface.register_sensor('camera', None)
+
+    kept = []
+    for frame in range(6):
+        interface.update_sensor('camera', ring.ingest(FakeImage(frame)), frame)
+        kept.append(interface.get_data()['camera'])
+
+    # more frames than ring buffers, each kept frame still holds its own image
+    for frame, (timestamp, image) in enumerate(kept):
+        assert timestamp == frame
+        assert image.shape == (6, 8, 4)
+        assert np.all(image == frame)
+
+
+def test_data_is_not_shared_between_calls():
+    interface = SensorInterface()
+    interface.register_sensor('gnss', None)
+    interface.update_sensor('gnss', np.array([1.0, 2.0, 3.0]), 1)
+
+    _, first = interface.get_data()['gnss']
+    first[0] = 10.0
+    _, second = interface.get_data()['gnss']
+    assert second.tolist() == [1.0, 2.0, 3.0]
@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+"""
+Tests of the warm world resets of the WorldResetter, on a fake server.
+
+A warm reset has to bring the world back to the state of its cold load. The state
+of both is compared directly, and a sequence of configurations (towns, weathers,
+traffic light freezes) is run with cold resets only, then with warm resets, and
+the criteria outcomes of every configuration must be the same. Each configuration
+runs a small scenario: the ego vehicle drives towards a traffic light and another
+vehicle crosses its path. It stops for a red light unless the fog hides it, and
+rain slows it down. So every state a scenario leaves behind and a warm reset has
+to undo (weather, frozen lights, leftover actors) changes the outcomes.
+"""
+
+import pytest
+
+carla = pytest.importorskip('carla')
+
+# pylint: disable=wrong-import-position
+from srunner.scenariomanager.carla_data_provider import CarlaDataProvider
+from srunner.tools.world_reset import WorldResetter
+
+from fake_world import FakeClient, spawn_points
+
+# town, index of the ego spawn point, weather set by the configuration (None keeps the current one),
+# traffic light frozen to red, vehicle left behind at the end
+CONFIGURATIONS = [
+    ('Town03', 0, None, False, False),
+    ('Town03', 0, dict(fog_density=80.0), False, True),
+    ('Town03', 0, None, False, False),
+    ('Town03', 0, None, True, False),
+    ('Town03', 0, None, False, False),
+    ('Town03', 0, dict(precipitation=100.0), True, False),
+    ('Town03', 0, None, False, True),
+    ('Town01', 0, None, True, False),
+    ('Town01', 0, None, False, False),
+    ('Town03', 0, dict(fog_density=80.0, precipitation=100.0), False, False),
+    ('Town03', 0, None, False, False),
+]
+
+TICKS = 400
+DELTA_SECONDS = 0.05
+STOP_LINE_Y = 113.0
+
+
+@pytest.fixture(autouse=True)
+def fixture_reset_data_provider():
+    # Actor reuse is off: reused actors don't wait a tick to spawn, which shifts the traffic
+    # light cycles compared to the cold resets, where nothing can be reused
+    CarlaDataProvider.set_actor_reuse(False)
+    yield
+    CarlaDataProvider.cleanup()
+    CarlaDataProvider.destroy_parked_actors()
+    CarlaDataProvider.set_actor_reuse(False)
+
+
+def world_state(world):
+    """
+    Everything a warm reset restores: weather, settings, traffic lights and actors
+    """
+    weather = world.get_weather()
+    settings = world.get_settings()
+    lights = [(light.get_state(), light.get_green_time(), light.get_yellow_time(), light.get_red_time(),
+               light.is_frozen(), light.elapsed_time)
+              for light in world.get_actors().filter('*traffic_light*')]
+    actors = sorted(actor.type_id for actor in world.get_actors())
+    return dict(weather=(weather.cloudiness, weather.precipitation, weather.fog_density),
+                settings=(settings.synchronous_mode, settings.fixed_delta_seconds, settings.no_rendering_mode),
+                lights=lights, actors=actors)
+
+
+def leave_a_mess(world):
+    """
+    Change everything a scenario can leave behind
+    """
+    world.set_weather(carla.WeatherParameters(cloudiness=50.0, precipitation=30.0, fog_density=90.0))
+    settings = world.get_settings()
+    settings.synchronous_mode = True
+    settings.fixed_delta_seconds = 0.1
+    world.apply_settings(settings)
+
+    light = world.get_actors().filter('*traffic_light*')[0]
+    light.set_green_time(1.0)
+    light.set_red_time(20.0)
+    light.set_state(carla.TrafficLightState.Green)
+    for _ in range(7):
+        world.tick()
+    light.freeze(True)
+
+    blueprints = world.get_blueprint_library()
+    for index, blueprint_id in enumerate(['vehicle.audi.a2', 'vehicle.volkswagen.t2']):
+        world.try_spawn_actor(blueprints.find(blueprint_id), spawn_points()[index])
+
+
+def test_warm_reset_restores_the_state_of_the_cold_load():
+    client = FakeClient(None)
+    resetter = WorldResetter(client, warm=True)
+
+    world = resetter.reset('Town03')
+    cold_state = world_state(world)
+
+    leave_a_mess(world)
+    assert world_state(world) != cold_state
+
+    assert resetter.reset('Town03') is world
+    assert client.loads == 1
+    assert world_state(world) == cold_state
+
+    # and the same state as a world loaded again
+    assert world_state(FakeClient(None).load_world('Town03')) == cold_state
+
+
+def test_warm_reset_keeps_the_parked_actors():
+    client = FakeClient(None)
+    resetter = WorldResetter(client, warm=True)
+    world = resetter.reset('Town03')
+
+    CarlaDataProvider.set_actor_reuse(True)
+    CarlaDataProvider.set_client(client)
+    CarlaDataProvider.set_world(world)
+    parked = CarlaDataProvider.request_new_actor('vehicle.tesla.model3', spawn_points()[0], 'hero')
+    left = CarlaDataProvider.request_new_actor('vehicle.audi.a2', spawn_points()[1])
+    CarlaDataProvider.cleanup()
+    world.try_spawn_actor(world.get_blueprint_library().find('vehicle.audi.a2'), spawn_points()[2])
+
+    resetter.reset('Town03')
+    vehicles = world.get_actors().filter('vehicle.*')
+    assert [actor.id for actor in vehicles] == sorted([parked.id, left.id])
+
+
+def test_cold_resets():
+    client = FakeClient(None)
+    resetter = WorldResetter(client, warm=True, cold_every=3)
+
+    for town in ['Town03', 'Town03', 'Town03', 'Town03', 'Town01', 'Town03']:
+        resetter.reset(town)
+    # cold for the first run, after 3 runs, and for both changes of town
+    assert client.loads == 4
+    assert len(resetter.cold_times) == 4 and len(resetter.warm_times) == 2
+
+    cold_only = WorldResetter(FakeClient(None), warm=False)
+    for _ in range(3):
+        cold_only.reset('Town03')
+    assert len(cold_only.cold_times) == 3 and not cold_only.warm_times
+    assert cold_only.saved_time() == 0.0
+
+
+def test_world_reloaded_outside_the_resetter_is_not_reused():
+    client = FakeClient(None)
+    resetter = WorldResetter(client, warm=True)
+    resetter.reset('Town03')
+    client.load_world('Town03')
+
+    world = resetter.reset('Town03')
+    assert client.loads == 3
+    assert world is client.get_world()
+
+
+def run_configuration(client, world, configuration):
+    """
+    Run the scenario of the configuration in the world and return its criteria outcomes
+    """
+    _, ego_index, weather, freeze_red, leave_vehicle = configuration
+
+    CarlaDataProvider.set_client(client)
+    CarlaDataProvider.set_world(world)
+    leftover_actors = len(world.get_actors().filter('vehicle.*'))
+
+    if weather is not None:
+        world.set_weather(carla.WeatherParameters(**weather))
+    light = world.get_actors().filter('*traffic_light*')[0]
+    if freeze_red:
+        light.set_state(carla.TrafficLightState.Red)
+        light.freeze(True)
+
+    ego_start = CarlaDataProvider.get_map().get_spawn_points()[ego_index]
+    other_start = carla.Transform(carla.Location(x=40.0, y=58.0, z=0.5), carla.Rotation(yaw=180.0))
+    ego = CarlaDataProvider.request_new_actor('vehicle.tesla.model3', ego_start, 'hero')
+    other = CarlaDataProvider.request_new_actor('vehicle.audi.a2', other_start)
+
+    current_weather = world.get_weather()
+    ego_speed = 8.0 * (1.0 - current_weather.precipitation / 200.0)
+    sees_light = current_weather.fog_density < 50.0
+
+    ego_y = ego_start.location.y
+    other_x = other_start.location.x
+    ran_red_light = False
+    collision = False
+    for _ in range(TICKS):
+        red = light.get_state() != carla.TrafficLightState.Green
+        before_line = ego_y < STOP_LINE_Y
+        if not (red and sees_light and before_line and STOP_LINE_Y - ego_y < 5.0):
+            next_y = ego_y + ego_speed * DELTA_SECONDS
+            if red and before_line and next_y >= STOP_LINE_Y:
+                ran_red_light = True
+            ego_y = next_y
+        other_x -= 6.0 * DELTA_SECONDS
+        if abs(other_x - ego_start.location.x) < 2.0 and abs(other_start.location.y - ego_y) < 2.0:
+            collision = True
+        ego.set_transform(carla.Transform(carla.Location(ego_start.location.x, ego_y, 0.5), ego_start.rotation))
+        other.set_transform(carla.Transform(carla.Location(other_x, other_start.location.y, 0.5), other_start.rotation))
+        world.tick()
+
+    if leave_vehicle:
+        # Spawned outside of the CarlaDataProvider, so only a world reset removes it
+        world.try_spawn_actor(world.get_blueprint_library().find('vehicle.volkswagen.t2'), ego_start)
+
+    CarlaDataProvider.remove_actor_by_id(other.id)
+    CarlaDataProvider.release_actor(ego)
+    CarlaDataProvider.cleanup()
+
+    return dict(leftover_actors=leftover_actors, ran_red_light=ran_red_light, collision=collision,
+                ego_distance=round(ego_y - ego_start.location.y, 6))
+
+
+class NoRestoreResetter(WorldResetter):
+
+    """
+    Warm resets that restore nothing, to check that the outcomes reveal it
+    """
+
+    def _reset_warm(self):
+        pass
+
+
+def run_configurations(resetter_class, warm):
+    """
+    Run all the configurations, returns their outcomes and the resetter
+    """
+    client = FakeClient(None)
+    resetter = resetter_class(client, warm)
+
+    outcomes = []
+    for configuration in CONFIGURATIONS:
+        world = resetter.reset(configuration[0])
+        settings = world.get_settings()
+        settings.fixed_delta_seconds = DELTA_SECONDS
+        world.apply_settings(settings)
+        outcomes.append(run_configuration(client, world, configuration))
+    return outcomes, resetter
+
+
+def test_warm_resets_give_the_outcomes_of_cold_loads():
+    cold_outcomes, cold_resetter = run_configurations(WorldResetter, False)
+    warm_outcomes, warm_resetter = run_configurations(WorldResetter, True)
+
+    assert len(cold_resetter.cold_times) == len(CONFIGURATIONS)
+    assert len(warm_resetter.cold_times) == 3 and len(warm_resetter.warm_times) == len(CONFIGURATIONS) - 3
+    assert warm_outcomes == cold_outcomes
+
+    # the scenario is sensitive to what a warm reset restores
+    assert set(outcome['ran_red_light'] for outcome in cold_outcomes) == {False, True}
+    assert all(outcome['leftover_actors'] == 0 for outcome in cold_outcomes)
+
+
+def test_warm_reset_that_restores_nothing_is_detected():
+    cold_outcomes, _ = run_configurations(WorldResetter, False)
+    no_restore_outcomes, _ = run_configurations(NoRestoreResetter, True)
+    assert no_restore_outcomes != cold_outcomes